@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.domains.file_monitor.services.file_watcher import FileWatcherService
 from app.infrastructure.config.settings import settings
 from app.infrastructure.security import token_handler
+from app.infrastructure.security.auth_cache import auth_cache
 from app.core.database import get_db
 
 # Try to import User from domains
@@ -28,6 +29,9 @@ except ImportError:
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+if User:
+    auth_cache.watch(User)
+
 def get_file_watcher() -> Generator[FileWatcherService, None, None]:
     try:
         service = FileWatcherService(settings.WATCH_PATH)
@@ -46,7 +50,6 @@ async def get_current_user(
             detail="Authentication not available"
         )
     
-    auth_service = AuthService(db)
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid credentials",
@@ -57,13 +60,13 @@ async def get_current_user(
         payload = token_handler_instance.verify_token(token)
         if payload is None:
             raise credentials_exception
-        username: str = payload.get("sub")
-        if username is None:
+        user_id = payload.get("user_id")
+        if user_id is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = auth_service.get_user_by_username(username=token_data.username)
+    # Ambil user dari cache principal (SELECT hanya saat miss)
+    user = auth_cache.load_principal(db, User, user_id)
     if user is None:
         raise credentials_exception
     return user
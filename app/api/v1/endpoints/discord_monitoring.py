@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, List, Optional
+from datetime import datetime
 
-from app.core.database import get_db
-from app.domains.discord.repositories.command_log_repository import CommandLogRepository
+from app.core.database import get_async_db
+from app.common.exceptions.custom_exceptions import ValidationException
+from app.domains.discord.repositories.async_command_log_repository import AsyncCommandLogRepository
 from app.domains.discord.services.bot_monitor import bot_monitor
 from app.domains.discord.services.command_tracker import command_tracker
+from app.domains.discord.services.log_search_engine import log_search_engine
 
 router = APIRouter()
 
@@ -44,20 +47,24 @@ async def get_bot_metrics() -> Dict[str, Any]:
 @router.get("/logs/recent")
 async def get_recent_logs(
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor dari next_cursor halaman sebelumnya"),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get recent command logs"""
     try:
-        repo = CommandLogRepository(db)
-        logs = repo.get_recent_logs(limit)
+        repo = AsyncCommandLogRepository(db)
+        page = await repo.get_logs_page(cursor, limit)
         
         return {
             "success": True,
             "data": {
-                "logs": [log.to_dict() for log in logs],
-                "total": len(logs)
+                "logs": [log.to_dict() for log in page["items"]],
+                "total": len(page["items"]),
+                "pagination": page["pagination"]
             }
         }
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -65,17 +72,50 @@ async def get_recent_logs(
 async def get_user_logs(
     user_id: str,
     limit: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor dari next_cursor halaman sebelumnya"),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get logs for specific user"""
     try:
-        repo = CommandLogRepository(db)
-        logs = repo.get_logs_by_user(user_id, limit)
+        repo = AsyncCommandLogRepository(db)
+        page = await repo.get_logs_page(cursor, limit, user_id=user_id)
         
         return {
             "success": True,
             "data": {
                 "user_id": user_id,
+                "logs": [log.to_dict() for log in page["items"]],
+                "total": len(page["items"]),
+                "pagination": page["pagination"]
+            }
+        }
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/logs/search")
+async def search_logs(
+    q: Optional[str] = Query(None, description="Kata kunci (multi-term, diranking)"),
+    user_id: Optional[str] = Query(None),
+    guild_id: Optional[str] = Query(None),
+    command: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """Search command logs lewat index in-process / full-text database"""
+    try:
+        logs = await db.run_sync(
+            lambda session: log_search_engine.search_logs(
+                session, q, user_id, guild_id, command, start_date, end_date, limit
+            )
+        )
+        
+        return {
+            "success": True,
+            "data": {
                 "logs": [log.to_dict() for log in logs],
                 "total": len(logs)
             }
@@ -83,17 +123,25 @@ async def get_user_logs(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/logs/search/stats")
+async def get_log_search_stats() -> Dict[str, Any]:
+    """Statistik index pencarian log"""
+    return {
+        "success": True,
+        "data": log_search_engine.get_index_stats()
+    }
+
 @router.get("/monitoring/logs")
 async def get_monitoring_logs(
     limit: int = Query(10, ge=1, le=100),
     level: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get monitoring logs for dashboard"""
     try:
         # Get real logs from database
-        repo = CommandLogRepository(db)
-        logs = repo.get_recent_logs(limit)
+        repo = AsyncCommandLogRepository(db)
+        logs = await repo.get_recent_logs(limit)
         
         # Convert to dict format and apply level filter if provided
         log_data = []
@@ -117,13 +165,13 @@ async def get_monitoring_logs(
 @router.get("/monitoring/commands/recent")
 async def get_recent_commands_monitoring(
     limit: int = Query(5, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get recent commands for monitoring dashboard"""
     try:
         # Get real command logs from database
-        repo = CommandLogRepository(db)
-        logs = repo.get_recent_logs(limit)
+        repo = AsyncCommandLogRepository(db)
+        logs = await repo.get_recent_logs(limit)
         
         # Convert to command format
         commands = []
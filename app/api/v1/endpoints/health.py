@@ -56,6 +56,14 @@ async def health_check():
             "timestamp": "2024-01-01T00:00:00Z"
         }
 
+@router.get("/health/upstreams")
+async def upstream_health():
+    """
+    Statistik HTTP client keluar per upstream (request, retry, error, histogram latency)
+    """
+    from app.infrastructure.external_apis.http_client import http_client_registry
+    return {"upstreams": http_client_registry.get_stats()}
+
 async def check_database_health():
     """Check database connection and return status"""
     try:
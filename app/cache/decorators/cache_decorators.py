@@ -4,10 +4,14 @@ Decorator untuk caching yang dapat digunakan kembali (DRY Principle)
 Menggabungkan implementasi dari cache/decorators dan common/utils/decorators
 """
 
+import asyncio
 import functools
 import inspect
 import logging
-from typing import Any, Optional, Union, Callable, Dict
+import math
+import random
+import time
+from typing import Any, Optional, Union, Callable, Dict, List
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
@@ -19,7 +23,10 @@ def cache_result(
     cache_type: str = "default",
     skip_cache_on_error: bool = True,
     key_template: str = None,  # Backward compatibility
-    expire_seconds: int = 300  # Backward compatibility
+    expire_seconds: int = 300,  # Backward compatibility
+    stale_ttl: Optional[Union[int, timedelta]] = None,
+    early_refresh_beta: float = 0.0,
+    lock_timeout: Optional[float] = None
 ):
     """
     Unified decorator untuk cache hasil function
@@ -32,6 +39,9 @@ def cache_result(
         skip_cache_on_error: Skip cache jika ada error
         key_template: Template untuk cache key (legacy interface)
         expire_seconds: Cache expiration time (legacy interface)
+        stale_ttl: Jendela stale-while-revalidate (new interface, lihat CacheHelper.get_or_set)
+        early_refresh_beta: Beta XFetch untuk refresh sebelum expire (new interface)
+        lock_timeout: Lock Redis lintas worker saat menghitung ulang (new interface)
     """
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
@@ -80,30 +90,27 @@ def cache_result(
                     # New implementation
                     from app.cache.managers.cache_manager import cache_manager
                     
-                    cache_service = await cache_manager.get_cache_service(cache_type)
                     key_generator = cache_manager.get_key_generator()
                     
                     prefix = key_prefix or f"func:{func.__name__}"
                     cache_key = key_generator.generate_key(prefix, *args, **kwargs)
                     
-                    cached_result = await cache_service.get(cache_key)
-                    if cached_result is not None:
-                        logger.debug(f"Cache hit for key: {cache_key}")
-                        return cached_result
-                    
-                    logger.debug(f"Cache miss for key: {cache_key}")
-                    result = await func(*args, **kwargs)
-                    
-                    await cache_service.set(cache_key, result, ttl)
-                    logger.debug(f"Cached result for key: {cache_key}")
-                    
-                    return result
-                    
             except Exception as e:
                 logger.error(f"Cache error in {func.__name__}: {e}")
                 if skip_cache_on_error:
                     return await func(*args, **kwargs)
                 raise
+            
+            # Di luar try: error dari func diteruskan apa adanya, tidak memicu eksekusi ulang
+            return await CacheHelper.get_or_set(
+                cache_key,
+                functools.partial(func, *args, **kwargs),
+                ttl,
+                cache_type,
+                stale_ttl=stale_ttl,
+                early_refresh_beta=early_refresh_beta,
+                lock_timeout=lock_timeout
+            )
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -312,44 +319,207 @@ def memoize(maxsize: int = 128):
     return decorator
 
 
+ENVELOPE_MARKER = "__cache_envelope__"
+_MISSING = object()
+
+
+async def _call_factory(factory_func: Callable) -> Any:
+    """Panggil factory sync/async (termasuk lambda yang mengembalikan coroutine)"""
+    result = factory_func()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _ttl_seconds(ttl: Optional[Union[int, timedelta]]) -> Optional[float]:
+    if isinstance(ttl, timedelta):
+        return int(ttl.total_seconds())
+    return ttl
+
+
+def _is_envelope(value: Any) -> bool:
+    return isinstance(value, dict) and value.get(ENVELOPE_MARKER) == 1
+
+
+class _SingleFlight:
+    """
+    Koalesensi request per key dalam satu proses
+    Hanya satu task yang menjalankan factory; pemanggil lain menunggu task yang sama
+    """
+    
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    def run(self, key: str, compute: Callable) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(compute())
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        return task
+    
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+    
+    def in_flight(self, key: str) -> bool:
+        task = self._tasks.get(key)
+        return task is not None and not task.done()
+
+
+_single_flight = _SingleFlight()
+
+
 class CacheHelper:
     """
     Helper class untuk cache operations yang tidak menggunakan decorator
     Mengikuti KISS principle - simple interface untuk cache operations
     """
     
+    LOCK_POLL_INTERVAL = 0.05
+    
     @staticmethod
     async def get_or_set(
         key: str,
         factory_func: Callable,
         ttl: Optional[Union[int, timedelta]] = None,
-        cache_type: str = "default"
+        cache_type: str = "default",
+        tags: Optional[List[str]] = None,
+        stale_ttl: Optional[Union[int, timedelta]] = None,
+        early_refresh_beta: float = 0.0,
+        lock_timeout: Optional[float] = None
     ) -> Any:
-        """Get dari cache, jika tidak ada execute factory_func dan cache hasilnya"""
+        """
+        Get dari cache, jika tidak ada execute factory_func dan cache hasilnya
+        
+        Anti-stampede:
+        - Pemanggil bersamaan untuk key yang sama di satu proses selalu berbagi satu
+          eksekusi factory_func (single-flight)
+        - stale_ttl: setelah ttl lewat, nilai lama masih dilayani selama stale_ttl detik
+          sementara satu background task me-refresh (stale-while-revalidate)
+        - early_refresh_beta: refresh probabilistik sebelum expire (XFetch); peluang naik
+          mendekati expiry dan sebanding dengan lama factory_func terakhir (1.0 = standar)
+        - lock_timeout: lock Redis agar hanya satu worker yang menjalankan factory_func;
+          worker lain menunggu hasilnya muncul di cache paling lama lock_timeout detik
+        """
         try:
             from app.cache.managers.cache_manager import cache_manager
             
             cache_service = await cache_manager.get_cache_service(cache_type)
-            
             cached_result = await cache_service.get(key)
-            if cached_result is not None:
+        except Exception as e:
+            logger.error(f"Cache helper error for key {key}: {e}")
+            return await _call_factory(factory_func)
+        
+        ttl_seconds = _ttl_seconds(ttl)
+        stale_seconds = _ttl_seconds(stale_ttl) or 0
+        use_envelope = bool(stale_seconds) or early_refresh_beta > 0
+        flight_key = f"{cache_type}:{key}"
+        
+        def compute():
+            return CacheHelper._compute_and_store(
+                cache_service, key, factory_func, ttl_seconds, tags,
+                stale_seconds, use_envelope, lock_timeout
+            )
+        
+        if cached_result is not None:
+            if not _is_envelope(cached_result):
                 return cached_result
             
-            if inspect.iscoroutinefunction(factory_func):
-                result = await factory_func()
+            now = time.time()
+            expires_at = cached_result.get("expires_at")
+            if expires_at is None or now < expires_at:
+                if early_refresh_beta > 0 and expires_at is not None:
+                    # XFetch: delta * beta * -ln(U) >= sisa umur
+                    jitter = -math.log(1.0 - random.random())
+                    if cached_result.get("delta", 0) * early_refresh_beta * jitter >= expires_at - now:
+                        CacheHelper._refresh_in_background(flight_key, compute)
+                return cached_result["value"]
+            
+            if now < expires_at + stale_seconds:
+                CacheHelper._refresh_in_background(flight_key, compute)
+                return cached_result["value"]
+        
+        # shield: pemanggil yang dibatalkan tidak membatalkan eksekusi bersama
+        return await asyncio.shield(_single_flight.run(flight_key, compute))
+    
+    @staticmethod
+    def _refresh_in_background(flight_key: str, compute: Callable):
+        """Jalankan refresh sekali per key; error hanya di-log karena nilai lama tetap dilayani"""
+        if _single_flight.in_flight(flight_key):
+            return
+        task = _single_flight.run(flight_key, compute)
+        task.add_done_callback(CacheHelper._log_refresh_error)
+    
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background cache refresh failed: {task.exception()}")
+    
+    @staticmethod
+    async def _compute_and_store(
+        cache_service,
+        key: str,
+        factory_func: Callable,
+        ttl: Optional[float],
+        tags: Optional[List[str]],
+        stale_seconds: float,
+        use_envelope: bool,
+        lock_timeout: Optional[float]
+    ) -> Any:
+        token = None
+        if lock_timeout and hasattr(cache_service, "acquire_lock"):
+            try:
+                token = await cache_service.acquire_lock(key, lock_timeout)
+            except Exception as e:
+                logger.warning(f"Cache lock unavailable for {key}, computing locally: {e}")
             else:
-                result = factory_func()
+                if token is None:
+                    # Worker lain sedang menghitung; tunggu hasilnya
+                    value = await CacheHelper._wait_for_value(cache_service, key, lock_timeout)
+                    if value is not _MISSING:
+                        return value
+        
+        try:
+            started = time.monotonic()
+            result = await _call_factory(factory_func)
             
-            await cache_service.set(key, result, ttl)
+            if use_envelope:
+                stored = {
+                    ENVELOPE_MARKER: 1,
+                    "value": result,
+                    "expires_at": time.time() + ttl if ttl else None,
+                    "delta": time.monotonic() - started
+                }
+                physical_ttl = int(math.ceil(ttl + stale_seconds)) if ttl else None
+            else:
+                stored, physical_ttl = result, ttl
             
+            await cache_service.set(key, stored, physical_ttl, tags=tags)
             return result
-            
-        except Exception as e:
-            logger.error(f"Cache helper error for key {key}: {e}")
-            if inspect.iscoroutinefunction(factory_func):
-                return await factory_func()
-            else:
-                return factory_func()
+        finally:
+            if token is not None:
+                try:
+                    await cache_service.release_lock(key, token)
+                except Exception as e:
+                    logger.warning(f"Failed to release cache lock for {key}: {e}")
+    
+    @staticmethod
+    async def _wait_for_value(cache_service, key: str, timeout: float) -> Any:
+        """Poll cache sampai nilai segar muncul atau timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(CacheHelper.LOCK_POLL_INTERVAL)
+            value = await cache_service.get(key)
+            if value is None:
+                continue
+            if not _is_envelope(value):
+                return value
+            expires_at = value.get("expires_at")
+            if expires_at is None or time.time() < expires_at:
+                return value["value"]
+        return _MISSING
     
     @staticmethod
     async def invalidate_pattern(
@@ -365,3 +535,18 @@ class CacheHelper:
         except Exception as e:
             logger.error(f"Error invalidating cache pattern {pattern}: {e}")
             return False
+    
+    @staticmethod
+    async def invalidate_tags(
+        tags: List[str],
+        cache_type: str = "default"
+    ) -> int:
+        """Invalidate semua key yang terdaftar pada tags"""
+        try:
+            from app.cache.managers.cache_manager import cache_manager
+            
+            cache_service = await cache_manager.get_cache_service(cache_type)
+            return await cache_service.invalidate_tags(tags)
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags {tags}: {e}")
+            return 0
@@ -0,0 +1,240 @@
+"""
+Cache Serializers
+Implementasi ICacheSerializer yang bisa dipilih per cache_type di CacheManager
+
+- json:    json stdlib (default lama, tipe Decimal/datetime kembali sebagai string)
+- orjson:  JSON biner cepat; Decimal dikirim sebagai string, datetime ISO 8601
+- msgpack: biner ringkas dengan ext type sehingga Decimal, datetime, date dan UUID
+           kembali ke tipe aslinya saat cache hit
+Setiap serializer bisa dibungkus CompressedCacheSerializer (zstd/lz4/zlib) yang hanya
+mengompresi payload di atas threshold; header 1 byte menandai codec yang dipakai.
+
+orjson, msgpack, zstandard dan lz4 bersifat opsional; bila tidak terpasang,
+build_serializer jatuh ke json / tanpa kompresi dengan warning.
+"""
+
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from app.cache.interfaces.cache_interfaces import ICacheSerializer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+
+def to_builtin(obj: Any) -> Any:
+    """
+    Fallback konversi objek non-standar (model SQLAlchemy, pydantic, Enum, set)
+    menjadi struktur builtin yang bisa di-serialize
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    table = getattr(obj, "__table__", None)
+    if table is not None:
+        return {column.name: getattr(obj, column.name, None) for column in table.columns}
+    return str(obj)
+
+
+class JSONCacheSerializer(ICacheSerializer):
+    """JSON serializer untuk cache data"""
+
+    binary = False
+
+    def serialize(self, data: Any) -> str:
+        """Serialize data ke JSON string"""
+        try:
+            return json.dumps(data, default=str, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Error serializing cache data: {e}")
+            raise
+
+    def deserialize(self, data: str) -> Any:
+        """Deserialize JSON string ke data"""
+        try:
+            return json.loads(data)
+        except Exception as e:
+            logger.error(f"Error deserializing cache data: {e}")
+            raise
+
+
+class OrjsonCacheSerializer(ICacheSerializer):
+    """JSON serializer berbasis orjson (output bytes)"""
+
+    binary = True
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return to_builtin(obj)
+
+    def serialize(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=self._default, option=orjson.OPT_NON_STR_KEYS)
+
+    def deserialize(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCacheSerializer(ICacheSerializer):
+    """Msgpack serializer dengan ext type untuk Decimal, datetime, date dan UUID"""
+
+    binary = True
+
+    EXT_DECIMAL = 1
+    EXT_DATETIME = 2
+    EXT_DATE = 3
+    EXT_UUID = 4
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is not installed")
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, Decimal):
+            return msgpack.ExtType(self.EXT_DECIMAL, str(obj).encode("ascii"))
+        if isinstance(obj, datetime):
+            return msgpack.ExtType(self.EXT_DATETIME, obj.isoformat().encode("ascii"))
+        if isinstance(obj, date):
+            return msgpack.ExtType(self.EXT_DATE, obj.isoformat().encode("ascii"))
+        if isinstance(obj, UUID):
+            return msgpack.ExtType(self.EXT_UUID, obj.bytes)
+        return to_builtin(obj)
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == self.EXT_DECIMAL:
+            return Decimal(data.decode("ascii"))
+        if code == self.EXT_DATETIME:
+            return datetime.fromisoformat(data.decode("ascii"))
+        if code == self.EXT_DATE:
+            return date.fromisoformat(data.decode("ascii"))
+        if code == self.EXT_UUID:
+            return UUID(bytes=data)
+        return msgpack.ExtType(code, data)
+
+    def serialize(self, data: Any) -> bytes:
+        # datetime=False agar datetime selalu lewat ext type (termasuk yang naive)
+        return msgpack.packb(data, default=self._default, use_bin_type=True, datetime=False)
+
+    def deserialize(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+
+def _codecs() -> Dict[str, Tuple[bytes, Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    """Codec kompresi yang tersedia: nama -> (header, compress, decompress)"""
+    codecs = {"zlib": (b"\x03", lambda raw: zlib.compress(raw, 6), zlib.decompress)}
+    if zstandard is not None:
+        codecs["zstd"] = (
+            b"\x01",
+            zstandard.ZstdCompressor(level=3).compress,
+            lambda raw: zstandard.ZstdDecompressor().decompress(raw)
+        )
+    if lz4_frame is not None:
+        codecs["lz4"] = (b"\x02", lz4_frame.compress, lz4_frame.decompress)
+    return codecs
+
+
+class CompressedCacheSerializer(ICacheSerializer):
+    """
+    Pembungkus serializer dengan kompresi di atas threshold byte.
+    Payload diberi header 1 byte (0 = tidak dikompresi) sehingga data lama dan baru,
+    terkompresi atau tidak, tetap bisa dibaca oleh instance yang sama.
+    """
+
+    binary = True
+    RAW = b"\x00"
+
+    def __init__(self, inner: ICacheSerializer, codec: str = "zstd", threshold: int = 1024):
+        codecs = _codecs()
+        if codec not in codecs:
+            raise ImportError(f"Compression codec '{codec}' is not available")
+        self.inner = inner
+        self.codec = codec
+        self.threshold = threshold
+        self._header, self._compress, _ = codecs[codec]
+        self._decompressors = {header: decompress for header, _, decompress in codecs.values()}
+
+    def serialize(self, data: Any) -> bytes:
+        payload = self.inner.serialize(data)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        if len(payload) >= self.threshold:
+            return self._header + self._compress(payload)
+        return self.RAW + payload
+
+    def deserialize(self, data: bytes) -> Any:
+        header, payload = data[:1], data[1:]
+        if header != self.RAW:
+            decompress = self._decompressors.get(header)
+            if decompress is None:
+                raise ValueError(f"Unknown compression header {header!r}")
+            payload = decompress(payload)
+        if not getattr(self.inner, "binary", False):
+            payload = payload.decode("utf-8")
+        return self.inner.deserialize(payload)
+
+
+SERIALIZERS = {
+    "json": JSONCacheSerializer,
+    "orjson": OrjsonCacheSerializer,
+    "msgpack": MsgpackCacheSerializer
+}
+
+
+def build_serializer(spec: Optional[str] = None, compression_threshold: int = 1024) -> ICacheSerializer:
+    """
+    Buat serializer dari spec "<format>[+<codec>]", mis. "json", "orjson", "msgpack+zstd".
+    Format/codec yang dependency-nya tidak terpasang diganti json / tanpa kompresi.
+    """
+    name, _, codec = (spec or "json").strip().lower().partition("+")
+
+    try:
+        serializer = SERIALIZERS[name]()
+    except KeyError:
+        logger.warning(f"Unknown cache serializer '{name}', using json")
+        serializer = JSONCacheSerializer()
+    except ImportError as e:
+        logger.warning(f"Cache serializer '{name}' unavailable ({e}), using json")
+        serializer = JSONCacheSerializer()
+
+    if codec and codec != "none":
+        try:
+            serializer = CompressedCacheSerializer(serializer, codec, compression_threshold)
+        except ImportError as e:
+            logger.warning(f"{e}, cache payloads will not be compressed")
+
+    return serializer
@@ -1,12 +1,23 @@
 """
 Memory Cache Service Implementation
 Implementasi in-memory cache sebagai fallback ketika Redis tidak tersedia
+
+Engine:
+- Setiap shard memakai OrderedDict sehingga get/set O(1) dengan urutan LRU
+  berdasarkan akses terakhir (bukan waktu pembuatan)
+- Expiry dicatat di min-heap per shard dan dibersihkan oleh background reaper,
+  sehingga get/set tidak pernah melakukan scan seluruh cache
+- Lock dipecah per shard agar operasi pada key berbeda tidak saling menunggu
 """
 
 import asyncio
-from typing import Any, Optional, Union, Dict
-from datetime import datetime, timedelta
+import fnmatch
+import heapq
 import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Union, Dict, List, Set, Tuple
+from datetime import datetime, timedelta
 from app.cache.interfaces.cache_interfaces import ICacheService
 
 logger = logging.getLogger(__name__)
@@ -14,23 +25,38 @@ logger = logging.getLogger(__name__)
 
 class MemoryCacheItem:
     """Item cache dengan TTL support"""
-    
+
+    __slots__ = ("value", "created_at", "expires_at")
+
     def __init__(self, value: Any, ttl: Optional[Union[int, timedelta]] = None):
         self.value = value
         self.created_at = datetime.now()
-        
+
+        # Gunakan monotonic clock agar TTL tidak terpengaruh perubahan jam sistem
         if ttl is None:
             self.expires_at = None
         elif isinstance(ttl, timedelta):
-            self.expires_at = self.created_at + ttl
+            self.expires_at = time.monotonic() + ttl.total_seconds()
         else:
-            self.expires_at = self.created_at + timedelta(seconds=ttl)
-    
-    def is_expired(self) -> bool:
+            self.expires_at = time.monotonic() + ttl
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Cek apakah item sudah expired"""
         if self.expires_at is None:
             return False
-        return datetime.now() > self.expires_at
+        return (now if now is not None else time.monotonic()) > self.expires_at
+
+
+class _CacheShard:
+    """Satu partisi cache: OrderedDict (urutan LRU) + heap expiry + lock sendiri"""
+
+    __slots__ = ("items", "expiry_heap", "lock", "capacity")
+
+    def __init__(self, capacity: int):
+        self.items: "OrderedDict[str, MemoryCacheItem]" = OrderedDict()
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.lock = asyncio.Lock()
+        self.capacity = capacity
 
 
 class MemoryCacheService(ICacheService):
@@ -38,142 +64,252 @@ class MemoryCacheService(ICacheService):
     In-memory cache implementation
     Mengikuti Single Responsibility Principle - hanya menangani memory operations
     """
-    
-    def __init__(self, max_size: int = 1000):
-        self._cache: Dict[str, MemoryCacheItem] = {}
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        shard_count: int = 16,
+        cleanup_interval: float = 1.0
+    ):
         self._max_size = max_size
-        self._lock = asyncio.Lock()
-    
+        self._shard_count = max(1, min(shard_count, max_size))
+        # Kapasitas dibagi rata per shard; eviction LRU berlaku per shard
+        shard_capacity = -(-max_size // self._shard_count)
+        self._shards = [_CacheShard(shard_capacity) for _ in range(self._shard_count)]
+        self._cleanup_interval = cleanup_interval
+        self._reaper_task: Optional[asyncio.Task] = None
+        # Index tag -> key; anggota yang sudah evict/expire dibersihkan saat set tag membesar
+        self._tags: Dict[str, Set[str]] = {}
+
+        # Statistik
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _get_shard(self, key: str) -> _CacheShard:
+        """Pilih shard berdasarkan hash key"""
+        return self._shards[hash(key) % self._shard_count]
+
+    def _ensure_reaper(self):
+        """Jalankan background reaper sekali saat event loop tersedia"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._reaper_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._reaper_task = loop.create_task(self._reaper_loop())
+
+    async def _reaper_loop(self):
+        """Background task yang menghapus item expired secara periodik"""
+        try:
+            while True:
+                await asyncio.sleep(self._cleanup_interval)
+                await self._cleanup_expired()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Memory cache reaper stopped: {e}")
+
+    def _reap_shard(self, shard: _CacheShard, now: float) -> int:
+        """Pop entry heap yang sudah lewat waktunya; entry basi (key sudah diganti) diabaikan"""
+        removed = 0
+        heap = shard.expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            item = shard.items.get(key)
+            if item is not None and item.expires_at == expires_at:
+                del shard.items[key]
+                removed += 1
+
+        # Compact heap jika terlalu banyak entry basi akibat overwrite/delete
+        if len(heap) > 2 * len(shard.items) + 64:
+            shard.expiry_heap = [
+                (item.expires_at, key)
+                for key, item in shard.items.items()
+                if item.expires_at is not None
+            ]
+            heapq.heapify(shard.expiry_heap)
+        return removed
+
     async def _cleanup_expired(self):
-        """Bersihkan item yang sudah expired"""
-        expired_keys = []
-        for key, item in self._cache.items():
-            if item.is_expired():
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self._cache[key]
-    
-    async def _ensure_capacity(self):
-        """Pastikan cache tidak melebihi max_size"""
-        if len(self._cache) >= self._max_size:
-            # Hapus 20% item tertua (LRU-like behavior)
-            items_to_remove = int(self._max_size * 0.2)
-            sorted_items = sorted(
-                self._cache.items(), 
-                key=lambda x: x[1].created_at
-            )
-            
-            for key, _ in sorted_items[:items_to_remove]:
-                del self._cache[key]
-    
+        """Bersihkan item yang sudah expired (dipanggil oleh reaper)"""
+        now = time.monotonic()
+        for shard in self._shards:
+            if not shard.expiry_heap or shard.expiry_heap[0][0] > now:
+                continue
+            async with shard.lock:
+                self._expirations += self._reap_shard(shard, now)
+
+    def _ensure_capacity(self, shard: _CacheShard):
+        """Pastikan shard tidak melebihi kapasitas dengan membuang item least recently used"""
+        while len(shard.items) >= shard.capacity:
+            shard.items.popitem(last=False)
+            self._evictions += 1
+
+    def _lookup(self, shard: _CacheShard, key: str) -> Optional[MemoryCacheItem]:
+        """Ambil item yang masih valid; item expired dihapus saat ditemui"""
+        item = shard.items.get(key)
+        if item is None:
+            return None
+        if item.is_expired():
+            del shard.items[key]
+            self._expirations += 1
+            return None
+        return item
+
     async def get(self, key: str) -> Optional[Any]:
         """Ambil data dari memory cache"""
-        async with self._lock:
-            await self._cleanup_expired()
-            
-            item = self._cache.get(key)
+        shard = self._get_shard(key)
+        async with shard.lock:
+            item = self._lookup(shard, key)
             if item is None:
+                self._misses += 1
                 return None
-            
-            if item.is_expired():
-                del self._cache[key]
-                return None
-            
+
+            shard.items.move_to_end(key)
+            self._hits += 1
             return item.value
-    
+
     async def set(
-        self, 
-        key: str, 
-        value: Any, 
-        ttl: Optional[Union[int, timedelta]] = None
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[Union[int, timedelta]] = None,
+        tags: Optional[List[str]] = None
     ) -> bool:
         """Simpan data ke memory cache"""
         try:
-            async with self._lock:
-                await self._cleanup_expired()
-                await self._ensure_capacity()
-                
-                self._cache[key] = MemoryCacheItem(value, ttl)
-                return True
-                
+            self._ensure_reaper()
+            shard = self._get_shard(key)
+            async with shard.lock:
+                item = MemoryCacheItem(value, ttl)
+                if key in shard.items:
+                    shard.items.move_to_end(key)
+                else:
+                    self._ensure_capacity(shard)
+                shard.items[key] = item
+
+                if item.expires_at is not None:
+                    heapq.heappush(shard.expiry_heap, (item.expires_at, key))
+
+            for tag in tags or ():
+                members = self._tags.setdefault(tag, set())
+                members.add(key)
+                if len(members) > self._max_size:
+                    self._tags[tag] = {member for member in members if self._contains(member)}
+            return True
+
         except Exception as e:
             logger.error(f"Error setting memory cache key {key}: {e}")
             return False
-    
+
     async def delete(self, key: str) -> bool:
         """Hapus data dari memory cache"""
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
-    
+        shard = self._get_shard(key)
+        async with shard.lock:
+            return shard.items.pop(key, None) is not None
+
     async def exists(self, key: str) -> bool:
         """Cek apakah key ada di memory cache"""
-        async with self._lock:
-            await self._cleanup_expired()
-            
-            item = self._cache.get(key)
-            if item is None:
-                return False
-            
-            if item.is_expired():
-                del self._cache[key]
-                return False
-            
-            return True
-    
+        shard = self._get_shard(key)
+        async with shard.lock:
+            return self._lookup(shard, key) is not None
+
     async def clear(self, pattern: Optional[str] = None) -> bool:
         """Hapus data dari memory cache"""
         try:
-            async with self._lock:
-                if pattern:
-                    # Simple pattern matching dengan wildcard
-                    import fnmatch
-                    keys_to_delete = []
-                    for key in self._cache.keys():
-                        if fnmatch.fnmatch(key, pattern):
-                            keys_to_delete.append(key)
-                    
-                    for key in keys_to_delete:
-                        del self._cache[key]
-                else:
-                    # Hapus semua data
-                    self._cache.clear()
-                
-                return True
-                
+            for shard in self._shards:
+                async with shard.lock:
+                    if pattern:
+                        # Simple pattern matching dengan wildcard
+                        keys_to_delete = [
+                            key for key in shard.items
+                            if fnmatch.fnmatchcase(key, pattern)
+                        ]
+                        for key in keys_to_delete:
+                            del shard.items[key]
+                    else:
+                        # Hapus semua data
+                        shard.items.clear()
+                        shard.expiry_heap.clear()
+            if not pattern:
+                self._tags.clear()
+
+            return True
+
         except Exception as e:
             logger.error(f"Error clearing memory cache with pattern {pattern}: {e}")
             return False
-    
+
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Hapus semua key yang terdaftar pada tags"""
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.pop(tag, ()))
+
+        removed = 0
+        for key in keys:
+            if await self.delete(key):
+                removed += 1
+        return removed
+
+    def _contains(self, key: str) -> bool:
+        return key in self._get_shard(key).items
+
+    def _size(self) -> int:
+        return sum(len(shard.items) for shard in self._shards)
+
+    def _counters(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations
+        }
+
     async def health_check(self) -> Dict[str, Any]:
         """Cek kesehatan memory cache"""
-        async with self._lock:
-            await self._cleanup_expired()
-            
-            return {
-                "status": "healthy",
-                "type": "memory",
-                "total_items": len(self._cache),
-                "max_size": self._max_size,
-                "usage_percentage": (len(self._cache) / self._max_size) * 100
-            }
-    
+        total_items = self._size()
+        return {
+            "status": "healthy",
+            "type": "memory",
+            "total_items": total_items,
+            "max_size": self._max_size,
+            "usage_percentage": (total_items / self._max_size) * 100,
+            "shards": self._shard_count,
+            **self._counters()
+        }
+
     async def get_stats(self) -> Dict[str, Any]:
         """Ambil statistik cache"""
-        async with self._lock:
-            await self._cleanup_expired()
-            
-            expired_count = 0
-            for item in self._cache.values():
-                if item.is_expired():
-                    expired_count += 1
-            
-            return {
-                "total_items": len(self._cache),
-                "expired_items": expired_count,
-                "max_size": self._max_size,
-                "usage_percentage": (len(self._cache) / self._max_size) * 100
-            }
+        now = time.monotonic()
+        expired_count = 0
+        for shard in self._shards:
+            async with shard.lock:
+                expired_count += sum(
+                    1 for item in shard.items.values() if item.is_expired(now)
+                )
+
+        total_items = self._size()
+        return {
+            "total_items": total_items,
+            "expired_items": expired_count,
+            "max_size": self._max_size,
+            "usage_percentage": (total_items / self._max_size) * 100,
+            **self._counters()
+        }
+
+    async def close(self):
+        """Hentikan background reaper"""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
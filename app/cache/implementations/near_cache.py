@@ -0,0 +1,309 @@
+"""
+Near Cache Service Implementation
+Cache dua tingkat: L1 in-process di depan L2 Redis
+
+- L1 adalah OrderedDict terbatas (LRU) di memori worker; hit L1 tidak menyentuh Redis
+  dan tidak melakukan deserialisasi
+- TTL L1 ditentukan per prefix key (mis. katalog produk 30 detik), tidak lebih lama
+  dari TTL L2
+- Koherensi antar worker uvicorn dijaga lewat channel pub/sub Redis: setiap set/delete/
+  clear/invalidate_tags mem-publish key yang berubah dan semua worker membuang entri L1-nya
+- Selama listener pub/sub belum tersambung (startup atau Redis putus), L1 dikosongkan
+  dan dilewati sehingga worker tidak pernah membaca entri yang mungkin basi
+"""
+
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.cache.interfaces.cache_interfaces import ICacheService
+from app.cache.implementations.redis_cache import RedisCacheService
+
+logger = logging.getLogger(__name__)
+
+
+class NearCacheService(ICacheService):
+    """
+    Near cache (L1 memory + L2 Redis)
+    Mengikuti Decorator Pattern - membungkus RedisCacheService tanpa mengubahnya
+    """
+
+    def __init__(
+        self,
+        l2: RedisCacheService,
+        max_size: int = 10000,
+        default_l1_ttl: float = 5.0,
+        prefix_ttls: Optional[Dict[str, float]] = None,
+        channel: str = "cache:invalidate"
+    ):
+        self.l2 = l2
+        self.max_size = max_size
+        self.default_l1_ttl = default_l1_ttl
+        # Prefix terpanjang dicek lebih dulu; TTL 0 berarti prefix tersebut tidak di-cache di L1
+        self.prefix_ttls = sorted((prefix_ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+
+        self._l1: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Naik setiap invalidation diterapkan; nilai L2 yang dibaca sebelum invalidation
+        # tidak dimasukkan ke L1 (mencegah race get lambat vs set dari worker lain)
+        self._generation = 0
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listening = False
+        self._stopping = False
+
+        # Statistik
+        self._l1_hits = 0
+        self._l1_misses = 0
+        self._l2_hits = 0
+        self._l2_misses = 0
+        self._invalidations_received = 0
+
+    # ---- L1 -------------------------------------------------------------
+
+    def _l1_ttl(self, key: str) -> float:
+        for prefix, ttl in self.prefix_ttls:
+            if key.startswith(prefix):
+                return ttl
+        return self.default_l1_ttl
+
+    def _l1_put(self, key: str, value: Any, l2_ttl: Optional[Union[int, timedelta]] = None):
+        if not self._listening:
+            return
+        ttl = self._l1_ttl(key)
+        if isinstance(l2_ttl, timedelta):
+            l2_ttl = l2_ttl.total_seconds()
+        if l2_ttl:
+            ttl = min(ttl, l2_ttl)
+        if ttl <= 0:
+            return
+
+        self._l1[key] = (time.monotonic() + ttl, value)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_size:
+            self._l1.popitem(last=False)
+
+    def _l1_get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            del self._l1[key]
+            return False, None
+        self._l1.move_to_end(key)
+        return True, entry[1]
+
+    def _l1_drop(self, keys: List[str]):
+        for key in keys:
+            self._l1.pop(key, None)
+
+    def _l1_drop_pattern(self, pattern: Optional[str]):
+        if pattern is None:
+            self._l1.clear()
+            return
+        for key in [key for key in self._l1 if fnmatch.fnmatchcase(key, pattern)]:
+            del self._l1[key]
+
+    # ---- Pub/sub invalidation -------------------------------------------
+
+    def _ensure_listener(self):
+        """Jalankan listener pub/sub sekali saat event loop tersedia"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._stopping:
+            return
+        task = self._listener_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._listener_task = loop.create_task(self._listen())
+
+    async def _listen(self):
+        """Subscribe channel invalidation; reconnect dengan backoff bila Redis putus"""
+        backoff = 1.0
+        while not self._stopping:
+            pubsub = None
+            try:
+                client = await self.l2._get_redis_client()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                # Pesan selama terputus bisa hilang; mulai dari L1 kosong
+                self._l1.clear()
+                self._listening = True
+                backoff = 1.0
+                logger.info(f"Near cache subscribed to {self.channel}")
+
+                # Flag dicek tiap iterasi: get_message(timeout) di redis-py bisa menelan
+                # CancelledError sehingga cancel() saja tidak cukup menghentikan loop
+                while not self._stopping:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None and message.get("type") == "message":
+                        self._apply_invalidation(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Near cache invalidation listener error: {e}")
+                self._listening = False
+                self._l1.clear()
+                if self._stopping:
+                    break
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                self._listening = False
+                self._l1.clear()
+                if pubsub is not None:
+                    try:
+                        await pubsub.reset()
+                    except Exception:
+                        pass
+
+    def _apply_invalidation(self, data: Union[str, bytes]):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            logger.warning("Near cache received malformed invalidation message")
+            return
+        if message.get("origin") == self.instance_id:
+            return
+
+        self._invalidations_received += 1
+        self._generation += 1
+        if "keys" in message:
+            self._l1_drop(message["keys"])
+        elif "pattern" in message:
+            self._l1_drop_pattern(message["pattern"])
+        else:
+            self._l1.clear()
+
+    async def _publish(self, **payload):
+        try:
+            client = await self.l2._get_redis_client()
+            await client.publish(self.channel, json.dumps({"origin": self.instance_id, **payload}))
+        except Exception as e:
+            # Worker lain tidak menerima invalidation; L1 mereka kedaluwarsa sesuai TTL L1
+            logger.error(f"Failed to publish cache invalidation: {e}")
+
+    # ---- ICacheService --------------------------------------------------
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Ambil dari L1; bila miss ambil dari L2 dan isi L1"""
+        found, value = self._l1_get(key)
+        if found:
+            self._l1_hits += 1
+            return value
+        self._l1_misses += 1
+        self._ensure_listener()
+
+        generation = self._generation
+        value = await self.l2.get(key)
+        if value is None:
+            self._l2_misses += 1
+            return None
+        self._l2_hits += 1
+        if generation == self._generation:
+            self._l1_put(key, value)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[Union[int, timedelta]] = None,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """Simpan ke L2, isi L1 lokal dan minta worker lain membuang L1 key ini"""
+        self._ensure_listener()
+        self._generation += 1
+        result = await self.l2.set(key, value, ttl, tags=tags)
+        self._l1.pop(key, None)
+        if result:
+            self._l1_put(key, value, ttl)
+            await self._publish(keys=[key])
+        return result
+
+    async def delete(self, key: str) -> bool:
+        self._generation += 1
+        self._l1.pop(key, None)
+        result = await self.l2.delete(key)
+        await self._publish(keys=[key])
+        return result
+
+    async def exists(self, key: str) -> bool:
+        found, _ = self._l1_get(key)
+        return found or await self.l2.exists(key)
+
+    async def clear(self, pattern: Optional[str] = None) -> bool:
+        self._generation += 1
+        self._l1_drop_pattern(pattern)
+        result = await self.l2.clear(pattern)
+        if pattern:
+            await self._publish(pattern=pattern)
+        else:
+            await self._publish(all=True)
+        return result
+
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        try:
+            keys = await self.l2.pop_tagged_keys(tags)
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags {tags}: {e}")
+            return 0
+        if keys:
+            keys = list(keys)
+            self._generation += 1
+            self._l1_drop(keys)
+            await self._publish(keys=keys)
+        return len(keys)
+
+    async def count(self, pattern: str) -> int:
+        return await self.l2.count(pattern)
+
+    async def acquire_lock(self, name: str, timeout: float) -> Optional[str]:
+        return await self.l2.acquire_lock(name, timeout)
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        return await self.l2.release_lock(name, token)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit ratio L1 dan L2 (L2 hanya dihitung untuk request yang miss di L1)"""
+        l1_lookups = self._l1_hits + self._l1_misses
+        l2_lookups = self._l2_hits + self._l2_misses
+        return {
+            "l1_size": len(self._l1),
+            "l1_max_size": self.max_size,
+            "l1_hits": self._l1_hits,
+            "l1_misses": self._l1_misses,
+            "l1_hit_ratio": round(self._l1_hits / l1_lookups, 4) if l1_lookups else 0.0,
+            "l2_hits": self._l2_hits,
+            "l2_misses": self._l2_misses,
+            "l2_hit_ratio": round(self._l2_hits / l2_lookups, 4) if l2_lookups else 0.0,
+            "invalidations_received": self._invalidations_received,
+            "listening": self._listening
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        health = await self.l2.health_check()
+        health["type"] = "near"
+        health["near_cache"] = self.get_stats()
+        return health
+
+    async def close(self):
+        self._stopping = True
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self._l1.clear()
+        await self.l2.close()
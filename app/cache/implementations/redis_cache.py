@@ -1,45 +1,43 @@
 """
 Redis Cache Service Implementation
 Implementasi konkret dari ICacheService menggunakan Redis
+
+Invalidation tidak pernah memakai KEYS (memblokir Redis selama scan seluruh keyspace):
+- Tag: setiap key yang di-set dengan tags didaftarkan ke set "tag:<nama>";
+  invalidate_tags mengambil dan menghapus set tag secara atomik lalu UNLINK anggotanya
+- Pattern: SCAN bertahap dengan UNLINK per batch sehingga perintah lain tetap dilayani
 """
 
-import json
+import uuid
 import redis.asyncio as redis
-from typing import Any, Optional, Union, Dict
+from typing import Any, Optional, Union, Dict, Iterable, List, Set
 from datetime import timedelta
 import logging
 from app.cache.interfaces.cache_interfaces import ICacheService, ICacheSerializer
+from app.cache.implementations.cache_serializers import JSONCacheSerializer
 from app.infrastructure.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
-class JSONCacheSerializer(ICacheSerializer):
-    """JSON serializer untuk cache data"""
-    
-    def serialize(self, data: Any) -> str:
-        """Serialize data ke JSON string"""
-        try:
-            return json.dumps(data, default=str, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Error serializing cache data: {e}")
-            raise
-    
-    def deserialize(self, data: str) -> Any:
-        """Deserialize JSON string ke data"""
-        try:
-            return json.loads(data)
-        except Exception as e:
-            logger.error(f"Error deserializing cache data: {e}")
-            raise
-
-
 class RedisCacheService(ICacheService):
     """
     Redis implementation dari ICacheService
     Mengikuti Single Responsibility Principle - hanya menangani Redis operations
     """
     
+    TAG_PREFIX = "tag:"
+    LOCK_PREFIX = "lock:"
+    # Hapus lock hanya jika token masih milik pemegangnya (lock bisa sudah expire dan diambil worker lain)
+    RELEASE_LOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+    SCAN_COUNT = 1000    # hint jumlah key per iterasi SCAN
+    UNLINK_BATCH = 500   # jumlah key per perintah UNLINK
+    
     def __init__(
         self, 
         redis_url: str = None,
@@ -61,7 +59,8 @@ class RedisCacheService(ICacheService):
                     self.redis_url,
                     password=self.password,
                     db=self.db,
-                    decode_responses=True,
+                    # Serializer biner (orjson/msgpack/kompresi) butuh payload bytes apa adanya
+                    decode_responses=not getattr(self.serializer, "binary", False),
                     socket_connect_timeout=5,
                     socket_timeout=5,
                     retry_on_timeout=True
@@ -94,7 +93,8 @@ class RedisCacheService(ICacheService):
         self, 
         key: str, 
         value: Any, 
-        ttl: Optional[Union[int, timedelta]] = None
+        ttl: Optional[Union[int, timedelta]] = None,
+        tags: Optional[List[str]] = None
     ) -> bool:
         """Simpan data ke Redis cache"""
         try:
@@ -105,8 +105,22 @@ class RedisCacheService(ICacheService):
             if isinstance(ttl, timedelta):
                 ttl = int(ttl.total_seconds())
             
-            result = await client.set(key, serialized_data, ex=ttl)
-            return bool(result)
+            if not tags:
+                result = await client.set(key, serialized_data, ex=ttl)
+                return bool(result)
+            
+            # SET dan registrasi tag dalam satu round trip
+            pipe = client.pipeline(transaction=False)
+            pipe.set(key, serialized_data, ex=ttl)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, key)
+                if ttl:
+                    # Set tag hidup minimal selama anggota terlama (NX untuk set baru, GT untuk perpanjang)
+                    pipe.expire(tag_key, ttl, nx=True)
+                    pipe.expire(tag_key, ttl, gt=True)
+            result = await pipe.execute()
+            return bool(result[0])
             
         except Exception as e:
             logger.error(f"Error setting cache key {key}: {e}")
@@ -140,21 +154,96 @@ class RedisCacheService(ICacheService):
             client = await self._get_redis_client()
             
             if pattern:
-                # Hapus berdasarkan pattern
-                keys = await client.keys(pattern)
-                if keys:
-                    result = await client.delete(*keys)
-                    return result > 0
+                # SCAN bertahap + UNLINK per batch, tidak memblokir Redis seperti KEYS
+                await self._unlink_batched(client, client.scan_iter(match=pattern, count=self.SCAN_COUNT))
                 return True
             else:
-                # Hapus semua data di database
-                result = await client.flushdb()
+                # Hapus semua data di database (pembebasan memori di background thread)
+                result = await client.flushdb(asynchronous=True)
                 return bool(result)
                 
         except Exception as e:
             logger.error(f"Error clearing cache with pattern {pattern}: {e}")
             return False
     
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Hapus semua key yang terdaftar pada tags; return jumlah key yang dihapus"""
+        try:
+            return len(await self.pop_tagged_keys(tags))
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags {tags}: {e}")
+            return 0
+    
+    async def pop_tagged_keys(self, tags: List[str]) -> Set[str]:
+        """
+        Hapus key yang terdaftar pada tags dan kembalikan daftar key tersebut.
+        SMEMBERS + UNLINK set tag dijalankan dalam satu transaksi sehingga key yang
+        didaftarkan setelahnya masuk ke set tag baru dan tidak ikut hilang.
+        """
+        if not tags:
+            return set()
+        client = await self._get_redis_client()
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        
+        pipe = client.pipeline(transaction=True)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        pipe.unlink(*tag_keys)
+        results = await pipe.execute()
+        
+        keys = set()
+        for members in results[:-1]:
+            keys.update(member.decode("utf-8") if isinstance(member, bytes) else member for member in members)
+        await self._unlink_batched(client, keys)
+        return keys
+    
+    async def acquire_lock(self, name: str, timeout: float) -> Optional[str]:
+        """Ambil lock lintas worker (SET NX PX); return token bila berhasil"""
+        client = await self._get_redis_client()
+        token = uuid.uuid4().hex
+        acquired = await client.set(f"{self.LOCK_PREFIX}{name}", token, nx=True, px=max(1, int(timeout * 1000)))
+        return token if acquired else None
+    
+    async def release_lock(self, name: str, token: str) -> bool:
+        """Lepas lock bila token masih cocok"""
+        client = await self._get_redis_client()
+        return bool(await client.eval(self.RELEASE_LOCK_SCRIPT, 1, f"{self.LOCK_PREFIX}{name}", token))
+    
+    async def count(self, pattern: str) -> int:
+        """Hitung key yang cocok dengan pattern menggunakan SCAN"""
+        client = await self._get_redis_client()
+        total = 0
+        async for _ in client.scan_iter(match=pattern, count=self.SCAN_COUNT):
+            total += 1
+        return total
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.TAG_PREFIX}{tag}"
+    
+    async def _unlink_batched(self, client: redis.Redis, keys: Union[Iterable[str], Any]) -> int:
+        """UNLINK key per UNLINK_BATCH; menerima iterable biasa maupun async iterator SCAN"""
+        removed = 0
+        batch: List[str] = []
+        
+        async def flush():
+            nonlocal removed, batch
+            if batch:
+                removed += await client.unlink(*batch)
+                batch = []
+        
+        if hasattr(keys, "__aiter__"):
+            async for key in keys:
+                batch.append(key)
+                if len(batch) >= self.UNLINK_BATCH:
+                    await flush()
+        else:
+            for key in keys:
+                batch.append(key)
+                if len(batch) >= self.UNLINK_BATCH:
+                    await flush()
+        await flush()
+        return removed
+    
     async def health_check(self) -> Dict[str, Any]:
         """Cek kesehatan Redis connection"""
         try:
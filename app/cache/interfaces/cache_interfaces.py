@@ -22,9 +22,10 @@ class ICacheService(ABC):
         self, 
         key: str, 
         value: Any, 
-        ttl: Optional[Union[int, timedelta]] = None
+        ttl: Optional[Union[int, timedelta]] = None,
+        tags: Optional[List[str]] = None
     ) -> bool:
-        """Simpan data ke cache dengan TTL opsional"""
+        """Simpan data ke cache dengan TTL opsional; key didaftarkan ke setiap tag"""
         pass
     
     @abstractmethod
@@ -41,6 +42,11 @@ class ICacheService(ABC):
     async def clear(self, pattern: Optional[str] = None) -> bool:
         """Hapus semua data atau berdasarkan pattern"""
         pass
+    
+    @abstractmethod
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Hapus semua key yang terdaftar pada tag; return jumlah key yang dihapus"""
+        pass
 
 
 class ICacheManager(ABC):
@@ -58,15 +64,20 @@ class ICacheManager(ABC):
 
 
 class ICacheSerializer(ABC):
-    """Interface untuk serialization cache data"""
+    """
+    Interface untuk serialization cache data
+    Serializer dengan atribut binary = True menghasilkan bytes (bukan str)
+    """
+    
+    binary = False
     
     @abstractmethod
-    def serialize(self, data: Any) -> str:
+    def serialize(self, data: Any) -> Union[str, bytes]:
         """Serialize data untuk disimpan di cache"""
         pass
     
     @abstractmethod
-    def deserialize(self, data: str) -> Any:
+    def deserialize(self, data: Union[str, bytes]) -> Any:
         """Deserialize data dari cache"""
         pass
 
@@ -4,10 +4,13 @@ Mengelola multiple cache instances dengan fallback mechanism
 """
 
 import logging
+import time
 from typing import Dict, Any, Optional
 from app.cache.interfaces.cache_interfaces import ICacheService, ICacheManager, ICacheKeyGenerator
 from app.cache.implementations.redis_cache import RedisCacheService
 from app.cache.implementations.memory_cache import MemoryCacheService
+from app.cache.implementations.cache_serializers import build_serializer
+from app.cache.implementations.near_cache import NearCacheService
 from app.infrastructure.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -55,6 +58,63 @@ class CacheManager(ICacheManager):
         self._fallback_cache_type = "memory"
         self._key_generator = CacheKeyGenerator()
         self._initialized = False
+        # cache_type tambahan -> spec serializer; masing-masing instance Redis sendiri
+        self._serializer_specs: Dict[str, str] = self._parse_mapping(
+            settings.CACHE_SERIALIZER_OVERRIDES
+        )
+        # cache_type -> (waktu cek monotonic, sehat?)
+        self._health_cache: Dict[str, tuple] = {}
+    
+    @staticmethod
+    def _parse_mapping(raw: str) -> Dict[str, str]:
+        """Parse "dashboard=msgpack+zstd,ppob=orjson" menjadi dict"""
+        specs = {}
+        for item in (raw or "").split(","):
+            name, _, spec = item.partition("=")
+            if name.strip() and spec.strip():
+                specs[name.strip()] = spec.strip()
+        return specs
+    
+    def _build_redis_cache(self, serializer_spec: str) -> ICacheService:
+        cache = RedisCacheService(
+            redis_url=settings.REDIS_URL,
+            password=settings.REDIS_PASSWORD,
+            db=int(settings.REDIS_DB),
+            serializer=build_serializer(serializer_spec, settings.CACHE_COMPRESSION_THRESHOLD)
+        )
+        if not settings.CACHE_NEAR_ENABLED:
+            return cache
+        return NearCacheService(
+            cache,
+            max_size=settings.CACHE_NEAR_MAX_SIZE,
+            default_l1_ttl=settings.CACHE_NEAR_DEFAULT_TTL,
+            prefix_ttls={
+                prefix: float(ttl)
+                for prefix, ttl in self._parse_mapping(settings.CACHE_NEAR_PREFIX_TTLS).items()
+            },
+            channel=settings.CACHE_INVALIDATION_CHANNEL
+        )
+    
+    async def _is_healthy(self, cache_type: str, cache_service: ICacheService) -> bool:
+        """Health check primary cache, hasilnya di-cache CACHE_HEALTH_CHECK_INTERVAL detik"""
+        now = time.monotonic()
+        cached = self._health_cache.get(cache_type)
+        if cached is not None and now - cached[0] < settings.CACHE_HEALTH_CHECK_INTERVAL:
+            return cached[1]
+        
+        health = await cache_service.health_check()
+        healthy = health.get("status") == "healthy"
+        self._health_cache[cache_type] = (now, healthy)
+        return healthy
+    
+    def configure_serializer(self, cache_type: str, serializer_spec: str):
+        """
+        Daftarkan cache_type dengan serializer sendiri (mis. "dashboard", "msgpack+zstd").
+        cache_type ini memakai Redis dengan fallback ke memory seperti "default".
+        """
+        self._serializer_specs[cache_type] = serializer_spec
+        if self._initialized:
+            self._cache_services[cache_type] = self._build_redis_cache(serializer_spec)
     
     async def initialize(self):
         """Initialize cache services"""
@@ -63,12 +123,9 @@ class CacheManager(ICacheManager):
         
         try:
             # Initialize Redis cache
-            redis_cache = RedisCacheService(
-                redis_url=settings.REDIS_URL,
-                password=settings.REDIS_PASSWORD,
-                db=int(settings.REDIS_DB)
-            )
-            self._cache_services["redis"] = redis_cache
+            self._cache_services["redis"] = self._build_redis_cache(settings.CACHE_SERIALIZER)
+            for cache_type, spec in self._serializer_specs.items():
+                self._cache_services[cache_type] = self._build_redis_cache(spec)
             logger.info("Redis cache service initialized")
             
         except Exception as e:
@@ -89,16 +146,16 @@ class CacheManager(ICacheManager):
         if not self._initialized:
             await self.initialize()
         
-        if cache_type == "default":
-            # Coba primary cache dulu
-            primary_cache = self._cache_services.get(self._primary_cache_type)
+        if cache_type == "default" or cache_type in self._serializer_specs:
+            # Coba primary cache dulu (cache_type dengan serializer khusus = Redis sendiri)
+            primary_type = self._primary_cache_type if cache_type == "default" else cache_type
+            primary_cache = self._cache_services.get(primary_type)
             if primary_cache:
                 # Test health primary cache
-                health = await primary_cache.health_check()
-                if health.get("status") == "healthy":
+                if await self._is_healthy(primary_type, primary_cache):
                     return primary_cache
                 else:
-                    logger.warning(f"Primary cache ({self._primary_cache_type}) unhealthy, using fallback")
+                    logger.warning(f"Primary cache ({primary_type}) unhealthy, using fallback")
             
             # Gunakan fallback cache
             fallback_cache = self._cache_services.get(self._fallback_cache_type)
@@ -181,6 +238,7 @@ class CacheManager(ICacheManager):
                 logger.error(f"Error closing {cache_type} cache: {e}")
         
         self._cache_services.clear()
+        self._health_cache.clear()
         self._initialized = False
 
 
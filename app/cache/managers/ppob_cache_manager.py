@@ -25,6 +25,62 @@ class PPOBCacheManager:
         self.default_ttl = timedelta(minutes=30)  # 30 menit default TTL
         self.product_ttl = timedelta(hours=1)     # 1 jam untuk product cache
         self.inquiry_ttl = timedelta(minutes=5)   # 5 menit untuk inquiry cache
+        # Katalog produk boleh dilayani basi sebentar selama satu worker me-refresh
+        self.product_stale_ttl = timedelta(minutes=5)
+        self.product_lock_timeout = 10.0
+    
+    @staticmethod
+    def user_tag(user_id: Any) -> str:
+        """Tag untuk semua cache milik satu user (riwayat transaksi, dsb)"""
+        return f"user:{user_id}"
+    
+    @staticmethod
+    def category_tag(category_code: Any) -> str:
+        """Tag untuk semua cache produk satu kategori"""
+        return f"ppob:category:{category_code}"
+    
+    def _key(self, key: str) -> str:
+        return cache_manager.get_key_generator().generate_key("ppob:cache", key)
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Ambil data cache PPOB generik"""
+        try:
+            cache_service = await cache_manager.get_cache_service(self.cache_type)
+            return await cache_service.get(self._key(key))
+        except Exception as e:
+            logger.error(f"Error getting PPOB cache {key}: {e}")
+            return None
+    
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[Any] = None,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """Simpan data cache PPOB generik; tags dipakai untuk invalidation tanpa scan"""
+        try:
+            cache_service = await cache_manager.get_cache_service(self.cache_type)
+            return await cache_service.set(self._key(key), value, ttl or self.default_ttl, tags=tags)
+        except Exception as e:
+            logger.error(f"Error setting PPOB cache {key}: {e}")
+            return False
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Hapus semua cache PPOB yang terdaftar pada tags"""
+        return await CacheHelper.invalidate_tags(tags, self.cache_type)
+    
+    async def invalidate_user_cache(self, user_id: Any) -> int:
+        """Hapus semua cache milik user (dipanggil setelah transaksi berubah)"""
+        return await self.invalidate_tags([self.user_tag(user_id)])
+    
+    async def delete_pattern(self, pattern: str) -> bool:
+        """Hapus cache PPOB generik berdasarkan pattern (SCAN bertahap di Redis)"""
+        key_generator = cache_manager.get_key_generator()
+        return await CacheHelper.invalidate_pattern(
+            key_generator.generate_pattern("ppob:cache", pattern),
+            self.cache_type
+        )
     
     async def get_products_by_category(
         self, 
@@ -41,7 +97,9 @@ class PPOBCacheManager:
             key=cache_key,
             factory_func=lambda: fetch_func(category),
             ttl=self.product_ttl,
-            cache_type=self.cache_type
+            cache_type=self.cache_type,
+            stale_ttl=self.product_stale_ttl,
+            lock_timeout=self.product_lock_timeout
         )
     
     async def get_product_by_code(
@@ -59,7 +117,9 @@ class PPOBCacheManager:
             key=cache_key,
             factory_func=lambda: fetch_func(product_code),
             ttl=self.product_ttl,
-            cache_type=self.cache_type
+            cache_type=self.cache_type,
+            stale_ttl=self.product_stale_ttl,
+            lock_timeout=self.product_lock_timeout
         )
     
     async def cache_inquiry_result(
@@ -126,6 +186,10 @@ class PPOBCacheManager:
         try:
             key_generator = cache_manager.get_key_generator()
             
+            if category is not None and not product_code:
+                # Cache generik per kategori (mis. dari PPOBProductService) terdaftar di tag kategori
+                await self.invalidate_tags([self.category_tag(getattr(category, "code", category))])
+            
             if product_code:
                 # Invalidate specific product
                 pattern = key_generator.generate_pattern("ppob:product", product_code)
@@ -195,10 +259,8 @@ class PPOBCacheManager:
                 # Untuk Redis, kita bisa count keys
                 # Untuk Memory cache, ini akan lebih kompleks
                 try:
-                    if hasattr(cache_service, '_redis_client'):
-                        client = await cache_service._get_redis_client()
-                        keys = await client.keys(pattern)
-                        stats[name] = len(keys)
+                    if hasattr(cache_service, 'count'):
+                        stats[name] = await cache_service.count(pattern)
                     else:
                         # Fallback untuk memory cache
                         stats[name] = "N/A"
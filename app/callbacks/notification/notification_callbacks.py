@@ -205,7 +205,7 @@ class DiscordWebhookHandler(WebhookCallbackHandler):
     async def _send_discord_webhook(self, webhook_url: str, title: str, message: str, color: int) -> bool:
         """Send Discord webhook"""
         try:
-            import aiohttp
+            from app.infrastructure.external_apis.http_client import http_client_registry
             
             embed = {
                 "title": title,
@@ -218,14 +218,13 @@ class DiscordWebhookHandler(WebhookCallbackHandler):
                 "embeds": [embed]
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(webhook_url, json=payload) as response:
-                    if response.status == 204:
-                        logger.info("Discord webhook sent successfully")
-                        return True
-                    else:
-                        logger.error(f"Discord webhook failed: {response.status}")
-                        return False
+            response = await http_client_registry.post("discord", webhook_url, json=payload)
+            if response.status == 204:
+                logger.info("Discord webhook sent successfully")
+                return True
+            else:
+                logger.error(f"Discord webhook failed: {response.status}")
+                return False
                         
         except Exception as e:
             logger.error(f"Error sending Discord webhook: {str(e)}")
@@ -265,7 +264,7 @@ class TelegramWebhookHandler(WebhookCallbackHandler):
     async def _send_telegram_message(self, chat_id: str, message: str, parse_mode: str) -> bool:
         """Send Telegram message"""
         try:
-            import aiohttp
+            from app.infrastructure.external_apis.http_client import http_client_registry
             
             url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             
@@ -275,14 +274,13 @@ class TelegramWebhookHandler(WebhookCallbackHandler):
                 "parse_mode": parse_mode
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        logger.info("Telegram message sent successfully")
-                        return True
-                    else:
-                        logger.error(f"Telegram message failed: {response.status}")
-                        return False
+            response = await http_client_registry.post("telegram", url, json=payload)
+            if response.status == 200:
+                logger.info("Telegram message sent successfully")
+                return True
+            else:
+                logger.error(f"Telegram message failed: {response.status}")
+                return False
                         
         except Exception as e:
             logger.error(f"Error sending Telegram message: {str(e)}")
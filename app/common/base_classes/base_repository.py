@@ -1,5 +1,7 @@
 from typing import TypeVar, Generic, Optional, List, Dict, Any
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 T = TypeVar('T', bound=DeclarativeMeta)
@@ -45,3 +47,46 @@ class BaseRepository(Generic[T]):
             self.db.commit()
             return True
         return False
+
+class AsyncBaseRepository(Generic[T]):
+    """Base repository class untuk AsyncSession (tidak memblokir event loop)"""
+    
+    def __init__(self, model: T, db: AsyncSession):
+        self.model = model
+        self.db = db
+    
+    async def get_by_id(self, id: int) -> Optional[T]:
+        """Get by ID"""
+        return await self.db.get(self.model, id)
+    
+    async def get_all(self, limit: int = 100, offset: int = 0) -> List[T]:
+        """Get all records"""
+        result = await self.db.execute(select(self.model).offset(offset).limit(limit))
+        return list(result.scalars().all())
+    
+    async def create(self, obj_data: Dict[str, Any]) -> T:
+        """Create new record"""
+        db_obj = self.model(**obj_data)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+    
+    async def update(self, id: int, obj_data: Dict[str, Any]) -> Optional[T]:
+        """Update record"""
+        db_obj = await self.get_by_id(id)
+        if db_obj:
+            for field, value in obj_data.items():
+                setattr(db_obj, field, value)
+            await self.db.commit()
+            await self.db.refresh(db_obj)
+        return db_obj
+    
+    async def delete(self, id: int) -> bool:
+        """Delete record"""
+        db_obj = await self.get_by_id(id)
+        if db_obj:
+            await self.db.delete(db_obj)
+            await self.db.commit()
+            return True
+        return False
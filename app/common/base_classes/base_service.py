@@ -2,4 +2,6 @@ from abc import ABC
 
 class BaseService(ABC):
     """Base service class"""
-    pass
+    
+    def __init__(self, repository=None):
+        self.repository = repository
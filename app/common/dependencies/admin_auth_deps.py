@@ -5,9 +5,11 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.common.security.auth_security import verify_token
 from app.domains.admin.models.admin import Admin
+from app.infrastructure.security.auth_cache import auth_cache
 
 # Security
 security = HTTPBearer()
+auth_cache.watch(Admin)
 
 def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -44,8 +46,8 @@ def get_current_admin(
                 detail="Invalid admin ID in token"
             )
         
-        # Ambil admin dari database
-        admin = db.query(Admin).filter(Admin.id == admin_id).first()
+        # Ambil admin dari cache principal (SELECT hanya saat miss)
+        admin = auth_cache.load_principal(db, Admin, admin_id)
         
         if admin is None:
             raise HTTPException(
@@ -4,12 +4,14 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.infrastructure.database.database_manager import get_db
 from app.infrastructure.security.token_handler import TokenHandler
+from app.infrastructure.security.auth_cache import auth_cache
 from app.domains.auth.repositories.user_repository import UserRepository
 from app.domains.auth.models.user import User
 
 # Security
 security = HTTPBearer()
 token_handler = TokenHandler()
+auth_cache.watch(User)
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -30,9 +32,8 @@ def get_current_user(
                 detail="Invalid token payload"
             )
         
-        # Ambil user dari database
-        user_repository = UserRepository(db)
-        user = user_repository.get_by_id(user_id)
+        # Ambil user dari cache principal (SELECT hanya saat miss)
+        user = auth_cache.load_principal(db, User, user_id)
         
         if user is None:
             raise HTTPException(
@@ -147,6 +147,18 @@ class RateLimitExceededError(BaseCustomException):
         )
 
 
+class PasswordServiceBusyError(BaseCustomException):
+    """Exception untuk antrian hashing password yang sudah penuh"""
+
+    def __init__(self, message: str = "Server sedang sibuk, silakan coba lagi", retry_after: int = 1):
+        super().__init__(
+            message=message,
+            status_code=503,
+            error_code="PASSWORD_SERVICE_BUSY",
+            details={"retry_after": retry_after}
+        )
+
+
 class PaymentError(BaseCustomException):
     """Exception untuk payment-related errors"""
     
@@ -211,6 +223,21 @@ class InsufficientBalanceError(BaseCustomException):
         )
 
 
+class InsufficientStockError(BaseCustomException):
+    """Exception untuk stok tidak cukup saat reservasi/pembelian"""
+    
+    def __init__(self, message: str = "Stok tidak mencukupi", product_id: Any = None, requested_quantity: int = 0):
+        super().__init__(
+            message=message,
+            status_code=409,
+            error_code="INSUFFICIENT_STOCK",
+            details={
+                "product_id": product_id,
+                "requested_quantity": requested_quantity
+            }
+        )
+
+
 class TransactionError(BaseCustomException):
     """Exception untuk error transaksi"""
     
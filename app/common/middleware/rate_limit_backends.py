@@ -0,0 +1,275 @@
+"""
+Rate Limit Storage Backends
+Backend penyimpanan untuk RateLimiterMiddleware yang bisa dipilih lewat konfigurasi
+
+- InMemoryTokenBucketBackend: token bucket per key di dalam proses (fallback)
+- RedisSlidingWindowBackend: sliding window log di Redis via Lua script atomik,
+  sehingga limit berlaku bersama untuk semua worker uvicorn
+"""
+
+import itertools
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitResult(NamedTuple):
+    """Hasil pengecekan rate limit untuk satu request"""
+    allowed: bool
+    retry_after: int
+    remaining: int
+
+
+class IRateLimitBackend(ABC):
+    """Interface untuk storage backend rate limiter"""
+
+    @abstractmethod
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        window: float,
+        burst_limit: int,
+        burst_window: float
+    ) -> RateLimitResult:
+        """Catat satu request untuk key dan kembalikan apakah request diizinkan"""
+        pass
+
+    async def cleanup(self) -> int:
+        """Bersihkan state yang sudah tidak aktif, kembalikan jumlah key yang dihapus"""
+        return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistik backend untuk monitoring"""
+        return {}
+
+    async def close(self):
+        """Tutup koneksi backend jika ada"""
+        pass
+
+
+class _TokenBucket:
+    """State token bucket per key: token per-window, token burst, dan waktu update terakhir"""
+
+    __slots__ = ("tokens", "burst_tokens", "updated_at")
+
+    def __init__(self, tokens: float, burst_tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.burst_tokens = burst_tokens
+        self.updated_at = updated_at
+
+
+class InMemoryTokenBucketBackend(IRateLimitBackend):
+    """
+    Token bucket in-process dengan dua bucket per key (per-window dan burst).
+    State per key hanya tiga float sehingga memori konstan berapapun jumlah request.
+    Limit hanya berlaku per worker.
+    """
+
+    def __init__(self, idle_ttl: float = 300):
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._idle_ttl = idle_ttl
+        self._last_cleanup = time.time()
+
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        window: float,
+        burst_limit: int,
+        burst_window: float
+    ) -> RateLimitResult:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = _TokenBucket(float(limit), float(burst_limit), now)
+            self._buckets[key] = bucket
+        else:
+            # Isi ulang token sesuai waktu yang berlalu
+            elapsed = now - bucket.updated_at
+            bucket.tokens = min(limit, bucket.tokens + elapsed * limit / window)
+            bucket.burst_tokens = min(
+                burst_limit, bucket.burst_tokens + elapsed * burst_limit / burst_window
+            )
+            bucket.updated_at = now
+
+        if bucket.burst_tokens < 1:
+            retry_after = (1 - bucket.burst_tokens) * burst_window / burst_limit
+            return RateLimitResult(False, max(1, int(retry_after)), 0)
+
+        if bucket.tokens < 1:
+            retry_after = (1 - bucket.tokens) * window / limit
+            return RateLimitResult(False, max(1, int(retry_after)), 0)
+
+        bucket.tokens -= 1
+        bucket.burst_tokens -= 1
+        return RateLimitResult(True, 0, int(bucket.tokens))
+
+    async def cleanup(self) -> int:
+        """Hapus bucket yang tidak dipakai lebih lama dari idle_ttl (bucket sudah penuh kembali)"""
+        threshold = time.monotonic() - self._idle_ttl
+        keys_to_remove = [
+            key for key, bucket in self._buckets.items()
+            if bucket.updated_at < threshold
+        ]
+        for key in keys_to_remove:
+            del self._buckets[key]
+
+        self._last_cleanup = time.time()
+        return len(keys_to_remove)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "storage_size": len(self._buckets),
+            "last_cleanup": self._last_cleanup
+        }
+
+
+class RedisSlidingWindowBackend(IRateLimitBackend):
+    """
+    Sliding window log di Redis sorted set.
+    Seluruh pengecekan (hapus entry lama, cek burst, cek limit, catat request)
+    dijalankan dalam satu Lua script sehingga atomik lintas worker.
+    Jika Redis tidak tersedia, request dicek dengan fallback backend in-process dan Redis
+    tidak dicoba lagi selama jendela backoff (bertambah dua kali lipat setiap kegagalan
+    beruntun sampai max_backoff), jadi request tidak menunggu timeout koneksi setiap kali.
+    """
+
+    # KEYS[1] = key
+    # ARGV = window_ms, limit, burst_window_ms, burst_limit, member
+    # Return: {allowed, retry_after_ms, remaining}
+    SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local burst_window = tonumber(ARGV[3])
+local burst_limit = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+
+local burst_start = '(' .. (now - burst_window)
+local recent = redis.call('ZCOUNT', key, burst_start, '+inf')
+if recent >= burst_limit then
+    local oldest = redis.call('ZRANGEBYSCORE', key, burst_start, '+inf', 'WITHSCORES', 'LIMIT', 0, 1)
+    return {0, burst_window - (now - tonumber(oldest[2])), 0}
+end
+
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return {0, window - (now - tonumber(oldest[2])), 0}
+end
+
+redis.call('ZADD', key, now, ARGV[5])
+redis.call('PEXPIRE', key, window)
+return {1, 0, limit - count - 1}
+"""
+
+    def __init__(
+        self,
+        redis_client=None,
+        redis_url: Optional[str] = None,
+        password: Optional[str] = None,
+        fallback: Optional[IRateLimitBackend] = None,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._client = redis_client
+        self._redis_url = redis_url
+        self._password = password
+        self._script = None
+        self._fallback = fallback or InMemoryTokenBucketBackend()
+        self._member_counter = itertools.count()
+        self._redis_errors = 0
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+
+    def _get_script(self):
+        """Lazy initialization Redis client dan registrasi Lua script"""
+        if self._script is None:
+            if self._client is None:
+                import redis.asyncio as redis
+
+                self._client = redis.from_url(
+                    self._redis_url,
+                    password=self._password,
+                    socket_connect_timeout=1,
+                    socket_timeout=1
+                )
+            self._script = self._client.register_script(self.SLIDING_WINDOW_SCRIPT)
+        return self._script
+
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        window: float,
+        burst_limit: int,
+        burst_window: float
+    ) -> RateLimitResult:
+        if self._clock() < self._retry_at:
+            return await self._fallback.hit(key, limit, window, burst_limit, burst_window)
+
+        # Member unik per request agar ZADD tidak menimpa request pada milidetik yang sama
+        member = f"{time.time_ns()}:{next(self._member_counter)}"
+        try:
+            allowed, retry_after_ms, remaining = await self._get_script()(
+                keys=[key],
+                args=[int(window * 1000), limit, int(burst_window * 1000), burst_limit, member]
+            )
+        except Exception as e:
+            self._redis_errors += 1
+            delay = min(self._max_backoff, self._backoff * 2 ** self._consecutive_failures)
+            self._consecutive_failures += 1
+            self._retry_at = self._clock() + delay
+            logger.warning(
+                f"Redis rate limit backend unavailable, using in-process fallback for {delay:.0f}s: {e}"
+            )
+            return await self._fallback.hit(key, limit, window, burst_limit, burst_window)
+
+        self._consecutive_failures = 0
+        if not allowed:
+            return RateLimitResult(False, max(1, -(-int(retry_after_ms) // 1000)), 0)
+        return RateLimitResult(True, 0, int(remaining))
+
+    async def cleanup(self) -> int:
+        # Key Redis kadaluarsa sendiri lewat PEXPIRE; hanya fallback yang perlu dibersihkan
+        return await self._fallback.cleanup()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "redis_errors": self._redis_errors,
+            "backing_off": self._clock() < self._retry_at,
+            "fallback": self._fallback.get_stats()
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._script = None
+
+
+def create_rate_limit_backend(backend_type: str = "memory") -> IRateLimitBackend:
+    """Factory untuk membuat backend rate limiter berdasarkan konfigurasi"""
+    if backend_type == "redis":
+        from app.infrastructure.config.settings import settings
+
+        return RedisSlidingWindowBackend(
+            redis_url=settings.REDIS_URL,
+            password=settings.REDIS_PASSWORD
+        )
+    return InMemoryTokenBucketBackend()
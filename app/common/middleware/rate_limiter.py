@@ -11,6 +11,9 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.infrastructure.config.constants import RateLimits, StatusMessages
 from app.infrastructure.config.settings import settings
+from app.common.middleware.rate_limit_backends import (
+    IRateLimitBackend, RateLimitResult, create_rate_limit_backend
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,18 +21,18 @@ logger = logging.getLogger(__name__)
 
 class RateLimiterMiddleware(BaseHTTPMiddleware):
     """
-    Rate limiter middleware dengan sliding window algorithm
-    Menggunakan in-memory storage untuk simplicity
-    Untuk production, gunakan Redis atau database
+    Rate limiter middleware dengan storage backend yang bisa diganti
+    - memory: token bucket in-process (limit per worker)
+    - redis: sliding window atomik via Lua script (limit bersama lintas worker)
     """
     
-    def __init__(self, app):
+    def __init__(self, app, backend: Optional[IRateLimitBackend] = None):
         super().__init__(app)
-        # In-memory storage untuk rate limiting
-        # Format: {key: {"count": int, "window_start": float, "requests": [timestamps]}}
-        self._storage: Dict[str, Dict] = {}
+        self._backend = backend or create_rate_limit_backend(settings.RATE_LIMIT_STORAGE)
+        self._window_size = 60  # 1 minute window
+        self._burst_window = 10  # Burst dihitung dalam 10 detik terakhir
         self._cleanup_interval = 60  # Cleanup every minute
-        self._last_cleanup = time.time()
+        self._cleanup_task: Optional[asyncio.Task] = None
         
         # Rate limit configurations per endpoint pattern
         self._rate_configs = {
@@ -54,6 +57,9 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         """Main rate limiting logic"""
         try:
+            # Satu background task cleanup untuk seluruh lifetime middleware
+            self._ensure_cleanup_task()
+            
             # Skip rate limiting untuk health checks dan docs
             if self._should_skip_rate_limiting(request):
                 response = await call_next(request)
@@ -66,14 +72,14 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
             config = self._get_rate_config(request.url.path)
             
             # Check rate limit
-            is_allowed, retry_after = await self._check_rate_limit(
+            result = await self._check_rate_limit(
                 rate_key, 
                 config["requests_per_minute"],
                 config["burst_limit"]
             )
             
-            if not is_allowed:
-                return self._create_rate_limit_response(retry_after)
+            if not result.allowed:
+                return self._create_rate_limit_response(result.retry_after, config)
             
             # Process request dengan proper error handling
             try:
@@ -96,10 +102,7 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
                 )
             
             # Add rate limit headers
-            self._add_rate_limit_headers(response, rate_key, config)
-            
-            # Cleanup old entries periodically (non-blocking)
-            asyncio.create_task(self._periodic_cleanup())
+            self._add_rate_limit_headers(response, result, config)
             
             return response
             
@@ -183,54 +186,22 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         key: str, 
         requests_per_minute: int, 
         burst_limit: int
-    ) -> tuple[bool, int]:
+    ) -> RateLimitResult:
         """
-        Check rate limit menggunakan sliding window algorithm
+        Check rate limit melalui storage backend
         
         Returns:
-            (is_allowed, retry_after_seconds)
+            RateLimitResult(allowed, retry_after, remaining)
         """
-        current_time = time.time()
-        window_size = 60  # 1 minute window
-        
-        # Get atau create entry
-        if key not in self._storage:
-            self._storage[key] = {
-                "requests": [],
-                "window_start": current_time
-            }
-        
-        entry = self._storage[key]
-        
-        # Remove old requests (outside window)
-        entry["requests"] = [
-            req_time for req_time in entry["requests"]
-            if current_time - req_time < window_size
-        ]
-        
-        # Check burst limit (requests dalam 10 detik terakhir)
-        recent_requests = [
-            req_time for req_time in entry["requests"]
-            if current_time - req_time < 10
-        ]
-        
-        if len(recent_requests) >= burst_limit:
-            retry_after = 10 - (current_time - min(recent_requests))
-            return False, max(1, int(retry_after))
-        
-        # Check rate limit (requests per minute)
-        if len(entry["requests"]) >= requests_per_minute:
-            # Calculate retry after berdasarkan oldest request dalam window
-            oldest_request = min(entry["requests"])
-            retry_after = window_size - (current_time - oldest_request)
-            return False, max(1, int(retry_after))
-        
-        # Allow request dan record timestamp
-        entry["requests"].append(current_time)
-        
-        return True, 0
+        return await self._backend.hit(
+            key,
+            limit=requests_per_minute,
+            window=self._window_size,
+            burst_limit=burst_limit,
+            burst_window=self._burst_window
+        )
     
-    def _create_rate_limit_response(self, retry_after: int) -> JSONResponse:
+    def _create_rate_limit_response(self, retry_after: int, config: Dict[str, int]) -> JSONResponse:
         """Create rate limit exceeded response"""
         return JSONResponse(
             status_code=429,
@@ -242,93 +213,39 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
             },
             headers={
                 "Retry-After": str(retry_after),
-                "X-RateLimit-Limit": "60",
+                "X-RateLimit-Limit": str(config["requests_per_minute"]),
                 "X-RateLimit-Remaining": "0",
                 "X-RateLimit-Reset": str(int(time.time() + retry_after))
             }
         )
     
-    def _add_rate_limit_headers(self, response: Response, key: str, config: Dict[str, int]):
+    def _add_rate_limit_headers(self, response: Response, result: RateLimitResult, config: Dict[str, int]):
         """Add rate limit headers ke response"""
         try:
-            if key in self._storage:
-                entry = self._storage[key]
-                current_time = time.time()
-                
-                # Count requests dalam current window
-                current_requests = len([
-                    req_time for req_time in entry["requests"]
-                    if current_time - req_time < 60
-                ])
-                
-                remaining = max(0, config["requests_per_minute"] - current_requests)
-                reset_time = int(current_time + 60)
-                
-                response.headers["X-RateLimit-Limit"] = str(config["requests_per_minute"])
-                response.headers["X-RateLimit-Remaining"] = str(remaining)
-                response.headers["X-RateLimit-Reset"] = str(reset_time)
+            response.headers["X-RateLimit-Limit"] = str(config["requests_per_minute"])
+            response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+            response.headers["X-RateLimit-Reset"] = str(int(time.time() + self._window_size))
                 
         except Exception as e:
             logger.warning(f"Error adding rate limit headers: {e}")
     
+    def _ensure_cleanup_task(self):
+        """Jalankan satu task cleanup terjadwal (bukan satu task per request)"""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.get_running_loop().create_task(self._periodic_cleanup())
+    
     async def _periodic_cleanup(self):
         """Cleanup old entries untuk prevent memory leak"""
-        current_time = time.time()
-        
-        if current_time - self._last_cleanup < self._cleanup_interval:
-            return
-        
-        try:
-            # Remove entries yang sudah tidak aktif > 5 menit
-            cleanup_threshold = current_time - 300  # 5 minutes
-            
-            keys_to_remove = []
-            for key, entry in self._storage.items():
-                if not entry["requests"]:
-                    keys_to_remove.append(key)
-                    continue
-                
-                # Remove old requests
-                entry["requests"] = [
-                    req_time for req_time in entry["requests"]
-                    if req_time > cleanup_threshold
-                ]
-                
-                # Remove entry jika tidak ada requests
-                if not entry["requests"]:
-                    keys_to_remove.append(key)
-            
-            for key in keys_to_remove:
-                del self._storage[key]
-            
-            self._last_cleanup = current_time
-            
-            if keys_to_remove:
-                logger.debug(f"Cleaned up {len(keys_to_remove)} rate limit entries")
-                
-        except Exception as e:
-            logger.error(f"Error during rate limit cleanup: {e}")
+        while True:
+            await asyncio.sleep(self._cleanup_interval)
+            try:
+                removed = await self._backend.cleanup()
+                if removed:
+                    logger.debug(f"Cleaned up {removed} rate limit entries")
+                    
+            except Exception as e:
+                logger.error(f"Error during rate limit cleanup: {e}")
     
     def get_stats(self) -> Dict[str, any]:
         """Get rate limiter statistics untuk monitoring"""
-        current_time = time.time()
-        active_keys = 0
-        total_requests = 0
-        
-        for entry in self._storage.values():
-            if entry["requests"]:
-                # Count requests dalam last 5 minutes
-                recent_requests = [
-                    req_time for req_time in entry["requests"]
-                    if current_time - req_time < 300
-                ]
-                if recent_requests:
-                    active_keys += 1
-                    total_requests += len(recent_requests)
-        
-        return {
-            "active_keys": active_keys,
-            "total_requests_last_5min": total_requests,
-            "storage_size": len(self._storage),
-            "last_cleanup": self._last_cleanup
-        }
+        return self._backend.get_stats()
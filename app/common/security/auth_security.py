@@ -1,11 +1,13 @@
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.infrastructure.config.settings import settings
+from app.infrastructure.security.auth_cache import auth_cache
+from app.infrastructure.security.password_service import build_password_context
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context (sinkron; endpoint async memakai password_service)
+pwd_context = build_password_context(settings.PASSWORD_BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password dengan hash"""
@@ -23,7 +25,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -31,17 +33,52 @@ def create_refresh_token(data: dict) -> str:
     """Buat refresh token JWT"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify JWT token"""
+    """Verify JWT token (hasil verifikasi di-cache di auth_cache; token yang dicabut -> None)"""
+    payload = auth_cache.get_claims(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    if auth_cache.is_revoked(token, payload):
+        return None
+    auth_cache.put_claims(token, payload)
+    return payload
+
+def revoke_token(token: str) -> bool:
+    """Cabut token (logout admin); False bila token memang sudah tidak valid"""
+    payload = verify_token(token)
+    if payload is None:
+        return False
+    auth_cache.revoke(token, payload)
+    return True
+
+def revoke_session(access_token: str, refresh_token: Optional[str] = None) -> bool:
+    """
+    Logout admin: cabut access token dan refresh token (bila valid dan subject-nya sama).
+    Return True bila refresh token ikut dicabut.
+    """
+    payload = verify_token(access_token)
+    if payload is None:
+        return False
+    auth_cache.revoke(access_token, payload)
+    if not refresh_token:
+        return False
+    refresh_payload = verify_token(refresh_token)
+    if (
+        refresh_payload is None
+        or refresh_payload.get("type") != "refresh"
+        or refresh_payload.get("sub") != payload.get("sub")
+    ):
+        return False
+    auth_cache.revoke(refresh_token, refresh_payload)
+    return True
 
 def decode_token(token: str) -> Optional[str]:
     """Decode token dan ambil username"""
@@ -0,0 +1,351 @@
+"""
+Streaming Export Engine
+Export data besar (user, transaksi wallet, transaksi PPOB) ke CSV, NDJSON atau Parquet
+dengan memori konstan:
+
+- Query dijalankan dengan yield_per sehingga baris diambil per chunk lewat server-side
+  cursor (PostgreSQL) dan tidak pernah dimuat sekaligus sebagai objek ORM
+- Setiap chunk langsung di-encode oleh writer format lalu dikirim/ditulis
+- Iterasi berjalan di thread: StreamingResponse Starlette mengiterasi generator sync di
+  threadpool, dan export ke file dijalankan via asyncio.to_thread
+- Export ke file tercatat sebagai ExportJob dengan progres baris/byte yang bisa dipantau
+"""
+
+import asyncio
+import csv
+import enum
+import io
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import types as sa_types
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.common.exceptions.custom_exceptions import ValidationException
+from app.core.database import SessionLocal
+from app.infrastructure.config.settings import settings
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+    pyarrow = None
+    pyarrow_parquet = None
+
+logger = logging.getLogger(__name__)
+
+
+class ExportSpec:
+    """Definisi export: nama dataset dan SELECT kolom yang diexport (urutan kolom = urutan output)"""
+
+    def __init__(self, name: str, statement: Select):
+        self.name = name
+        self.statement = statement
+        self.columns: List[str] = [column.name for column in statement.selected_columns]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+# ---- Writer per format -----------------------------------------------------
+
+class CsvExportWriter:
+    media_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self, spec: ExportSpec):
+        self.spec = spec
+
+    def _encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    def begin(self) -> bytes:
+        return self._encode([self.spec.columns])
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return self._encode([
+            [
+                "" if value is None else value.isoformat() if isinstance(value, (datetime, date)) else _plain(value)
+                for value in row
+            ]
+            for row in rows
+        ])
+
+    def finish(self) -> bytes:
+        return b""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+class NdjsonExportWriter:
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self, spec: ExportSpec):
+        self.columns = spec.columns
+
+    def begin(self) -> bytes:
+        return b""
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        lines = [json.dumps(dict(zip(self.columns, row)), default=_json_default) for row in rows]
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _ByteSink:
+    """File-like tujuan ParquetWriter; byte yang sudah ditulis diambil (drain) per row group"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(column_type: sa_types.TypeEngine):
+    if isinstance(column_type, sa_types.Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, sa_types.Integer):
+        return pyarrow.int64()
+    if isinstance(column_type, (sa_types.Numeric, sa_types.Float)):
+        return pyarrow.float64()
+    if isinstance(column_type, sa_types.DateTime):
+        return pyarrow.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, sa_types.Date):
+        return pyarrow.date32()
+    return pyarrow.string()
+
+
+class ParquetExportWriter:
+    """Satu chunk = satu row group; footer ditulis saat finish"""
+
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, spec: ExportSpec):
+        if pyarrow is None:
+            raise ValidationException("Format parquet membutuhkan paket pyarrow")
+        self.columns = spec.columns
+        self.schema = pyarrow.schema([
+            (column.name, _arrow_type(column.type)) for column in spec.statement.selected_columns
+        ])
+        self._sink = _ByteSink()
+        self._writer = pyarrow_parquet.ParquetWriter(self._sink, self.schema, compression="zstd")
+
+    def begin(self) -> bytes:
+        return self._sink.drain()
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        arrays = []
+        for index, field in enumerate(self.schema):
+            values = [_plain(row[index]) for row in rows]
+            if pyarrow.types.is_floating(field.type):
+                values = [None if value is None else float(value) for value in values]
+            elif pyarrow.types.is_string(field.type):
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(pyarrow.array(values, type=field.type))
+        self._writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+EXPORT_WRITERS = {
+    "csv": CsvExportWriter,
+    "ndjson": NdjsonExportWriter,
+    "parquet": ParquetExportWriter
+}
+
+
+def get_writer_class(export_format: str):
+    writer_class = EXPORT_WRITERS.get(export_format)
+    if writer_class is None:
+        raise ValidationException(f"Format export tidak didukung: {export_format}. Gunakan {', '.join(EXPORT_WRITERS)}")
+    if writer_class is ParquetExportWriter and pyarrow is None:
+        raise ValidationException("Format parquet membutuhkan paket pyarrow")
+    return writer_class
+
+
+# ---- Job & progres ---------------------------------------------------------
+
+class ExportJob:
+    """Status export ke file yang berjalan di background"""
+
+    def __init__(self, name: str, export_format: str, path: str):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.format = export_format
+        self.path = path
+        self.status = "pending"
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def advance(self, rows: int, size: int):
+        self.rows_written += rows
+        self.bytes_written += size
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "format": self.format,
+            "status": self.status,
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "file_url": f"/static/exports/{os.path.basename(self.path)}" if self.status == "completed" else None,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+# ---- Engine ----------------------------------------------------------------
+
+class StreamingExporter:
+    """
+    Engine export streaming - Single Responsibility: mengalirkan hasil query ke writer format
+    Menggunakan session sendiri (session_factory) karena iterasi berjalan di thread lain.
+    """
+
+    MAX_TRACKED_JOBS = 100
+
+    def __init__(self, session_factory: Callable[[], Session], chunk_size: int = 5000, export_dir: str = "static/exports"):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.export_dir = export_dir
+        self._jobs: "OrderedDict[str, ExportJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def iter_export(self, spec: ExportSpec, export_format: str, job: Optional[ExportJob] = None) -> Iterator[bytes]:
+        """Generator sync penghasil byte export per chunk"""
+        writer = get_writer_class(export_format)(spec)
+        db = self.session_factory()
+        result = None
+        try:
+            header = writer.begin()
+            if header:
+                yield header
+            result = db.execute(spec.statement.execution_options(yield_per=self.chunk_size))
+            for rows in result.partitions():
+                data = writer.write_rows(rows)
+                if job is not None:
+                    job.advance(len(rows), len(data))
+                if data:
+                    yield data
+            footer = writer.finish()
+            if footer:
+                yield footer
+        finally:
+            if result is not None:
+                result.close()
+            db.close()
+
+    def streaming_response(self, spec: ExportSpec, export_format: str) -> StreamingResponse:
+        """Response HTTP yang mengalirkan export langsung ke client"""
+        writer_class = get_writer_class(export_format)
+        filename = f"{spec.name}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{writer_class.extension}"
+        return StreamingResponse(
+            self.iter_export(spec, export_format),
+            media_type=writer_class.media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    def _write_file(self, spec: ExportSpec, export_format: str, job: ExportJob):
+        job.status = "running"
+        temp_path = f"{job.path}.part"
+        try:
+            with open(temp_path, "wb") as file:
+                for data in self.iter_export(spec, export_format, job):
+                    file.write(data)
+            os.replace(temp_path, job.path)
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Export {spec.name} ({export_format}) failed: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    def _new_job(self, spec: ExportSpec, export_format: str, path: Optional[str]) -> ExportJob:
+        writer_class = get_writer_class(export_format)
+        if path is None:
+            os.makedirs(self.export_dir, exist_ok=True)
+            filename = f"{spec.name}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.{writer_class.extension}"
+            path = os.path.join(self.export_dir, filename)
+        job = ExportJob(spec.name, export_format, path)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.MAX_TRACKED_JOBS:
+            self._jobs.popitem(last=False)
+        return job
+
+    async def export_to_file(self, spec: ExportSpec, export_format: str, path: Optional[str] = None) -> ExportJob:
+        """Tulis export ke file di worker thread dan tunggu sampai selesai"""
+        job = self._new_job(spec, export_format, path)
+        await asyncio.to_thread(self._write_file, spec, export_format, job)
+        return job
+
+    def start_file_export(self, spec: ExportSpec, export_format: str) -> ExportJob:
+        """Mulai export ke file di background; progres dipantau lewat get_job"""
+        job = self._new_job(spec, export_format, None)
+        task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._write_file, spec, export_format, job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ExportJob]:
+        return self._jobs.get(job_id)
+
+
+# Global instance
+streaming_exporter = StreamingExporter(SessionLocal, chunk_size=settings.EXPORT_CHUNK_SIZE, export_dir=settings.EXPORT_DIR)
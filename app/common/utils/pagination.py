@@ -0,0 +1,192 @@
+"""
+Keyset (cursor) pagination.
+
+Halaman berikutnya diambil dengan WHERE (sort_key, id) < (nilai terakhir) alih-alih OFFSET,
+sehingga biaya halaman dalam tetap konstan dan tidak butuh COUNT(*) di setiap request.
+Cursor bersifat opaque (base64url JSON) dan hanya berisi nilai kolom sort item terakhir.
+"""
+
+import base64
+import binascii
+import enum
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import DateTime, and_, asc, desc, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.common.exceptions.custom_exceptions import ValidationException
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode nilai kolom sort menjadi cursor opaque"""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode cursor opaque; cursor rusak / dimanipulasi menghasilkan ValidationException"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list):
+            raise ValueError("cursor bukan list")
+        return [_decode_value(value) for value in values]
+    except (ValueError, TypeError, UnicodeError, binascii.Error) as e:
+        raise ValidationException("Cursor pagination tidak valid", errors=[str(e)])
+
+def _dialect_name(db) -> str:
+    return db.get_bind().dialect.name
+
+class KeysetPaginator:
+    """
+    Paginator keyset di atas statement select() SQLAlchemy 2.0.
+    Kolom sort harus unik secara gabungan dan NOT NULL; kolom terakhir biasanya primary key
+    sebagai tie-breaker, mis. KeysetPaginator(Model.created_at, Model.id).
+    Envelope hasil sama dengan PaginationService: {'items': [...], 'pagination': {...}}.
+    """
+
+    def __init__(self, *columns, descending: bool = True,
+                 default_page_size: int = 20, max_page_size: int = 100):
+        if not columns:
+            raise ValueError("KeysetPaginator membutuhkan minimal satu kolom sort")
+        self.columns = columns
+        self.descending = descending
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+
+    def page_size(self, page_size: Optional[int] = None) -> int:
+        if not page_size:
+            return self.default_page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    @staticmethod
+    def _is_sqlite_datetime(column, dialect: str) -> bool:
+        # SQLite menyimpan DateTime sebagai teks dengan format yang bisa berbeda
+        # (server default tanpa mikrodetik); bandingkan sebagai julianday agar konsisten
+        return dialect == "sqlite" and isinstance(column.type, DateTime)
+
+    def _after(self, values: List[Any], dialect: str):
+        """Ekspansi (c1, c2, ...) < (v1, v2, ...) yang portabel antar database"""
+        keys, bounds = [], []
+        for column, value in zip(self.columns, values):
+            if self._is_sqlite_datetime(column, dialect):
+                keys.append(func.julianday(column))
+                bounds.append(func.julianday(value))
+            else:
+                keys.append(column)
+                bounds.append(value)
+
+        clauses = []
+        for position, key in enumerate(keys):
+            comparison = key < bounds[position] if self.descending else key > bounds[position]
+            equalities = [keys[index] == bounds[index] for index in range(position)]
+            clauses.append(and_(*equalities, comparison))
+        return or_(*clauses)
+
+    def apply(self, statement, cursor: Optional[str] = None,
+              page_size: Optional[int] = None, dialect: str = "default"):
+        """Tambahkan filter cursor, ORDER BY dan LIMIT (page_size + 1 untuk deteksi has_next)"""
+        size = self.page_size(page_size)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(self.columns):
+                raise ValidationException("Cursor pagination tidak cocok dengan listing ini")
+            statement = statement.where(self._after(values, dialect))
+
+        return statement.order_by(None).order_by(*self.order_by_clauses()).limit(size + 1)
+
+    def order_by_clauses(self) -> List[Any]:
+        """ORDER BY listing ini; dipakai juga jalur OFFSET agar urutan halaman konsisten"""
+        direction = desc if self.descending else asc
+        return [direction(column) for column in self.columns]
+
+    def cursor_for(self, item: Any) -> str:
+        """Cursor yang menunjuk ke setelah item ini"""
+        return encode_cursor([getattr(item, column.key) for column in self.columns])
+
+    def build_page(self, rows: Sequence[Any], cursor: Optional[str] = None, page_size: Optional[int] = None,
+                   total: Optional[int] = None, total_is_estimate: bool = False) -> Dict[str, Any]:
+        size = self.page_size(page_size)
+        items = list(rows[:size])
+        has_next = len(rows) > size
+        return {
+            "items": items,
+            "pagination": {
+                "page_size": size,
+                "total_items": total,
+                "total_pages": (total + size - 1) // size if total is not None else None,
+                "total_is_estimate": total_is_estimate,
+                "has_next": has_next,
+                "has_prev": cursor is not None,
+                "next_cursor": self.cursor_for(items[-1]) if has_next and items else None
+            }
+        }
+
+    def paginate(self, db: Session, statement, cursor: Optional[str] = None,
+                 page_size: Optional[int] = None, count: Optional[str] = None) -> Dict[str, Any]:
+        """Ambil satu halaman dengan Session sync"""
+        dialect = _dialect_name(db)
+        rows = db.scalars(self.apply(statement, cursor, page_size, dialect)).all()
+        total, is_estimate = count_rows(db, statement, count)
+        return self.build_page(rows, cursor, page_size, total, is_estimate)
+
+    async def apaginate(self, db: AsyncSession, statement, cursor: Optional[str] = None,
+                        page_size: Optional[int] = None, count: Optional[str] = None) -> Dict[str, Any]:
+        """Ambil satu halaman dengan AsyncSession"""
+        dialect = _dialect_name(db)
+        rows = (await db.scalars(self.apply(statement, cursor, page_size, dialect))).all()
+        total, is_estimate = None, False
+        if count is not None:
+            total, is_estimate = await db.run_sync(lambda session: count_rows(session, statement, count))
+        return self.build_page(rows, cursor, page_size, total, is_estimate)
+
+def count_rows(db: Session, statement, mode: Optional[str] = None):
+    """
+    Hitung total baris statement (tanpa ORDER BY / LIMIT).
+    mode=None tidak menghitung; "estimate" memakai estimasi planner PostgreSQL
+    (EXPLAIN, tanpa scan) dan jatuh ke hitungan eksak di database lain; "exact" = COUNT(*).
+    Return (total, is_estimate).
+    """
+    if mode is None:
+        return None, False
+
+    base = statement.order_by(None).limit(None).offset(None)
+    if mode == COUNT_ESTIMATE and _dialect_name(db) == "postgresql":
+        estimate = estimate_rows(db, base)
+        if estimate is not None:
+            return estimate, True
+
+    return db.scalar(select(func.count()).select_from(base.subquery())) or 0, False
+
+def estimate_rows(db: Session, statement) -> Optional[int]:
+    """Estimasi jumlah baris dari statistik planner PostgreSQL"""
+    try:
+        compiled = statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        plan = db.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
@@ -0,0 +1,13 @@
+from fastapi import Request
+
+def get_client_ip(request: Request) -> str:
+    """Get real client IP (X-Forwarded-For, X-Real-IP, lalu client host)"""
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+    
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return real_ip
+    
+    return request.client.host if request.client else "unknown"
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.infrastructure.config.settings import settings
@@ -29,11 +30,50 @@ def create_database_engine():
             echo=settings.DEBUG,
         )
 
+def get_async_database_url(database_url: str) -> str:
+    """Ubah URL database sync menjadi URL dengan driver async (asyncpg / aiosqlite)"""
+    scheme, separator, rest = database_url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "postgresql":
+        return f"postgresql+asyncpg{separator}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{separator}{rest}"
+    return database_url
+
+# Create async database engine for async def services, sharing the same database
+def create_async_database_engine():
+    """Create async database engine with appropriate settings"""
+    async_url = get_async_database_url(settings.DATABASE_URL)
+    try:
+        if settings.is_postgresql:
+            logger.info("Configuring async PostgreSQL engine (asyncpg)")
+            return create_async_engine(
+                async_url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                echo=settings.DEBUG,
+            )
+        else:
+            logger.info("Configuring async SQLite engine (aiosqlite)")
+            return create_async_engine(async_url, echo=settings.DEBUG)
+    except ImportError as e:
+        logger.warning(f"Async database driver not available, async sessions disabled: {e}")
+        return None
+
 engine = create_database_engine()
+async_engine = create_async_database_engine()
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create AsyncSessionLocal class; objects stay usable after commit for async callers
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -44,3 +84,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get async database session
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database session is not configured (install asyncpg / aiosqlite)")
+    async with AsyncSessionLocal() as db:
+        yield db
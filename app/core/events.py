@@ -13,7 +13,57 @@ async def startup_event_handler():
     # Initialize file watcher service
     file_watcher_service = FileWatcherService(settings.WATCH_PATH)
     await file_watcher_service.start()
+    
+    # Sweeper reservasi stok expired (bulk release, dijadwalkan dari expiry terdekat)
+    from app.domains.inventory.services.stock_reservation_engine import stock_reservation_sweeper
+    stock_reservation_sweeper.start()
+    
+    # Bridge pub/sub Redis untuk broadcast WebSocket lintas worker (bila diaktifkan)
+    from app.domains.discord.services.websocket_manager import connection_manager
+    await connection_manager.start_bridge()
+    
+    # Refresh snapshot dashboard admin di background
+    from app.domains.admin.services.dashboard.dashboard_snapshot import dashboard_snapshot
+    dashboard_snapshot.start()
+    
+    # Listener revocation token & invalidation principal lintas worker (bila diaktifkan)
+    from app.infrastructure.security.auth_cache import auth_cache
+    await auth_cache.start()
+    
+    # Health check terjadwal provider PPOB (mengisi status, peak-EWMA dan probe circuit breaker)
+    from app.domains.ppob.services.providers.ppob_provider_factory import ppob_provider_factory
+    ppob_provider_factory.start_health_checks()
 
 async def shutdown_event_handler():
     if file_watcher_service:
         await file_watcher_service.stop()
+    
+    from app.domains.inventory.services.stock_reservation_engine import stock_reservation_sweeper
+    await stock_reservation_sweeper.stop()
+    
+    from app.domains.discord.services.websocket_manager import connection_manager
+    await connection_manager.close()
+    
+    from app.domains.admin.services.dashboard.dashboard_snapshot import dashboard_snapshot
+    await dashboard_snapshot.stop()
+    
+    # Drain event analytics yang masih di-buffer sebelum proses berhenti
+    from app.domains.analytics.services.analytics_ingestion import analytics_ingestion_queue
+    await analytics_ingestion_queue.close()
+    
+    from app.domains.analytics.services.analytics_rollup_refresher import analytics_rollup_refresher
+    await analytics_rollup_refresher.stop()
+
+    # Hentikan pool hashing password
+    from app.infrastructure.security.password_service import password_service
+    password_service.shutdown()
+
+    from app.infrastructure.security.auth_cache import auth_cache
+    await auth_cache.close()
+
+    from app.domains.ppob.services.providers.ppob_provider_factory import ppob_provider_factory
+    await ppob_provider_factory.stop_health_checks()
+
+    # Tutup pool koneksi HTTP keluar
+    from app.infrastructure.external_apis.http_client import http_client_registry
+    await http_client_registry.aclose()
@@ -0,0 +1,126 @@
+"""
+Import Profiler
+Mode profil waktu import untuk mengukur cold start worker. Bila environment variable
+IMPORT_PROFILE aktif, finder di sys.meta_path mencatat waktu eksekusi setiap module
+(self = tanpa submodule yang diimportnya, total = termasuk submodule) lalu laporan
+per module ditulis ke log setelah aplikasi selesai dibuat.
+
+Module ini sengaja hanya memakai stdlib karena harus dipasang sebelum import lain.
+"""
+
+import importlib.abc
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Bungkus loader asli; mengukur exec_module lalu mengembalikan loader asli ke module"""
+
+    def __init__(self, loader, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        name = module.__name__
+        self._profiler._enter(name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(name)
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+            module.__loader__ = self._loader
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "ImportProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class ImportProfiler:
+    """Pencatat waktu import per module (self dan kumulatif, dalam detik)"""
+
+    ENV_VAR = "IMPORT_PROFILE"
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._finder: Optional[_TimingFinder] = None
+        # Stack [nama, waktu mulai, waktu anak]
+        self._stack: List[List] = []
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.started_at: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        return self._finder is not None
+
+    def start(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+            self.started_at = self._clock()
+
+    def start_from_env(self) -> bool:
+        """Aktifkan profiler bila IMPORT_PROFILE bernilai 1/true/yes"""
+        if os.environ.get(self.ENV_VAR, "").lower() in ("1", "true", "yes"):
+            self.start()
+        return self.active
+
+    def stop(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _enter(self, name: str):
+        self._stack.append([name, self._clock(), 0.0])
+
+    def _exit(self, name: str):
+        module_name, started, children = self._stack.pop()
+        total = self._clock() - started
+        self.timings[module_name] = (total - children, total)
+        if self._stack:
+            self._stack[-1][2] += total
+
+    def report(self, limit: int = 30) -> List[Tuple[str, float, float]]:
+        """Baris (module, self, total) diurutkan dari total terbesar"""
+        rows = [(name, own, total) for name, (own, total) in self.timings.items()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:limit]
+
+    def log_report(self, limit: int = 30):
+        """Tulis laporan import ke log lalu hentikan profiler"""
+        if not self.active:
+            return
+        self.stop()
+        elapsed = self._clock() - self.started_at
+        lines = [f"{total * 1000:9.1f}ms total {own * 1000:8.1f}ms self  {name}" for name, own, total in self.report(limit)]
+        logger.info(
+            f"Import profile: {len(self.timings)} modules, startup {elapsed * 1000:.1f}ms\n" + "\n".join(lines)
+        )
+
+
+# Global instance
+import_profiler = ImportProfiler()
@@ -8,6 +8,7 @@ from app.core.database import get_db
 from app.domains.admin.services.admin_management_service import AdminManagementService
 from app.domains.admin.schemas.admin_schemas import PaginatedResponse, AuditLogResponse
 from app.common.dependencies.admin_auth_deps import get_current_admin
+from app.common.exceptions.custom_exceptions import ValidationException
 from app.domains.admin.models.admin import Admin
 
 # Setup enhanced logging
@@ -34,10 +35,15 @@ class AdminAuditController:
             size: int = 10,
             action: Optional[str] = None,
             resource: Optional[str] = None,
+            cursor: Optional[str] = None,
             current_admin: Admin = Depends(get_current_admin),
             db: Session = Depends(get_db)
         ):
-            """Ambil audit logs dengan filtering dan logging akses"""
+            """
+            Ambil audit logs dengan filtering dan logging akses.
+            Halaman pertama dan parameter cursor memakai keyset pagination (next_cursor);
+            parameter page > 1 tanpa cursor tetap didukung sebagai offset pagination legacy.
+            """
             start_time = time.time()
             request_id = f"get_audit_logs_{int(start_time)}"
             
@@ -47,21 +53,32 @@ class AdminAuditController:
             
             try:
                 admin_service = AdminManagementService(db)
-                skip = (page - 1) * size
                 
-                # Log query parameters untuk debugging
-                logger.debug(f"[{request_id}] Fetching audit logs with skip: {skip}, limit: {size}, "
-                           f"filters - action: {action}, resource: {resource}")
-                
-                logs, total = admin_service.get_audit_logs(skip, size, action, resource)
-                
-                response = PaginatedResponse(
-                    items=[AuditLogResponse.from_orm(log) for log in logs],
-                    total=total,
-                    page=page,
-                    size=size,
-                    pages=(total + size - 1) // size
-                )
+                if cursor or page == 1:
+                    logger.debug(f"[{request_id}] Fetching audit logs with cursor, limit: {size}, "
+                               f"filters - action: {action}, resource: {resource}")
+                    result = admin_service.get_audit_logs_page(cursor, size, action, resource)
+                    logs = result["items"]
+                    response = PaginatedResponse.from_keyset(
+                        result, [AuditLogResponse.from_orm(log) for log in logs], page
+                    )
+                else:
+                    skip = (page - 1) * size
+                    
+                    # Log query parameters untuk debugging
+                    logger.debug(f"[{request_id}] Fetching audit logs with skip: {skip}, limit: {size}, "
+                               f"filters - action: {action}, resource: {resource}")
+                    
+                    logs, total = admin_service.get_audit_logs(skip, size, action, resource)
+                    
+                    response = PaginatedResponse(
+                        items=[AuditLogResponse.from_orm(log) for log in logs],
+                        total=total,
+                        page=page,
+                        size=size,
+                        pages=(total + size - 1) // size,
+                        has_next=skip + len(logs) < total
+                    )
                 
                 duration = time.time() - start_time
                 logger.info(f"[{request_id}] Successfully retrieved {len(logs)} audit logs in {duration:.3f}s")
@@ -72,6 +89,9 @@ class AdminAuditController:
                 
                 return response
                 
+            except ValidationException as e:
+                logger.warning(f"[{request_id}] Invalid audit log cursor: {e.message}")
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
             except Exception as e:
                 duration = time.time() - start_time
                 logger.error(f"[{request_id}] Error getting audit logs after {duration:.3f}s: {str(e)}", exc_info=True)
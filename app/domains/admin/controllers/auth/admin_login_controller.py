@@ -12,6 +12,7 @@ from app.domains.admin.schemas.admin_schemas import (
     AdminLogin, AdminLoginResponse, AdminResponse
 )
 from app.common.security.auth_security import create_access_token
+from app.common.exceptions.custom_exceptions import PasswordServiceBusyError
 from app.common.logging.endpoint_logger import endpoint_logger, log_endpoint_error
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ async def login_admin(
         # Log login attempt
         logger.info(f"🔐 Admin login attempt for username: {login_data.username}")
         
-        admin = auth_service.authenticate_admin(
+        admin = await auth_service.authenticate_admin(
             login_data.username, 
             login_data.password
         )
@@ -56,8 +57,8 @@ async def login_admin(
             admin=AdminResponse.from_orm(admin)
         )
         
-    except HTTPException:
-        # Re-raise HTTP exceptions
+    except (HTTPException, PasswordServiceBusyError):
+        # Re-raise HTTP exceptions dan antrian hashing penuh (503)
         raise
     except Exception as e:
         # Log unexpected errors
@@ -2,12 +2,18 @@
 Modul ini berisi implementasi logout controller untuk admin.
 """
 
+import asyncio
+from typing import Optional
+
 from fastapi import APIRouter, Depends
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.common.dependencies.admin_auth_deps import get_current_admin
+from app.common.dependencies.admin_auth_deps import get_current_admin, security
+from app.common.security.auth_security import revoke_session
 from app.domains.admin.models.admin import Admin
+from app.domains.auth.schemas.auth_schemas import LogoutRequest
 from app.common.responses.api_response import APIResponse
 from app.domains.admin.repositories.admin_repository import AuditLogRepository
 
@@ -15,10 +21,16 @@ router = APIRouter()
 
 @router.post("/logout")
 async def logout_admin(
+    logout_data: Optional[LogoutRequest] = None,
     current_admin: Admin = Depends(get_current_admin),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """Logout admin"""
+    # Cabut access token (dan refresh token bila dikirim) sehingga langsung ditolak di semua worker
+    refresh_token = logout_data.refresh_token if logout_data else None
+    await asyncio.to_thread(revoke_session, credentials.credentials, refresh_token)
+    
     # Log logout activity
     audit_repo = AuditLogRepository(db)
     audit_repo.create_log(
@@ -15,6 +15,7 @@ from app.domains.admin.schemas.admin_schemas import ProductCreate, ProductUpdate
 from app.common.dependencies.admin_auth_deps import get_current_admin
 from app.domains.admin.models.admin import Admin
 from app.common.responses.api_response import APIResponse
+from app.common.exceptions.custom_exceptions import ValidationException
 
 logger = logging.getLogger(__name__)
 
@@ -32,20 +33,30 @@ class ProductCrudController:
         @self.router.get("/", response_model=PaginatedResponse)
         async def get_products(
             page: int = 1, size: int = 10, search: Optional[str] = None,
-            category: Optional[str] = None, is_active: Optional[bool] = None,
+            category: Optional[str] = None, is_active: Optional[bool] = None, cursor: Optional[str] = None,
             current_admin: Admin = Depends(get_current_admin), db: Session = Depends(get_db)
         ):
-            """Ambil daftar produk"""
+            """Ambil daftar produk (keyset pagination via cursor; page > 1 tanpa cursor = offset legacy)"""
             try:
                 product_service = ProductManagementService(db)
+                if cursor or page == 1:
+                    result = product_service.get_products_page(cursor, size, search, category, is_active)
+                    logger.info(f"Retrieved {len(result['items'])} products for admin {current_admin.username}")
+                    return PaginatedResponse.from_keyset(
+                        result, [ProductResponse.from_orm(product) for product in result["items"]], page
+                    )
+                
                 skip = (page - 1) * size
                 products, total = product_service.get_products(skip, size, search, category, is_active)
                 
                 logger.info(f"Retrieved {len(products)} products for admin {current_admin.username}")
                 return PaginatedResponse(
                     items=[ProductResponse.from_orm(product) for product in products],
-                    total=total, page=page, size=size, pages=(total + size - 1) // size
+                    total=total, page=page, size=size, pages=(total + size - 1) // size,
+                    has_next=skip + len(products) < total
                 )
+            except ValidationException as e:
+                raise HTTPException(status_code=400, detail=e.message)
             except Exception as e:
                 logger.error(f"Error getting products: {str(e)}", exc_info=True)
                 raise HTTPException(status_code=500, detail="Failed to get products")
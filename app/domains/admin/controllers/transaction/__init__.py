@@ -6,9 +6,11 @@ Memecah transaction controller menjadi modul-modul kecil
 from .transaction_main_controller import TransactionMainController
 from .transaction_stats_controller import TransactionStatsController
 from .transaction_management_controller import TransactionManagementController
+from .transaction_export_controller import TransactionExportController
 
 __all__ = [
     'TransactionMainController',
     'TransactionStatsController',
-    'TransactionManagementController'
+    'TransactionManagementController',
+    'TransactionExportController'
 ]
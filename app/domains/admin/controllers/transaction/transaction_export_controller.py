@@ -0,0 +1,78 @@
+"""
+Transaction Export Controller
+Controller untuk export transaksi wallet dan PPOB secara streaming
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.common.dependencies.admin_auth_deps import get_current_admin
+from app.common.responses.api_response import APIResponse
+from app.common.services.streaming_export import streaming_exporter
+from app.domains.admin.models.admin import Admin
+from app.domains.admin.services.data_export_service import DataExportService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_SPECS = {
+    "wallet": DataExportService.wallet_transactions_spec,
+    "ppob": DataExportService.ppob_transactions_spec
+}
+
+
+class TransactionExportController:
+    """Controller untuk export transaksi - Single Responsibility"""
+    
+    def __init__(self):
+        self.router = APIRouter()
+        self._setup_routes()
+    
+    def _setup_routes(self):
+        """Setup routes untuk export transaksi"""
+        
+        def build_spec(source: str, start_date, end_date, transaction_status):
+            spec_builder = EXPORT_SPECS.get(source)
+            if spec_builder is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Sumber export tidak dikenal: {source}")
+            return spec_builder(start_date, end_date, transaction_status)
+        
+        @self.router.get("/export/{source}")
+        async def export_transactions(
+            source: str,
+            format: str = Query("csv", description="csv, ndjson atau parquet"),
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            transaction_status: Optional[str] = Query(None, alias="status"),
+            current_admin: Admin = Depends(get_current_admin)
+        ):
+            """Stream export transaksi (wallet / ppob) langsung ke client"""
+            spec = build_spec(source, start_date, end_date, transaction_status)
+            logger.info(f"Transaction export {source} ({format}) streamed for admin {current_admin.username}")
+            return streaming_exporter.streaming_response(spec, format)
+        
+        @self.router.post("/export/{source}/jobs")
+        async def start_transactions_export_job(
+            source: str,
+            format: str = Query("csv", description="csv, ndjson atau parquet"),
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            transaction_status: Optional[str] = Query(None, alias="status"),
+            current_admin: Admin = Depends(get_current_admin)
+        ):
+            """Export transaksi ke file di background"""
+            spec = build_spec(source, start_date, end_date, transaction_status)
+            job = streaming_exporter.start_file_export(spec, format)
+            return APIResponse.success(data=job.to_dict(), message="Export transaksi dimulai")
+        
+        @self.router.get("/export/jobs/{job_id}")
+        async def get_transactions_export_job(
+            job_id: str,
+            current_admin: Admin = Depends(get_current_admin)
+        ):
+            """Progres export ke file"""
+            job = streaming_exporter.get_job(job_id)
+            if job is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job export tidak ditemukan")
+            return APIResponse.success(data=job.to_dict())
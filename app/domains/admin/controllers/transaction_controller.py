@@ -10,6 +10,7 @@ import logging
 from .transaction.transaction_main_controller import TransactionMainController
 from .transaction.transaction_stats_controller import TransactionStatsController
 from .transaction.transaction_management_controller import TransactionManagementController
+from .transaction.transaction_export_controller import TransactionExportController
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +33,13 @@ class TransactionController:
             main_controller = TransactionMainController()
             stats_controller = TransactionStatsController()
             management_controller = TransactionManagementController()
+            export_controller = TransactionExportController()
             
             # Include all routers
             self.router.include_router(main_controller.router, tags=["transaction-main"])
             self.router.include_router(stats_controller.router, tags=["transaction-stats"])
             self.router.include_router(management_controller.router, tags=["transaction-management"])
+            self.router.include_router(export_controller.router, tags=["transaction-export"])
             
             logger.info("Transaction controllers initialized successfully")
             
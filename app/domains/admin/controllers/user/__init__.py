@@ -3,11 +3,13 @@ User management controllers module
 """
 
 from .user_crud_controller import user_crud_controller
+from .user_export_controller import user_export_controller
 from .user_stats_controller import user_stats_controller
 from .user_validation_controller import user_validation_controller
 
 __all__ = [
     'user_crud_controller',
+    'user_export_controller',
     'user_stats_controller', 
     'user_validation_controller'
 ]
@@ -11,6 +11,7 @@ from app.domains.admin.schemas.admin_schemas import (
 from app.common.dependencies.admin_auth_deps import get_current_admin
 from app.domains.admin.models.admin import Admin
 from app.common.responses.api_response import APIResponse
+from app.common.exceptions.custom_exceptions import ValidationException
 
 logger = logging.getLogger(__name__)
 
@@ -33,13 +34,23 @@ class UserCrudController:
             size: int = 10,
             search: Optional[str] = None,
             is_active: Optional[bool] = None,
+            cursor: Optional[str] = None,
             current_admin: Admin = Depends(get_current_admin),
             db: Session = Depends(get_db)
         ):
-            """Ambil daftar user"""
+            """Ambil daftar user (keyset pagination via cursor; page > 1 tanpa cursor = offset legacy)"""
             user_service = UserManagementService(db)
-            skip = (page - 1) * size
             
+            if cursor or page == 1:
+                try:
+                    result = user_service.get_users_page(cursor, size, search, is_active)
+                except ValidationException as e:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+                return PaginatedResponse.from_keyset(
+                    result, [UserManagementResponse.from_orm(user) for user in result["items"]], page
+                )
+            
+            skip = (page - 1) * size
             users, total = user_service.get_users(skip, size, search, is_active)
             
             return PaginatedResponse(
@@ -47,7 +58,8 @@ class UserCrudController:
                 total=total,
                 page=page,
                 size=size,
-                pages=(total + size - 1) // size
+                pages=(total + size - 1) // size,
+                has_next=skip + len(users) < total
             )
         
         @self.router.get("/{user_id}", response_model=UserManagementResponse)
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+import logging
+
+from app.common.dependencies.admin_auth_deps import get_current_admin
+from app.common.responses.api_response import APIResponse
+from app.common.services.streaming_export import streaming_exporter
+from app.domains.admin.models.admin import Admin
+from app.domains.admin.services.data_export_service import DataExportService
+
+logger = logging.getLogger(__name__)
+
+
+class UserExportController:
+    """
+    Controller untuk export data user - Single Responsibility: User export
+    """
+    
+    def __init__(self):
+        self.router = APIRouter()
+        self._setup_routes()
+    
+    def _setup_routes(self):
+        """Setup routes untuk export user"""
+        
+        @self.router.get("/export")
+        async def export_users(
+            format: str = Query("csv", description="csv, ndjson atau parquet"),
+            user_status: Optional[str] = Query(None, alias="status", description="active / inactive"),
+            current_admin: Admin = Depends(get_current_admin)
+        ):
+            """Stream export data user langsung ke client"""
+            logger.info(f"User export ({format}) streamed for admin {current_admin.username}")
+            return streaming_exporter.streaming_response(DataExportService.users_spec(user_status), format)
+        
+        @self.router.post("/export/jobs")
+        async def start_users_export_job(
+            format: str = Query("csv", description="csv, ndjson atau parquet"),
+            user_status: Optional[str] = Query(None, alias="status", description="active / inactive"),
+            current_admin: Admin = Depends(get_current_admin)
+        ):
+            """Export data user ke file di background"""
+            job = streaming_exporter.start_file_export(DataExportService.users_spec(user_status), format)
+            return APIResponse.success(data=job.to_dict(), message="Export user dimulai")
+        
+        @self.router.get("/export/jobs/{job_id}")
+        async def get_users_export_job(
+            job_id: str,
+            current_admin: Admin = Depends(get_current_admin)
+        ):
+            """Progres export ke file"""
+            job = streaming_exporter.get_job(job_id)
+            if job is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job export tidak ditemukan")
+            return APIResponse.success(data=job.to_dict())
+
+
+# Initialize controller
+user_export_controller = UserExportController()
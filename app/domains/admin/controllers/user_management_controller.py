@@ -3,6 +3,7 @@ import logging
 
 from .user import (
     user_crud_controller,
+    user_export_controller,
     user_stats_controller,
     user_validation_controller
 )
@@ -21,6 +22,12 @@ class UserManagementController:
     
     def _setup_routes(self):
         """Setup routes dengan menggabungkan semua sub-controllers"""
+        # Include export operations (sebelum CRUD agar /export tidak tertangkap /{user_id})
+        self.router.include_router(
+            user_export_controller.router,
+            tags=["User Management - Export"]
+        )
+        
         # Include CRUD operations
         self.router.include_router(
             user_crud_controller.router,
@@ -4,12 +4,15 @@ Dipecah dari admin_repository.py untuk meningkatkan maintainability
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional, Tuple
+from sqlalchemy import desc, select
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.common.logging.admin_logger import admin_logger
+from app.common.utils.pagination import COUNT_ESTIMATE, KeysetPaginator
 from app.domains.admin.models.admin import AdminAuditLog
 
+audit_log_paginator = KeysetPaginator(AdminAuditLog.created_at, AdminAuditLog.id, default_page_size=10)
+
 
 class AuditLogRepository:
     """
@@ -97,3 +100,25 @@ class AuditLogRepository:
                 "action": action, "resource": resource
             })
             raise
+    
+    def get_logs_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        admin_id: Optional[str] = None,
+        action: Optional[str] = None,
+        resource: Optional[str] = None,
+        count: Optional[str] = COUNT_ESTIMATE
+    ) -> Dict[str, Any]:
+        """Ambil audit log dengan keyset pagination (created_at, id) terbaru dulu"""
+        statement = select(AdminAuditLog)
+        if admin_id:
+            statement = statement.where(AdminAuditLog.admin_id == admin_id)
+        if action:
+            statement = statement.where(AdminAuditLog.action == action)
+        if resource:
+            statement = statement.where(AdminAuditLog.resource == resource)
+        
+        page = audit_log_paginator.paginate(self.db, statement, cursor, limit, count)
+        admin_logger.info(f"Ditemukan {len(page['items'])} audit logs (keyset), has_next: {page['pagination']['has_next']}")
+        return page
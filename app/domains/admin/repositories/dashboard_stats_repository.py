@@ -4,7 +4,7 @@ Dipecah dari admin_repository.py untuk meningkatkan maintainability
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
 from typing import Dict, Any
 
 from app.common.logging.admin_logger import admin_logger
@@ -26,33 +26,29 @@ class DashboardStatsRepository:
         try:
             admin_logger.info("Mengambil statistik dashboard")
             
-            # User stats
-            total_users = self.db.query(User).count()
-            active_users = self.db.query(User).filter(User.is_active == True).count()
+            # Satu query agregat per tabel (bukan satu query per angka)
+            users = self.db.query(
+                func.count(User.id).label("total"),
+                func.count(case((User.is_active == True, 1))).label("active")
+            ).one()
             
-            # Transaction stats
-            total_transactions = self.db.query(PPOBTransaction).count()
-            pending_transactions = self.db.query(PPOBTransaction).filter(
-                PPOBTransaction.status == TransactionStatus.PENDING
-            ).count()
-            failed_transactions = self.db.query(PPOBTransaction).filter(
-                PPOBTransaction.status == TransactionStatus.FAILED
-            ).count()
-            
-            # Revenue stats
-            total_revenue = self.db.query(
-                func.sum(PPOBTransaction.total_amount)
-            ).filter(
-                PPOBTransaction.status == TransactionStatus.SUCCESS
-            ).scalar() or 0
+            transactions = self.db.query(
+                func.count(PPOBTransaction.id).label("total"),
+                func.count(case((PPOBTransaction.status == TransactionStatus.PENDING, 1))).label("pending"),
+                func.count(case((PPOBTransaction.status == TransactionStatus.FAILED, 1))).label("failed"),
+                func.sum(case(
+                    (PPOBTransaction.status == TransactionStatus.SUCCESS, PPOBTransaction.total_amount),
+                    else_=0
+                )).label("revenue")
+            ).one()
             
             stats = {
-                "total_users": total_users,
-                "active_users": active_users,
-                "total_transactions": total_transactions,
-                "total_revenue": float(total_revenue),
-                "pending_transactions": pending_transactions,
-                "failed_transactions": failed_transactions
+                "total_users": users.total,
+                "active_users": users.active,
+                "total_transactions": transactions.total,
+                "total_revenue": float(transactions.revenue or 0),
+                "pending_transactions": transactions.pending,
+                "failed_transactions": transactions.failed
             }
             
             admin_logger.info("Statistik dashboard berhasil diambil", stats)
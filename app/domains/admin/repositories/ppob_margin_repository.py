@@ -67,3 +67,59 @@ class PPOBMarginRepository:
         except Exception as e:
             admin_logger.error(f"Error saat mencari margin global untuk kategori: {category}", e)
             raise
+    
+    def get_all_active(self) -> List[PPOBMarginConfig]:
+        """Ambil semua margin aktif (untuk tabel aturan margin)"""
+        try:
+            result = self.db.query(PPOBMarginConfig).filter(
+                PPOBMarginConfig.is_active == True
+            ).order_by(PPOBMarginConfig.id).all()
+            admin_logger.info(f"Ditemukan {len(result)} margin aktif")
+            return result
+        except Exception as e:
+            admin_logger.error("Error saat mengambil margin aktif", e)
+            raise
+    
+    def get_by_id(self, config_id) -> Optional[PPOBMarginConfig]:
+        """Ambil margin berdasarkan ID"""
+        return self.db.query(PPOBMarginConfig).filter(PPOBMarginConfig.id == config_id).first()
+    
+    def get_all(self, skip: int = 0, limit: int = 100) -> List[PPOBMarginConfig]:
+        """Ambil semua margin dengan pagination"""
+        return self.db.query(PPOBMarginConfig).order_by(PPOBMarginConfig.id).offset(skip).limit(limit).all()
+    
+    def create(self, config: PPOBMarginConfig) -> PPOBMarginConfig:
+        """Simpan margin baru"""
+        try:
+            self.db.add(config)
+            self.db.commit()
+            self.db.refresh(config)
+            admin_logger.info(f"Margin dibuat: {config.id}")
+            return config
+        except Exception as e:
+            admin_logger.error("Error saat membuat margin", e)
+            self.db.rollback()
+            raise
+    
+    def update(self, config: PPOBMarginConfig) -> PPOBMarginConfig:
+        """Simpan perubahan margin"""
+        try:
+            self.db.commit()
+            self.db.refresh(config)
+            admin_logger.info(f"Margin diupdate: {config.id}")
+            return config
+        except Exception as e:
+            admin_logger.error(f"Error saat update margin: {config.id}", e)
+            self.db.rollback()
+            raise
+    
+    def delete(self, config_id) -> bool:
+        """Hapus margin"""
+        try:
+            deleted = self.db.query(PPOBMarginConfig).filter(PPOBMarginConfig.id == config_id).delete()
+            self.db.commit()
+            return deleted > 0
+        except Exception as e:
+            admin_logger.error(f"Error saat hapus margin: {config_id}", e)
+            self.db.rollback()
+            raise
@@ -4,11 +4,15 @@ Dipecah dari admin_repository.py untuk meningkatkan maintainability
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional, Tuple
+from sqlalchemy import or_, select
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.common.logging.admin_logger import admin_logger
-from app.domains.ppob.models.ppob import PPOBProduct
+from app.common.utils.pagination import COUNT_ESTIMATE, KeysetPaginator
+from app.domains.ppob.models.ppob import PPOBCategory, PPOBProduct
+
+# created_at produk nullable, jadi keyset cukup di primary key (urutan katalog)
+product_paginator = KeysetPaginator(PPOBProduct.id, descending=False, default_page_size=10)
 
 
 class ProductManagementRepository:
@@ -52,7 +56,7 @@ class ProductManagementRepository:
                 query = query.filter(PPOBProduct.is_active == str(is_active).lower())
             
             total = query.count()
-            products = query.offset(skip).limit(limit).all()
+            products = query.order_by(*product_paginator.order_by_clauses()).offset(skip).limit(limit).all()
             
             admin_logger.info(f"Ditemukan {len(products)} products dari total {total}")
             return products, total
@@ -64,6 +68,33 @@ class ProductManagementRepository:
             })
             raise
     
+    def get_products_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        count: Optional[str] = COUNT_ESTIMATE
+    ) -> Dict[str, Any]:
+        """Ambil produk dengan keyset pagination berdasarkan id"""
+        statement = select(PPOBProduct)
+        if search:
+            statement = statement.where(
+                or_(
+                    PPOBProduct.product_code.ilike(f"%{search}%"),
+                    PPOBProduct.product_name.ilike(f"%{search}%")
+                )
+            )
+        if category:
+            statement = statement.where(PPOBProduct.category.has(PPOBCategory.code == category))
+        if is_active is not None:
+            statement = statement.where(PPOBProduct.is_active == is_active)
+        
+        page = product_paginator.paginate(self.db, statement, cursor, limit, count)
+        admin_logger.info(f"Ditemukan {len(page['items'])} products (keyset), has_next: {page['pagination']['has_next']}")
+        return page
+    
     def get_product_categories(self) -> List[str]:
         """Ambil semua kategori produk"""
         try:
@@ -4,12 +4,15 @@ Dipecah dari admin_repository.py untuk meningkatkan maintainability
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional, Dict, Tuple
+from sqlalchemy import or_, select
+from typing import Any, List, Optional, Dict, Tuple
 
 from app.common.logging.admin_logger import admin_logger
+from app.common.utils.pagination import COUNT_ESTIMATE, KeysetPaginator
 from app.domains.auth.models.user import User
 
+user_paginator = KeysetPaginator(User.created_at, User.id, default_page_size=10)
+
 
 class UserManagementRepository:
     """
@@ -48,7 +51,7 @@ class UserManagementRepository:
                 query = query.filter(User.is_active == is_active)
             
             total = query.count()
-            users = query.offset(skip).limit(limit).all()
+            users = query.order_by(*user_paginator.order_by_clauses()).offset(skip).limit(limit).all()
             
             admin_logger.info(f"Ditemukan {len(users)} users dari total {total}")
             return users, total
@@ -59,6 +62,31 @@ class UserManagementRepository:
             })
             raise
     
+    def get_users_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        count: Optional[str] = COUNT_ESTIMATE
+    ) -> Dict[str, Any]:
+        """Ambil user dengan keyset pagination (created_at, id) terbaru dulu"""
+        statement = select(User)
+        if search:
+            statement = statement.where(
+                or_(
+                    User.username.ilike(f"%{search}%"),
+                    User.email.ilike(f"%{search}%"),
+                    User.full_name.ilike(f"%{search}%")
+                )
+            )
+        if is_active is not None:
+            statement = statement.where(User.is_active == is_active)
+        
+        page = user_paginator.paginate(self.db, statement, cursor, limit, count)
+        admin_logger.info(f"Ditemukan {len(page['items'])} users (keyset), has_next: {page['pagination']['has_next']}")
+        return page
+    
     def get_user_stats(self) -> Dict[str, int]:
         """Ambil statistik user"""
         try:
@@ -21,6 +21,25 @@ class PaginatedResponse(BaseModel):
     page: int
     size: int
     pages: int
+    # Keyset pagination: kirim next_cursor sebagai parameter cursor untuk halaman berikutnya
+    next_cursor: Optional[str] = None
+    has_next: bool = False
+    total_is_estimate: bool = False
+
+    @classmethod
+    def from_keyset(cls, result: Dict[str, Any], items: List[Any], page: int = 1) -> "PaginatedResponse":
+        """Bangun response dari envelope KeysetPaginator ({'items', 'pagination'})"""
+        meta = result["pagination"]
+        return cls(
+            items=items,
+            total=meta["total_items"] or 0,
+            page=page,
+            size=meta["page_size"],
+            pages=meta["total_pages"] or 0,
+            next_cursor=meta["next_cursor"],
+            has_next=meta["has_next"],
+            total_is_estimate=meta["total_is_estimate"]
+        )
 
 
 class AuditLogResponse(BaseModel):
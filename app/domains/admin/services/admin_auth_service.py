@@ -7,7 +7,8 @@ from app.common.base_classes.base_service import BaseService
 from app.domains.admin.models.admin import Admin
 from app.domains.admin.repositories.admin_repository import AdminRepository, AuditLogRepository
 from app.domains.admin.schemas.admin_schemas import AdminCreate
-from app.common.security.auth_security import get_password_hash, verify_password
+from app.common.security.auth_security import get_password_hash
+from app.infrastructure.security.password_service import password_service
 
 
 class AdminAuthService(BaseService):
@@ -20,18 +21,23 @@ class AdminAuthService(BaseService):
         self.admin_repo = AdminRepository(db)
         self.audit_repo = AuditLogRepository(db)
     
-    def authenticate_admin(self, username: str, password: str) -> Optional[Admin]:
+    async def authenticate_admin(self, username: str, password: str) -> Optional[Admin]:
         """Autentikasi admin"""
         admin = self.admin_repo.get_by_username(username)
         if not admin:
             return None
         
-        if not verify_password(password, admin.hashed_password):
+        valid, new_hashed_password = await password_service.verify_and_update(password, admin.hashed_password)
+        if not valid:
             return None
         
         if not admin.is_active:
             return None
         
+        # Hash lama dengan cost bcrypt berbeda ikut tersimpan saat commit update last login
+        if new_hashed_password:
+            admin.hashed_password = new_hashed_password
+        
         # Update last login
         self.admin_repo.update_last_login(admin.id)
         
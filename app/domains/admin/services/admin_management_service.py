@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List
+from typing import Any, Dict, List, Optional
 import json
 
 from app.common.base_classes.base_service import BaseService
@@ -20,6 +20,26 @@ class AdminManagementService(BaseService):
         """Ambil daftar admin dengan pagination"""
         return self.admin_repo.get_all_with_pagination(skip, limit)
     
+    def get_audit_logs(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        action: Optional[str] = None,
+        resource: Optional[str] = None
+    ) -> tuple[List[Any], int]:
+        """Ambil audit log dengan offset pagination (legacy, parameter page)"""
+        return self.audit_repo.get_logs_with_pagination(skip, limit, action=action, resource=resource)
+    
+    def get_audit_logs_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        action: Optional[str] = None,
+        resource: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Ambil audit log dengan keyset pagination"""
+        return self.audit_repo.get_logs_page(cursor, limit, action=action, resource=resource)
+    
     def get_admin_by_id(self, admin_id: str) -> Admin:
         """Ambil admin berdasarkan ID"""
         admin = self.admin_repo.get_by_id(admin_id)
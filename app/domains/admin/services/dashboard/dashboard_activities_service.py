@@ -10,6 +10,8 @@ import logging
 
 from app.common.base_classes.base_service import BaseService
 from app.domains.admin.repositories.admin_repository import DashboardRepository
+from .dashboard_helpers import serialize_recent_transaction
+from .dashboard_snapshot import dashboard_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -23,20 +25,18 @@ class DashboardActivitiesService(BaseService):
     
     def get_recent_transactions(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Ambil transaksi terbaru dengan error handling"""
+        if limit <= dashboard_snapshot.RECENT_LIMIT:
+            snapshot = dashboard_snapshot.get()
+            if snapshot is not None:
+                return snapshot["recent_transactions"][:limit]
+        
         try:
             transactions = self.dashboard_repo.get_recent_transactions(limit)
             result = []
             
             for tx in transactions:
                 try:
-                    tx_data = {
-                        "id": tx.id,
-                        "transaction_code": tx.transaction_code,
-                        "product_name": tx.product_name,
-                        "amount": float(tx.total_amount) if tx.total_amount else 0,
-                        "status": tx.status.value if hasattr(tx, 'status') and tx.status else "UNKNOWN",
-                        "created_at": tx.created_at.isoformat() if tx.created_at else None
-                    }
+                    tx_data = serialize_recent_transaction(tx)
                     result.append(tx_data)
                 except Exception as e:
                     logger.error(f"Error processing transaction {tx.id}: {str(e)}", exc_info=True)
@@ -12,6 +12,18 @@ from app.domains.admin.schemas.admin_schemas import DashboardResponse, Dashboard
 logger = logging.getLogger(__name__)
 
 
+def serialize_recent_transaction(tx) -> Dict[str, Any]:
+    """Format transaksi terbaru untuk response dashboard"""
+    return {
+        "id": tx.id,
+        "transaction_code": tx.transaction_code,
+        "product_name": tx.product_name,
+        "amount": float(tx.total_amount) if tx.total_amount else 0,
+        "status": tx.status.value if hasattr(tx, 'status') and tx.status else "UNKNOWN",
+        "created_at": tx.created_at.isoformat() if tx.created_at else None
+    }
+
+
 def get_transaction_trends(dashboard_repo, days: int = 7) -> List[TransactionStats]:
     """Get transaction trends dengan error handling"""
     try:
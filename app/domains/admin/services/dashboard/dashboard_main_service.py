@@ -15,7 +15,8 @@ from app.domains.admin.schemas.admin_schemas import DashboardResponse, Dashboard
 from .dashboard_stats_service import DashboardStatsService
 from .dashboard_activities_service import DashboardActivitiesService
 from .dashboard_system_service import DashboardSystemService
-from .dashboard_helpers import get_transaction_trends, get_top_products, get_empty_dashboard_response
+from .dashboard_helpers import get_empty_dashboard_response
+from .dashboard_snapshot import dashboard_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -33,23 +34,17 @@ class DashboardMainService(BaseService):
     def get_dashboard_data(self) -> DashboardResponse:
         """Ambil data dashboard lengkap dengan improved error handling"""
         try:
-            # Get statistics
-            stats_data = self.stats_service.get_dashboard_stats()
-            dashboard_stats = DashboardStats(**stats_data)
-            
-            # Get recent transactions
-            recent_transactions = self.activities_service.get_recent_transactions(10)
-            
-            # Get transaction trends and top products using helpers
-            transaction_trends = get_transaction_trends(self.dashboard_repo, 7)
-            top_products = get_top_products(self.dashboard_repo, 5)
+            # Semua bagian dashboard diambil dari snapshot bersama (satu set query untuk semua admin)
+            snapshot = dashboard_snapshot.get()
+            if snapshot is None:
+                return get_empty_dashboard_response()
             
             logger.info("Dashboard data retrieved successfully")
             return DashboardResponse(
-                stats=dashboard_stats,
-                recent_transactions=recent_transactions,
-                transaction_trends=transaction_trends,
-                top_products=top_products
+                stats=DashboardStats(**snapshot["stats"]),
+                recent_transactions=snapshot["recent_transactions"],
+                transaction_trends=[TransactionStats(**trend) for trend in snapshot["transaction_trends"]],
+                top_products=snapshot["top_products"]
             )
             
         except Exception as e:
@@ -0,0 +1,146 @@
+"""
+Dashboard Snapshot
+Payload dashboard admin (statistik, transaksi terbaru, trend, produk terpopuler) dibangun
+sekali lalu dipakai bersama oleh semua request. Snapshot di-refresh di background setiap
+interval selama masih ada admin yang membuka dashboard; bila tidak ada pembaca selama
+idle_timeout refresh berhenti dan snapshot berikutnya dibangun saat diminta.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.domains.admin.repositories.dashboard_repository import DashboardRepository
+from app.infrastructure.config.settings import settings
+from .dashboard_helpers import serialize_recent_transaction
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardSnapshot:
+    """
+    Cache snapshot dashboard - Single Responsibility: satu set query dashboard untuk semua admin
+    Refresh memakai session sendiri dan single-flight (lock) sehingga N admin = satu set query.
+    """
+
+    RECENT_LIMIT = 10
+    TREND_DAYS = 7
+    TOP_PRODUCTS_LIMIT = 5
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval: float = 5.0,
+        idle_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._payload: Optional[Dict[str, Any]] = None
+        self._built_at: Optional[float] = None
+        self._last_read: Optional[float] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_count = 0
+
+    def _is_fresh(self, max_age: float) -> bool:
+        return self._built_at is not None and self._clock() - self._built_at < max_age
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """Snapshot terbaru; dibangun di tempat bila belum ada atau sudah terlalu lama"""
+        self._last_read = self._clock()
+        # Selama refresh background berjalan, beri kelonggaran satu interval agar request
+        # tidak ikut me-refresh tepat saat background sedang melakukannya
+        background_active = self._task is not None and not self._task.done()
+        max_age = self.interval * 2 if background_active else self.interval
+        if not self._is_fresh(max_age):
+            with self._lock:
+                if not self._is_fresh(max_age):
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        # Snapshot lama (bila ada) tetap dipakai daripada dashboard kosong
+                        logger.error(f"Error refreshing dashboard snapshot: {e}", exc_info=True)
+        return self._payload
+
+    def refresh(self):
+        """Jalankan set query dashboard dan ganti snapshot"""
+        db = self.session_factory()
+        try:
+            data = DashboardRepository(db).get_complete_dashboard_data()
+        finally:
+            db.close()
+
+        self._payload = {
+            "stats": data["stats"],
+            "recent_transactions": [serialize_recent_transaction(tx) for tx in data["recent_transactions"]],
+            "transaction_trends": data["transaction_trends"],
+            "top_products": data["top_products"],
+            "generated_at": datetime.utcnow().isoformat()
+        }
+        self._built_at = self._clock()
+        self._refresh_count += 1
+
+    def invalidate(self):
+        self._built_at = None
+
+    def _has_readers(self) -> bool:
+        return self._last_read is not None and self._clock() - self._last_read < self.idle_timeout
+
+    # ---- Background refresh ------------------------------------------------
+
+    def start(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _refresh_if_read(self):
+        if not self._has_readers():
+            return
+        with self._lock:
+            self.refresh()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self._refresh_if_read)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Dashboard snapshot refresh failed: {e}", exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "refresh_count": self._refresh_count,
+            "age_seconds": None if self._built_at is None else round(self._clock() - self._built_at, 1),
+            "background_active": self._task is not None and not self._task.done()
+        }
+
+
+# Global instance
+dashboard_snapshot = DashboardSnapshot(
+    SessionLocal,
+    interval=settings.DASHBOARD_SNAPSHOT_INTERVAL,
+    idle_timeout=settings.DASHBOARD_SNAPSHOT_IDLE_TIMEOUT
+)
@@ -12,6 +12,7 @@ from app.common.base_classes.base_service import BaseService
 from app.domains.admin.repositories.admin_repository import DashboardRepository
 from app.domains.admin.schemas.admin_schemas import DashboardStats
 from app.domains.ppob.models.ppob import TransactionStatus
+from .dashboard_snapshot import dashboard_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,8 @@ class DashboardStatsService(BaseService):
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """Ambil statistik dashboard"""
         try:
-            stats = self.dashboard_repo.get_dashboard_stats()
+            snapshot = dashboard_snapshot.get()
+            stats = dict(snapshot["stats"]) if snapshot is not None else None
             if not stats:
                 logger.warning("No stats data found, returning empty stats")
                 return self._get_empty_stats()
@@ -0,0 +1,83 @@
+"""
+Data Export Service - Definisi dataset export admin
+Membangun ExportSpec (SELECT kolom, tanpa objek ORM) untuk user, transaksi wallet dan
+transaksi PPOB; eksekusi dan encoding dilakukan StreamingExporter.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.common.exceptions.custom_exceptions import ValidationException
+from app.common.services.streaming_export import ExportSpec
+from app.domains.auth.models.user import User
+from app.domains.ppob.models.ppob import PPOBTransaction, TransactionStatus as PPOBTransactionStatus
+from app.domains.wallet.models.wallet import WalletTransaction, TransactionStatus as WalletTransactionStatus
+
+
+def _parse_status(enum_class, value: Optional[str]):
+    if not value:
+        return None
+    for member in enum_class:
+        if member.value.lower() == value.lower():
+            return member
+    raise ValidationException(f"Status tidak valid: {value}")
+
+
+class DataExportService:
+    """Service definisi export - Single Responsibility: memilih kolom dan filter dataset"""
+
+    @staticmethod
+    def users_spec(status: Optional[str] = None) -> ExportSpec:
+        statement = select(
+            User.id, User.username, User.email, User.full_name, User.phone_number,
+            User.balance, User.is_active, User.created_at
+        ).order_by(User.id)
+        if status == "active":
+            statement = statement.where(User.is_active == True)
+        elif status == "inactive":
+            statement = statement.where(User.is_active == False)
+        return ExportSpec("users", statement)
+
+    @staticmethod
+    def wallet_transactions_spec(
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status: Optional[str] = None
+    ) -> ExportSpec:
+        statement = select(
+            WalletTransaction.id, WalletTransaction.transaction_code, WalletTransaction.user_id,
+            WalletTransaction.transaction_type, WalletTransaction.amount,
+            WalletTransaction.balance_before, WalletTransaction.balance_after,
+            WalletTransaction.status, WalletTransaction.reference_id, WalletTransaction.created_at
+        ).order_by(WalletTransaction.id)
+        if start_date:
+            statement = statement.where(WalletTransaction.created_at >= start_date)
+        if end_date:
+            statement = statement.where(WalletTransaction.created_at <= end_date)
+        status_value = _parse_status(WalletTransactionStatus, status)
+        if status_value is not None:
+            statement = statement.where(WalletTransaction.status == status_value)
+        return ExportSpec("wallet_transactions", statement)
+
+    @staticmethod
+    def ppob_transactions_spec(
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status: Optional[str] = None
+    ) -> ExportSpec:
+        statement = select(
+            PPOBTransaction.id, PPOBTransaction.transaction_code, PPOBTransaction.user_id,
+            PPOBTransaction.product_code, PPOBTransaction.product_name, PPOBTransaction.customer_number,
+            PPOBTransaction.amount, PPOBTransaction.admin_fee, PPOBTransaction.total_amount,
+            PPOBTransaction.status, PPOBTransaction.provider_ref, PPOBTransaction.created_at
+        ).order_by(PPOBTransaction.id)
+        if start_date:
+            statement = statement.where(PPOBTransaction.created_at >= start_date)
+        if end_date:
+            statement = statement.where(PPOBTransaction.created_at <= end_date)
+        status_value = _parse_status(PPOBTransactionStatus, status)
+        if status_value is not None:
+            statement = statement.where(PPOBTransaction.status == status_value)
+        return ExportSpec("ppob_transactions", statement)
@@ -4,19 +4,21 @@ Dipecah dari margin_management_service.py untuk meningkatkan maintainability
 """
 
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
 from app.common.base_classes.base_service import BaseService
 from app.domains.admin.repositories.admin_repository import PPOBMarginRepository
+from .margin_rule_table import MarginRuleTable, margin_rule_table
 
 
 class MarginCalculationService(BaseService):
     """Service untuk kalkulasi margin"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, rule_table: Optional[MarginRuleTable] = None):
         self.db = db
         self.margin_repo = PPOBMarginRepository(db)
+        self.rule_table = rule_table or margin_rule_table
     
     def calculate_price_with_margin(
         self, 
@@ -24,27 +26,17 @@ class MarginCalculationService(BaseService):
         category: str, 
         product_code: Optional[str] = None
     ) -> Decimal:
-        """Hitung harga dengan margin - KISS principle: Simple calculation"""
-        # Try to get product-specific margin first
-        margin_config = None
-        if product_code:
-            margin_config = self.margin_repo.get_by_product_code(product_code)
-        
-        # If no product-specific margin, get category margin
-        if not margin_config:
-            margin_config = self.margin_repo.get_global_margin(category)
-        
-        # If no margin config found, return base price
-        if not margin_config:
-            return base_price
-        
-        # Calculate margin
-        if margin_config.margin_type == "percentage":
-            margin_amount = base_price * (margin_config.margin_value / 100)
-        else:  # fixed
-            margin_amount = margin_config.margin_value
-        
-        return base_price + margin_amount
+        """Hitung harga dengan margin dari tabel aturan margin in-process"""
+        self.rule_table.ensure_fresh(self.margin_repo)
+        return self.rule_table.price(base_price, category, product_code)
+    
+    def price_many(self, products: list) -> List[Decimal]:
+        """
+        Hitung harga jual seluruh katalog dalam satu pass.
+        Produk berupa dict atau objek dengan base_price, category dan product_code/code.
+        """
+        self.rule_table.ensure_fresh(self.margin_repo)
+        return self.rule_table.price_many(products)
     
     def calculate_margin_amount(
         self,
@@ -76,24 +68,29 @@ class MarginCalculationService(BaseService):
         category: str
     ) -> list:
         """Hitung harga dengan margin untuk multiple produk"""
-        results = []
+        items = [
+            {
+                'base_price': Decimal(str(product.get('base_price', 0))),
+                'category': category,
+                'product_code': product.get('product_code')
+            }
+            for product in products
+        ]
+        final_prices = self.calculate_batch_prices(items)
         
-        for product in products:
-            base_price = Decimal(str(product.get('base_price', 0)))
-            product_code = product.get('product_code')
-            
-            final_price = self.calculate_price_with_margin(
-                base_price, category, product_code
-            )
-            
-            results.append({
-                'product_code': product_code,
-                'base_price': base_price,
+        return [
+            {
+                'product_code': item['product_code'],
+                'base_price': item['base_price'],
                 'final_price': final_price,
-                'margin_amount': final_price - base_price
-            })
-        
-        return results
+                'margin_amount': final_price - item['base_price']
+            }
+            for item, final_price in zip(items, final_prices)
+        ]
+    
+    def calculate_batch_prices(self, items: list) -> List[Decimal]:
+        """Hitung harga jual untuk satu batch (alias price_many untuk bulk update harga)"""
+        return self.price_many(items)
     
     def get_margin_config_for_product(
         self,
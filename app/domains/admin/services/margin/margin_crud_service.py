@@ -11,6 +11,7 @@ from app.common.base_classes.base_service import BaseService
 from app.domains.ppob.models.ppob import PPOBMarginConfig
 from app.domains.admin.repositories.admin_repository import PPOBMarginRepository, AuditLogRepository
 from app.domains.admin.schemas.admin_schemas import MarginConfigCreate, MarginConfigUpdate
+from .margin_rule_table import margin_rule_table
 
 
 class MarginCrudService(BaseService):
@@ -29,6 +30,7 @@ class MarginCrudService(BaseService):
         """Buat konfigurasi margin baru"""
         margin_config = PPOBMarginConfig(**margin_data.dict())
         created_config = self.margin_repo.create(margin_config)
+        margin_rule_table.invalidate()
         
         # Log creation
         self.audit_repo.create_log(
@@ -87,6 +89,7 @@ class MarginCrudService(BaseService):
             setattr(config, field, value)
         
         updated_config = self.margin_repo.update(config)
+        margin_rule_table.invalidate()
         
         # Log update
         self.audit_repo.create_log(
@@ -119,6 +122,7 @@ class MarginCrudService(BaseService):
         
         # Delete config
         success = self.margin_repo.delete(config_id)
+        margin_rule_table.invalidate()
         
         if success:
             # Log deletion
@@ -139,6 +143,7 @@ class MarginCrudService(BaseService):
         old_active_status = config.is_active
         config.is_active = True
         updated_config = self.margin_repo.update(config)
+        margin_rule_table.invalidate()
         
         # Log activation
         self.audit_repo.create_log(
@@ -159,6 +164,7 @@ class MarginCrudService(BaseService):
         old_active_status = config.is_active
         config.is_active = False
         updated_config = self.margin_repo.update(config)
+        margin_rule_table.invalidate()
         
         # Log deactivation
         self.audit_repo.create_log(
@@ -0,0 +1,125 @@
+"""
+Margin Rule Table - Tabel aturan margin in-process
+Semua konfigurasi margin aktif dimuat sekali (satu query) menjadi dua map:
+override per product_code dan default per kategori. Kalkulasi harga cukup lookup dict,
+tanpa query per produk. Tabel di-invalidate oleh MarginCrudService setiap kali menulis
+dan dimuat ulang periodik agar perubahan dari worker lain ikut terbaca.
+"""
+
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.infrastructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MarginRule:
+    """Satu aturan margin yang sudah dinormalisasi ke Decimal"""
+
+    __slots__ = ("margin_type", "margin_value")
+
+    def __init__(self, margin_type: Any, margin_value: Any):
+        self.margin_type = getattr(margin_type, "value", margin_type)
+        self.margin_value = Decimal(str(margin_value or 0))
+
+    def margin_amount(self, base_price: Decimal) -> Decimal:
+        if self.margin_type == "percentage":
+            return base_price * (self.margin_value / 100)
+        return self.margin_value  # fixed
+
+    def apply(self, base_price: Decimal) -> Decimal:
+        return base_price + self.margin_amount(base_price)
+
+
+def _field(product: Any, *names: str) -> Any:
+    """Ambil field dari dict atau objek (ORM / schema)"""
+    for name in names:
+        value = product.get(name) if isinstance(product, dict) else getattr(product, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+class MarginRuleTable:
+    """
+    Tabel aturan margin - Single Responsibility: resolusi margin produk tanpa akses DB
+    Prioritas sama dengan kalkulasi lama: margin product_code lebih dulu, lalu margin kategori.
+    """
+
+    def __init__(self, refresh_interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._product_overrides: Dict[str, MarginRule] = {}
+        self._category_defaults: Dict[str, MarginRule] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or self._clock() - self._loaded_at >= self.refresh_interval
+
+    def ensure_fresh(self, repository):
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self.load(repository)
+
+    def load(self, repository):
+        """Bangun ulang kedua map dari semua konfigurasi margin aktif"""
+        product_overrides: Dict[str, MarginRule] = {}
+        category_defaults: Dict[str, MarginRule] = {}
+        # Urut id: bila ada duplikat, konfigurasi tertua menang (sama dengan .first())
+        for config in repository.get_all_active():
+            rule = MarginRule(config.margin_type, config.margin_value)
+            if config.product_code:
+                product_overrides.setdefault(config.product_code, rule)
+            else:
+                category_defaults.setdefault(config.category, rule)
+
+        self._product_overrides, self._category_defaults = product_overrides, category_defaults
+        self._loaded_at = self._clock()
+        logger.info(
+            f"Margin rule table loaded: {len(product_overrides)} product overrides, "
+            f"{len(category_defaults)} category defaults"
+        )
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def resolve(self, category: Optional[str], product_code: Optional[str] = None) -> Optional[MarginRule]:
+        if product_code:
+            rule = self._product_overrides.get(product_code)
+            if rule is not None:
+                return rule
+        return self._category_defaults.get(category)
+
+    def price(self, base_price: Decimal, category: Optional[str], product_code: Optional[str] = None) -> Decimal:
+        rule = self.resolve(category, product_code)
+        return rule.apply(base_price) if rule is not None else base_price
+
+    def price_many(self, products: Iterable[Any]) -> List[Decimal]:
+        """
+        Hitung harga jual untuk seluruh katalog dalam satu pass.
+        Produk boleh dict atau objek dengan base_price, category dan product_code (atau code).
+        """
+        overrides, defaults = self._product_overrides, self._category_defaults
+        prices = []
+        for product in products:
+            base_price = Decimal(str(_field(product, "base_price") or 0))
+            rule = overrides.get(_field(product, "product_code", "code")) or defaults.get(_field(product, "category"))
+            prices.append(rule.apply(base_price) if rule is not None else base_price)
+        return prices
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "product_overrides": len(self._product_overrides),
+            "category_defaults": len(self._category_defaults),
+            "age_seconds": None if self._loaded_at is None else round(self._clock() - self._loaded_at, 1)
+        }
+
+
+# Global instance
+margin_rule_table = MarginRuleTable(refresh_interval=settings.MARGIN_RULES_REFRESH_INTERVAL)
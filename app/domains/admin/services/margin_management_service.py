@@ -49,6 +49,10 @@ class MarginManagementService(BaseService):
             base_price, category, product_code
         )
     
+    def price_many(self, products: list) -> list:
+        """Hitung harga jual seluruh katalog dalam satu pass"""
+        return self.calculation_service.price_many(products)
+    
     def calculate_margin_amount(
         self,
         base_price: Decimal,
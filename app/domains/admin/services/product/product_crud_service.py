@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import json
 
 from app.common.base_classes.base_service import BaseService
@@ -30,6 +30,17 @@ class ProductCrudService(BaseService):
             skip, limit, search, category, is_active
         )
     
+    def get_products_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Ambil daftar produk dengan keyset pagination"""
+        return self.product_repo.get_products_page(cursor, limit, search, category, is_active)
+    
     def get_product_categories(self) -> List[str]:
         """Ambil semua kategori produk"""
         return self.product_repo.get_product_categories()
@@ -32,6 +32,17 @@ class ProductManagementService(BaseService):
         """Ambil daftar produk dengan filter"""
         return self.crud_service.get_products(skip, limit, search, category, is_active)
     
+    def get_products_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        search: Optional[str] = None,
+        category: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Ambil daftar produk dengan keyset pagination"""
+        return self.crud_service.get_products_page(cursor, limit, search, category, is_active)
+    
     def get_product_categories(self) -> List[str]:
         """Ambil semua kategori produk"""
         return self.crud_service.get_product_categories()
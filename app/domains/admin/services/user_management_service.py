@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 import json
 
 from app.common.base_classes.base_service import BaseService
@@ -26,6 +26,16 @@ class UserManagementService(BaseService):
         """Ambil daftar user dengan filter"""
         return self.user_repo.get_users_with_pagination(skip, limit, search, is_active)
     
+    def get_users_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Ambil daftar user dengan keyset pagination"""
+        return self.user_repo.get_users_page(cursor, limit, search, is_active)
+    
     def get_user_stats(self) -> Dict[str, int]:
         """Ambil statistik user"""
         return self.user_repo.get_user_stats()
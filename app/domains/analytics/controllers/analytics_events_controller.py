@@ -42,12 +42,12 @@ async def track_event(
         if not event_data.user_agent:
             event_data.user_agent = request.headers.get("user-agent")
         
-        event = await service.track_event(event_data)
+        accepted = await service.track_event(event_data)
         
         return create_response(
             success=True,
-            message="Event analytics berhasil ditrack",
-            data={"event_id": event.id, "event_type": event.event_type}
+            message="Event analytics diterima" if accepted else "Antrian analytics penuh, event dilewati",
+            data={"event_type": event_data.event_type, "queued": accepted}
         )
         
     except Exception as e:
@@ -4,6 +4,7 @@ from typing import Optional
 from decimal import Decimal
 
 from app.domains.analytics.services.analytics_service import AnalyticsService
+from app.domains.analytics.services.analytics_ingestion import analytics_ingestion_queue
 from app.domains.analytics.schemas.analytics_schemas import AnalyticsEventCreate
 from app.core.database import get_db
 from app.common.responses.api_response import create_response
@@ -40,12 +41,12 @@ async def track_event(
         if not event_data.user_agent:
             event_data.user_agent = request.headers.get("user-agent")
         
-        event = await service.track_event(event_data)
+        accepted = await service.track_event(event_data)
         
         return create_response(
             success=True,
-            message="Event analytics berhasil ditrack",
-            data={"event_id": event.id, "event_type": event.event_type}
+            message="Event analytics diterima" if accepted else "Antrian analytics penuh, event dilewati",
+            data={"event_type": event_data.event_type, "queued": accepted}
         )
         
     except Exception as e:
@@ -117,3 +118,12 @@ async def track_voucher_usage(
     except Exception as e:
         logger.error(f"Error tracking voucher usage: {e}")
         raise HTTPException(status_code=500, detail="Gagal melakukan tracking")
+
+@router.get("/ingestion/stats", response_model=dict, summary="Analytics Ingestion Queue Stats")
+async def get_ingestion_stats():
+    """Metrics antrian ingestion analytics (queue depth, flush latency, event dropped)"""
+    return create_response(
+        success=True,
+        message="Statistik ingestion analytics berhasil diambil",
+        data=analytics_ingestion_queue.get_stats()
+    )
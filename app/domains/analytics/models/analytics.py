@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Numeric, DateTime, Text, ForeignKey, Index
+from sqlalchemy import Column, String, Integer, Numeric, DateTime, Text, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from app.common.base_classes.base import BaseModel
 from datetime import datetime
@@ -125,3 +125,89 @@ class DashboardMetrics(BaseModel):
     __table_args__ = (
         Index('idx_dashboard_metrics_unique', 'metric_name', 'metric_type', 'date', unique=True),
     )
+
+class RollupGranularity(enum.Enum):
+    """Granularitas bucket rollup analytics"""
+    HOUR = "hour"
+    DAY = "day"
+
+class AnalyticsRollup(BaseModel):
+    """
+    Rollup agregat analytics per jam / per hari.
+    Diisi incremental dari analytics_events sehingga dashboard tidak perlu scan tabel event mentah.
+    """
+    __tablename__ = "analytics_rollups"
+    
+    granularity = Column(String(10), nullable=False)  # hour, day
+    bucket_start = Column(DateTime, nullable=False)
+    
+    # Revenue & transaksi (event transaction_success / product_purchase dengan amount)
+    revenue = Column(Numeric(20, 2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    
+    # Aktivitas user
+    new_registrations = Column(Integer, nullable=False, default=0)
+    total_logins = Column(Integer, nullable=False, default=0)
+    unique_users_sketch = Column(LargeBinary, nullable=True)  # register HyperLogLog
+    
+    __table_args__ = (
+        Index('idx_analytics_rollup_unique', 'granularity', 'bucket_start', unique=True),
+    )
+
+class AnalyticsProductRollup(BaseModel):
+    """
+    Rollup view / purchase / revenue per produk per jam / per hari.
+    """
+    __tablename__ = "analytics_product_rollups"
+    
+    granularity = Column(String(10), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    product_id = Column(Integer, nullable=False)
+    
+    view_count = Column(Integer, nullable=False, default=0)
+    purchase_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(20, 2), nullable=False, default=0)
+    
+    __table_args__ = (
+        Index('idx_analytics_product_rollup_unique', 'granularity', 'bucket_start', 'product_id', unique=True),
+    )
+
+class AnalyticsVoucherRollup(BaseModel):
+    """
+    Rollup penggunaan voucher per jam / per hari.
+    """
+    __tablename__ = "analytics_voucher_rollups"
+    
+    granularity = Column(String(10), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    voucher_id = Column(Integer, nullable=False)
+    
+    usage_count = Column(Integer, nullable=False, default=0)
+    total_discount = Column(Numeric(20, 2), nullable=False, default=0)
+    
+    __table_args__ = (
+        Index('idx_analytics_voucher_rollup_unique', 'granularity', 'bucket_start', 'voucher_id', unique=True),
+    )
+
+class AnalyticsRollupState(BaseModel):
+    """
+    High-water mark refresh rollup.
+    Semua event dengan id <= last_event_id sudah masuk ke tabel rollup.
+    """
+    __tablename__ = "analytics_rollup_state"
+    
+    name = Column(String(50), nullable=False, unique=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=True)
+
+class AnalyticsRollupGap(BaseModel):
+    """
+    Rentang id event (start_id..end_id) yang belum ada saat refresh melewatinya.
+    Transaksi yang commit terlambat bisa mengisi rentang ini setelah high-water mark maju,
+    jadi rentang di-scan ulang setiap refresh sampai terisi atau melewati jendela overlap.
+    """
+    __tablename__ = "analytics_rollup_gaps"
+    
+    start_id = Column(Integer, nullable=False)
+    end_id = Column(Integer, nullable=False)
+    detected_at = Column(DateTime, nullable=False)
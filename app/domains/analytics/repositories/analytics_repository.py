@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, asc
+from sqlalchemy import func, and_, or_, desc, asc, insert
 from datetime import datetime, timedelta
 from app.domains.analytics.models.analytics import (
     AnalyticsEvent, ProductAnalytics, VoucherAnalytics, DashboardMetrics
@@ -21,27 +21,35 @@ class AnalyticsRepository(BaseRepository[AnalyticsEvent]):
     def __init__(self, db: Session):
         super().__init__(AnalyticsEvent, db)
     
+    @staticmethod
+    def build_event_row(event_data: AnalyticsEventCreate,
+                        event_timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """Ubah schema event menjadi dict kolom siap insert"""
+        # Convert event_data dict to JSON string if exists
+        event_data_json = None
+        if event_data.event_data:
+            event_data_json = json.dumps(event_data.event_data)
+        
+        return {
+            'event_type': event_data.event_type,
+            'user_id': event_data.user_id,
+            'session_id': event_data.session_id,
+            'product_id': event_data.product_id,
+            'voucher_id': event_data.voucher_id,
+            'transaction_id': event_data.transaction_id,
+            'event_data': event_data_json,
+            'amount': event_data.amount,
+            'currency': 'IDR',
+            'ip_address': event_data.ip_address,
+            'user_agent': event_data.user_agent,
+            'referrer': event_data.referrer,
+            'event_timestamp': event_timestamp or datetime.utcnow()
+        }
+    
     def create_event(self, event_data: AnalyticsEventCreate) -> AnalyticsEvent:
         """Membuat event analytics baru"""
         try:
-            # Convert event_data dict to JSON string if exists
-            event_data_json = None
-            if event_data.event_data:
-                event_data_json = json.dumps(event_data.event_data)
-            
-            db_event = AnalyticsEvent(
-                event_type=event_data.event_type,
-                user_id=event_data.user_id,
-                session_id=event_data.session_id,
-                product_id=event_data.product_id,
-                voucher_id=event_data.voucher_id,
-                transaction_id=event_data.transaction_id,
-                event_data=event_data_json,
-                amount=event_data.amount,
-                ip_address=event_data.ip_address,
-                user_agent=event_data.user_agent,
-                referrer=event_data.referrer
-            )
+            db_event = AnalyticsEvent(**self.build_event_row(event_data))
             
             self.db.add(db_event)
             self.db.commit()
@@ -55,6 +63,19 @@ class AnalyticsRepository(BaseRepository[AnalyticsEvent]):
             self.db.rollback()
             raise
     
+    def bulk_create_events(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert banyak event sekaligus (multi-row INSERT ... VALUES) dalam satu commit"""
+        if not rows:
+            return 0
+        try:
+            self.db.execute(insert(AnalyticsEvent), rows)
+            self.db.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error bulk creating analytics events: {e}")
+            self.db.rollback()
+            raise
+    
     def get_events_by_filter(self, filter_params: AnalyticsFilter, 
                            limit: int = 100, offset: int = 0) -> List[AnalyticsEvent]:
         """Mendapatkan events berdasarkan filter"""
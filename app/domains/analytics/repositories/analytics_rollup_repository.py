@@ -0,0 +1,551 @@
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func, case, and_, or_, desc, false, literal, union_all
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.domains.analytics.models.analytics import (
+    AnalyticsEvent, AnalyticsRollup, AnalyticsProductRollup, AnalyticsVoucherRollup,
+    AnalyticsRollupState, AnalyticsRollupGap, RollupGranularity
+)
+from app.common.utils.hyperloglog import HyperLogLog
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_STATE_NAME = "analytics_events"
+REVENUE_EVENT_TYPES = ('transaction_success', 'product_purchase')
+PRODUCT_EVENT_TYPES = ('product_view', 'product_purchase')
+
+HOUR = RollupGranularity.HOUR.value
+DAY = RollupGranularity.DAY.value
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+def ceil_hour(value: datetime) -> datetime:
+    floored = floor_hour(value)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+def floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def ceil_day(value: datetime) -> datetime:
+    floored = floor_day(value)
+    return floored if floored == value else floored + timedelta(days=1)
+
+def period_start(value: datetime, group_by: str = "day") -> datetime:
+    """Awal periode (day / week / month) untuk sebuah timestamp"""
+    day = floor_day(value)
+    if group_by == "week":
+        return day - timedelta(days=day.weekday())
+    if group_by == "month":
+        return day.replace(day=1)
+    return day
+
+class AnalyticsRollupRepository:
+    """
+    Repository untuk tabel rollup analytics (per jam dan per hari).
+
+    Refresh berjalan incremental dari high-water mark (id event terakhir yang sudah di-rollup).
+    Id yang belum ada saat high-water mark melewatinya (transaksi yang commit terlambat)
+    dicatat sebagai gap dan di-scan ulang selama jendela overlap, jadi event tersebut tetap
+    masuk rollup dan selama belum masuk dibaca dari tabel mentah. Query baca menggabungkan rollup harian untuk hari penuh, rollup per jam untuk sisa jam,
+    dan scan event mentah hanya untuk jam parsial di tepi rentang serta event yang belum
+    di-rollup (id > high-water mark, praktis jam yang sedang berjalan). Hasilnya tetap
+    eksak tanpa bergantung pada kapan refresh terakhir dijalankan.
+    """
+
+    REFRESH_BATCH_SIZE = 5000
+    # Gap di belakang high-water mark di-scan ulang selama jendela ini lalu dianggap kosong
+    GAP_OVERLAP_WINDOW = timedelta(hours=1)
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # High-water mark
+    def get_state(self) -> Optional[AnalyticsRollupState]:
+        """Ambil state refresh rollup"""
+        return self.db.scalar(
+            select(AnalyticsRollupState).where(AnalyticsRollupState.name == ROLLUP_STATE_NAME)
+        )
+
+    def get_high_water_mark(self) -> int:
+        """Id event terakhir yang sudah masuk ke rollup"""
+        return self.db.scalar(
+            select(AnalyticsRollupState.last_event_id).where(AnalyticsRollupState.name == ROLLUP_STATE_NAME)
+        ) or 0
+
+    def _get_or_create_state(self) -> AnalyticsRollupState:
+        state = self.get_state()
+        if state is not None:
+            return state
+        try:
+            state = AnalyticsRollupState(name=ROLLUP_STATE_NAME, last_event_id=0)
+            self.db.add(state)
+            self.db.commit()
+            return state
+        except IntegrityError:
+            # Dibuat bersamaan oleh proses lain
+            self.db.rollback()
+            return self.get_state()
+
+    # Refresh
+    def refresh(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Rollup event baru sejak high-water mark.
+        Hanya prefix id yang seluruh event-nya berada di jam yang sudah tertutup yang diproses,
+        sehingga event di jam berjalan tetap dibaca dari tabel mentah sampai jamnya selesai.
+        """
+        now = now or datetime.utcnow()
+        boundary = floor_hour(now)
+        state = self._get_or_create_state()
+        old_mark = state.last_event_id
+
+        try:
+            first_open_id = self.db.scalar(
+                select(func.min(AnalyticsEvent.id)).where(
+                    AnalyticsEvent.id > old_mark,
+                    AnalyticsEvent.event_timestamp >= boundary
+                )
+            )
+            if first_open_id is not None:
+                new_mark = first_open_id - 1
+            else:
+                new_mark = self.db.scalar(
+                    select(func.max(AnalyticsEvent.id)).where(AnalyticsEvent.id > old_mark)
+                ) or old_mark
+
+            # Klaim rentang id lebih dulu: refresh paralel akan gagal di sini dan mundur
+            claimed = self.db.execute(
+                update(AnalyticsRollupState)
+                .where(
+                    AnalyticsRollupState.id == state.id,
+                    AnalyticsRollupState.last_event_id == old_mark
+                )
+                .values(last_event_id=new_mark, refreshed_at=now)
+            )
+            if claimed.rowcount != 1:
+                self.db.rollback()
+                logger.info("Analytics rollup refresh skipped, another refresh is running")
+                return {"processed_events": 0, "high_water_mark": self.get_high_water_mark(), "skipped": True}
+
+            processed = self._rescan_gaps(boundary, now)
+            if new_mark > old_mark:
+                count, missing = self._rollup_events(old_mark + 1, new_mark)
+                processed += count
+                for start_id, end_id in missing:
+                    self.db.add(AnalyticsRollupGap(start_id=start_id, end_id=end_id, detected_at=now))
+
+            self.db.commit()
+            if processed:
+                logger.info(f"Analytics rollup refreshed: {processed} events, high-water mark {new_mark}")
+            return {"processed_events": processed, "high_water_mark": new_mark, "skipped": False}
+
+        except IntegrityError:
+            self.db.rollback()
+            logger.info("Analytics rollup refresh skipped, bucket created concurrently")
+            return {"processed_events": 0, "high_water_mark": self.get_high_water_mark(), "skipped": True}
+        except Exception as e:
+            logger.error(f"Error refreshing analytics rollups: {e}")
+            self.db.rollback()
+            raise
+
+    def _rescan_gaps(self, boundary: datetime, now: datetime) -> int:
+        """Rollup event yang commit terlambat ke dalam gap; sisa gap yang masih kosong dipertahankan"""
+        self.db.execute(
+            delete(AnalyticsRollupGap).where(AnalyticsRollupGap.detected_at < now - self.GAP_OVERLAP_WINDOW)
+        )
+        processed = 0
+        for gap in self.db.scalars(select(AnalyticsRollupGap)).all():
+            count, missing = self._rollup_events(gap.start_id, gap.end_id, before=boundary)
+            if not count:
+                continue
+            processed += count
+            self.db.delete(gap)
+            for start_id, end_id in missing:
+                self.db.add(AnalyticsRollupGap(start_id=start_id, end_id=end_id, detected_at=gap.detected_at))
+        return processed
+
+    def get_gaps(self) -> List[Tuple[int, int]]:
+        """Rentang id yang belum di-rollup walau berada di bawah high-water mark"""
+        return [tuple(row) for row in self.db.execute(select(AnalyticsRollupGap.start_id, AnalyticsRollupGap.end_id))]
+
+    def _rollup_events(self, first_id: int, last_id: int,
+                       before: Optional[datetime] = None) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Agregasi event [first_id, last_id] lalu gabungkan ke baris rollup.
+        Return (jumlah event, rentang id yang tidak ditemukan). Event dengan timestamp >= before
+        dilewati dan ikut dihitung sebagai rentang yang tidak ditemukan.
+        """
+        totals: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
+        products: Dict[Tuple[str, datetime, int], List] = {}
+        vouchers: Dict[Tuple[str, datetime, int], List] = {}
+        processed = 0
+        missing: List[Tuple[int, int]] = []
+        expected_id = first_id
+
+        query = (
+            select(
+                AnalyticsEvent.id,
+                AnalyticsEvent.event_type,
+                AnalyticsEvent.event_timestamp,
+                AnalyticsEvent.user_id,
+                AnalyticsEvent.product_id,
+                AnalyticsEvent.voucher_id,
+                AnalyticsEvent.amount
+            )
+            .where(AnalyticsEvent.id >= first_id, AnalyticsEvent.id <= last_id)
+            .order_by(AnalyticsEvent.id)
+            .execution_options(yield_per=self.REFRESH_BATCH_SIZE)
+        )
+        if before is not None:
+            query = query.where(AnalyticsEvent.event_timestamp < before)
+
+        for row in self.db.execute(query):
+            if row.id > expected_id:
+                missing.append((expected_id, row.id - 1))
+            expected_id = row.id + 1
+            processed += 1
+            if row.event_timestamp is None:
+                continue
+
+            for granularity, bucket in ((HOUR, floor_hour(row.event_timestamp)), (DAY, floor_day(row.event_timestamp))):
+                total = totals.get((granularity, bucket))
+                if total is None:
+                    total = totals[(granularity, bucket)] = {
+                        'revenue': Decimal('0'), 'transaction_count': 0,
+                        'new_registrations': 0, 'total_logins': 0, 'users': set()
+                    }
+
+                if row.event_type in REVENUE_EVENT_TYPES and row.amount is not None:
+                    total['revenue'] += row.amount
+                    total['transaction_count'] += 1
+                elif row.event_type == 'user_registration':
+                    total['new_registrations'] += 1
+                elif row.event_type == 'user_login':
+                    total['total_logins'] += 1
+
+                if row.user_id is not None:
+                    total['users'].add(row.user_id)
+
+                if row.product_id is not None and row.event_type in PRODUCT_EVENT_TYPES:
+                    product = products.setdefault((granularity, bucket, row.product_id), [0, 0, Decimal('0')])
+                    if row.event_type == 'product_purchase':
+                        product[1] += 1
+                        product[2] += row.amount or 0
+                    else:
+                        product[0] += 1
+
+                if row.voucher_id is not None and row.event_type == 'voucher_used':
+                    voucher = vouchers.setdefault((granularity, bucket, row.voucher_id), [0, Decimal('0')])
+                    voucher[0] += 1
+                    voucher[1] += row.amount or 0
+
+        self._merge_totals(totals)
+        self._merge_products(products)
+        self._merge_vouchers(vouchers)
+        if expected_id <= last_id:
+            missing.append((expected_id, last_id))
+        return processed, missing
+
+    def _existing_rows(self, model, keys, dimension=None) -> Dict[tuple, Any]:
+        """Ambil baris rollup yang sudah ada untuk kumpulan key (granularity, bucket[, dimensi])"""
+        existing = {}
+        for granularity in (HOUR, DAY):
+            buckets = {key[1] for key in keys if key[0] == granularity}
+            if not buckets:
+                continue
+            query = select(model).where(model.granularity == granularity, model.bucket_start.in_(buckets))
+            if dimension is not None:
+                query = query.where(dimension.in_({key[2] for key in keys if key[0] == granularity}))
+            for row in self.db.scalars(query):
+                if dimension is None:
+                    existing[(row.granularity, row.bucket_start)] = row
+                else:
+                    existing[(row.granularity, row.bucket_start, getattr(row, dimension.key))] = row
+        return existing
+
+    def _merge_totals(self, totals: Dict[Tuple[str, datetime], Dict[str, Any]]) -> None:
+        existing = self._existing_rows(AnalyticsRollup, totals.keys())
+        for key, total in totals.items():
+            sketch = HyperLogLog()
+            sketch.update(total['users'])
+            row = existing.get(key)
+            if row is None:
+                self.db.add(AnalyticsRollup(
+                    granularity=key[0],
+                    bucket_start=key[1],
+                    revenue=total['revenue'],
+                    transaction_count=total['transaction_count'],
+                    new_registrations=total['new_registrations'],
+                    total_logins=total['total_logins'],
+                    unique_users_sketch=sketch.to_bytes()
+                ))
+                continue
+
+            sketch.merge_bytes(row.unique_users_sketch)
+            row.revenue = (row.revenue or 0) + total['revenue']
+            row.transaction_count = (row.transaction_count or 0) + total['transaction_count']
+            row.new_registrations = (row.new_registrations or 0) + total['new_registrations']
+            row.total_logins = (row.total_logins or 0) + total['total_logins']
+            row.unique_users_sketch = sketch.to_bytes()
+
+    def _merge_products(self, products: Dict[Tuple[str, datetime, int], List]) -> None:
+        existing = self._existing_rows(AnalyticsProductRollup, products.keys(), AnalyticsProductRollup.product_id)
+        for key, (views, purchases, revenue) in products.items():
+            row = existing.get(key)
+            if row is None:
+                self.db.add(AnalyticsProductRollup(
+                    granularity=key[0], bucket_start=key[1], product_id=key[2],
+                    view_count=views, purchase_count=purchases, revenue=revenue
+                ))
+                continue
+            row.view_count = (row.view_count or 0) + views
+            row.purchase_count = (row.purchase_count or 0) + purchases
+            row.revenue = (row.revenue or 0) + revenue
+
+    def _merge_vouchers(self, vouchers: Dict[Tuple[str, datetime, int], List]) -> None:
+        existing = self._existing_rows(AnalyticsVoucherRollup, vouchers.keys(), AnalyticsVoucherRollup.voucher_id)
+        for key, (usage, discount) in vouchers.items():
+            row = existing.get(key)
+            if row is None:
+                self.db.add(AnalyticsVoucherRollup(
+                    granularity=key[0], bucket_start=key[1], voucher_id=key[2],
+                    usage_count=usage, total_discount=discount
+                ))
+                continue
+            row.usage_count = (row.usage_count or 0) + usage
+            row.total_discount = (row.total_discount or 0) + discount
+
+    # Query plan
+    @staticmethod
+    def _plan(start_date: datetime, end_date: datetime):
+        """
+        Pecah rentang [start_date, end_date) menjadi bucket rollup.
+        Return (ranges, rolled_start, rolled_end): ranges berisi (granularity, awal, akhir);
+        bagian di luar [rolled_start, rolled_end) harus dibaca dari event mentah.
+        """
+        rolled_start = ceil_hour(start_date)
+        rolled_end = floor_hour(end_date)
+        if rolled_end <= rolled_start:
+            return [], rolled_start, rolled_start
+
+        first_day = ceil_day(rolled_start)
+        last_day = floor_day(rolled_end)
+        if first_day >= last_day:
+            return [(HOUR, rolled_start, rolled_end)], rolled_start, rolled_end
+
+        ranges = [(DAY, first_day, last_day)]
+        if rolled_start < first_day:
+            ranges.append((HOUR, rolled_start, first_day))
+        if last_day < rolled_end:
+            ranges.append((HOUR, last_day, rolled_end))
+        return ranges, rolled_start, rolled_end
+
+    @staticmethod
+    def _bucket_clause(model, ranges):
+        if not ranges:
+            return false()
+        return or_(*[
+            and_(model.granularity == granularity, model.bucket_start >= lower, model.bucket_start < upper)
+            for granularity, lower, upper in ranges
+        ])
+
+    @staticmethod
+    def _raw_clause(start_date: datetime, end_date: datetime, rolled_start: datetime,
+                    rolled_end: datetime, high_water_mark: int, gaps: List[Tuple[int, int]] = ()):
+        return and_(
+            AnalyticsEvent.event_timestamp >= start_date,
+            AnalyticsEvent.event_timestamp < end_date,
+            or_(
+                AnalyticsEvent.id > high_water_mark,
+                *[AnalyticsEvent.id.between(start_id, end_id) for start_id, end_id in gaps],
+                AnalyticsEvent.event_timestamp < rolled_start,
+                AnalyticsEvent.event_timestamp >= rolled_end
+            )
+        )
+
+    def _prepare(self, start_date: datetime, end_date: datetime):
+        ranges, rolled_start, rolled_end = self._plan(start_date, end_date)
+        raw_clause = self._raw_clause(
+            start_date, end_date, rolled_start, rolled_end, self.get_high_water_mark(), self.get_gaps()
+        )
+        return ranges, raw_clause
+
+    # Query baca
+    def get_period_totals(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Total revenue, transaksi, unique users (estimasi HLL), registrasi dan login dalam rentang"""
+        ranges, raw_clause = self._prepare(start_date, end_date)
+        sketch = HyperLogLog()
+        totals = {'total_revenue': Decimal('0'), 'transaction_count': 0, 'new_registrations': 0, 'total_logins': 0}
+
+        for row in self.db.execute(
+            select(
+                AnalyticsRollup.revenue, AnalyticsRollup.transaction_count,
+                AnalyticsRollup.new_registrations, AnalyticsRollup.total_logins,
+                AnalyticsRollup.unique_users_sketch
+            ).where(self._bucket_clause(AnalyticsRollup, ranges))
+        ):
+            totals['total_revenue'] += row.revenue or 0
+            totals['transaction_count'] += row.transaction_count or 0
+            totals['new_registrations'] += row.new_registrations or 0
+            totals['total_logins'] += row.total_logins or 0
+            sketch.merge_bytes(row.unique_users_sketch)
+
+        is_revenue = and_(AnalyticsEvent.event_type.in_(REVENUE_EVENT_TYPES), AnalyticsEvent.amount.isnot(None))
+        raw = self.db.execute(
+            select(
+                func.sum(case((is_revenue, AnalyticsEvent.amount), else_=0)).label('revenue'),
+                func.sum(case((is_revenue, 1), else_=0)).label('transaction_count'),
+                func.sum(case((AnalyticsEvent.event_type == 'user_registration', 1), else_=0)).label('new_registrations'),
+                func.sum(case((AnalyticsEvent.event_type == 'user_login', 1), else_=0)).label('total_logins')
+            ).where(raw_clause)
+        ).one()
+        totals['total_revenue'] += Decimal(str(raw.revenue or 0))
+        totals['transaction_count'] += raw.transaction_count or 0
+        totals['new_registrations'] += raw.new_registrations or 0
+        totals['total_logins'] += raw.total_logins or 0
+
+        sketch.update(self.db.scalars(
+            select(AnalyticsEvent.user_id).where(raw_clause, AnalyticsEvent.user_id.isnot(None)).distinct()
+        ))
+
+        totals['total_revenue'] = float(totals['total_revenue'])
+        totals['unique_users'] = sketch.count()
+        return totals
+
+    def get_period_series(self, start_date: datetime, end_date: datetime,
+                          group_by: str = "day") -> List[Dict[str, Any]]:
+        """Revenue, transaksi, registrasi dan login per periode (day / week / month)"""
+        ranges, raw_clause = self._prepare(start_date, end_date)
+        series: Dict[datetime, Dict[str, Any]] = {}
+
+        def bucket_for(timestamp: datetime) -> Dict[str, Any]:
+            key = period_start(timestamp, group_by)
+            item = series.get(key)
+            if item is None:
+                item = series[key] = {
+                    'period': key, 'total_revenue': Decimal('0'), 'transaction_count': 0,
+                    'new_registrations': 0, 'total_logins': 0
+                }
+            return item
+
+        for row in self.db.execute(
+            select(
+                AnalyticsRollup.bucket_start, AnalyticsRollup.revenue, AnalyticsRollup.transaction_count,
+                AnalyticsRollup.new_registrations, AnalyticsRollup.total_logins
+            ).where(self._bucket_clause(AnalyticsRollup, ranges))
+        ):
+            item = bucket_for(row.bucket_start)
+            item['total_revenue'] += row.revenue or 0
+            item['transaction_count'] += row.transaction_count or 0
+            item['new_registrations'] += row.new_registrations or 0
+            item['total_logins'] += row.total_logins or 0
+
+        for row in self.db.execute(
+            select(AnalyticsEvent.event_timestamp, AnalyticsEvent.event_type, AnalyticsEvent.amount).where(
+                raw_clause,
+                AnalyticsEvent.event_type.in_(REVENUE_EVENT_TYPES + ('user_registration', 'user_login'))
+            )
+        ):
+            item = bucket_for(row.event_timestamp)
+            if row.event_type in REVENUE_EVENT_TYPES:
+                if row.amount is not None:
+                    item['total_revenue'] += row.amount
+                    item['transaction_count'] += 1
+            elif row.event_type == 'user_registration':
+                item['new_registrations'] += 1
+            else:
+                item['total_logins'] += 1
+
+        result = [series[key] for key in sorted(series)]
+        for item in result:
+            item['total_revenue'] = float(item['total_revenue'])
+        return result
+
+    def get_top_products(self, start_date: datetime, end_date: datetime,
+                         limit: int = 10) -> List[Dict[str, Any]]:
+        """Produk terpopuler (view + purchase) dari rollup ditambah event mentah yang belum di-rollup"""
+        ranges, raw_clause = self._prepare(start_date, end_date)
+        is_purchase = AnalyticsEvent.event_type == 'product_purchase'
+
+        combined = union_all(
+            select(
+                AnalyticsProductRollup.product_id.label('product_id'),
+                AnalyticsProductRollup.view_count.label('views'),
+                AnalyticsProductRollup.purchase_count.label('purchases'),
+                AnalyticsProductRollup.revenue.label('revenue')
+            ).where(self._bucket_clause(AnalyticsProductRollup, ranges)),
+            select(
+                AnalyticsEvent.product_id.label('product_id'),
+                case((is_purchase, 0), else_=1).label('views'),
+                case((is_purchase, 1), else_=0).label('purchases'),
+                case((is_purchase, func.coalesce(AnalyticsEvent.amount, 0)), else_=literal(0)).label('revenue')
+            ).where(
+                raw_clause,
+                AnalyticsEvent.product_id.isnot(None),
+                AnalyticsEvent.event_type.in_(PRODUCT_EVENT_TYPES)
+            )
+        ).subquery()
+
+        view_count = (func.sum(combined.c.views) + func.sum(combined.c.purchases)).label('view_count')
+        result = self.db.execute(
+            select(
+                combined.c.product_id,
+                view_count,
+                func.sum(combined.c.purchases).label('purchase_count'),
+                func.sum(combined.c.revenue).label('total_revenue')
+            ).group_by(combined.c.product_id).order_by(desc(view_count)).limit(limit)
+        ).all()
+
+        return [
+            {
+                'product_id': row.product_id,
+                'view_count': row.view_count,
+                'purchase_count': row.purchase_count,
+                'total_revenue': float(row.total_revenue or 0),
+                'conversion_rate': (row.purchase_count / row.view_count * 100) if row.view_count > 0 else 0
+            }
+            for row in result
+        ]
+
+    def get_top_vouchers(self, start_date: datetime, end_date: datetime,
+                         limit: int = 10) -> List[Dict[str, Any]]:
+        """Voucher terpopuler dari rollup ditambah event mentah yang belum di-rollup"""
+        ranges, raw_clause = self._prepare(start_date, end_date)
+
+        combined = union_all(
+            select(
+                AnalyticsVoucherRollup.voucher_id.label('voucher_id'),
+                AnalyticsVoucherRollup.usage_count.label('usage_count'),
+                AnalyticsVoucherRollup.total_discount.label('total_discount')
+            ).where(self._bucket_clause(AnalyticsVoucherRollup, ranges)),
+            select(
+                AnalyticsEvent.voucher_id.label('voucher_id'),
+                literal(1).label('usage_count'),
+                func.coalesce(AnalyticsEvent.amount, 0).label('total_discount')
+            ).where(
+                raw_clause,
+                AnalyticsEvent.voucher_id.isnot(None),
+                AnalyticsEvent.event_type == 'voucher_used'
+            )
+        ).subquery()
+
+        usage_count = func.sum(combined.c.usage_count).label('usage_count')
+        result = self.db.execute(
+            select(
+                combined.c.voucher_id,
+                usage_count,
+                func.sum(combined.c.total_discount).label('total_discount')
+            ).group_by(combined.c.voucher_id).order_by(desc(usage_count)).limit(limit)
+        ).all()
+
+        return [
+            {
+                'voucher_id': row.voucher_id,
+                'usage_count': row.usage_count,
+                'total_discount': float(row.total_discount or 0)
+            }
+            for row in result
+        ]
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.domains.analytics.models.analytics import AnalyticsEvent
+from app.domains.analytics.repositories.analytics_repository import AnalyticsRepository
+from app.domains.analytics.schemas.analytics_schemas import AnalyticsEventCreate
+from app.infrastructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class AnalyticsIngestionQueue:
+    """
+    Antrian ingestion analytics in-process.
+    Event di-buffer di memori (dibatasi max_queue_size) lalu ditulis oleh satu worker
+    sebagai bulk INSERT per batch, di-flush saat batch penuh atau flush_interval berlalu.
+    Saat buffer penuh, enqueue menunggu paling lama enqueue_timeout (backpressure)
+    sebelum event dibuang dan dihitung sebagai dropped.
+    """
+
+    MAX_FLUSH_RETRIES = 3
+
+    def __init__(
+        self,
+        max_queue_size: int = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+        enqueue_timeout: float = None,
+        session_factory: Optional[Callable] = None
+    ):
+        self.max_queue_size = max_queue_size or settings.ANALYTICS_QUEUE_MAX_SIZE
+        self.batch_size = batch_size or settings.ANALYTICS_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.ANALYTICS_FLUSH_INTERVAL
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else settings.ANALYTICS_ENQUEUE_TIMEOUT
+        self._session_factory = session_factory
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._not_full: Optional[asyncio.Event] = None
+        self._closing = False
+
+        # Metrics
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_latency_ms = 0.0
+        self.max_flush_latency_ms = 0.0
+        self._total_flush_latency_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._buffer)
+
+    def _ensure_worker(self) -> None:
+        """Jalankan worker flush sekali per event loop"""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._worker.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._closing = False
+        self._worker = loop.create_task(self._run())
+
+    async def put(self, row: Dict[str, Any]) -> bool:
+        """Masukkan satu baris event ke buffer. Return False jika event dibuang karena buffer penuh."""
+        self._ensure_worker()
+
+        if len(self._buffer) >= self.max_queue_size:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.enqueue_timeout
+            self._wakeup.set()
+            while len(self._buffer) >= self.max_queue_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.dropped += 1
+                    return False
+                self._not_full.clear()
+                try:
+                    await asyncio.wait_for(self._not_full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+        self._buffer.append(row)
+        self.enqueued += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def enqueue(self, event_data: AnalyticsEventCreate) -> bool:
+        """Enqueue event analytics; timestamp diambil saat event diterima, bukan saat flush"""
+        return await self.put(AnalyticsRepository.build_event_row(event_data, datetime.utcnow()))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._buffer:
+                await self._flush_batch()
+
+            if self._closing:
+                return
+
+    async def _flush_batch(self) -> None:
+        count = min(self.batch_size, len(self._buffer))
+        rows = [self._buffer.popleft() for _ in range(count)]
+        self._not_full.set()
+
+        for attempt in range(1, self.MAX_FLUSH_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                await self._write(rows)
+            except Exception as e:
+                if attempt == self.MAX_FLUSH_RETRIES:
+                    self.failed += len(rows)
+                    logger.error(f"Dropping {len(rows)} analytics events after {attempt} failed flushes: {e}")
+                    return
+                logger.warning(f"Analytics flush failed (attempt {attempt}), retrying: {e}")
+                await asyncio.sleep(0.1 * attempt)
+                continue
+
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.flushed += len(rows)
+            self.batches += 1
+            self.last_flush_latency_ms = latency_ms
+            self.max_flush_latency_ms = max(self.max_flush_latency_ms, latency_ms)
+            self._total_flush_latency_ms += latency_ms
+            return
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """Tulis satu batch; pakai AsyncSession bila tersedia, jika tidak Session sync di thread"""
+        session_factory = self._session_factory
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        if session_factory is not None:
+            async with session_factory() as session:
+                await session.execute(insert(AnalyticsEvent), rows)
+                await session.commit()
+            return
+
+        await asyncio.to_thread(self._write_sync, rows)
+
+    @staticmethod
+    def _write_sync(rows: List[Dict[str, Any]]) -> None:
+        from app.core.database import SessionLocal
+        db = SessionLocal()
+        try:
+            AnalyticsRepository(db).bulk_create_events(rows)
+        finally:
+            db.close()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Drain seluruh buffer ke database lalu hentikan worker (dipanggil saat shutdown)"""
+        if self._worker is None or self._worker.done():
+            return
+        self._closing = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._worker), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Analytics queue drain timed out, {len(self._buffer)} events not written")
+            self._worker.cancel()
+        self._worker = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Metrics antrian ingestion"""
+        return {
+            "queue_depth": len(self._buffer),
+            "max_queue_size": self.max_queue_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 2),
+            "avg_flush_latency_ms": round(self._total_flush_latency_ms / self.batches, 2) if self.batches else 0.0,
+            "max_flush_latency_ms": round(self.max_flush_latency_ms, 2)
+        }
+
+analytics_ingestion_queue = AnalyticsIngestionQueue()
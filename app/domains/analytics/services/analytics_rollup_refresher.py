@@ -0,0 +1,102 @@
+"""
+Analytics Rollup Refresher
+Refresh rollup analytics (termasuk backfill pertama) dijalankan di thread terpisah dengan
+session sendiri sehingga tidak memblokir event loop. Jalur baca hanya menjadwalkan refresh;
+hasil query tetap eksak selama refresh berjalan karena event yang belum di-rollup dibaca mentah.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.domains.analytics.repositories.analytics_rollup_repository import AnalyticsRollupRepository, floor_hour
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsRollupRefresher:
+    """
+    Penjadwal refresh rollup - Single Responsibility: satu refresh di background per worker
+    Pengecekan state dibatasi check_interval agar request baca tidak membuat thread setiap kali.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        check_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.session_factory = session_factory
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._last_check: Optional[float] = None
+        self._last_result: Optional[Dict[str, Any]] = None
+
+    def schedule(self) -> None:
+        """Jadwalkan refresh di background bila belum ada yang berjalan; tidak menunggu hasilnya"""
+        if self._task is not None and not self._task.done():
+            return
+        now = self._clock()
+        if self._last_check is not None and now - self._last_check < self.check_interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_check = now
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.to_thread(self.refresh_if_stale)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Query rollup tetap eksak walau refresh gagal, cukup dicatat
+            logger.warning(f"Could not refresh analytics rollups: {e}")
+
+    def refresh_if_stale(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Refresh paling banyak sekali per jam (state disimpan di DB, berlaku lintas worker)"""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            now = now or datetime.utcnow()
+            db = self.session_factory()
+            try:
+                repository = AnalyticsRollupRepository(db)
+                state = repository.get_state()
+                if state is not None and state.refreshed_at is not None and state.refreshed_at >= floor_hour(now):
+                    return None
+                self._last_result = repository.refresh(now=now)
+                return self._last_result
+            finally:
+                db.close()
+        finally:
+            self._lock.release()
+
+    async def stop(self) -> None:
+        """Tunggu refresh yang sedang berjalan selesai (thread tidak bisa dibatalkan di tengah jalan)"""
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "last_result": self._last_result
+        }
+
+
+# Global instance
+analytics_rollup_refresher = AnalyticsRollupRefresher(SessionLocal)
@@ -2,6 +2,11 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.domains.analytics.repositories.analytics_repository import AnalyticsRepository
+from app.domains.analytics.repositories.analytics_rollup_repository import (
+    AnalyticsRollupRepository, floor_day
+)
+from app.domains.analytics.services.analytics_ingestion import analytics_ingestion_queue
+from app.domains.analytics.services.analytics_rollup_refresher import analytics_rollup_refresher
 from app.domains.analytics.schemas.analytics_schemas import (
     AnalyticsEventCreate, AnalyticsFilter, DashboardSummary, ChartData, ChartDataPoint
 )
@@ -21,11 +26,28 @@ class AnalyticsService(BaseService):
     def __init__(self, db: Session):
         self.db = db
         self.repository = AnalyticsRepository(db)
+        self.rollup_repository = AnalyticsRollupRepository(db)
+    
+    def refresh_rollups(self) -> Dict[str, Any]:
+        """Refresh incremental tabel rollup analytics dari high-water mark"""
+        return self.rollup_repository.refresh()
     
-    async def track_event(self, event_data: AnalyticsEventCreate) -> AnalyticsEvent:
-        """Track event analytics baru"""
+    def _ensure_rollups_fresh(self) -> None:
+        """
+        Jadwalkan refresh rollup (paling banyak sekali per jam) di background dari jalur baca.
+        Request tidak menunggu refresh; query rollup tetap eksak karena event yang belum
+        di-rollup dibaca mentah.
+        """
+        analytics_rollup_refresher.schedule()
+    
+    async def track_event(self, event_data: AnalyticsEventCreate) -> bool:
+        """
+        Track event analytics baru (fire-and-forget).
+        Event hanya dimasukkan ke antrian ingestion dan ditulis per batch di background;
+        return False jika event dibuang karena antrian penuh.
+        """
         try:
-            return self.repository.create_event(event_data)
+            return await analytics_ingestion_queue.enqueue(event_data)
         except Exception as e:
             logger.error(f"Error tracking analytics event: {e}")
             raise
@@ -45,24 +67,22 @@ class AnalyticsService(BaseService):
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=days)
             
-            # Get revenue data
-            revenue_data = self.repository.get_revenue_by_period(start_date, end_date)
-            total_revenue = sum(item['total_revenue'] for item in revenue_data)
-            total_transactions = sum(item['transaction_count'] for item in revenue_data)
+            self._ensure_rollups_fresh()
             
-            # Get user stats
-            user_stats = self.repository.get_user_activity_stats(start_date, end_date)
+            # Totals dari rollup (+ scan mentah hanya untuk jam parsial)
+            current_totals = self.rollup_repository.get_period_totals(start_date, end_date)
+            total_revenue = current_totals['total_revenue']
+            total_transactions = current_totals['transaction_count']
             
             # Get top products and vouchers
-            top_products = self.repository.get_top_products(start_date, end_date, limit=5)
-            top_vouchers = self.repository.get_top_vouchers(start_date, end_date, limit=5)
+            top_products = self.rollup_repository.get_top_products(start_date, end_date, limit=5)
+            top_vouchers = self.rollup_repository.get_top_vouchers(start_date, end_date, limit=5)
             
             # Calculate growth (compare with previous period)
             prev_start_date = start_date - timedelta(days=days)
-            prev_revenue_data = self.repository.get_revenue_by_period(prev_start_date, start_date)
-            prev_total_revenue = sum(item['total_revenue'] for item in prev_revenue_data)
-            prev_total_transactions = sum(item['transaction_count'] for item in prev_revenue_data)
-            prev_user_stats = self.repository.get_user_activity_stats(prev_start_date, start_date)
+            prev_totals = self.rollup_repository.get_period_totals(prev_start_date, start_date)
+            prev_total_revenue = prev_totals['total_revenue']
+            prev_total_transactions = prev_totals['transaction_count']
             
             # Calculate growth percentages
             revenue_growth = None
@@ -74,13 +94,13 @@ class AnalyticsService(BaseService):
                 transaction_growth = ((total_transactions - prev_total_transactions) / prev_total_transactions) * 100
             
             user_growth = None
-            if prev_user_stats['unique_users'] > 0:
-                user_growth = ((user_stats['unique_users'] - prev_user_stats['unique_users']) / prev_user_stats['unique_users']) * 100
+            if prev_totals['unique_users'] > 0:
+                user_growth = ((current_totals['unique_users'] - prev_totals['unique_users']) / prev_totals['unique_users']) * 100
             
             return DashboardSummary(
                 total_revenue=Decimal(str(total_revenue)),
                 total_transactions=total_transactions,
-                total_users=user_stats['unique_users'],
+                total_users=current_totals['unique_users'],
                 total_products=len(top_products),
                 revenue_growth=Decimal(str(revenue_growth)) if revenue_growth is not None else None,
                 transaction_growth=Decimal(str(transaction_growth)) if transaction_growth is not None else None,
@@ -99,7 +119,8 @@ class AnalyticsService(BaseService):
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=days)
             
-            revenue_data = self.repository.get_revenue_by_period(start_date, end_date, group_by)
+            self._ensure_rollups_fresh()
+            revenue_data = self.rollup_repository.get_period_series(start_date, end_date, group_by)
             
             # Prepare chart data
             labels = []
@@ -140,7 +161,8 @@ class AnalyticsService(BaseService):
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=days)
             
-            top_products = self.repository.get_top_products(start_date, end_date, limit=10)
+            self._ensure_rollups_fresh()
+            top_products = self.rollup_repository.get_top_products(start_date, end_date, limit=10)
             
             labels = [f"Product {p['product_id']}" for p in top_products]
             data_points = []
@@ -187,7 +209,8 @@ class AnalyticsService(BaseService):
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=days)
             
-            top_vouchers = self.repository.get_top_vouchers(start_date, end_date, limit=10)
+            self._ensure_rollups_fresh()
+            top_vouchers = self.rollup_repository.get_top_vouchers(start_date, end_date, limit=10)
             
             labels = [f"Voucher {v['voucher_id']}" for v in top_vouchers]
             data_points = []
@@ -233,27 +256,20 @@ class AnalyticsService(BaseService):
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=days)
             
-            # Get daily user activity
+            # Get daily user activity dari rollup harian
+            self._ensure_rollups_fresh()
+            series = self.rollup_repository.get_period_series(floor_day(start_date), end_date, "day")
+            logins_by_day = {item['period']: item['total_logins'] for item in series}
+            
             daily_activity = []
-            current_date = start_date
+            current_date = floor_day(start_date)
             
             while current_date <= end_date:
-                next_date = current_date + timedelta(days=1)
-                
-                filter_params = AnalyticsFilter(
-                    start_date=current_date,
-                    end_date=next_date,
-                    event_type="user_login"
-                )
-                
-                daily_logins = len(self.repository.get_events_by_filter(filter_params, limit=1000))
-                
                 daily_activity.append({
                     'date': current_date,
-                    'logins': daily_logins
+                    'logins': logins_by_day.get(current_date, 0)
                 })
-                
-                current_date = next_date
+                current_date += timedelta(days=1)
             
             labels = [item['date'].strftime('%Y-%m-%d') for item in daily_activity]
             data_points = []
@@ -1,16 +1,18 @@
-from typing import List
+import asyncio
+from typing import List, Optional
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.common.base_classes.base_controller import BaseController
 from app.common.responses.api_response import APIResponse
+from app.common.exceptions.custom_exceptions import PasswordServiceBusyError
 from app.domains.auth.services.auth_service import AuthService
 from app.domains.auth.repositories.user_repository import UserRepository
 from app.domains.auth.models.user import User
 from app.domains.auth.schemas.auth_schemas import (
     UserCreate, UserUpdate, UserResponse, UserLogin, 
-    Token, RefreshToken, PasswordChange, UserStats
+    Token, RefreshToken, LogoutRequest, PasswordChange, UserStats
 )
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, oauth2_scheme
 from app.infrastructure.security.token_handler import TokenHandler
 
 class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, UserResponse]):
@@ -39,6 +41,12 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
             methods=["POST"],
             response_model=APIResponse[dict]
         )
+        self.router.add_api_route(
+            "/logout",
+            self.logout,
+            methods=["POST"],
+            response_model=APIResponse[dict]
+        )
         self.router.add_api_route(
             "/me",
             self.get_current_user_profile,
@@ -64,7 +72,7 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
             repository = UserRepository(db)
             service = AuthService(repository)
             
-            user = service.create(item_data.dict())
+            user = await service.create(item_data.dict())
             user_data = {
                 "id": user.id,
                 "username": user.username,
@@ -81,7 +89,7 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
                 data=UserResponse(**user_data),
                 message="User berhasil didaftarkan"
             )
-        except HTTPException as e:
+        except (HTTPException, PasswordServiceBusyError) as e:
             raise e
         except Exception as e:
             raise HTTPException(
@@ -220,7 +228,7 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
             repository = UserRepository(db)
             service = AuthService(repository)
             
-            user = service.authenticate_user(login_data.username, login_data.password)
+            user = await service.authenticate_user(login_data.username, login_data.password)
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -240,7 +248,7 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
                 data=Token(**token_data),
                 message="Login berhasil"
             )
-        except HTTPException as e:
+        except (HTTPException, PasswordServiceBusyError) as e:
             raise e
         except Exception as e:
             raise HTTPException(
@@ -264,6 +272,22 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
                 detail=str(e)
             )
     
+    async def logout(
+        self,
+        logout_data: Optional[LogoutRequest] = None,
+        token: str = Depends(oauth2_scheme)
+    ) -> APIResponse[dict]:
+        """
+        Logout user: access token dan refresh token yang dikirim dicabut sehingga langsung
+        ditolak di semua request berikutnya dan sesi tidak bisa diperpanjang lewat refresh
+        """
+        refresh_token = logout_data.refresh_token if logout_data else None
+        refresh_revoked = await asyncio.to_thread(self.token_handler.revoke_session, token, refresh_token)
+        return APIResponse.success_response(
+            data={"logged_out": True, "refresh_token_revoked": refresh_revoked},
+            message="Logout berhasil"
+        )
+    
     async def get_current_user_profile(self, current_user: User = Depends(get_current_user)) -> APIResponse[UserResponse]:
         """Ambil profil user yang sedang login"""
         user_data = {
@@ -294,7 +318,7 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
             repository = UserRepository(db)
             service = AuthService(repository)
             
-            success = service.change_password(current_user.id, password_data)
+            success = await service.change_password(current_user.id, password_data)
             if success:
                 return APIResponse.success_response(
                     data={"changed": True},
@@ -305,7 +329,7 @@ class AuthController(BaseController[User, AuthService, UserCreate, UserUpdate, U
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Gagal mengubah password"
                 )
-        except HTTPException as e:
+        except (HTTPException, PasswordServiceBusyError) as e:
             raise e
         except Exception as e:
             raise HTTPException(
@@ -107,6 +107,10 @@ class RefreshToken(BaseModel):
     """Schema untuk refresh token request"""
     refresh_token: str
 
+class LogoutRequest(BaseModel):
+    """Schema untuk logout; refresh token (bila dikirim) ikut dicabut"""
+    refresh_token: Optional[str] = None
+
 class UserStats(BaseModel):
     """Schema untuk statistik user"""
     total_users: int
@@ -5,6 +5,7 @@ from app.domains.auth.repositories.user_repository import UserRepository
 from app.domains.auth.models.user import User
 from app.domains.auth.schemas.auth_schemas import UserCreate, UserUpdate, PasswordChange
 from app.infrastructure.security.password_handler import PasswordHandler
+from app.infrastructure.security.password_service import password_service
 from app.infrastructure.security.token_handler import TokenHandler
 
 class AuthService:
@@ -16,9 +17,10 @@ class AuthService:
     def __init__(self, repository: UserRepository):
         self.repository = repository
         self.password_handler = PasswordHandler()
+        self.password_service = password_service
         self.token_handler = TokenHandler()
     
-    def create(self, data: dict) -> User:
+    async def create(self, data: dict) -> User:
         """Buat user baru dengan validasi business rules"""
         # Validasi business rules
         if not self._validate_business_rules(data):
@@ -30,10 +32,6 @@ class AuthService:
         # Hook before create
         data = self._before_create(data)
         
-        # Hash password
-        if 'password' in data:
-            data['hashed_password'] = self.password_handler.hash_password(data.pop('password'))
-        
         # Cek duplikasi username dan email
         if self.repository.get_by_username(data['username']):
             raise HTTPException(
@@ -47,6 +45,10 @@ class AuthService:
                 detail="Email sudah digunakan"
             )
         
+        # Hash password di pool bcrypt setelah data lolos validasi
+        if 'password' in data:
+            data['hashed_password'] = await self.password_service.hash_password(data.pop('password'))
+        
         # Create user
         user = self.repository.create(data)
         
@@ -94,13 +96,14 @@ class AuthService:
         return self.repository.delete(user_id)
     
     # Authentication specific methods
-    def authenticate_user(self, username: str, password: str) -> Optional[User]:
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Autentikasi user dengan username dan password"""
         user = self.repository.get_by_username(username)
         if not user:
             return None
         
-        if not self.password_handler.verify_password(password, user.hashed_password):
+        valid, new_hashed_password = await self.password_service.verify_and_update(password, user.hashed_password)
+        if not valid:
             return None
         
         if not user.is_active:
@@ -109,21 +112,25 @@ class AuthService:
                 detail="User tidak aktif"
             )
         
+        # Hash lama dengan cost bcrypt berbeda diganti hash baru
+        if new_hashed_password:
+            user = self.repository.update(user.id, {'hashed_password': new_hashed_password})
+        
         return user
     
-    def change_password(self, user_id: int, password_data: PasswordChange) -> bool:
+    async def change_password(self, user_id: int, password_data: PasswordChange) -> bool:
         """Ubah password user"""
         user = self.get_by_id(user_id)
         
         # Verifikasi password lama
-        if not self.password_handler.verify_password(password_data.current_password, user.hashed_password):
+        if not await self.password_service.verify_password(password_data.current_password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Password lama tidak benar"
             )
         
         # Hash password baru
-        new_hashed_password = self.password_handler.hash_password(password_data.new_password)
+        new_hashed_password = await self.password_service.hash_password(password_data.new_password)
         
         # Update password
         return bool(self.repository.update(user_id, {'hashed_password': new_hashed_password}))
@@ -0,0 +1,89 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, func, case
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+
+from app.domains.discord.models.command_log import DiscordCommandLog
+from app.common.utils.pagination import KeysetPaginator
+
+command_log_paginator = KeysetPaginator(
+    DiscordCommandLog.timestamp, DiscordCommandLog.id, default_page_size=100, max_page_size=1000
+)
+
+class AsyncCommandLogRepository:
+    """Versi async dari CommandLogRepository untuk handler Discord dan endpoint monitoring"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_log(self, log_data: Dict[str, Any]) -> DiscordCommandLog:
+        """Buat log command baru"""
+        log = DiscordCommandLog(**log_data)
+        self.db.add(log)
+        await self.db.commit()
+        await self.db.refresh(log)
+        return log
+
+    async def get_recent_logs(self, limit: int = 100) -> List[DiscordCommandLog]:
+        """Ambil log terbaru"""
+        result = await self.db.execute(
+            select(DiscordCommandLog)
+            .order_by(desc(DiscordCommandLog.timestamp))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_logs_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Ambil satu halaman log (terbaru dulu) dengan keyset cursor"""
+        statement = select(DiscordCommandLog)
+        if user_id:
+            statement = statement.where(DiscordCommandLog.user_id == user_id)
+        return await command_log_paginator.apaginate(self.db, statement, cursor, limit)
+
+    async def get_logs_by_user(self, user_id: str, limit: int = 50) -> List[DiscordCommandLog]:
+        """Ambil log berdasarkan user"""
+        result = await self.db.execute(
+            select(DiscordCommandLog)
+            .where(DiscordCommandLog.user_id == user_id)
+            .order_by(desc(DiscordCommandLog.timestamp))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_failed_logs(self, hours: int = 24) -> List[DiscordCommandLog]:
+        """Ambil log yang gagal dalam X jam terakhir"""
+        since = datetime.utcnow() - timedelta(hours=hours)
+        result = await self.db.execute(
+            select(DiscordCommandLog)
+            .where(
+                DiscordCommandLog.is_successful.is_(False),
+                DiscordCommandLog.timestamp >= since
+            )
+            .order_by(desc(DiscordCommandLog.timestamp))
+        )
+        return list(result.scalars().all())
+
+    async def get_command_stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Statistik command dalam X jam terakhir (dihitung di database, bukan di Python)"""
+        since = datetime.utcnow() - timedelta(hours=hours)
+        row = (await self.db.execute(
+            select(
+                func.count(DiscordCommandLog.id).label("total"),
+                func.sum(case((DiscordCommandLog.is_successful.is_(True), 1), else_=0)).label("success"),
+                func.avg(DiscordCommandLog.execution_time_ms).label("avg_time")
+            ).where(DiscordCommandLog.timestamp >= since)
+        )).one()
+
+        total = row.total or 0
+        success = row.success or 0
+        return {
+            "total": total,
+            "success": success,
+            "failed": total - success,
+            "avg_response_time_ms": round(float(row.avg_time or 0), 2)
+        }
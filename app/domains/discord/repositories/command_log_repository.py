@@ -1,10 +1,30 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, select, func, literal_column, text, Integer, Float
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import re
+import weakref
 
 from app.domains.discord.models.command_log import DiscordCommandLog
 
+# Kolom teks yang masuk ke index full-text
+SEARCH_FIELDS = ("command", "command_args", "response_message", "error_message")
+SEARCH_FTS_TABLE = "discord_command_logs_fts"
+SEARCH_GIN_INDEX = "idx_discord_command_logs_search"
+
+# Engine yang index full-text-nya sudah dipastikan ada
+_search_index_ready = weakref.WeakSet()
+
+def extract_search_terms(text_value: Optional[str]) -> List[str]:
+    """Pecah teks menjadi term lowercase untuk indexing / query (kata pendek dilewati)"""
+    if not text_value:
+        return []
+    return [word for word in re.findall(r'\w+', text_value.lower()) if len(word) > 2]
+
+def search_document_sql() -> str:
+    """Ekspresi SQL dokumen pencarian (gabungan kolom teks)"""
+    return " || ' ' || ".join(f"coalesce({field}, '')" for field in SEARCH_FIELDS)
+
 class CommandLogRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -52,3 +72,128 @@ class CommandLogRepository:
             else:
                 stats["failed"] += 1
         return stats
+    
+    def get_logs_after(self, last_id: int, limit: int = 1000) -> List[DiscordCommandLog]:
+        """Ambil log dengan id > last_id (urut id) untuk indexing incremental"""
+        return self.db.query(DiscordCommandLog)\
+            .filter(DiscordCommandLog.id > last_id)\
+            .order_by(DiscordCommandLog.id)\
+            .limit(limit).all()
+    
+    def get_max_log_id(self) -> int:
+        """Id log terbesar"""
+        return self.db.scalar(select(func.max(DiscordCommandLog.id))) or 0
+    
+    def get_logs_by_ids(self, log_ids: List[int]) -> List[DiscordCommandLog]:
+        """Ambil log berdasarkan daftar id dengan urutan yang sama"""
+        if not log_ids:
+            return []
+        logs = self.db.query(DiscordCommandLog).filter(DiscordCommandLog.id.in_(log_ids)).all()
+        by_id = {log.id: log for log in logs}
+        return [by_id[log_id] for log_id in log_ids if log_id in by_id]
+    
+    # Full-text search (PostgreSQL tsvector + GIN, SQLite FTS5)
+    def _dialect_name(self) -> str:
+        return self.db.get_bind().dialect.name
+    
+    def ensure_search_index(self) -> None:
+        """Buat index full-text bila belum ada (sekali per proses per database)"""
+        engine = self.db.get_bind().engine
+        if engine in _search_index_ready:
+            return
+        
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            self.db.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {SEARCH_GIN_INDEX} ON discord_command_logs "
+                f"USING GIN (to_tsvector('simple', {search_document_sql()}))"
+            ))
+            self.db.commit()
+        elif dialect == "sqlite":
+            self.db.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_FTS_TABLE} USING fts5(document)"
+            ))
+            self.db.commit()
+        _search_index_ready.add(engine)
+    
+    def sync_search_index(self) -> int:
+        """
+        Index incremental log baru ke tabel FTS5 (SQLite).
+        PostgreSQL memakai expression index sehingga selalu up to date.
+        """
+        if self._dialect_name() != "sqlite":
+            return 0
+        self.ensure_search_index()
+        result = self.db.execute(text(
+            f"INSERT INTO {SEARCH_FTS_TABLE} (rowid, document) "
+            f"SELECT id, {search_document_sql()} FROM discord_command_logs "
+            f"WHERE id > (SELECT coalesce(max(rowid), 0) FROM {SEARCH_FTS_TABLE})"
+        ))
+        self.db.commit()
+        return result.rowcount or 0
+    
+    def _filtered_query(
+        self,
+        user_id: Optional[str] = None,
+        guild_id: Optional[str] = None,
+        command: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        query = select(DiscordCommandLog)
+        if user_id:
+            query = query.where(DiscordCommandLog.user_id == str(user_id))
+        if guild_id:
+            query = query.where(DiscordCommandLog.guild_id == str(guild_id))
+        if command:
+            query = query.where(func.lower(DiscordCommandLog.command) == command.lower())
+        if start_date:
+            query = query.where(DiscordCommandLog.timestamp >= start_date)
+        if end_date:
+            query = query.where(DiscordCommandLog.timestamp <= end_date)
+        return query
+    
+    def search_logs(
+        self,
+        search_term: Optional[str] = None,
+        user_id: Optional[str] = None,
+        guild_id: Optional[str] = None,
+        command: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 50
+    ) -> List[DiscordCommandLog]:
+        """
+        Cari log dengan ranking relevansi untuk query multi-term (OR antar term,
+        log yang cocok dengan lebih banyak / lebih jarang term di atas).
+        """
+        query = self._filtered_query(user_id, guild_id, command, start_date, end_date)
+        terms = extract_search_terms(search_term)
+        if not terms:
+            return list(self.db.scalars(query.order_by(desc(DiscordCommandLog.timestamp)).limit(limit)))
+        
+        dialect = self._dialect_name()
+        if dialect == "postgresql":
+            self.ensure_search_index()
+            vector = func.to_tsvector(literal_column("'simple'"), literal_column(search_document_sql()))
+            ts_query = func.to_tsquery(literal_column("'simple'"), " | ".join(terms))
+            rank = func.ts_rank(vector, ts_query)
+            query = query.where(vector.op("@@")(ts_query)).order_by(desc(rank), desc(DiscordCommandLog.timestamp))
+        elif dialect == "sqlite":
+            self.sync_search_index()
+            fts_match = " OR ".join(f'"{term}"' for term in terms)
+            ranked = text(
+                f"SELECT rowid AS log_id, bm25({SEARCH_FTS_TABLE}) AS score "
+                f"FROM {SEARCH_FTS_TABLE} WHERE {SEARCH_FTS_TABLE} MATCH :match"
+            ).columns(log_id=Integer, score=Float)\
+                .bindparams(match=fts_match).subquery()
+            # bm25 FTS5: makin kecil makin relevan
+            query = query.join(ranked, ranked.c.log_id == DiscordCommandLog.id)\
+                .order_by(ranked.c.score, desc(DiscordCommandLog.timestamp))
+        else:
+            query = query.where(or_(*[
+                getattr(DiscordCommandLog, field).ilike(f"%{term}%")
+                for field in SEARCH_FIELDS for term in terms
+            ])).order_by(desc(DiscordCommandLog.timestamp))
+        
+        return list(self.db.scalars(query.limit(limit)))
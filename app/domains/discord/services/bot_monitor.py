@@ -1,10 +1,12 @@
-import psutil
 import time
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from app.domains.discord.repositories.command_log_repository import CommandLogRepository
-from app.core.database import get_db
+from app.domains.discord.repositories.async_command_log_repository import AsyncCommandLogRepository
+from app.core.database import AsyncSessionLocal
+from app.common.utils.lazy_imports import lazy_import
+
+psutil = lazy_import("psutil")
 
 class BotMonitor:
     def __init__(self):
@@ -38,25 +40,10 @@ class BotMonitor:
         }
     
     async def get_command_metrics(self, hours: int = 24) -> Dict[str, Any]:
-        """Ambil metrics command dari database"""
-        db = next(get_db())
-        try:
-            repo = CommandLogRepository(db)
-            stats = repo.get_command_stats(hours)
-            
-            # Hitung average response time
-            since = datetime.utcnow() - timedelta(hours=hours)
-            recent_logs = repo.get_recent_logs(1000)
-            
-            if recent_logs:
-                avg_time = sum(log.execution_time_ms for log in recent_logs) / len(recent_logs)
-                stats["avg_response_time_ms"] = round(avg_time, 2)
-            else:
-                stats["avg_response_time_ms"] = 0.0
-            
-            return stats
-        finally:
-            db.close()
+        """Ambil metrics command dari database (total, sukses, gagal, rata-rata waktu respon)"""
+        async with AsyncSessionLocal() as db:
+            repo = AsyncCommandLogRepository(db)
+            return await repo.get_command_stats(hours)
     
     async def health_check(self) -> Dict[str, Any]:
         """Comprehensive health check"""
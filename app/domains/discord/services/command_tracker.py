@@ -3,8 +3,8 @@ import asyncio
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-from app.domains.discord.repositories.command_log_repository import CommandLogRepository
-from app.core.database import get_db
+from app.domains.discord.repositories.async_command_log_repository import AsyncCommandLogRepository
+from app.core.database import AsyncSessionLocal
 
 class CommandTracker:
     def __init__(self):
@@ -47,13 +47,10 @@ class CommandTracker:
             "timestamp": datetime.utcnow()
         }
         
-        # Simpan ke database
-        db = next(get_db())
-        try:
-            repo = CommandLogRepository(db)
-            repo.create_log(log_data)
-        finally:
-            db.close()
+        # Simpan ke database tanpa memblokir event loop bot
+        async with AsyncSessionLocal() as db:
+            repo = AsyncCommandLogRepository(db)
+            await repo.create_log(log_data)
     
     def get_active_commands_count(self) -> int:
         """Jumlah command yang sedang berjalan"""
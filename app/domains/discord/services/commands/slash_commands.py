@@ -10,14 +10,20 @@ import logging
 from typing import Optional
 from decimal import Decimal
 
+from sqlalchemy import and_, update
+
+from app.common.exceptions.custom_exceptions import InsufficientStockError
 from app.infrastructure.database.database_manager import get_db
-from app.models.discord import (
-    DiscordUser, DiscordWallet, LiveStock, 
-    AdminWorldConfig, CurrencyType
+from app.domains.discord.models.discord import (
+    DiscordUser, DiscordWallet, LiveStock, AdminWorldConfig
 )
+from app.domains.inventory.services.stock_reservation_engine import stock_reservation_engine
 
 logger = logging.getLogger(__name__)
 
+# Nilai tukar ke WL (harga live stock disimpan dalam WL)
+CURRENCY_TO_WL = {"WL": 1, "DL": 100, "BGL": 10000}
+
 
 class DiscordSlashCommands:
     """Service untuk mengelola Discord Slash Commands"""
@@ -65,7 +71,8 @@ class DiscordSlashCommands:
     ):
         """Handle buy command"""
         try:
-            await interaction.response.defer(ephemeral=True)
+            if not interaction.response.is_done():
+                await interaction.response.defer(ephemeral=True)
             
             db = next(get_db())
             
@@ -92,50 +99,63 @@ class DiscordSlashCommands:
             # Find product in live stock
             product = db.query(LiveStock).filter(
                 LiveStock.product_code == product_code.upper(),
-                LiveStock.is_active == True,
-                LiveStock.stock >= quantity
+                LiveStock.is_active == True
             ).first()
             
-            if not product:
+            if not product or quantity <= 0:
                 await interaction.followup.send(
                     f"❌ Produk {product_code} tidak tersedia atau stok tidak mencukupi",
                     ephemeral=True
                 )
                 return
             
-            # Calculate total price
-            total_price = product.price * quantity
-            
-            # Get user wallet
-            wallet = db.query(DiscordWallet).filter(
-                DiscordWallet.discord_user_id == discord_user.id
-            ).first()
-            
-            if not wallet:
+            # Calculate total price (price_wl dikonversi ke mata uang pembayaran)
+            currency = currency.upper()
+            total_price = Decimal(product.price_wl) * quantity / CURRENCY_TO_WL[currency]
+            balance_column = getattr(DiscordWallet, f"{currency.lower()}_balance")
+            
+            # Reservasi stok + potong saldo dalam satu transaksi. Keduanya UPDATE bersyarat
+            # sehingga pembelian bersamaan tidak bisa oversell stok atau membuat saldo minus;
+            # interaction.id sebagai idempotency key mencegah double charge saat retry
+            try:
+                reservation = stock_reservation_engine.reserve(
+                    db, "livestock", product.id, quantity,
+                    reserved_for=f"discord:{interaction.user.id}",
+                    idempotency_key=f"discord-buy:{interaction.id}",
+                    commit=False
+                )
+            except InsufficientStockError:
                 await interaction.followup.send(
-                    "❌ Wallet tidak ditemukan",
+                    f"❌ Produk {product_code} tidak tersedia atau stok tidak mencukupi",
                     ephemeral=True
                 )
                 return
             
-            # Check balance based on currency
-            currency_balance = getattr(wallet, f"{currency.lower()}_balance")
-            if currency_balance < total_price:
+            if not reservation.is_active:
                 await interaction.followup.send(
-                    f"❌ Saldo {currency.upper()} tidak mencukupi. "
-                    f"Dibutuhkan: {total_price:,.2f}, Tersedia: {currency_balance:,.2f}",
+                    "ℹ️ Pembelian ini sudah diproses sebelumnya",
                     ephemeral=True
                 )
                 return
             
-            # Process purchase
-            # Deduct balance
-            setattr(wallet, f"{currency.lower()}_balance", currency_balance - total_price)
+            charged = db.execute(
+                update(DiscordWallet)
+                .where(and_(DiscordWallet.user_id == discord_user.id, balance_column >= total_price))
+                .values({balance_column.name: balance_column - total_price})
+            ).rowcount == 1
             
-            # Reduce stock
-            product.stock -= quantity
+            if not charged:
+                db.rollback()
+                await interaction.followup.send(
+                    f"❌ Saldo {currency} tidak mencukupi atau wallet tidak ditemukan. "
+                    f"Dibutuhkan: {total_price:,.2f}",
+                    ephemeral=True
+                )
+                return
             
+            stock_reservation_engine.confirm(db, reservation.id, commit=False)
             db.commit()
+            db.refresh(product)
             
             # Send success message
             embed = discord.Embed(
@@ -144,8 +164,8 @@ class DiscordSlashCommands:
             )
             embed.add_field(name="Produk", value=product.product_name, inline=True)
             embed.add_field(name="Jumlah", value=f"{quantity:,}", inline=True)
-            embed.add_field(name="Total", value=f"{total_price:,.2f} {currency.upper()}", inline=True)
-            embed.add_field(name="Sisa Stok", value=f"{product.stock:,}", inline=True)
+            embed.add_field(name="Total", value=f"{total_price:,.2f} {currency}", inline=True)
+            embed.add_field(name="Sisa Stok", value=f"{product.stock_quantity:,}", inline=True)
             
             await interaction.followup.send(embed=embed, ephemeral=True)
             
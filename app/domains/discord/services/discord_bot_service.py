@@ -4,14 +4,19 @@ Service utama untuk mengelola Discord bot yang terintegrasi dengan backend
 """
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from datetime import datetime, timezone
-import discord
-from discord.ext import commands
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.callbacks.discord.discord_callbacks import DiscordBotEventHandler, DiscordSlashCommandHandler
+from app.common.utils.lazy_imports import lazy_import
+
+# discord.py baru diimport saat bot diinisialisasi, bukan saat worker start
+discord = lazy_import("discord")
+commands = lazy_import("discord.ext.commands")
+
+if TYPE_CHECKING:
+    from app.callbacks.discord.discord_callbacks import DiscordBotEventHandler, DiscordSlashCommandHandler
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +25,12 @@ class DiscordBotService:
     """Service untuk mengelola Discord bot"""
     
     def __init__(self):
-        self.bot: Optional[commands.Bot] = None
+        self.bot: Optional["commands.Bot"] = None
         self.is_running = False
         self.is_ready = False
         self.token: Optional[str] = None
-        self.event_handler: Optional[DiscordBotEventHandler] = None
-        self.slash_handler: Optional[DiscordSlashCommandHandler] = None
+        self.event_handler: Optional["DiscordBotEventHandler"] = None
+        self.slash_handler: Optional["DiscordSlashCommandHandler"] = None
         self.last_connect = None
         
     async def initialize(self, token: str, command_prefix: str = "!") -> bool:
@@ -47,6 +52,7 @@ class DiscordBotService:
             )
             
             # Setup event handlers
+            from app.callbacks.discord.discord_callbacks import DiscordBotEventHandler, DiscordSlashCommandHandler
             self.event_handler = DiscordBotEventHandler(self.bot)
             self.slash_handler = DiscordSlashCommandHandler(self.bot)
             
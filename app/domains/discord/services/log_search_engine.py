@@ -1,122 +1,285 @@
-from typing import List, Dict, Any, Optional, Set
-from datetime import datetime, timedelta
-from collections import defaultdict
-import re
+from typing import List, Dict, Any, Optional, Iterable
+from datetime import datetime, timezone
+from array import array
+from bisect import bisect_left, bisect_right
+import math
 
-from ..models.command_log import CommandLog
+from sqlalchemy.orm import Session
+
+from ..models.command_log import DiscordCommandLog
+from ..repositories.command_log_repository import CommandLogRepository, extract_search_terms
+
+def _to_epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+def _add_posting(postings: Dict[str, array], term: str, log_id: int):
+    posting = postings.get(term)
+    if posting is None:
+        postings[term] = array('q', [log_id])
+    elif posting[-1] < log_id:
+        posting.append(log_id)
+    else:
+        position = bisect_left(posting, log_id)
+        if posting[position] != log_id:
+            posting.insert(position, log_id)
+
+def _intersect(first: array, second: array) -> array:
+    """Irisan dua posting list terurut (bisect pada list yang lebih besar)"""
+    if len(first) > len(second):
+        first, second = second, first
+    result = array('q')
+    position = 0
+    for log_id in first:
+        position = bisect_left(second, log_id, position)
+        if position == len(second):
+            break
+        if second[position] == log_id:
+            result.append(log_id)
+    return result
 
 class LogSearchEngine:
-    """Search engine untuk log data dengan indexing dan fast retrieval"""
-    
-    def __init__(self):
-        # Index untuk fast search
-        self.command_index: Dict[str, Set[int]] = defaultdict(set)
-        self.user_index: Dict[str, Set[int]] = defaultdict(set)
-        self.guild_index: Dict[str, Set[int]] = defaultdict(set)
-        self.text_index: Dict[str, Set[int]] = defaultdict(set)
-        self.date_index: Dict[str, Set[int]] = defaultdict(set)
-        
-        # Cache untuk logs yang sudah di-index
-        self.indexed_logs: Dict[int, CommandLog] = {}
+    """
+    Search engine dua tier untuk Discord command log.
+
+    Tier in-process menyimpan posting list integer terurut (array 'q') per term dan
+    index tanggal berupa array timestamp terurut (range query via bisect), tanpa
+    menyimpan objek log. Jumlah dokumen dibatasi max_documents; log terlama di-evict
+    sehingga memori tetap terbatas berapapun volume log.
+    Query di luar jendela in-process diteruskan ke index persisten di database
+    (PostgreSQL tsvector + GIN, SQLite FTS5) lewat CommandLogRepository.
+    """
+
+    EVICTION_SLACK = 1.1
+    SYNC_BATCH_SIZE = 1000
+
+    def __init__(self, max_documents: int = 50000):
+        self.max_documents = max_documents
+
+        # Posting list: term -> id log terurut
+        self.command_index: Dict[str, array] = {}
+        self.user_index: Dict[str, array] = {}
+        self.guild_index: Dict[str, array] = {}
+        self.text_index: Dict[str, array] = {}
+
+        # Semua id yang ter-index (terurut) dan index tanggal (timestamp terurut + id pasangannya)
+        self._doc_ids = array('q')
+        self._timestamps = array('d')
+        self._timestamp_ids = array('q')
+
+        # Log dengan id > last_synced_id belum ditarik dari repository
+        self.last_synced_id = 0
+        # True jika jendela in-process sudah dipotong (baik oleh eviction maupun sync awal)
+        self._truncated = False
         self.last_index_update = datetime.now()
-        
-    def index_log(self, log: CommandLog):
+
+    # Indexing
+    def index_log(self, log: DiscordCommandLog):
         """Index single log untuk fast search"""
         log_id = log.id
-        
-        # Index berdasarkan command
+        position = bisect_left(self._doc_ids, log_id)
+        if position < len(self._doc_ids) and self._doc_ids[position] == log_id:
+            return
+        self._doc_ids.insert(position, log_id)
+
         if log.command:
-            self.command_index[log.command.lower()].add(log_id)
-            
-        # Index berdasarkan user
+            _add_posting(self.command_index, log.command.lower(), log_id)
         if log.user_id:
-            self.user_index[str(log.user_id)].add(log_id)
-            
-        # Index berdasarkan guild
+            _add_posting(self.user_index, str(log.user_id), log_id)
         if log.guild_id:
-            self.guild_index[str(log.guild_id)].add(log_id)
-            
-        # Index berdasarkan text content (command, response, error)
-        text_content = []
-        if log.command:
-            text_content.append(log.command)
-        if log.response:
-            text_content.append(log.response)
-        if log.error_message:
-            text_content.append(log.error_message)
-            
-        for text in text_content:
-            words = self._extract_words(text)
-            for word in words:
-                self.text_index[word.lower()].add(log_id)
-                
-        # Index berdasarkan tanggal
+            _add_posting(self.guild_index, str(log.guild_id), log_id)
+
+        terms = set()
+        for field in (log.command, log.command_args, log.response_message, log.error_message):
+            terms.update(extract_search_terms(field))
+        for term in terms:
+            _add_posting(self.text_index, term, log_id)
+
         if log.timestamp:
-            date_key = log.timestamp.strftime('%Y-%m-%d')
-            self.date_index[date_key].add(log_id)
-            
-        # Simpan log di cache
-        self.indexed_logs[log_id] = log
-        
-    def bulk_index_logs(self, logs: List[CommandLog]):
+            epoch = _to_epoch(log.timestamp)
+            position = bisect_right(self._timestamps, epoch)
+            self._timestamps.insert(position, epoch)
+            self._timestamp_ids.insert(position, log_id)
+
+        if len(self._doc_ids) > self.max_documents * self.EVICTION_SLACK:
+            self._evict()
+
+    def bulk_index_logs(self, logs: Iterable[DiscordCommandLog]):
         """Index multiple logs sekaligus"""
         for log in logs:
             self.index_log(log)
         self.last_index_update = datetime.now()
-        
-    def search_by_command(self, command: str) -> List[CommandLog]:
+
+    def _evict(self):
+        """Buang log terlama sampai tersisa max_documents"""
+        cutoff = self._doc_ids[len(self._doc_ids) - self.max_documents]
+        del self._doc_ids[:bisect_left(self._doc_ids, cutoff)]
+
+        for postings in (self.command_index, self.user_index, self.guild_index, self.text_index):
+            for term in list(postings):
+                posting = postings[term]
+                del posting[:bisect_left(posting, cutoff)]
+                if not posting:
+                    del postings[term]
+
+        keep = [i for i, log_id in enumerate(self._timestamp_ids) if log_id >= cutoff]
+        self._timestamps = array('d', (self._timestamps[i] for i in keep))
+        self._timestamp_ids = array('q', (self._timestamp_ids[i] for i in keep))
+        self._truncated = True
+
+    def sync(self, repository: CommandLogRepository) -> int:
+        """Tarik log baru dari repository secara incremental (id > last_synced_id)"""
+        if self.last_synced_id == 0:
+            # Sync awal: cukup jendela terbaru, jangan memuat seluruh tabel
+            start_id = max(0, repository.get_max_log_id() - self.max_documents)
+            if start_id > 0:
+                self.last_synced_id = start_id
+                self._truncated = True
+
+        pulled = 0
+        while True:
+            logs = repository.get_logs_after(self.last_synced_id, self.SYNC_BATCH_SIZE)
+            if not logs:
+                break
+            self.bulk_index_logs(logs)
+            self.last_synced_id = logs[-1].id
+            pulled += len(logs)
+            if len(logs) < self.SYNC_BATCH_SIZE:
+                break
+        return pulled
+
+    def covers(self, start_date: Optional[datetime]) -> bool:
+        """Apakah jendela in-process memuat semua log sejak start_date"""
+        if not self._truncated:
+            return True
+        if start_date is None or not self._timestamps:
+            return False
+        return _to_epoch(start_date) >= self._timestamps[0]
+
+    # Query in-process (hasil: id log, terbaru dulu)
+    def search_by_command(self, command: str) -> List[int]:
         """Search logs berdasarkan command"""
-        log_ids = self.command_index.get(command.lower(), set())
-        return [self.indexed_logs[log_id] for log_id in log_ids if log_id in self.indexed_logs]
-        
-    def search_by_user(self, user_id: str) -> List[CommandLog]:
+        return list(reversed(self.command_index.get(command.lower(), array('q'))))
+
+    def search_by_user(self, user_id: str) -> List[int]:
         """Search logs berdasarkan user_id"""
-        log_ids = self.user_index.get(str(user_id), set())
-        return [self.indexed_logs[log_id] for log_id in log_ids if log_id in self.indexed_logs]
-        
-    def search_by_text(self, search_term: str) -> List[CommandLog]:
-        """Search logs berdasarkan text content"""
-        words = self._extract_words(search_term)
-        matching_log_ids = set()
-        
-        for word in words:
-            word_matches = self.text_index.get(word.lower(), set())
-            if not matching_log_ids:
-                matching_log_ids = word_matches.copy()
-            else:
-                matching_log_ids = matching_log_ids.intersection(word_matches)
-                
-        return [self.indexed_logs[log_id] for log_id in matching_log_ids if log_id in self.indexed_logs]
-        
-    def search_by_date_range(self, start_date: datetime, end_date: datetime) -> List[CommandLog]:
-        """Search logs berdasarkan rentang tanggal"""
-        matching_log_ids = set()
-        current_date = start_date.date()
-        
-        while current_date <= end_date.date():
-            date_key = current_date.strftime('%Y-%m-%d')
-            date_matches = self.date_index.get(date_key, set())
-            matching_log_ids.update(date_matches)
-            current_date += timedelta(days=1)
-            
-        return [self.indexed_logs[log_id] for log_id in matching_log_ids if log_id in self.indexed_logs]
-        
-    def _extract_words(self, text: str) -> List[str]:
-        """Extract words dari text untuk indexing"""
-        if not text:
-            return []
-        # Remove special characters dan split berdasarkan whitespace
-        words = re.findall(r'\b\w+\b', text.lower())
-        return [word for word in words if len(word) > 2]  # Skip kata pendek
-        
+        return list(reversed(self.user_index.get(str(user_id), array('q'))))
+
+    def search_by_guild(self, guild_id: str) -> List[int]:
+        """Search logs berdasarkan guild_id"""
+        return list(reversed(self.guild_index.get(str(guild_id), array('q'))))
+
+    def search_by_text(self, search_term: str) -> List[int]:
+        """Search logs yang mengandung semua term"""
+        return list(reversed(self._match_all(extract_search_terms(search_term))))
+
+    def search_by_date_range(self, start_date: datetime, end_date: datetime) -> List[int]:
+        """Search logs berdasarkan rentang waktu (bisect pada index tanggal)"""
+        return list(reversed(self._date_range(start_date, end_date)))
+
+    def _match_all(self, terms: List[str]) -> array:
+        result = None
+        for term in sorted(set(terms), key=lambda t: len(self.text_index.get(t, ()))):
+            posting = self.text_index.get(term)
+            if posting is None:
+                return array('q')
+            result = posting if result is None else _intersect(result, posting)
+        return result if result is not None else array('q')
+
+    def _date_range(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> array:
+        lower = bisect_left(self._timestamps, _to_epoch(start_date)) if start_date else 0
+        upper = bisect_right(self._timestamps, _to_epoch(end_date)) if end_date else len(self._timestamps)
+        return array('q', sorted(self._timestamp_ids[lower:upper]))
+
+    def search(
+        self,
+        search_term: Optional[str] = None,
+        user_id: Optional[str] = None,
+        guild_id: Optional[str] = None,
+        command: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 50
+    ) -> List[int]:
+        """
+        Query gabungan di tier in-process.
+        Filter (user, guild, command, tanggal) diiris sebagai posting list; term teks
+        di-OR dan diranking dengan jumlah IDF term yang cocok, lalu id terbaru.
+        """
+        candidates: Optional[array] = None
+        filters = []
+        if user_id:
+            filters.append(self.user_index.get(str(user_id), array('q')))
+        if guild_id:
+            filters.append(self.guild_index.get(str(guild_id), array('q')))
+        if command:
+            filters.append(self.command_index.get(command.lower(), array('q')))
+        if start_date or end_date:
+            filters.append(self._date_range(start_date, end_date))
+        for posting in sorted(filters, key=len):
+            candidates = posting if candidates is None else _intersect(candidates, posting)
+
+        terms = set(extract_search_terms(search_term))
+        if not terms:
+            ids = candidates if candidates is not None else self._doc_ids
+            return list(reversed(ids[-limit:])) if limit else list(reversed(ids))
+
+        total = max(len(self._doc_ids), 1)
+        scores: Dict[int, float] = {}
+        for term in terms:
+            posting = self.text_index.get(term)
+            if not posting:
+                continue
+            if candidates is not None:
+                posting = _intersect(posting, candidates)
+            idf = math.log(1 + total / len(self.text_index[term]))
+            for log_id in posting:
+                scores[log_id] = scores.get(log_id, 0.0) + idf
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return [log_id for log_id, _ in ranked[:limit]]
+
+    def search_logs(
+        self,
+        db: Session,
+        search_term: Optional[str] = None,
+        user_id: Optional[str] = None,
+        guild_id: Optional[str] = None,
+        command: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 50
+    ) -> List[DiscordCommandLog]:
+        """
+        Entry point pencarian: sync incremental lalu jawab dari tier in-process bila
+        rentang waktunya tercakup, selain itu dari index full-text database.
+        """
+        repository = CommandLogRepository(db)
+        self.sync(repository)
+
+        if self.covers(start_date):
+            log_ids = self.search(search_term, user_id, guild_id, command, start_date, end_date, limit)
+            return repository.get_logs_by_ids(log_ids)
+
+        return repository.search_logs(search_term, user_id, guild_id, command, start_date, end_date, limit)
+
     def get_index_stats(self) -> Dict[str, Any]:
         """Return statistik index"""
+        posting_entries = sum(
+            len(posting)
+            for postings in (self.command_index, self.user_index, self.guild_index, self.text_index)
+            for posting in postings.values()
+        )
         return {
-            "total_indexed_logs": len(self.indexed_logs),
+            "total_indexed_logs": len(self._doc_ids),
+            "max_documents": self.max_documents,
             "command_terms": len(self.command_index),
             "text_terms": len(self.text_index),
             "users": len(self.user_index),
             "guilds": len(self.guild_index),
+            "posting_bytes": posting_entries * 8 + len(self._timestamps) * 16 + len(self._doc_ids) * 8,
+            "last_synced_id": self.last_synced_id,
             "last_update": self.last_index_update.isoformat()
         }
 
@@ -1,9 +1,11 @@
 """Pagination Service untuk Discord - Efficient data loading"""
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import select
 import math
 
+from app.common.utils.pagination import KeysetPaginator
+
 class PaginationService:
     def __init__(self, db_session: Session):
         """Initialize pagination service dengan database session"""
@@ -12,7 +14,10 @@ class PaginationService:
         self.max_page_size = 100
 
     def paginate_query(self, query, page: int = 1, page_size: int = None) -> Dict[str, Any]:
-        """Paginate SQLAlchemy query dengan cursor-based pagination"""
+        """
+        Paginate SQLAlchemy query dengan OFFSET/LIMIT + COUNT (legacy, berbasis nomor halaman).
+        Untuk listing besar gunakan paginate_cursor.
+        """
         if page_size is None:
             page_size = self.default_page_size
         page_size = min(page_size, self.max_page_size)
@@ -37,14 +42,26 @@ class PaginationService:
             }
         }
 
-    def paginate_logs(self, model_class, filters: Dict = None, 
-                     page: int = 1, page_size: int = None) -> Dict[str, Any]:
-        """Paginate command logs dengan filtering"""
-        query = self.db.query(model_class)
+    def paginate_cursor(self, statement, sort_columns, cursor: Optional[str] = None,
+                        page_size: int = None, count: Optional[str] = None) -> Dict[str, Any]:
+        """Paginate select() dengan keyset cursor di atas sort_columns (tanpa OFFSET, count opsional)"""
+        paginator = KeysetPaginator(
+            *sort_columns,
+            default_page_size=self.default_page_size,
+            max_page_size=self.max_page_size
+        )
+        return paginator.paginate(self.db, statement, cursor, page_size, count)
+
+    def paginate_logs(self, model_class, filters: Dict = None, cursor: Optional[str] = None,
+                      page_size: int = None, count: Optional[str] = None) -> Dict[str, Any]:
+        """Paginate command logs dengan filtering, keyset di atas (timestamp, id)"""
+        statement = select(model_class)
         if filters:
             for key, value in filters.items():
                 if hasattr(model_class, key) and value is not None:
-                    query = query.filter(getattr(model_class, key) == value)
+                    statement = statement.where(getattr(model_class, key) == value)
         if hasattr(model_class, 'timestamp'):
-            query = query.order_by(desc(model_class.timestamp))
-        return self.paginate_query(query, page, page_size)
+            sort_columns = (model_class.timestamp, model_class.id)
+        else:
+            sort_columns = (model_class.id,)
+        return self.paginate_cursor(statement, sort_columns, cursor, page_size, count)
@@ -1,93 +1,330 @@
+"""
+WebSocket Connection Manager
+Hub broadcast WebSocket berbasis topik:
+
+- Reverse index topik -> set client_id sehingga broadcast hanya menyentuh subscriber topik
+- Pesan di-serialize sekali per broadcast lalu teks yang sama dikirim ke semua subscriber
+- Setiap client punya antrian outbound terbatas dan task pengirim sendiri; broadcast hanya
+  memasukkan pesan ke antrian (put_nowait) sehingga socket lambat tidak menahan yang lain
+- Client yang antriannya penuh (slow consumer) atau send-nya melebihi batas waktu diputus
+- Bridge pub/sub Redis (opsional) meneruskan broadcast ke client yang terhubung di worker lain
+"""
+
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
+import asyncio
 import uuid
 import json
 import logging
-from datetime import datetime
+
+import redis.asyncio as redis
+
+from app.infrastructure.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Kode close WebSocket 1013 "Try Again Later" untuk client yang tidak sanggup mengikuti
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ClientConnection:
+    """State satu koneksi: socket, topik yang di-subscribe, antrian outbound dan task pengirim"""
+
+    __slots__ = ("client_id", "websocket", "topics", "queue", "sender_task")
+
+    def __init__(self, client_id: str, websocket: WebSocket, queue_size: int):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.topics: Set[str] = set()
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        self.sender_task: Optional[asyncio.Task] = None
+
+
 class ConnectionManager:
-    def __init__(self):
-        # Mapping client_id ke WebSocket connection
-        self.connections: Dict[str, WebSocket] = {}
-        # Mapping client_id ke list topik yang di-subscribe
-        self.subscriptions: Dict[str, List[str]] = {}
-        
+    def __init__(
+        self,
+        queue_size: int = 256,
+        send_timeout: float = 5.0,
+        redis_url: Optional[str] = None,
+        channel: str = "ws:broadcast"
+    ):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.redis_url = redis_url
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+
+        self.clients: Dict[str, ClientConnection] = {}
+        # Reverse index topik -> client_id yang subscribe
+        self.topic_index: Dict[str, Set[str]] = {}
+
+        self._redis_client = None
+        self._bridge_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._dropped_slow_consumers = 0
+        self._messages_broadcast = 0
+
+    # ---- Koneksi & subscription -------------------------------------------
+
+    @property
+    def connections(self) -> Dict[str, WebSocket]:
+        """Mapping client_id ke WebSocket (kompatibel dengan API lama)"""
+        return {client_id: client.websocket for client_id, client in self.clients.items()}
+
+    @property
+    def subscriptions(self) -> Dict[str, List[str]]:
+        """Mapping client_id ke list topik (kompatibel dengan API lama)"""
+        return {client_id: list(client.topics) for client_id, client in self.clients.items()}
+
     async def connect(self, websocket: WebSocket) -> str:
         """Accept koneksi baru dan return client_id"""
         await websocket.accept()
         client_id = str(uuid.uuid4())
-        self.connections[client_id] = websocket
-        self.subscriptions[client_id] = []
+        self.register(client_id, websocket)
         logger.info(f"New WebSocket connection: {client_id}")
         return client_id
-        
+
+    def register(self, client_id: str, websocket: WebSocket) -> ClientConnection:
+        """Daftarkan socket yang sudah di-accept dan jalankan task pengirimnya"""
+        client = ClientConnection(client_id, websocket, self.queue_size)
+        client.sender_task = asyncio.get_running_loop().create_task(self._sender(client))
+        self.clients[client_id] = client
+        return client
+
     def disconnect(self, client_id: str):
-        """Hapus koneksi client"""
-        if client_id in self.connections:
-            del self.connections[client_id]
-        if client_id in self.subscriptions:
-            del self.subscriptions[client_id]
+        """Hapus koneksi client beserta entri index topiknya"""
+        client = self.clients.pop(client_id, None)
+        if client is None:
+            return
+        self._unindex(client_id, client.topics)
+        client.topics.clear()
+        task = client.sender_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
         logger.info(f"Client disconnected: {client_id}")
-        
+
     async def subscribe_to_topics(self, client_id: str, topics: List[str]):
         """Subscribe client ke topik-topik tertentu"""
-        if client_id in self.subscriptions:
-            # Tambah topik baru tanpa duplikasi
-            current_topics = set(self.subscriptions[client_id])
-            new_topics = set(topics)
-            self.subscriptions[client_id] = list(current_topics.union(new_topics))
-            
+        client = self.clients.get(client_id)
+        if client is None:
+            return
+        for topic in set(topics) - client.topics:
+            client.topics.add(topic)
+            self.topic_index.setdefault(topic, set()).add(client_id)
+
     async def unsubscribe_from_topics(self, client_id: str, topics: List[str]):
         """Unsubscribe client dari topik tertentu"""
-        if client_id in self.subscriptions:
-            current_topics = set(self.subscriptions[client_id])
-            remove_topics = set(topics)
-            self.subscriptions[client_id] = list(current_topics - remove_topics)
-            
-    async def broadcast_to_topic(self, topic: str, message: dict):
-        """Broadcast message ke semua client yang subscribe topik"""
-        disconnected_clients = []
-        
-        for client_id, topics in self.subscriptions.items():
-            if topic in topics and client_id in self.connections:
-                try:
-                    websocket = self.connections[client_id]
-                    await websocket.send_text(json.dumps(message))
-                except WebSocketDisconnect:
-                    disconnected_clients.append(client_id)
-                except Exception as e:
-                    logger.error(f"Error sending to {client_id}: {e}")
-                    disconnected_clients.append(client_id)
-                    
-        # Cleanup disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
-            
-    async def send_to_client(self, client_id: str, message: dict):
+        client = self.clients.get(client_id)
+        if client is None:
+            return
+        removed = client.topics.intersection(topics)
+        client.topics -= removed
+        self._unindex(client_id, removed)
+
+    def _unindex(self, client_id: str, topics: Iterable[str]):
+        for topic in topics:
+            subscribers = self.topic_index.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client_id)
+                if not subscribers:
+                    del self.topic_index[topic]
+
+    # ---- Pengiriman --------------------------------------------------------
+
+    async def broadcast_to_topic(self, topic: str, message: dict) -> int:
+        """
+        Broadcast message ke semua client yang subscribe topik (di semua worker bila bridge aktif).
+        Return jumlah client lokal yang menerima pesan di antriannya.
+        """
+        text = json.dumps(message)
+        delivered = self.deliver_local(topic, text)
+        if self._bridge_task is not None:
+            await self._publish(topic, text)
+        return delivered
+
+    def deliver_local(self, topic: str, text: str) -> int:
+        """Masukkan teks yang sudah di-serialize ke antrian subscriber topik di worker ini"""
+        subscribers = self.topic_index.get(topic)
+        if not subscribers:
+            return 0
+        self._messages_broadcast += 1
+        delivered = 0
+        slow_consumers = []
+        for client_id in subscribers:
+            if self._enqueue(self.clients[client_id], text):
+                delivered += 1
+            else:
+                slow_consumers.append(client_id)
+        for client_id in slow_consumers:
+            self._drop_slow_consumer(client_id)
+        return delivered
+
+    async def send_to_client(self, client_id: str, message: dict) -> bool:
         """Kirim message ke client tertentu"""
-        if client_id in self.connections:
-            try:
-                websocket = self.connections[client_id]
-                await websocket.send_text(json.dumps(message))
-                return True
-            except WebSocketDisconnect:
-                self.disconnect(client_id)
-                return False
+        client = self.clients.get(client_id)
+        if client is None:
+            return False
+        if self._enqueue(client, json.dumps(message)):
+            return True
+        self._drop_slow_consumer(client_id)
         return False
-        
+
+    @staticmethod
+    def _enqueue(client: ClientConnection, text: str) -> bool:
+        try:
+            client.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _drop_slow_consumer(self, client_id: str):
+        client = self.clients.get(client_id)
+        if client is None:
+            return
+        self._dropped_slow_consumers += 1
+        logger.warning(f"Dropping slow WebSocket consumer {client_id}: outbound queue full")
+        self.disconnect(client_id)
+        asyncio.get_running_loop().create_task(self._close_socket(client.websocket))
+
+    @staticmethod
+    async def _close_socket(websocket: WebSocket):
+        try:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    async def _sender(self, client: ClientConnection):
+        """Task per client: kirim isi antrian berurutan; gagal atau timeout memutus client"""
+        try:
+            # Kondisi loop juga dicek karena wait_for bisa menelan cancel yang datang
+            # bersamaan dengan selesainya send
+            while self.clients.get(client.client_id) is client:
+                text = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send_text(text), self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"WebSocket send to {client.client_id} timed out")
+            self._dropped_slow_consumers += 1
+            self.disconnect(client.client_id)
+            await self._close_socket(client.websocket)
+        except WebSocketDisconnect:
+            self.disconnect(client.client_id)
+        except Exception as e:
+            logger.error(f"Error sending to {client.client_id}: {e}")
+            self.disconnect(client.client_id)
+
+    # ---- Bridge Redis antar worker ----------------------------------------
+
+    async def start_bridge(self):
+        """Mulai listener pub/sub Redis agar broadcast dari worker lain ikut dikirim"""
+        if self.redis_url is None or self._bridge_task is not None:
+            return
+        self._stopping = False
+        self._bridge_task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _get_redis_client(self):
+        if self._redis_client is None:
+            self._redis_client = redis.from_url(self.redis_url, decode_responses=True)
+        return self._redis_client
+
+    def _frame(self, topic: str, text: str) -> str:
+        # json.dumps tidak pernah menghasilkan newline mentah, topik divalidasi tanpa newline
+        return f"{self.instance_id}\n{topic}\n{text}"
+
+    async def _publish(self, topic: str, text: str):
+        if "\n" in topic:
+            raise ValueError("Topik WebSocket tidak boleh mengandung newline")
+        try:
+            client = await self._get_redis_client()
+            await client.publish(self.channel, self._frame(topic, text))
+        except Exception as e:
+            # Client lokal sudah menerima; hanya worker lain yang terlewat
+            logger.error(f"Failed to publish WebSocket broadcast: {e}")
+
+    def handle_bridge_message(self, data: str) -> int:
+        """Teruskan broadcast dari worker lain ke subscriber lokal (pesan sendiri diabaikan)"""
+        origin, _, rest = data.partition("\n")
+        topic, _, text = rest.partition("\n")
+        if origin == self.instance_id or not topic:
+            return 0
+        return self.deliver_local(topic, text)
+
+    async def _listen(self):
+        """Subscribe channel broadcast; reconnect dengan backoff bila Redis putus"""
+        backoff = 1.0
+        while not self._stopping:
+            pubsub = None
+            try:
+                client = await self._get_redis_client()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                backoff = 1.0
+                logger.info(f"WebSocket bridge subscribed to {self.channel}")
+
+                while not self._stopping:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None and message.get("type") == "message":
+                        self.handle_bridge_message(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket bridge listener error: {e}")
+                if self._stopping:
+                    break
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.reset()
+                    except Exception:
+                        pass
+
+    async def close(self):
+        """Hentikan bridge dan semua task pengirim"""
+        self._stopping = True
+        if self._bridge_task is not None:
+            self._bridge_task.cancel()
+            try:
+                await self._bridge_task
+            except asyncio.CancelledError:
+                pass
+            self._bridge_task = None
+        sender_tasks = [client.sender_task for client in self.clients.values() if client.sender_task is not None]
+        for client_id in list(self.clients):
+            self.disconnect(client_id)
+        await asyncio.gather(*sender_tasks, return_exceptions=True)
+        if self._redis_client is not None:
+            await self._redis_client.close()
+            self._redis_client = None
+
+    # ---- Statistik ---------------------------------------------------------
+
     def get_active_connections_count(self) -> int:
         """Return jumlah koneksi aktif"""
-        return len(self.connections)
-        
+        return len(self.clients)
+
     def get_topic_subscribers(self, topic: str) -> List[str]:
         """Return list client_id yang subscribe ke topik"""
-        subscribers = []
-        for client_id, topics in self.subscriptions.items():
-            if topic in topics:
-                subscribers.append(client_id)
-        return subscribers
+        return list(self.topic_index.get(topic, ()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.clients),
+            "topics": len(self.topic_index),
+            "messages_broadcast": self._messages_broadcast,
+            "dropped_slow_consumers": self._dropped_slow_consumers,
+            "queued_messages": sum(client.queue.qsize() for client in self.clients.values()),
+            "bridge_active": self._bridge_task is not None and not self._bridge_task.done()
+        }
+
 
 # Global instance
-connection_manager = ConnectionManager()
+connection_manager = ConnectionManager(
+    queue_size=settings.WS_OUTBOUND_QUEUE_SIZE,
+    send_timeout=settings.WS_SEND_TIMEOUT,
+    redis_url=settings.REDIS_URL if settings.WS_REDIS_BRIDGE_ENABLED else None,
+    channel=settings.WS_BROADCAST_CHANNEL
+)
@@ -1,12 +1,10 @@
 """
 Model untuk manajemen stok dan inventory
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
-
-Base = declarative_base()
+from app.core.database import Base
 
 class StockAlert(Base):
     """Model untuk alert stok"""
@@ -47,7 +45,15 @@ class StockReservation(Base):
     product_type = Column(String(50), nullable=False)
     quantity = Column(Integer, nullable=False)
     reserved_for = Column(String(100), nullable=False)  # user_id, order_id
+    # Request yang diulang dengan key sama mendapat reservasi yang sama (tidak memotong stok lagi)
+    idempotency_key = Column(String(150), unique=True, nullable=True)
     expires_at = Column(DateTime, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    released_at = Column(DateTime)
+    confirmed_at = Column(DateTime)  # stok benar-benar terpakai (transaksi selesai)
+    released_at = Column(DateTime)   # stok dikembalikan (dibatalkan atau expired)
+    
+    __table_args__ = (
+        # Sweeper expiry: WHERE is_active AND expires_at < now
+        Index("ix_stock_reservations_active_expires", "is_active", "expires_at"),
+    )
@@ -3,9 +3,10 @@ Service untuk manajemen stok real-time
 """
 import asyncio
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from app.domains.inventory.models.inventory_models import StockAlert, StockMovement, StockReservation
+from app.common.exceptions.custom_exceptions import InsufficientStockError
+from app.domains.inventory.models.inventory_models import StockAlert, StockMovement
+from app.domains.inventory.services.stock_reservation_engine import stock_reservation_engine
 
 class StockMonitoringService:
     """Service untuk monitoring stok real-time"""
@@ -82,45 +83,23 @@ class StockReservationService:
         self.db = db
     
     def reserve_stock(self, product_id: int, product_type: str, quantity: int, 
-                     reserved_for: str, duration_minutes: int = 15) -> bool:
-        """Reservasi stok untuk transaksi"""
-        expires_at = datetime.utcnow() + timedelta(minutes=duration_minutes)
-        
-        reservation = StockReservation(
-            product_id=product_id,
-            product_type=product_type,
-            quantity=quantity,
-            reserved_for=reserved_for,
-            expires_at=expires_at
-        )
-        
-        self.db.add(reservation)
-        self.db.commit()
+                     reserved_for: str, duration_minutes: int = 15,
+                     idempotency_key: Optional[str] = None) -> bool:
+        """Reservasi stok untuk transaksi; False bila stok tidak mencukupi"""
+        try:
+            stock_reservation_engine.reserve(
+                self.db, product_type, product_id, quantity, reserved_for,
+                ttl_seconds=duration_minutes * 60,
+                idempotency_key=idempotency_key
+            )
+        except InsufficientStockError:
+            return False
         return True
     
     def release_reservation(self, reservation_id: int) -> bool:
-        """Lepas reservasi stok"""
-        reservation = self.db.query(StockReservation).filter(
-            StockReservation.id == reservation_id
-        ).first()
-        
-        if reservation and reservation.is_active:
-            reservation.is_active = False
-            reservation.released_at = datetime.utcnow()
-            self.db.commit()
-            return True
-        return False
+        """Lepas reservasi stok dan kembalikan stoknya"""
+        return stock_reservation_engine.release(self.db, reservation_id)
     
     def cleanup_expired_reservations(self):
-        """Bersihkan reservasi yang sudah expired"""
-        expired_reservations = self.db.query(StockReservation).filter(
-            StockReservation.expires_at < datetime.utcnow(),
-            StockReservation.is_active == True
-        ).all()
-        
-        for reservation in expired_reservations:
-            reservation.is_active = False
-            reservation.released_at = datetime.utcnow()
-        
-        self.db.commit()
-        return len(expired_reservations)
+        """Bersihkan reservasi yang sudah expired (satu bulk UPDATE)"""
+        return stock_reservation_engine.sweep_expired(self.db)
@@ -0,0 +1,296 @@
+"""
+Engine reservasi stok atomik
+
+- Pengurangan stok memakai satu UPDATE bersyarat
+  (UPDATE ... SET stock = stock - :q WHERE id = :id AND stock >= :q RETURNING stock)
+  sehingga dua pembeli bersamaan tidak bisa sama-sama lolos pengecekan stok
+- Idempotency key: request ulang dengan key yang sama mengembalikan reservasi yang sama
+- confirm/release/expire adalah UPDATE bersyarat pada is_active, jadi stok tidak
+  pernah dikembalikan dua kali
+- Reservasi expired dibersihkan dengan satu bulk UPDATE ... RETURNING lalu stok
+  dikembalikan per produk; jadwal sweep diambil dari min-heap waktu expiry
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, and_, bindparam, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.common.exceptions.custom_exceptions import InsufficientStockError, ValidationException
+from app.domains.inventory.models.inventory_models import StockReservation
+
+logger = logging.getLogger(__name__)
+
+
+class StockSource:
+    """Lokasi kolom stok untuk satu product_type"""
+
+    def __init__(self, table: Table, stock_column: str, id_column: str = "id"):
+        self.table = table
+        self.stock = table.c[stock_column]
+        self.id = table.c[id_column]
+
+
+class StockReservationEngine:
+    """
+    Engine reservasi stok - Single Responsibility: mutasi stok yang aman terhadap konkurensi
+    Semua method menerima Session milik pemanggil; commit=False memungkinkan reservasi
+    digabung dengan perubahan lain (mis. potong saldo) dalam satu transaksi.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, StockSource] = {}
+        # (expires_at, reservation_id) reservasi yang dibuat di proses ini
+        self._expiry_heap: List[Tuple[datetime, int]] = []
+        self._heap_lock = threading.Lock()
+
+    def register_source(self, product_type: str, table: Table, stock_column: str, id_column: str = "id"):
+        self._sources[product_type] = StockSource(table, stock_column, id_column)
+
+    def _source(self, product_type: str) -> StockSource:
+        source = self._sources.get(product_type)
+        if source is None:
+            raise ValidationException(f"Product type '{product_type}' tidak memiliki stok terkelola")
+        return source
+
+    # ---- Mutasi stok ------------------------------------------------------
+
+    def decrement_stock(self, db: Session, product_type: str, product_id: int, quantity: int) -> int:
+        """Kurangi stok secara atomik; return sisa stok atau raise InsufficientStockError"""
+        if quantity <= 0:
+            raise ValidationException("Quantity harus lebih dari 0")
+        source = self._source(product_type)
+        statement = (
+            update(source.table)
+            .where(and_(source.id == product_id, source.stock >= quantity))
+            .values({source.stock.name: source.stock - quantity})
+        )
+
+        if db.get_bind().dialect.update_returning:
+            remaining = db.execute(statement.returning(source.stock)).scalar_one_or_none()
+            if remaining is None:
+                raise InsufficientStockError(product_id=product_id, requested_quantity=quantity)
+            return remaining
+
+        # Dialect tanpa RETURNING: rowcount tetap atomik, sisa stok dibaca terpisah
+        if db.execute(statement).rowcount != 1:
+            raise InsufficientStockError(product_id=product_id, requested_quantity=quantity)
+        return db.execute(source.table.select().with_only_columns(source.stock).where(source.id == product_id)).scalar()
+
+    def _restock(self, db: Session, product_type: str, quantities: Dict[int, int]):
+        """Kembalikan stok; satu executemany untuk semua produk"""
+        if not quantities:
+            return
+        source = self._source(product_type)
+        db.execute(
+            update(source.table)
+            .where(source.id == bindparam("_product_id"))
+            .values({source.stock.name: source.stock + bindparam("_quantity")}),
+            [{"_product_id": product_id, "_quantity": quantity} for product_id, quantity in quantities.items()]
+        )
+
+    # ---- Reservasi --------------------------------------------------------
+
+    def reserve(
+        self,
+        db: Session,
+        product_type: str,
+        product_id: int,
+        quantity: int,
+        reserved_for: str,
+        ttl_seconds: int = 900,
+        idempotency_key: Optional[str] = None,
+        commit: bool = True
+    ) -> StockReservation:
+        """Potong stok dan catat reservasi; key yang sama mengembalikan reservasi lama"""
+        if idempotency_key:
+            existing = self._find_by_key(db, idempotency_key)
+            if existing is not None:
+                return existing
+
+        # Savepoint: kegagalan hanya membatalkan reservasi ini, bukan transaksi pemanggil (commit=False)
+        savepoint = db.begin_nested()
+        try:
+            self.decrement_stock(db, product_type, product_id, quantity)
+            reservation = StockReservation(
+                product_id=product_id,
+                product_type=product_type,
+                quantity=quantity,
+                reserved_for=reserved_for,
+                idempotency_key=idempotency_key,
+                expires_at=datetime.utcnow() + timedelta(seconds=ttl_seconds)
+            )
+            db.add(reservation)
+            db.flush()
+        except IntegrityError:
+            # Request kembar dengan key sama menang duluan; pengurangan stok ikut di-rollback
+            savepoint.rollback()
+            existing = self._find_by_key(db, idempotency_key) if idempotency_key else None
+            if existing is None:
+                raise
+            return existing
+        except Exception:
+            savepoint.rollback()
+            raise
+        savepoint.commit()
+
+        if commit:
+            db.commit()
+        self._schedule_expiry(reservation.expires_at, reservation.id)
+        return reservation
+
+    def confirm(self, db: Session, reservation_id: int, commit: bool = True) -> bool:
+        """Tandai stok terpakai permanen; False bila reservasi sudah tidak aktif"""
+        confirmed = db.execute(
+            update(StockReservation)
+            .where(and_(StockReservation.id == reservation_id, StockReservation.is_active == True))
+            .values(is_active=False, confirmed_at=datetime.utcnow())
+        ).rowcount == 1
+        if commit:
+            db.commit()
+        return confirmed
+
+    def release(self, db: Session, reservation_id: int, commit: bool = True) -> bool:
+        """Batalkan reservasi aktif dan kembalikan stoknya"""
+        row = db.execute(
+            update(StockReservation)
+            .where(and_(StockReservation.id == reservation_id, StockReservation.is_active == True))
+            .values(is_active=False, released_at=datetime.utcnow())
+            .returning(StockReservation.product_type, StockReservation.product_id, StockReservation.quantity)
+        ).first()
+        if row is not None:
+            self._restock(db, row.product_type, {row.product_id: row.quantity})
+        if commit:
+            db.commit()
+        return row is not None
+
+    def sweep_expired(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Lepas semua reservasi expired dengan satu bulk UPDATE ... RETURNING,
+        lalu kembalikan stok teragregasi per produk. Return jumlah reservasi yang dilepas.
+        """
+        now = now or datetime.utcnow()
+        rows = db.execute(
+            update(StockReservation)
+            .where(and_(StockReservation.is_active == True, StockReservation.expires_at < now))
+            .values(is_active=False, released_at=now)
+            .returning(StockReservation.product_type, StockReservation.product_id, StockReservation.quantity)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        per_type: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for row in rows:
+            per_type[row.product_type][row.product_id] += row.quantity
+        for product_type, quantities in per_type.items():
+            if product_type in self._sources:
+                self._restock(db, product_type, quantities)
+            else:
+                logger.warning(f"Expired reservations for unmanaged product type '{product_type}' not restocked")
+
+        db.commit()
+        return len(rows)
+
+    def _find_by_key(self, db: Session, idempotency_key: str) -> Optional[StockReservation]:
+        return db.query(StockReservation).filter(StockReservation.idempotency_key == idempotency_key).first()
+
+    # ---- Jadwal expiry ----------------------------------------------------
+
+    def _schedule_expiry(self, expires_at: datetime, reservation_id: int):
+        with self._heap_lock:
+            heapq.heappush(self._expiry_heap, (expires_at, reservation_id))
+
+    def next_expiry(self) -> Optional[datetime]:
+        with self._heap_lock:
+            return self._expiry_heap[0][0] if self._expiry_heap else None
+
+    def pop_due(self, now: datetime) -> int:
+        """Buang entry heap yang sudah jatuh tempo (sudah ditangani sweep)"""
+        popped = 0
+        with self._heap_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                heapq.heappop(self._expiry_heap)
+                popped += 1
+        return popped
+
+
+class StockReservationSweeper:
+    """
+    Background task pelepas reservasi expired
+    Tidur sampai expiry terdekat di heap (atau max_interval untuk reservasi dari worker lain),
+    lalu menjalankan sweep_expired di thread agar event loop tidak terblokir query DB.
+    """
+
+    def __init__(self, engine: StockReservationEngine, session_factory: Callable[[], Session], max_interval: float = 30.0):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.max_interval = max_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _sleep_seconds(self) -> float:
+        next_expiry = self.engine.next_expiry()
+        if next_expiry is None:
+            return self.max_interval
+        delay = (next_expiry - datetime.utcnow()).total_seconds()
+        return min(self.max_interval, max(0.0, delay))
+
+    def sweep_once(self) -> int:
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            released = self.engine.sweep_expired(db, now)
+            self.engine.pop_due(now)
+            return released
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self._sleep_seconds())
+            try:
+                started = time.monotonic()
+                released = await asyncio.to_thread(self.sweep_once)
+                if released:
+                    logger.info(f"Released {released} expired stock reservations in {time.monotonic() - started:.3f}s")
+            except Exception as e:
+                logger.error(f"Stock reservation sweep failed: {e}")
+
+
+def _build_default_engine() -> StockReservationEngine:
+    engine = StockReservationEngine()
+    try:
+        from app.domains.discord.models.discord import LiveStock
+        engine.register_source("livestock", LiveStock.__table__, "stock_quantity")
+    except ImportError as e:
+        logger.warning(f"LiveStock stock source not available: {e}")
+    return engine
+
+
+# Global instance
+stock_reservation_engine = _build_default_engine()
+stock_reservation_sweeper = StockReservationSweeper(stock_reservation_engine, SessionLocal)
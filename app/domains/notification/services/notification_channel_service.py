@@ -2,7 +2,6 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
-import aiohttp
 import asyncio
 import json
 import smtplib
@@ -12,6 +11,7 @@ from app.core.config import settings
 from app.models.notification import NotificationChannel
 from app.schemas.notification import NotificationSendRequest
 from app.utils.exceptions import HTTPException
+from app.infrastructure.external_apis.http_client import http_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -77,14 +77,13 @@ class NotificationChannelService:
                 "embeds": [embed]
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(webhook_url, json=payload) as response:
-                    if response.status == 204:
-                        logger.info("Discord notification sent successfully")
-                        return True
-                    else:
-                        logger.error(f"Discord webhook failed with status: {response.status}")
-                        return False
+            response = await http_client_registry.post("discord", webhook_url, json=payload)
+            if response.status == 204:
+                logger.info("Discord notification sent successfully")
+                return True
+            else:
+                logger.error(f"Discord webhook failed with status: {response.status}")
+                return False
                         
         except Exception as e:
             logger.error(f"Error sending Discord notification: {str(e)}")
@@ -104,14 +103,13 @@ class NotificationChannelService:
                 "parse_mode": "HTML"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        logger.info("Telegram notification sent successfully")
-                        return True
-                    else:
-                        logger.error(f"Telegram API failed with status: {response.status}")
-                        return False
+            response = await http_client_registry.post("telegram", url, json=payload)
+            if response.status == 200:
+                logger.info("Telegram notification sent successfully")
+                return True
+            else:
+                logger.error(f"Telegram API failed with status: {response.status}")
+                return False
                         
         except Exception as e:
             logger.error(f"Error sending Telegram notification: {str(e)}")
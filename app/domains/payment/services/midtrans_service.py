@@ -2,28 +2,55 @@
 Midtrans Payment Service - Mengikuti prinsip Single Responsibility
 Hanya menangani integrasi dengan Midtrans API
 """
-import midtransclient
 from app.core.config import settings
+from app.common.utils.lazy_imports import lazy_import
+from app.infrastructure.external_apis.http_client import http_client_registry
 from typing import Dict, Any
 import uuid
 from decimal import Decimal
 
+midtransclient = lazy_import("midtransclient")
+
 
 class MidtransService:
     """Service khusus untuk integrasi Midtrans - mengikuti SRP"""
     
     def __init__(self):
-        self.snap = midtransclient.Snap(
+        # Client Midtrans (dan import midtransclient) dibuat saat pertama kali dipakai
+        self._snap = None
+        self._core_api = None
+    
+    def _build_clients(self):
+        snap = midtransclient.Snap(
             is_production=settings.MIDTRANS_IS_PRODUCTION,
             server_key=settings.MIDTRANS_SERVER_KEY,
             client_key=settings.MIDTRANS_CLIENT_KEY
         )
         
-        self.core_api = midtransclient.CoreApi(
+        core_api = midtransclient.CoreApi(
             is_production=settings.MIDTRANS_IS_PRODUCTION,
             server_key=settings.MIDTRANS_SERVER_KEY,
             client_key=settings.MIDTRANS_CLIENT_KEY
         )
+        
+        # midtransclient memanggil requests.request per call (koneksi baru tiap request);
+        # ganti dengan Session bersama agar koneksi TLS ke Midtrans dipakai ulang
+        pooled_session = http_client_registry.sync_session("midtrans")
+        snap.http_client.http_client = pooled_session
+        core_api.http_client.http_client = pooled_session
+        self._snap, self._core_api = snap, core_api
+    
+    @property
+    def snap(self):
+        if self._snap is None:
+            self._build_clients()
+        return self._snap
+    
+    @property
+    def core_api(self):
+        if self._core_api is None:
+            self._build_clients()
+        return self._core_api
     
     def create_payment_token(
         self, 
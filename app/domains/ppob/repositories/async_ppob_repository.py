@@ -0,0 +1,214 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, func, case, or_
+from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+
+from app.common.base_classes.base_repository import AsyncBaseRepository
+from app.common.utils.pagination import COUNT_ESTIMATE, KeysetPaginator
+from app.domains.ppob.models.ppob import PPOBTransaction, PPOBProduct, PPOBCategory, TransactionStatus
+
+# created_at transaksi PPOB nullable; id autoincrement sudah mengikuti urutan pembuatan
+ppob_transaction_paginator = KeysetPaginator(PPOBTransaction.id, default_page_size=20)
+
+class AsyncPPOBRepository(AsyncBaseRepository[PPOBTransaction]):
+    """
+    Versi async dari PPOBRepository untuk service async def
+    (PPOBProductService, PPOBTransactionService, PPOBPaymentService).
+    Semua query dijalankan lewat AsyncSession sehingga tidak memblokir event loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(PPOBTransaction, db)
+
+    # Product methods
+    async def get_all_categories(self) -> List[PPOBCategory]:
+        """Ambil semua kategori aktif"""
+        result = await self.db.execute(
+            select(PPOBCategory).where(PPOBCategory.is_active.is_(True)).order_by(PPOBCategory.name)
+        )
+        return list(result.scalars().all())
+
+    async def get_products_by_category(self, category_id: int) -> List[PPOBProduct]:
+        """Ambil produk aktif berdasarkan kategori"""
+        result = await self.db.execute(
+            select(PPOBProduct).where(
+                PPOBProduct.category_id == category_id,
+                PPOBProduct.is_active.is_(True)
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_product_by_code(self, product_code: str) -> Optional[PPOBProduct]:
+        """Ambil produk aktif berdasarkan kode"""
+        return await self.db.scalar(
+            select(PPOBProduct).where(
+                PPOBProduct.product_code == product_code,
+                PPOBProduct.is_active.is_(True)
+            ).limit(1)
+        )
+
+    async def search_products(self, query: str, category_id: Optional[int] = None) -> List[PPOBProduct]:
+        """Cari produk aktif berdasarkan nama atau kode"""
+        pattern = f"%{query}%"
+        statement = select(PPOBProduct).where(
+            PPOBProduct.is_active.is_(True),
+            or_(PPOBProduct.product_name.ilike(pattern), PPOBProduct.product_code.ilike(pattern))
+        )
+        if category_id:
+            statement = statement.where(PPOBProduct.category_id == category_id)
+
+        result = await self.db.execute(statement)
+        return list(result.scalars().all())
+
+    async def get_popular_products(self, limit: int = 10) -> List[PPOBProduct]:
+        """Ambil produk yang paling sering dibeli (transaksi SUCCESS)"""
+        transaction_count = func.count(PPOBTransaction.id).label("transaction_count")
+        popular = (
+            select(PPOBTransaction.product_code, transaction_count)
+            .where(PPOBTransaction.status == TransactionStatus.SUCCESS)
+            .group_by(PPOBTransaction.product_code)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(PPOBProduct)
+            .join(popular, popular.c.product_code == PPOBProduct.product_code)
+            .where(PPOBProduct.is_active.is_(True))
+            .order_by(desc(popular.c.transaction_count))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    # Transaction methods
+    async def get_transaction_by_id(self, transaction_id: int) -> Optional[PPOBTransaction]:
+        """Ambil transaksi berdasarkan ID"""
+        return await self.get_by_id(transaction_id)
+
+    async def get_transaction_by_code(self, transaction_code: str) -> Optional[PPOBTransaction]:
+        """Ambil transaksi berdasarkan kode"""
+        return await self.db.scalar(
+            select(PPOBTransaction).where(
+                PPOBTransaction.transaction_code == transaction_code
+            ).limit(1)
+        )
+
+    async def create_transaction(self, transaction_data: Dict[str, Any]) -> PPOBTransaction:
+        """Buat transaksi PPOB baru"""
+        return await self.create(transaction_data)
+
+    async def update_transaction(self, transaction_id: int, update_data: Dict[str, Any]) -> Optional[PPOBTransaction]:
+        """Update field transaksi"""
+        return await self.update(transaction_id, update_data)
+
+    def _user_transactions_query(
+        self,
+        user_id: int,
+        status: Optional[TransactionStatus] = None,
+        category_id: Optional[int] = None
+    ):
+        query = select(PPOBTransaction).where(PPOBTransaction.user_id == user_id)
+
+        if status:
+            query = query.where(PPOBTransaction.status == status)
+
+        if category_id:
+            query = query.where(PPOBTransaction.category_id == category_id)
+
+        return query
+
+    async def get_user_transactions(
+        self,
+        user_id: int,
+        status: Optional[TransactionStatus] = None,
+        limit: int = 20,
+        offset: int = 0,
+        category_id: Optional[int] = None
+    ) -> List[PPOBTransaction]:
+        """Ambil transaksi user dengan filter"""
+        query = self._user_transactions_query(user_id, status, category_id)
+        result = await self.db.execute(
+            query.order_by(desc(PPOBTransaction.created_at)).offset(offset).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_user_transactions_page(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        status: Optional[TransactionStatus] = None,
+        category_id: Optional[int] = None,
+        count: Optional[str] = COUNT_ESTIMATE
+    ) -> Dict[str, Any]:
+        """Ambil transaksi user dengan keyset pagination (tanpa OFFSET), terbaru dulu"""
+        query = self._user_transactions_query(user_id, status, category_id)
+        return await ppob_transaction_paginator.apaginate(self.db, query, cursor, limit, count)
+
+    async def count_user_transactions(
+        self,
+        user_id: int,
+        status: Optional[TransactionStatus] = None,
+        category_id: Optional[int] = None
+    ) -> int:
+        """Hitung total transaksi user"""
+        query = self._user_transactions_query(user_id, status, category_id)
+        return await self.db.scalar(select(func.count()).select_from(query.subquery()))
+
+    async def get_transaction_history(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 50
+    ) -> List[PPOBTransaction]:
+        """Ambil riwayat transaksi user dengan filter tanggal (format ISO)"""
+        query = self._user_transactions_query(user_id)
+        if start_date:
+            query = query.where(PPOBTransaction.created_at >= datetime.fromisoformat(start_date))
+        if end_date:
+            query = query.where(PPOBTransaction.created_at <= datetime.fromisoformat(end_date))
+
+        result = await self.db.execute(query.order_by(desc(PPOBTransaction.created_at)).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_pending_transactions(self, older_than_minutes: int = 30) -> List[PPOBTransaction]:
+        """Ambil transaksi pending yang sudah lama"""
+        cutoff_time = datetime.utcnow() - timedelta(minutes=older_than_minutes)
+        result = await self.db.execute(
+            select(PPOBTransaction).where(
+                PPOBTransaction.status == TransactionStatus.PENDING,
+                PPOBTransaction.created_at < cutoff_time
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_transaction_stats(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """Ambil statistik transaksi dalam satu query agregat"""
+        today = datetime.utcnow().date()
+        query = select(
+            func.count(PPOBTransaction.id).label("total"),
+            func.sum(case((PPOBTransaction.status == TransactionStatus.SUCCESS, 1), else_=0)).label("success"),
+            func.sum(case((PPOBTransaction.status == TransactionStatus.FAILED, 1), else_=0)).label("failed"),
+            func.sum(case((PPOBTransaction.status == TransactionStatus.PENDING, 1), else_=0)).label("pending"),
+            func.sum(case(
+                (PPOBTransaction.status == TransactionStatus.SUCCESS, PPOBTransaction.total_amount),
+                else_=0
+            )).label("total_amount"),
+            func.sum(case((func.date(PPOBTransaction.created_at) == today, 1), else_=0)).label("today")
+        )
+
+        if user_id:
+            query = query.where(PPOBTransaction.user_id == user_id)
+
+        row = (await self.db.execute(query)).one()
+        total_transactions = row.total or 0
+        success_transactions = row.success or 0
+
+        return {
+            "total_transactions": total_transactions,
+            "success_transactions": success_transactions,
+            "failed_transactions": row.failed or 0,
+            "pending_transactions": row.pending or 0,
+            "total_amount": float(row.total_amount or 0),
+            "today_transactions": row.today or 0,
+            "success_rate": (success_transactions / total_transactions * 100) if total_transactions > 0 else 0
+        }
@@ -84,6 +84,7 @@ class PPOBInquiryRequest(BaseModel):
     """Schema request untuk inquiry tagihan"""
     category_id: int = Field(..., description="ID kategori layanan")
     customer_number: str = Field(..., description="Nomor pelanggan")
+    product_code: Optional[str] = Field(None, description="Kode produk")
     
     @validator('customer_number')
     def validate_customer_number(cls, v):
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
-from app.schemas.ppob import PPOBInquiryResponse, PPOBInquiryRequest
+from app.domains.ppob.schemas.ppob_schemas import PPOBInquiryResponse, PPOBInquiryRequest
 from app.domains.ppob.models.ppob import PPOBCategory
 
 class PPOBProviderInterface(ABC):
@@ -36,6 +36,10 @@ class BasePPOBProvider(PPOBProviderInterface):
             "Authorization": f"Bearer {self.api_key}"
         }
     
+    async def health_check(self) -> Dict[str, Any]:
+        """Health check default; provider dengan endpoint ringan sebaiknya override"""
+        return {"status": "healthy"}
+    
     def _generate_transaction_code(self) -> str:
         """Generate unique transaction code"""
         import uuid
@@ -46,21 +50,21 @@ class BasePPOBProvider(PPOBProviderInterface):
         return f"TRX{timestamp}{unique_id}"
     
     async def _make_request(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Helper method untuk membuat HTTP request"""
+        """Helper method untuk membuat HTTP request lewat pool koneksi bersama"""
         import aiohttp
-        import asyncio
+        from app.infrastructure.external_apis.http_client import http_client_registry, UpstreamError
         
         url = f"{self.api_url}/{endpoint}"
         headers = self._get_headers()
         
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-                async with session.post(url, json=data, headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        raise Exception(f"API Error: {response.status} - {await response.text()}")
-        except asyncio.TimeoutError:
-            raise Exception("Request timeout")
-        except Exception as e:
+            response = await http_client_registry.post(
+                "ppob", url, json=data, headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        except UpstreamError as e:
             raise Exception(f"Request failed: {str(e)}")
+        
+        if response.status == 200:
+            return response.json()
+        raise Exception(f"API Error: {response.status} - {response.text()}")
@@ -8,9 +8,11 @@ from fastapi import HTTPException, status
 from decimal import Decimal
 
 from app.common.base_classes.base_service import BaseService
-from app.domains.ppob.repositories.ppob_repository import PPOBRepository
+from app.common.exceptions.custom_exceptions import ExternalServiceError
+from app.domains.ppob.repositories.async_ppob_repository import AsyncPPOBRepository
 from app.domains.ppob.models.ppob import PPOBTransaction, TransactionStatus
 from app.domains.ppob.schemas.ppob_schemas import PPOBInquiryRequest, PPOBInquiryResponse, PPOBPaymentRequest
+from app.domains.ppob.services.providers.ppob_provider_factory import PPOBProviderFactory, ppob_provider_factory
 
 # Try to import User from domains
 try:
@@ -18,12 +20,6 @@ try:
 except ImportError:
     User = None
 
-try:
-    from app.services.ppob.providers import DefaultPPOBProvider
-    from app.services.ppob.providers.digiflazz_provider import DigiflazzProvider
-except ImportError:
-    DefaultPPOBProvider = DigiflazzProvider = None
-
 try:
     from app.services.admin_service import AdminConfigService, PPOBMarginService
 except ImportError:
@@ -35,44 +31,17 @@ from app.infrastructure.config.settings import settings
 class PPOBPaymentService(BaseService):
     """Service untuk menangani operasi pembayaran PPOB"""
     
-    def __init__(self, repository: PPOBRepository):
+    def __init__(self, repository: AsyncPPOBRepository, provider_factory: Optional[PPOBProviderFactory] = None):
         super().__init__(repository)
         self.admin_service = AdminConfigService(repository.db) if AdminConfigService else None
         self.margin_service = PPOBMarginService(repository.db) if PPOBMarginService else None
-        self.provider = self._get_provider()
-    
-    def _get_provider(self):
-        """Ambil provider berdasarkan konfigurasi admin (Factory Pattern)"""
-        try:
-            if self.admin_service:
-                provider_config = self.admin_service.get_ppob_provider_config()
-                provider_name = provider_config.get('provider', 'default')
-                
-                if provider_name == 'digiflazz' and DigiflazzProvider:
-                    return DigiflazzProvider(
-                        username=provider_config.get('username'),
-                        api_key=provider_config.get('api_key'),
-                        production=provider_config.get('production', False)
-                    )
-            
-            # Fallback to default provider
-            if DefaultPPOBProvider:
-                return DefaultPPOBProvider()
-            
-            return None
-        except Exception as e:
-            # Log error and return None
-            return None
+        # Semua panggilan provider lewat factory agar routing peak-EWMA dan circuit breaker
+        # melihat inquiry/payment nyata
+        self.provider_factory = provider_factory or ppob_provider_factory
     
     async def inquiry(self, request: PPOBInquiryRequest) -> PPOBInquiryResponse:
-        """Lakukan inquiry ke provider"""
+        """Lakukan inquiry ke provider tercepat yang sehat (failover aman untuk inquiry)"""
         try:
-            if not self.provider:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="PPOB provider not available"
-                )
-            
             # Get product info
             product = await self.repository.get_product_by_code(request.product_code)
             if not product:
@@ -81,37 +50,32 @@ class PPOBPaymentService(BaseService):
                     detail="Product not found"
                 )
             
-            # Call provider inquiry
-            inquiry_result = await self.provider.inquiry(
-                product_code=request.product_code,
-                customer_number=request.customer_number
-            )
-            
-            if not inquiry_result.get('success', False):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=inquiry_result.get('message', 'Inquiry failed')
-                )
+            inquiry_result = await self.provider_factory.inquiry(request)
             
             # Calculate final price with margin
-            base_price = Decimal(str(inquiry_result.get('amount', product.price)))
-            margin = self._calculate_margin(product, base_price)
-            final_price = base_price + margin
+            base_price = Decimal(str(inquiry_result.amount))
+            admin_fee = Decimal(str(inquiry_result.admin_fee))
+            final_price = base_price + self._calculate_margin(product, base_price)
             
             return PPOBInquiryResponse(
-                success=True,
-                product_code=request.product_code,
-                customer_number=request.customer_number,
-                customer_name=inquiry_result.get('customer_name', ''),
+                customer_number=inquiry_result.customer_number,
+                customer_name=inquiry_result.customer_name,
                 amount=final_price,
-                admin_fee=inquiry_result.get('admin_fee', 0),
-                total_amount=final_price + Decimal(str(inquiry_result.get('admin_fee', 0))),
-                message=inquiry_result.get('message', 'Inquiry successful'),
-                ref_id=inquiry_result.get('ref_id', '')
+                admin_fee=admin_fee,
+                total_amount=final_price + admin_fee,
+                product_name=inquiry_result.product_name or product.product_name,
+                ref_id=inquiry_result.ref_id,
+                due_date=inquiry_result.due_date,
+                period=inquiry_result.period
             )
             
         except HTTPException:
             raise
+        except ExternalServiceError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=e.message
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -119,14 +83,8 @@ class PPOBPaymentService(BaseService):
             )
     
     async def process_payment(self, transaction_id: int) -> PPOBTransaction:
-        """Proses pembayaran ke provider"""
+        """Proses pembayaran ke provider (tanpa failover agar tidak terjadi transaksi ganda)"""
         try:
-            if not self.provider:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="PPOB provider not available"
-                )
-            
             # Get transaction
             transaction = await self.repository.get_transaction_by_id(transaction_id)
             if not transaction:
@@ -141,37 +99,19 @@ class PPOBPaymentService(BaseService):
                     detail="Transaction is not in pending status"
                 )
             
-            # Update status to processing
-            await self.repository.update_transaction(transaction_id, {
-                'status': TransactionStatus.PROCESSING
-            })
-            
             try:
-                # Call provider payment
-                payment_result = await self.provider.payment(
-                    product_code=transaction.product_code,
-                    customer_number=transaction.customer_number,
-                    amount=transaction.amount,
-                    ref_id=transaction.reference_id
+                payment_result = await self.provider_factory.payment({
+                    'product_code': transaction.product_code,
+                    'customer_number': transaction.customer_number,
+                    'amount': transaction.total_amount,
+                    'transaction_code': transaction.transaction_code
+                })
+            except ExternalServiceError as e:
+                # Tidak ada provider yang bisa dipakai; transaksi tetap PENDING untuk dicoba lagi
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=e.message
                 )
-                
-                if payment_result.get('success', False):
-                    # Payment successful
-                    updated_transaction = await self.repository.update_transaction(transaction_id, {
-                        'status': TransactionStatus.SUCCESS,
-                        'provider_ref_id': payment_result.get('provider_ref_id'),
-                        'serial_number': payment_result.get('serial_number'),
-                        'notes': payment_result.get('message', 'Payment successful')
-                    })
-                else:
-                    # Payment failed
-                    updated_transaction = await self.repository.update_transaction(transaction_id, {
-                        'status': TransactionStatus.FAILED,
-                        'notes': payment_result.get('message', 'Payment failed')
-                    })
-                
-                return updated_transaction
-                
             except Exception as provider_error:
                 # Provider error, mark as failed
                 await self.repository.update_transaction(transaction_id, {
@@ -182,6 +122,27 @@ class PPOBPaymentService(BaseService):
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"Payment processing failed: {str(provider_error)}"
                 )
+            
+            payment_status = payment_result.get('status')
+            if payment_status == 'success':
+                update_data = {
+                    'status': TransactionStatus.SUCCESS,
+                    'provider_ref': payment_result.get('sn') or payment_result.get('transaction_id'),
+                    'notes': payment_result.get('message', 'Payment successful')
+                }
+            elif payment_status == 'pending':
+                # Status final menyusul lewat callback provider
+                update_data = {
+                    'provider_ref': payment_result.get('transaction_id'),
+                    'notes': payment_result.get('message', 'Payment pending')
+                }
+            else:
+                update_data = {
+                    'status': TransactionStatus.FAILED,
+                    'notes': payment_result.get('message', 'Payment failed')
+                }
+            
+            return await self.repository.update_transaction(transaction_id, update_data)
                 
         except HTTPException:
             raise
@@ -213,12 +174,6 @@ class PPOBPaymentService(BaseService):
     async def check_transaction_status(self, transaction_id: int) -> Dict[str, Any]:
         """Cek status transaksi dari provider"""
         try:
-            if not self.provider:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="PPOB provider not available"
-                )
-            
             transaction = await self.repository.get_transaction_by_id(transaction_id)
             if not transaction:
                 raise HTTPException(
@@ -226,10 +181,20 @@ class PPOBPaymentService(BaseService):
                     detail="Transaction not found"
                 )
             
+            provider = await self.provider_factory.get_provider()
+            if not provider:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="PPOB provider not available"
+                )
+            if not hasattr(provider, 'check_status'):
+                raise HTTPException(
+                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                    detail="Provider does not support status check"
+                )
+            
             # Check status from provider
-            status_result = await self.provider.check_status(
-                ref_id=transaction.reference_id
-            )
+            status_result = await provider.check_status(ref_id=transaction.transaction_code)
             
             return {
                 'transaction_id': transaction_id,
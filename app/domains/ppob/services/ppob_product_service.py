@@ -7,7 +7,7 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 
 from app.common.base_classes.base_service import BaseService
-from app.domains.ppob.repositories.ppob_repository import PPOBRepository
+from app.domains.ppob.repositories.async_ppob_repository import AsyncPPOBRepository
 from app.domains.ppob.models.ppob import PPOBProduct, PPOBCategory
 
 try:
@@ -19,7 +19,7 @@ except ImportError:
 class PPOBProductService(BaseService):
     """Service untuk menangani operasi produk PPOB"""
     
-    def __init__(self, repository: PPOBRepository):
+    def __init__(self, repository: AsyncPPOBRepository):
         super().__init__(repository)
     
     async def get_products_by_category(self, category: PPOBCategory) -> List[PPOBProduct]:
@@ -36,7 +36,10 @@ class PPOBProductService(BaseService):
             
             # Cache the result
             if ppob_cache_manager and products:
-                await ppob_cache_manager.set(cache_key, products, ttl=300)  # 5 minutes
+                await ppob_cache_manager.set(
+                    cache_key, products, ttl=300,  # 5 minutes
+                    tags=[ppob_cache_manager.category_tag(category.code)]
+                )
             
             return products
         except Exception as e:
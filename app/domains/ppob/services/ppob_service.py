@@ -8,7 +8,7 @@ from fastapi import HTTPException, status
 from decimal import Decimal
 
 from app.common.base_classes.base_service import BaseService
-from app.domains.ppob.repositories.ppob_repository import PPOBRepository
+from app.domains.ppob.repositories.async_ppob_repository import AsyncPPOBRepository
 from app.domains.ppob.models.ppob import PPOBTransaction, PPOBProduct, PPOBCategory, TransactionStatus
 from app.domains.ppob.schemas.ppob_schemas import (
     PPOBInquiryRequest, PPOBInquiryResponse, PPOBPaymentRequest,
@@ -33,7 +33,7 @@ class PPOBService(BaseService):
     Menggunakan composition pattern untuk memisahkan tanggung jawab.
     """
     
-    def __init__(self, repository: PPOBRepository):
+    def __init__(self, repository: AsyncPPOBRepository):
         super().__init__(repository)
         
         # Initialize sub-services
@@ -76,7 +76,12 @@ class PPOBService(BaseService):
         return await self.payment_service.check_transaction_status(transaction_id)
     
     # Transaction operations - delegate to transaction service
-    async def create_transaction(self, user: User, request: PPOBPaymentRequest) -> PPOBTransaction:
+    async def create_transaction(
+        self,
+        user: User,
+        request: PPOBPaymentRequest,
+        ip_address: Optional[str] = None
+    ) -> PPOBTransaction:
         """Buat transaksi baru"""
         # Convert payment request to transaction create
         transaction_data = PPOBTransactionCreate(
@@ -85,9 +90,9 @@ class PPOBService(BaseService):
             amount=request.amount,
             notes=getattr(request, 'notes', None)
         )
-        return await self.transaction_service.create_transaction(user, transaction_data)
+        return await self.transaction_service.create_transaction(user, transaction_data, ip_address)
     
-    def get_user_transactions(
+    async def get_user_transactions(
         self, 
         user_id: int, 
         status: Optional[TransactionStatus] = None,
@@ -95,15 +100,25 @@ class PPOBService(BaseService):
         offset: int = 0
     ) -> List[PPOBTransaction]:
         """Ambil transaksi user"""
-        return self.transaction_service.get_user_transactions(user_id, status, limit, offset)
+        return await self.transaction_service.get_user_transactions(user_id, status, limit, offset)
+    
+    async def get_user_transactions_page(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        transaction_status: Optional[TransactionStatus] = None
+    ) -> Dict[str, Any]:
+        """Ambil transaksi user dengan keyset pagination"""
+        return await self.transaction_service.get_user_transactions_page(user_id, cursor, limit, transaction_status)
     
-    def get_transaction_by_id(self, transaction_id: int) -> Optional[PPOBTransaction]:
+    async def get_transaction_by_id(self, transaction_id: int) -> Optional[PPOBTransaction]:
         """Ambil transaksi berdasarkan ID"""
-        return self.transaction_service.get_transaction_by_id(transaction_id)
+        return await self.transaction_service.get_transaction_by_id(transaction_id)
     
-    def get_transaction_stats(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+    async def get_transaction_stats(self, user_id: Optional[int] = None) -> Dict[str, Any]:
         """Ambil statistik transaksi"""
-        return self.transaction_service.get_transaction_stats(user_id)
+        return await self.transaction_service.get_transaction_stats(user_id)
     
     async def update_transaction_status(
         self, 
@@ -8,7 +8,9 @@ from fastapi import HTTPException, status
 from decimal import Decimal
 
 from app.common.base_classes.base_service import BaseService
-from app.domains.ppob.repositories.ppob_repository import PPOBRepository
+from app.common.exceptions.custom_exceptions import ValidationException
+from app.domains.security.services.fraud_feature_store import fraud_feature_store
+from app.domains.ppob.repositories.async_ppob_repository import AsyncPPOBRepository
 from app.domains.ppob.models.ppob import PPOBTransaction, TransactionStatus
 from app.domains.ppob.schemas.ppob_schemas import PPOBTransactionCreate, PPOBTransactionUpdate
 
@@ -27,11 +29,16 @@ except ImportError:
 class PPOBTransactionService(BaseService):
     """Service untuk menangani operasi transaksi PPOB"""
     
-    def __init__(self, repository: PPOBRepository):
+    def __init__(self, repository: AsyncPPOBRepository):
         super().__init__(repository)
     
-    async def create_transaction(self, user: User, transaction_data: PPOBTransactionCreate) -> PPOBTransaction:
-        """Buat transaksi baru"""
+    async def create_transaction(
+        self,
+        user: User,
+        transaction_data: PPOBTransactionCreate,
+        ip_address: Optional[str] = None
+    ) -> PPOBTransaction:
+        """Buat transaksi baru; ip_address request (bila ada) ikut dicatat ke fitur fraud per IP"""
         try:
             # Validate user balance if needed
             if hasattr(user, 'balance') and user.balance < transaction_data.amount:
@@ -46,10 +53,11 @@ class PPOBTransactionService(BaseService):
                 'user_id': user.id,
                 'status': TransactionStatus.PENDING
             })
+            fraud_feature_store.record_transaction(user.id, transaction_data.amount, ip_address)
             
             # Clear cache
             if ppob_cache_manager:
-                await ppob_cache_manager.delete_pattern(f"user_transactions_{user.id}*")
+                await ppob_cache_manager.invalidate_user_cache(user.id)
             
             return transaction
         except HTTPException:
@@ -60,7 +68,7 @@ class PPOBTransactionService(BaseService):
                 detail=f"Error creating transaction: {str(e)}"
             )
     
-    def get_user_transactions(
+    async def get_user_transactions(
         self, 
         user_id: int, 
         status: Optional[TransactionStatus] = None,
@@ -69,7 +77,7 @@ class PPOBTransactionService(BaseService):
     ) -> List[PPOBTransaction]:
         """Ambil transaksi user"""
         try:
-            return self.repository.get_user_transactions(
+            return await self.repository.get_user_transactions(
                 user_id=user_id,
                 status=status,
                 limit=limit,
@@ -81,20 +89,43 @@ class PPOBTransactionService(BaseService):
                 detail=f"Error getting user transactions: {str(e)}"
             )
     
-    def get_transaction_by_id(self, transaction_id: int) -> Optional[PPOBTransaction]:
+    async def get_user_transactions_page(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        transaction_status: Optional[TransactionStatus] = None
+    ) -> Dict[str, Any]:
+        """Ambil transaksi user dengan keyset pagination ({'items', 'pagination'})"""
+        try:
+            return await self.repository.get_user_transactions_page(
+                user_id=user_id,
+                cursor=cursor,
+                limit=limit,
+                status=transaction_status
+            )
+        except ValidationException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error getting user transactions: {str(e)}"
+            )
+    
+    async def get_transaction_by_id(self, transaction_id: int) -> Optional[PPOBTransaction]:
         """Ambil transaksi berdasarkan ID"""
         try:
-            return self.repository.get_transaction_by_id(transaction_id)
+            return await self.repository.get_transaction_by_id(transaction_id)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error getting transaction: {str(e)}"
             )
     
-    def get_transaction_stats(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+    async def get_transaction_stats(self, user_id: Optional[int] = None) -> Dict[str, Any]:
         """Ambil statistik transaksi"""
         try:
-            return self.repository.get_transaction_stats(user_id)
+            return await self.repository.get_transaction_stats(user_id)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -127,7 +158,7 @@ class PPOBTransactionService(BaseService):
             
             # Clear cache
             if ppob_cache_manager:
-                await ppob_cache_manager.delete_pattern(f"user_transactions_{transaction.user_id}*")
+                await ppob_cache_manager.invalidate_user_cache(transaction.user_id)
             
             return updated_transaction
         except HTTPException:
@@ -189,7 +220,10 @@ class PPOBTransactionService(BaseService):
             
             # Cache the result
             if ppob_cache_manager and history:
-                await ppob_cache_manager.set(cache_key, history, ttl=300)  # 5 minutes
+                await ppob_cache_manager.set(
+                    cache_key, history, ttl=300,  # 5 minutes
+                    tags=[ppob_cache_manager.user_tag(user_id)]
+                )
             
             return history
         except Exception as e:
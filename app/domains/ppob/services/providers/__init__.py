@@ -4,6 +4,8 @@ untuk meningkatkan maintainability dan mengikuti prinsip Single Responsibility.
 """
 
 from .provider_config import ProviderConfig, ProviderStatus
+from .provider_circuit_breaker import ProviderCircuitBreaker, CircuitState
+from .provider_latency import PeakEwmaLatency
 from .provider_health_monitor import ProviderHealthMonitor
 from .provider_load_balancer import ProviderLoadBalancer
 from .ppob_provider_factory import PPOBProviderFactory
@@ -11,6 +13,9 @@ from .ppob_provider_factory import PPOBProviderFactory
 __all__ = [
     'ProviderConfig',
     'ProviderStatus',
+    'ProviderCircuitBreaker',
+    'CircuitState',
+    'PeakEwmaLatency',
     'ProviderHealthMonitor',
     'ProviderLoadBalancer',
     'PPOBProviderFactory'
@@ -22,13 +27,17 @@ __all__ = [
 # - Mengelola konfigurasi dan status provider
 # - Enum untuk status provider (HEALTHY, UNHEALTHY, MAINTENANCE, DISABLED)
 
+# ProviderCircuitBreaker & PeakEwmaLatency
+# - Circuit breaker per provider (closed/open/half-open dengan probe)
+# - Estimasi latency peak-EWMA dari timing inquiry/payment/health check nyata
+
 # ProviderHealthMonitor
-# - Melakukan health check pada provider
+# - Melakukan health check pada provider secara bersamaan dan terjadwal
 # - Monitoring kesehatan dan update status provider
 
 # ProviderLoadBalancer
 # - Implementasi load balancing strategies
-# - Strategy pattern untuk pemilihan provider (priority, round_robin, least_errors, random)
+# - Strategy pattern untuk pemilihan provider (priority, round_robin, least_errors, random, ewma, p2c)
 
 # PPOBProviderFactory
 # - Factory pattern untuk mengelola multiple provider
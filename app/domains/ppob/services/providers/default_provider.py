@@ -1,6 +1,6 @@
 from typing import Dict, Any
-from app.services.ppob.base import BasePPOBProvider
-from app.schemas.ppob import PPOBInquiryResponse, PPOBInquiryRequest
+from app.domains.ppob.services.base import BasePPOBProvider
+from app.domains.ppob.schemas.ppob_schemas import PPOBInquiryResponse, PPOBInquiryRequest
 from app.domains.ppob.models.ppob import PPOBCategory
 import asyncio
 
@@ -1,10 +1,10 @@
 import aiohttp
-import asyncio
 from typing import Dict, Any, List
-from app.services.ppob.base import BasePPOBProvider
-from app.schemas.ppob import PPOBInquiryResponse, PPOBInquiryRequest
+from app.domains.ppob.services.base import BasePPOBProvider
+from app.domains.ppob.schemas.ppob_schemas import PPOBInquiryResponse, PPOBInquiryRequest
 from app.domains.ppob.models.ppob import PPOBCategory
 from app.core.config import settings
+from app.infrastructure.external_apis.http_client import http_client_registry, UpstreamError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -133,33 +133,29 @@ class DigiflazzProvider(BasePPOBProvider):
             return result
             
         except Exception as e:
+            # Error transport/HTTP diteruskan agar factory mencatatnya sebagai kegagalan provider
             logger.error(f"Digiflazz payment error: {str(e)}")
-            return {
-                "transaction_id": request.get("transaction_code", ""),
-                "status": "failed",
-                "message": f"Pembayaran gagal: {str(e)}"
-            }
+            raise
     
     async def _make_digiflazz_request(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Helper method untuk membuat HTTP request ke Digiflazz"""
+        """Helper method untuk membuat HTTP request ke Digiflazz lewat pool koneksi bersama"""
         url = f"{self.base_url}/{endpoint}"
         headers = self._get_headers()
         
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-                async with session.post(url, json=data, headers=headers) as response:
-                    response_text = await response.text()
-                    logger.info(f"Digiflazz API response: {response.status} - {response_text}")
-                    
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        raise Exception(f"API Error: {response.status} - {response_text}")
-                        
-        except asyncio.TimeoutError:
-            raise Exception("Request timeout")
-        except Exception as e:
+            response = await http_client_registry.post(
+                "digiflazz", url, json=data, headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        except UpstreamError as e:
             raise Exception(f"Request failed: {str(e)}")
+        
+        response_text = response.text()
+        logger.info(f"Digiflazz API response: {response.status} - {response_text}")
+        
+        if response.status == 200:
+            return response.json()
+        raise Exception(f"API Error: {response.status} - {response_text}")
     
     def get_supported_categories(self) -> List[PPOBCategory]:
         """Kategori yang didukung Digiflazz"""
@@ -172,6 +168,14 @@ class DigiflazzProvider(BasePPOBProvider):
             PPOBCategory.MULTIFINANCE
         ]
     
+    async def health_check(self) -> Dict[str, Any]:
+        """Health check memakai endpoint cek saldo (ringan, tanpa transaksi)"""
+        try:
+            await self.get_balance()
+            return {"status": "healthy"}
+        except Exception as e:
+            return {"status": "unhealthy", "error": str(e)}
+    
     async def get_balance(self) -> Dict[str, Any]:
         """Cek saldo Digiflazz"""
         try:
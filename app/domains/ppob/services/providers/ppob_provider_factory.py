@@ -1,9 +1,12 @@
-from typing import Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 import logging
+import time
 
-from app.services.ppob.base import PPOBProviderInterface
-from app.services.ppob.providers.digiflazz_provider import DigiflazzProvider
-from app.services.ppob.providers.default_provider import DefaultPPOBProvider
+from app.common.exceptions.custom_exceptions import ExternalServiceError
+from app.domains.ppob.services.base import PPOBProviderInterface
+from app.infrastructure.config.settings import settings
+from .digiflazz_provider import DigiflazzProvider
+from .default_provider import DefaultPPOBProvider
 
 from .provider_config import ProviderConfig, ProviderStatus
 from .provider_health_monitor import ProviderHealthMonitor
@@ -30,16 +33,17 @@ class PPOBProviderFactory:
     
     def _setup_default_providers(self):
         """Setup provider default"""
-        # Digiflazz Provider
+        # Digiflazz Provider (aktif hanya bila kredensial dikonfigurasi)
         self.register_provider(
             name="digiflazz",
             provider_class=DigiflazzProvider,
             priority=1,
             config={
-                "username": "",
-                "api_key": "",
-                "production": False
-            }
+                "username": settings.DIGIFLAZZ_USERNAME,
+                "api_key": settings.DIGIFLAZZ_API_KEY,
+                "production": settings.DIGIFLAZZ_PRODUCTION
+            },
+            is_active=bool(settings.DIGIFLAZZ_USERNAME and settings.DIGIFLAZZ_API_KEY)
         )
         
         # Default Provider (fallback)
@@ -83,6 +87,7 @@ class PPOBProviderFactory:
             return False
         
         self.providers[name].config.update(config)
+        self.providers[name].invalidate_instance()
         self.logger.info(f"Provider {name} config updated")
         return True
     
@@ -92,8 +97,7 @@ class PPOBProviderFactory:
             return False
         
         self.providers[name].is_active = True
-        self.providers[name].status = ProviderStatus.HEALTHY
-        self.providers[name].error_count = 0
+        self.providers[name].reset_errors()
         self.logger.info(f"Provider {name} enabled")
         return True
     
@@ -119,8 +123,7 @@ class PPOBProviderFactory:
             return None
         
         try:
-            # Create provider instance
-            provider = selected_config.provider_class(**selected_config.config)
+            provider = selected_config.get_instance()
             self.logger.info(f"Selected provider: {selected_config.name}")
             return provider
         except Exception as e:
@@ -141,13 +144,67 @@ class PPOBProviderFactory:
             return None
         
         try:
-            provider = config.provider_class(**config.config)
-            return provider
+            return config.get_instance()
         except Exception as e:
             self.logger.error(f"Error creating provider {name}: {e}")
             config.increment_error()
             return None
     
+    async def execute(
+        self,
+        operation: str,
+        *args,
+        strategy: str = "p2c",
+        failover: bool = False,
+        **kwargs
+    ) -> Any:
+        """
+        Jalankan operasi provider (mis. "inquiry", "payment") lewat load balancer.
+        Durasi dan hasil setiap panggilan dicatat ke peak-EWMA dan circuit breaker provider
+        sehingga routing mengikuti provider sehat tercepat. failover=True mencoba provider
+        berikutnya bila gagal; jangan dipakai untuk operasi yang tidak idempoten.
+        """
+        tried = set()
+        last_error: Optional[Exception] = None
+        while True:
+            candidates = [config for name, config in self.providers.items() if name not in tried]
+            config = self.load_balancer.select_provider(candidates, strategy)
+            if config is None or not config.circuit_breaker.acquire():
+                break
+            tried.add(config.name)
+            
+            config.latency.start()
+            started = time.perf_counter()
+            try:
+                result = await getattr(config.get_instance(), operation)(*args, **kwargs)
+            except Exception as e:
+                self.load_balancer.record_result(config, (time.perf_counter() - started) * 1000, False)
+                self.logger.warning(f"Provider {config.name} {operation} failed: {e}")
+                last_error = e
+                if not failover:
+                    raise
+                continue
+            finally:
+                config.latency.finish()
+            
+            self.load_balancer.record_result(config, (time.perf_counter() - started) * 1000, True)
+            return result
+        
+        raise ExternalServiceError(
+            f"Tidak ada provider PPOB yang tersedia untuk {operation}"
+            + (f": {last_error}" if last_error else ""),
+            service_name="ppob",
+            status_code=503
+        )
+    
+    async def inquiry(self, request, strategy: str = "p2c") -> Any:
+        """Inquiry lewat provider tercepat; aman di-failover karena tidak mengubah saldo"""
+        return await self.execute("inquiry", request, strategy=strategy, failover=True)
+    
+    async def payment(self, request: Dict[str, Any], strategy: str = "p2c") -> Any:
+        """Payment lewat provider tercepat tanpa failover (hindari transaksi ganda)"""
+        return await self.execute("payment", request, strategy=strategy)
+    
     def get_provider_list(self) -> List[Dict]:
         """Ambil daftar semua provider"""
         return [config.to_dict() for config in self.providers.values()]
@@ -160,9 +217,16 @@ class PPOBProviderFactory:
         ]
     
     async def health_check_all(self) -> Dict[str, bool]:
-        """Lakukan health check untuk semua provider"""
+        """Lakukan health check untuk semua provider (bersamaan)"""
         return await self.health_monitor.perform_health_checks(self.providers)
     
+    def start_health_checks(self) -> None:
+        """Jalankan health check terjadwal di background (dipanggil dari startup aplikasi)"""
+        self.health_monitor.start(self.providers)
+    
+    async def stop_health_checks(self) -> None:
+        await self.health_monitor.stop()
+    
     def get_health_summary(self) -> Dict:
         """Ambil ringkasan kesehatan provider"""
         return self.health_monitor.get_health_summary(self.providers)
@@ -194,3 +258,7 @@ class PPOBProviderFactory:
         config.status = ProviderStatus.MAINTENANCE
         self.logger.info(f"Provider {name} set to maintenance. Reason: {reason}")
         return True
+
+
+# Global instance
+ppob_provider_factory = PPOBProviderFactory()
@@ -0,0 +1,90 @@
+from enum import Enum
+from typing import Callable, Dict
+import logging
+import time
+
+
+class CircuitState(Enum):
+    """State circuit breaker provider"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ProviderCircuitBreaker:
+    """
+    Circuit breaker per provider - Single Responsibility: Isolasi provider yang gagal
+
+    CLOSED: semua request lewat. Setelah failure_threshold kegagalan berturut-turut
+    menjadi OPEN dan provider dilewati selama recovery_timeout detik. Setelah itu
+    HALF_OPEN: maksimal half_open_max_probes request (transaksi nyata atau health check)
+    boleh lewat sebagai probe; sukses menutup circuit, gagal membukanya lagi.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_probes = half_open_max_probes
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def state(self) -> CircuitState:
+        """State saat ini; OPEN berpindah ke HALF_OPEN setelah recovery_timeout"""
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+        return self._state
+
+    def allows_request(self) -> bool:
+        """Apakah request boleh dikirim (tanpa memesan slot probe)"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN:
+            return self._probes_in_flight < self.half_open_max_probes
+        return False
+
+    def acquire(self) -> bool:
+        """Pesan izin request; di HALF_OPEN memakai satu slot probe"""
+        if not self.allows_request():
+            return False
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes_in_flight += 1
+        return True
+
+    def record_success(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            self.logger.info("Circuit breaker CLOSED after successful probe")
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._probes_in_flight = 0
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != CircuitState.OPEN:
+                self.logger.warning(f"Circuit breaker OPEN after {self._consecutive_failures} consecutive failures")
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            self._probes_in_flight = 0
+
+    def reset(self) -> None:
+        """Tutup circuit secara manual (mis. saat provider di-enable admin)"""
+        self.record_success()
+
+    def to_dict(self) -> Dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._consecutive_failures
+        }
@@ -2,7 +2,9 @@ from typing import Dict, Type
 from enum import Enum
 from datetime import datetime
 
-from app.services.ppob.base import PPOBProviderInterface
+from app.domains.ppob.services.base import PPOBProviderInterface
+from .provider_circuit_breaker import ProviderCircuitBreaker
+from .provider_latency import PeakEwmaLatency
 
 
 class ProviderStatus(Enum):
@@ -34,6 +36,20 @@ class ProviderConfig:
         self.last_health_check = None
         self.error_count = 0
         self.max_errors = 5
+        
+        # Diisi dari timing inquiry/payment/health check nyata
+        self.latency = PeakEwmaLatency()
+        self.circuit_breaker = ProviderCircuitBreaker(failure_threshold=self.max_errors)
+        self._instance = None
+    
+    def get_instance(self) -> PPOBProviderInterface:
+        """Instance provider dipakai ulang (pool koneksi ikut dipakai ulang), dibuat ulang bila config berubah"""
+        if self._instance is None:
+            self._instance = self.provider_class(**self.config)
+        return self._instance
+    
+    def invalidate_instance(self) -> None:
+        self._instance = None
     
     def to_dict(self) -> Dict:
         """Convert config to dictionary"""
@@ -45,14 +61,17 @@ class ProviderConfig:
             "status": self.status.value,
             "last_health_check": self.last_health_check.isoformat() if self.last_health_check else None,
             "error_count": self.error_count,
-            "max_errors": self.max_errors
+            "max_errors": self.max_errors,
+            "latency": self.latency.to_dict(),
+            "circuit_breaker": self.circuit_breaker.to_dict()
         }
     
     def is_available(self) -> bool:
         """Check if provider is available for use"""
         return (
             self.is_active and 
-            self.status in [ProviderStatus.HEALTHY, ProviderStatus.MAINTENANCE]
+            self.status in [ProviderStatus.HEALTHY, ProviderStatus.MAINTENANCE] and
+            self.circuit_breaker.allows_request()
         )
     
     def increment_error(self) -> None:
@@ -65,3 +84,4 @@ class ProviderConfig:
         """Reset error count and set status to healthy"""
         self.error_count = 0
         self.status = ProviderStatus.HEALTHY
+        self.circuit_breaker.reset()
@@ -1,8 +1,11 @@
-from typing import Dict
+from typing import Dict, Optional
+import asyncio
 import logging
+import time
 from datetime import datetime
 
-from app.services.ppob.base import PPOBProviderInterface
+from app.domains.ppob.services.base import PPOBProviderInterface
+from app.infrastructure.config.settings import settings
 from .provider_config import ProviderConfig, ProviderStatus
 
 
@@ -11,8 +14,11 @@ class ProviderHealthMonitor:
     Monitor kesehatan provider - Single Responsibility: Health monitoring
     """
     
-    def __init__(self):
+    def __init__(self, interval: float = None, timeout: float = None):
         self.logger = logging.getLogger(__name__)
+        self.interval = interval if interval is not None else settings.PPOB_HEALTH_CHECK_INTERVAL
+        self.timeout = timeout if timeout is not None else settings.PPOB_HEALTH_CHECK_TIMEOUT
+        self._task: Optional[asyncio.Task] = None
     
     async def check_provider_health(self, provider: PPOBProviderInterface) -> bool:
         """Cek kesehatan provider"""
@@ -42,29 +48,67 @@ class ProviderHealthMonitor:
                 config.status = ProviderStatus.UNHEALTHY
     
     async def perform_health_checks(self, configs: Dict[str, ProviderConfig]) -> Dict[str, bool]:
-        """Perform health checks on all providers"""
-        results = {}
+        """
+        Health check semua provider secara bersamaan (asyncio.gather) dengan timeout per provider.
+        Instance provider dipakai ulang; latency health check ikut mengisi peak-EWMA dan
+        hasilnya menjadi probe half-open untuk circuit breaker.
+        """
+        names = list(configs)
+        checks = [self._check_one(configs[name]) for name in names]
+        return dict(zip(names, await asyncio.gather(*checks)))
+    
+    async def _check_one(self, config: ProviderConfig) -> bool:
+        if not config.is_active:
+            return False
         
-        for name, config in configs.items():
-            if not config.is_active:
-                results[name] = False
-                continue
-            
+        is_probe = config.circuit_breaker.acquire()
+        started = time.perf_counter()
+        try:
+            provider = config.get_instance()
+            is_healthy = await asyncio.wait_for(self.check_provider_health(provider), self.timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Health check for {config.name} timed out after {self.timeout}s")
+            is_healthy = False
+        except Exception as e:
+            self.logger.error(f"Error during health check for {config.name}: {e}")
+            is_healthy = False
+        
+        config.latency.observe((time.perf_counter() - started) * 1000)
+        if is_probe:
+            if is_healthy:
+                config.circuit_breaker.record_success()
+            else:
+                config.circuit_breaker.record_failure()
+        
+        await self.update_provider_status(config, is_healthy)
+        self.logger.info(f"Health check for {config.name}: {'PASS' if is_healthy else 'FAIL'}")
+        return is_healthy
+    
+    def start(self, configs: Dict[str, ProviderConfig]) -> None:
+        """Jalankan health check terjadwal di background (sekali per event loop)"""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run(configs))
+    
+    async def _run(self, configs: Dict[str, ProviderConfig]) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
             try:
-                # Create provider instance for health check
-                provider = config.provider_class(**config.config)
-                is_healthy = await self.check_provider_health(provider)
-                await self.update_provider_status(config, is_healthy)
-                results[name] = is_healthy
-                
-                self.logger.info(f"Health check for {name}: {'PASS' if is_healthy else 'FAIL'}")
-                
+                await self.perform_health_checks(configs)
             except Exception as e:
-                self.logger.error(f"Error during health check for {name}: {e}")
-                await self.update_provider_status(config, False)
-                results[name] = False
-        
-        return results
+                self.logger.error(f"Scheduled provider health check failed: {e}")
+    
+    async def stop(self) -> None:
+        """Hentikan health check terjadwal"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
     
     def get_health_summary(self, configs: Dict[str, ProviderConfig]) -> Dict:
         """Get summary of provider health status"""
@@ -83,7 +127,9 @@ class ProviderHealthMonitor:
                 "status": status,
                 "error_count": config.error_count,
                 "last_health_check": config.last_health_check.isoformat() if config.last_health_check else None,
-                "is_active": config.is_active
+                "is_active": config.is_active,
+                "latency": config.latency.to_dict(),
+                "circuit_breaker": config.circuit_breaker.to_dict()
             }
             
             # Count by status
@@ -112,6 +158,5 @@ class ProviderHealthMonitor:
     async def enable_provider(self, config: ProviderConfig) -> None:
         """Enable provider and reset status"""
         config.is_active = True
-        config.status = ProviderStatus.HEALTHY
-        config.error_count = 0
+        config.reset_errors()
         self.logger.info(f"Provider {config.name} enabled")
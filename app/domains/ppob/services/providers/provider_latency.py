@@ -0,0 +1,58 @@
+from typing import Callable, Dict
+import math
+import time
+
+
+class PeakEwmaLatency:
+    """
+    Estimasi latency provider dengan peak-EWMA - Single Responsibility: Latency tracking
+
+    Sampel yang lebih lambat dari estimasi langsung dipakai (peak), sampel lebih cepat
+    di-decay secara eksponensial dengan konstanta waktu decay_seconds. Dengan begitu
+    lonjakan latency segera menjauhkan trafik, sementara pemulihan diakui bertahap.
+    cost() mengalikan estimasi dengan jumlah request in-flight + 1 sehingga provider
+    yang sedang antri ikut terhindari.
+    """
+
+    def __init__(
+        self,
+        initial_ms: float = 0.0,
+        decay_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ewma_ms = initial_ms
+        self.decay_seconds = decay_seconds
+        self.in_flight = 0
+        self.samples = 0
+        self._clock = clock
+        self._last_update = clock()
+
+    def start(self) -> None:
+        self.in_flight += 1
+
+    def finish(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def observe(self, latency_ms: float) -> None:
+        """Masukkan satu sampel latency (ms) dari inquiry/payment/health check"""
+        now = self._clock()
+        if self.samples == 0 or latency_ms > self.ewma_ms:
+            self.ewma_ms = latency_ms
+        else:
+            weight = math.exp(-(now - self._last_update) / self.decay_seconds)
+            self.ewma_ms = self.ewma_ms * weight + latency_ms * (1 - weight)
+        self._last_update = now
+        self.samples += 1
+
+    def cost(self) -> float:
+        # Provider yang belum pernah terukur dicoba dulu agar latency-nya diketahui
+        if self.samples == 0:
+            return float(self.in_flight)
+        return self.ewma_ms * (self.in_flight + 1)
+
+    def to_dict(self) -> Dict:
+        return {
+            "ewma_ms": round(self.ewma_ms, 2),
+            "in_flight": self.in_flight,
+            "samples": self.samples
+        }
@@ -1,5 +1,6 @@
 from typing import List, Optional
 import logging
+import random
 
 from .provider_config import ProviderConfig, ProviderStatus
 
@@ -21,11 +22,8 @@ class ProviderLoadBalancer:
         """
         Pilih provider berdasarkan strategi - Strategy Pattern
         """
-        # Filter provider yang aktif dan sehat
-        available_providers = [
-            p for p in providers 
-            if p.is_active and p.status == ProviderStatus.HEALTHY
-        ]
+        # Filter provider yang aktif, sehat dan circuit breaker-nya mengizinkan request
+        available_providers = self.get_available_providers(providers)
         
         if not available_providers:
             self.logger.error("No healthy providers available")
@@ -39,6 +37,10 @@ class ProviderLoadBalancer:
             return self._select_least_errors(available_providers)
         elif strategy == "random":
             return self._select_random(available_providers)
+        elif strategy == "ewma":
+            return self._select_lowest_latency(available_providers)
+        elif strategy == "p2c":
+            return self._select_power_of_two(available_providers)
         else:
             return available_providers[0]
     
@@ -66,14 +68,37 @@ class ProviderLoadBalancer:
     
     def _select_random(self, providers: List[ProviderConfig]) -> ProviderConfig:
         """Pilih provider secara random"""
-        import random
         return random.choice(providers)
     
+    def _select_lowest_latency(self, providers: List[ProviderConfig]) -> ProviderConfig:
+        """Pilih provider dengan cost peak-EWMA terendah (latency x beban in-flight)"""
+        return min(providers, key=lambda p: (p.latency.cost(), p.priority))
+    
+    def _select_power_of_two(self, providers: List[ProviderConfig]) -> ProviderConfig:
+        """
+        Power-of-two-choices: ambil dua provider acak dan pakai yang cost peak-EWMA-nya
+        lebih rendah. Menghindari semua request menumpuk ke satu provider tercepat.
+        """
+        if len(providers) < 3:
+            return self._select_lowest_latency(providers)
+        first, second = random.sample(providers, 2)
+        return self._select_lowest_latency([first, second])
+    
+    def record_result(self, provider: ProviderConfig, latency_ms: float, success: bool) -> None:
+        """Masukkan timing nyata inquiry/payment ke estimasi latency dan circuit breaker"""
+        provider.latency.observe(latency_ms)
+        if success:
+            provider.circuit_breaker.record_success()
+        else:
+            # Status UNHEALTHY tetap diatur health monitor; isolasi cepat lewat circuit breaker
+            provider.circuit_breaker.record_failure()
+            provider.error_count += 1
+    
     def get_available_providers(self, providers: List[ProviderConfig]) -> List[ProviderConfig]:
         """Get list of available providers"""
         return [
             p for p in providers 
-            if p.is_active and p.status == ProviderStatus.HEALTHY
+            if p.is_active and p.status == ProviderStatus.HEALTHY and p.circuit_breaker.allows_request()
         ]
     
     def get_provider_weights(self, providers: List[ProviderConfig]) -> dict:
@@ -97,8 +122,6 @@ class ProviderLoadBalancer:
     
     def select_weighted_provider(self, providers: List[ProviderConfig]) -> Optional[ProviderConfig]:
         """Select provider based on weighted random selection"""
-        import random
-        
         available_providers = self.get_available_providers(providers)
         if not available_providers:
             return None
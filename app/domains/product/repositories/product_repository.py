@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, bindparam, select, update
 from app.common.base_classes.base_repository import BaseRepository
 from app.domains.product.models.product import Product, ProductStatus
 
@@ -130,3 +130,52 @@ class ProductRepository:
         ).update({"status": status}, synchronize_session=False)
         self.db.commit()
         return updated
+    
+    # Batas jumlah parameter per IN (...) agar aman untuk semua driver
+    IN_CHUNK_SIZE = 1000
+    
+    def get_price_rows(self, product_ids: List[int], codes: List[str]) -> List[dict]:
+        """Ambil kolom harga untuk banyak produk sekaligus (tanpa memuat objek ORM)"""
+        columns = (Product.id, Product.code, Product.category, Product.base_price,
+                   Product.selling_price, Product.admin_fee)
+        rows = []
+        for column, values in ((Product.id, list(set(product_ids))), (Product.code, list(set(codes)))):
+            for start in range(0, len(values), self.IN_CHUNK_SIZE):
+                chunk = values[start:start + self.IN_CHUNK_SIZE]
+                rows.extend(self.db.execute(select(*columns).where(column.in_(chunk))).mappings().all())
+        return [dict(row) for row in rows]
+    
+    def bulk_update_prices(self, rows: List[Dict]) -> int:
+        """
+        Update harga banyak produk dalam satu transaksi dengan satu statement executemany.
+        Setiap row berisi id, base_price, selling_price, admin_fee dan margin.
+        """
+        if not rows:
+            return 0
+        statement = (
+            update(Product.__table__)
+            .where(Product.__table__.c.id == bindparam("_id"))
+            .values(
+                base_price=bindparam("_base_price"),
+                selling_price=bindparam("_selling_price"),
+                admin_fee=bindparam("_admin_fee"),
+                margin=bindparam("_margin"),
+                updated_at=func.now()
+            )
+        )
+        try:
+            self.db.execute(statement, [
+                {
+                    "_id": row["id"],
+                    "_base_price": row["base_price"],
+                    "_selling_price": row["selling_price"],
+                    "_admin_fee": row["admin_fee"],
+                    "_margin": row["margin"]
+                }
+                for row in rows
+            ])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(rows)
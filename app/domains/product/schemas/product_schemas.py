@@ -68,3 +68,16 @@ class ProductStatsResponse(BaseModel):
     inactive_products: int
     categories: List[str]
     providers: List[str]
+
+class BulkPriceUpdateError(BaseModel):
+    """Detail baris yang gagal pada bulk update harga"""
+    index: int
+    product_id: Optional[int] = None
+    code: Optional[str] = None
+    error: str
+
+class BulkPriceUpdateResult(BaseModel):
+    """Hasil bulk update harga"""
+    updated_count: int
+    failed_count: int
+    errors: List[BulkPriceUpdateError] = []
@@ -1,11 +1,12 @@
 from typing import List, Optional
 from fastapi import HTTPException, status
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from app.common.base_classes.base_service import BaseService
 from app.domains.product.repositories.product_repository import ProductRepository
 from app.domains.product.models.product import Product, ProductStatus
 from app.domains.product.schemas.product_schemas import (
-    ProductCreate, ProductUpdate, ProductListResponse, ProductStatsResponse
+    ProductCreate, ProductUpdate, ProductListResponse, ProductStatsResponse,
+    BulkPriceUpdateError, BulkPriceUpdateResult
 )
 
 class ProductService(BaseService):
@@ -119,16 +120,95 @@ class ProductService(BaseService):
     
     async def bulk_update_prices(self, updates: List[dict]) -> int:
         """Update harga beberapa produk sekaligus"""
-        updated_count = 0
-        for update in updates:
-            product_id = update.get('product_id')
-            new_price = update.get('selling_price')
-            
-            if product_id and new_price:
-                try:
-                    await self.update_product(product_id, ProductUpdate(selling_price=new_price))
-                    updated_count += 1
-                except HTTPException:
-                    continue
-        
-        return updated_count
+        result = await self.bulk_sync_prices(updates)
+        return result.updated_count
+    
+    async def bulk_sync_prices(self, updates: List[dict], margin_service=None) -> BulkPriceUpdateResult:
+        """
+        Sinkronisasi harga banyak produk (mis. price list Digiflazz) secara set-based.
+        
+        Setiap item berisi product_id atau code, dan minimal satu dari base_price,
+        selling_price, admin_fee. Bila margin_service (MarginCalculationService) diberikan,
+        item tanpa selling_price dihitung harga jualnya dari base_price + margin untuk
+        seluruh batch sekaligus. Data produk diambil dengan query IN per chunk, divalidasi
+        dalam satu pass, lalu ditulis dengan satu executemany dan satu commit.
+        Baris yang gagal validasi dilaporkan per index tanpa menggagalkan batch.
+        """
+        errors: List[BulkPriceUpdateError] = []
+        
+        def fail(index: int, item: dict, message: str):
+            errors.append(BulkPriceUpdateError(
+                index=index, product_id=item.get('product_id'), code=item.get('code'), error=message
+            ))
+        
+        # Pass 1: normalisasi input
+        parsed = []
+        for index, item in enumerate(updates):
+            if not item.get('product_id') and not item.get('code'):
+                fail(index, item, "product_id atau code wajib diisi")
+                continue
+            prices = {}
+            try:
+                for field in ('base_price', 'selling_price', 'admin_fee'):
+                    if item.get(field) is not None:
+                        prices[field] = Decimal(str(item[field]))
+            except InvalidOperation:
+                fail(index, item, "Format harga tidak valid")
+                continue
+            if not prices:
+                fail(index, item, "Tidak ada harga yang diupdate")
+                continue
+            if any(value < 0 for value in prices.values()):
+                fail(index, item, "Harga tidak boleh negatif")
+                continue
+            parsed.append((index, item, prices))
+        
+        # Pass 2: ambil data produk sekaligus
+        current_rows = self.repository.get_price_rows(
+            [item['product_id'] for _, item, _ in parsed if item.get('product_id')],
+            [item['code'] for _, item, _ in parsed if not item.get('product_id')]
+        )
+        by_id = {row['id']: row for row in current_rows}
+        by_code = {row['code']: row for row in current_rows}
+        
+        merged = []
+        for index, item, prices in parsed:
+            current = by_id.get(item['product_id']) if item.get('product_id') else by_code.get(item['code'])
+            if current is None:
+                fail(index, item, "Produk tidak ditemukan")
+                continue
+            row = {
+                'id': current['id'],
+                'base_price': prices.get('base_price', current['base_price']),
+                'selling_price': prices.get('selling_price', current['selling_price']),
+                'admin_fee': prices.get('admin_fee', current['admin_fee'] or Decimal('0'))
+            }
+            needs_margin = margin_service is not None and 'selling_price' not in prices
+            merged.append((index, item, row, current, needs_margin))
+        
+        # Pass 3: terapkan margin untuk seluruh batch dalam satu langkah
+        margin_items = [entry for entry in merged if entry[4]]
+        if margin_items:
+            final_prices = margin_service.calculate_batch_prices([
+                {'base_price': row['base_price'], 'category': current['category'], 'product_code': current['code']}
+                for _, _, row, current, _ in margin_items
+            ])
+            for (_, _, row, _, _), final_price in zip(margin_items, final_prices):
+                row['selling_price'] = final_price
+        
+        # Pass 4: validasi harga akhir lalu tulis
+        rows = []
+        for index, item, row, _, _ in merged:
+            if row['selling_price'] < row['base_price']:
+                fail(index, item, "Harga jual tidak boleh lebih kecil dari harga dasar")
+                continue
+            row['margin'] = row['selling_price'] - row['base_price'] - row['admin_fee']
+            rows.append(row)
+        
+        updated_count = self.repository.bulk_update_prices(rows)
+        errors.sort(key=lambda error: error.index)
+        return BulkPriceUpdateResult(
+            updated_count=updated_count,
+            failed_count=len(errors),
+            errors=errors
+        )
@@ -0,0 +1,256 @@
+"""
+Feature store real-time untuk anti-fraud.
+
+Fitur per user dan per IP diperbarui incremental setiap transaksi wallet/PPOB sehingga
+scoring cukup membaca beberapa angka di memori, tanpa agregasi database per pengecekan:
+- counter ring buffer untuk jendela 1 menit, 1 jam dan 1 hari
+- mean/variance nominal transaksi secara streaming (algoritma Welford)
+- blacklist bersama berbasis bloom filter
+"""
+
+import hashlib
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+
+class RingBufferCounter:
+    """
+    Counter sliding window dengan bucket melingkar.
+    Jendela window_seconds dibagi menjadi `buckets` slot; slot yang epoch-nya sudah lewat
+    dianggap kosong dan di-reset saat ditimpa, jadi add/count O(buckets) tanpa alokasi.
+    """
+
+    __slots__ = ("bucket_seconds", "buckets", "_counts", "_epochs")
+
+    def __init__(self, window_seconds: int, buckets: int):
+        self.bucket_seconds = window_seconds / buckets
+        self.buckets = buckets
+        self._counts = array("l", [0] * buckets)
+        self._epochs = array("q", [-1] * buckets)
+
+    def add(self, timestamp: float, amount: int = 1) -> None:
+        epoch = int(timestamp // self.bucket_seconds)
+        slot = epoch % self.buckets
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._counts[slot] = 0
+        self._counts[slot] += amount
+
+    def count(self, now: float) -> int:
+        current = int(now // self.bucket_seconds)
+        oldest = current - self.buckets + 1
+        return sum(
+            count for count, epoch in zip(self._counts, self._epochs)
+            if oldest <= epoch <= current
+        )
+
+
+class RunningStats:
+    """Mean dan variance streaming (Welford) tanpa menyimpan riwayat nominal"""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def z_score(self, value: float) -> float:
+        std = self.std
+        if std == 0:
+            return 0.0
+        return (value - self.mean) / std
+
+
+class BloomFilter:
+    """Bloom filter dengan double hashing blake2b; tidak ada false negative"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class SharedBlacklist:
+    """
+    Blacklist yang dipakai bersama semua instance AntiFraudService.
+    Bloom filter menjawab "pasti tidak ada" tanpa lookup; hit dikonfirmasi ke set exact
+    sehingga false positive tidak memblokir transaksi. Hapus entri membangun ulang bloom.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._members: Set[str] = set()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+
+    def add(self, identifier: str) -> None:
+        with self._lock:
+            self._members.add(identifier)
+            self._bloom.add(identifier)
+
+    def remove(self, identifier: str) -> None:
+        with self._lock:
+            if identifier not in self._members:
+                return
+            self._members.discard(identifier)
+            self._rebuild(self._members)
+
+    def load(self, identifiers: Iterable[str]) -> None:
+        """Ganti isi blacklist (mis. dimuat dari database saat startup)"""
+        with self._lock:
+            self._members = set(identifiers)
+            self._rebuild(self._members)
+
+    def _rebuild(self, members: Set[str]) -> None:
+        bloom = BloomFilter(max(self.capacity, len(members) * 2), self.error_rate)
+        for member in members:
+            bloom.add(member)
+        self._bloom = bloom
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self._bloom and identifier in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+
+class EntityFeatures:
+    """Fitur satu entitas (user atau IP)"""
+
+    __slots__ = ("minute", "hour", "day", "amounts", "last_seen")
+
+    def __init__(self):
+        self.minute = RingBufferCounter(60, 60)
+        self.hour = RingBufferCounter(3600, 60)
+        self.day = RingBufferCounter(86400, 24)
+        self.amounts = RunningStats()
+        self.last_seen = 0.0
+
+    def record(self, amount: float, timestamp: float) -> None:
+        self.minute.add(timestamp)
+        self.hour.add(timestamp)
+        self.day.add(timestamp)
+        self.amounts.update(amount)
+        self.last_seen = timestamp
+
+    def snapshot(self, now: float) -> Dict:
+        return {
+            "count_1m": self.minute.count(now),
+            "count_1h": self.hour.count(now),
+            "count_1d": self.day.count(now),
+            "amount_count": self.amounts.count,
+            "amount_mean": self.amounts.mean,
+            "amount_std": self.amounts.std
+        }
+
+
+class FraudFeatureStore:
+    """
+    Feature store per user/per IP di memori proses.
+    Jumlah entitas dibatasi max_entities (LRU) sehingga memori tetap terbatas;
+    entitas yang ter-evict mulai dari nol, sama seperti user yang baru aktif.
+    """
+
+    EMPTY = {
+        "count_1m": 0, "count_1h": 0, "count_1d": 0,
+        "amount_count": 0, "amount_mean": 0.0, "amount_std": 0.0
+    }
+
+    def __init__(self, max_entities: int = 100000, clock=time.time):
+        self.max_entities = max_entities
+        self._entities: "OrderedDict[str, EntityFeatures]" = OrderedDict()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.user_blacklist = SharedBlacklist()
+        self.ip_blacklist = SharedBlacklist()
+
+    @staticmethod
+    def _key(kind: str, identifier) -> str:
+        return f"{kind}:{identifier}"
+
+    def _entity(self, key: str) -> EntityFeatures:
+        entity = self._entities.get(key)
+        if entity is None:
+            entity = self._entities[key] = EntityFeatures()
+            if len(self._entities) > self.max_entities:
+                self._entities.popitem(last=False)
+        else:
+            self._entities.move_to_end(key)
+        return entity
+
+    def record_transaction(
+        self,
+        user_id,
+        amount: float,
+        ip_address: Optional[str] = None,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Update fitur user (dan IP bila ada) dengan satu transaksi"""
+        timestamp = timestamp if timestamp is not None else self._clock()
+        amount = float(amount)
+        with self._lock:
+            self._entity(self._key("user", user_id)).record(amount, timestamp)
+            if ip_address:
+                self._entity(self._key("ip", ip_address)).record(amount, timestamp)
+
+    def _features(self, key: str, now: float) -> Dict:
+        entity = self._entities.get(key)
+        return entity.snapshot(now) if entity is not None else dict(self.EMPTY)
+
+    def get_user_features(self, user_id) -> Dict:
+        with self._lock:
+            return self._features(self._key("user", user_id), self._clock())
+
+    def get_ip_features(self, ip_address: str) -> Dict:
+        with self._lock:
+            return self._features(self._key("ip", ip_address), self._clock())
+
+    def get_user_amount_stats(self, user_id) -> RunningStats:
+        with self._lock:
+            entity = self._entities.get(self._key("user", user_id))
+            return entity.amounts if entity is not None else RunningStats()
+
+    def get_stats(self) -> Dict:
+        return {
+            "entities": len(self._entities),
+            "max_entities": self.max_entities,
+            "blacklisted_users": len(self.user_blacklist),
+            "blacklisted_ips": len(self.ip_blacklist)
+        }
+
+
+# Global instance (dipakai bersama semua AntiFraudService dan hook transaksi)
+fraud_feature_store = FraudFeatureStore()
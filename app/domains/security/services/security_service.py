@@ -6,20 +6,29 @@ import json
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from collections import defaultdict
+
+from app.domains.security.services.fraud_feature_store import FraudFeatureStore, fraud_feature_store
 
 class AntiFraudService:
-    """Service untuk deteksi fraud dan keamanan"""
+    """
+    Service untuk deteksi fraud dan keamanan.
+    Fitur velocity dan pola nominal dibaca dari FraudFeatureStore yang diperbarui
+    incremental setiap transaksi; blacklist dipakai bersama semua instance.
+    """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, feature_store: FraudFeatureStore = None):
         self.db = db
+        self.feature_store = feature_store or fraud_feature_store
         self.suspicious_patterns = {
             "rapid_transactions": 5,  # Max 5 transaksi dalam 1 menit
             "daily_limit": 10,        # Max 10 transaksi per hari untuk user baru
             "amount_threshold": 1000000,  # Transaksi di atas 1 juta perlu verifikasi
+            "ip_hourly_limit": 30,    # Max 30 transaksi per jam dari satu IP
+            "amount_z_score": 3.0,    # Nominal > 3 standar deviasi dari kebiasaan user
+            "min_history": 5,         # Minimal riwayat sebelum z-score dipakai
         }
-        self.blacklisted_ips = set()
-        self.blacklisted_users = set()
+        self.blacklisted_ips = self.feature_store.ip_blacklist
+        self.blacklisted_users = self.feature_store.user_blacklist
     
     def check_transaction_fraud(self, user_id: str, amount: float, ip_address: str) -> Dict:
         """Cek apakah transaksi mencurigakan"""
@@ -36,7 +45,7 @@ class AntiFraudService:
             }
         
         # Cek user blacklist
-        if user_id in self.blacklisted_users:
+        if str(user_id) in self.blacklisted_users:
             return {
                 "is_fraud": True,
                 "score": 100,
@@ -45,17 +54,25 @@ class AntiFraudService:
             }
         
         # Cek rapid transactions
-        rapid_check = self._check_rapid_transactions(user_id)
+        user_features = self.feature_store.get_user_features(user_id)
+        rapid_check = self._check_rapid_transactions(user_id, user_features)
         if rapid_check["is_suspicious"]:
             fraud_score += 30
             reasons.append("Transaksi terlalu cepat")
         
         # Cek daily limit
-        daily_check = self._check_daily_limit(user_id)
+        daily_check = self._check_daily_limit(user_id, user_features)
         if daily_check["is_suspicious"]:
             fraud_score += 20
             reasons.append("Melebihi batas harian")
         
+        # Cek velocity per IP (banyak akun dari satu IP)
+        if ip_address:
+            ip_check = self._check_ip_velocity(ip_address)
+            if ip_check["is_suspicious"]:
+                fraud_score += 20
+                reasons.append("Terlalu banyak transaksi dari IP yang sama")
+        
         # Cek amount threshold
         if amount > self.suspicious_patterns["amount_threshold"]:
             fraud_score += 25
@@ -83,11 +100,10 @@ class AntiFraudService:
             "action": action
         }
     
-    def _check_rapid_transactions(self, user_id: str) -> Dict:
+    def _check_rapid_transactions(self, user_id: str, features: Dict = None) -> Dict:
         """Cek transaksi rapid dalam 1 menit terakhir"""
-        # Simulasi pengecekan (implementasi nyata perlu query database)
-        # Anggap ada 3 transaksi dalam 1 menit terakhir
-        recent_count = 3
+        features = features or self.feature_store.get_user_features(user_id)
+        recent_count = features["count_1m"]
         
         return {
             "is_suspicious": recent_count >= self.suspicious_patterns["rapid_transactions"],
@@ -95,10 +111,10 @@ class AntiFraudService:
             "limit": self.suspicious_patterns["rapid_transactions"]
         }
     
-    def _check_daily_limit(self, user_id: str) -> Dict:
+    def _check_daily_limit(self, user_id: str, features: Dict = None) -> Dict:
         """Cek batas transaksi harian"""
-        # Simulasi pengecekan
-        daily_count = 8
+        features = features or self.feature_store.get_user_features(user_id)
+        daily_count = features["count_1d"]
         
         return {
             "is_suspicious": daily_count >= self.suspicious_patterns["daily_limit"],
@@ -106,33 +122,60 @@ class AntiFraudService:
             "limit": self.suspicious_patterns["daily_limit"]
         }
     
+    def _check_ip_velocity(self, ip_address: str) -> Dict:
+        """Cek jumlah transaksi dari satu IP dalam 1 jam terakhir"""
+        hourly_count = self.feature_store.get_ip_features(ip_address)["count_1h"]
+        
+        return {
+            "is_suspicious": hourly_count >= self.suspicious_patterns["ip_hourly_limit"],
+            "count": hourly_count,
+            "limit": self.suspicious_patterns["ip_hourly_limit"]
+        }
+    
     def _check_user_pattern(self, user_id: str, amount: float) -> Dict:
-        """Cek pola transaksi user"""
-        # Simulasi analisis pola
-        # Misalnya user biasanya transaksi 50rb, tiba-tiba 500rb
-        avg_amount = 50000
-        deviation = abs(amount - avg_amount) / avg_amount
+        """
+        Cek pola transaksi user terhadap mean/std nominal historisnya (Welford).
+        Dengan riwayat cukup dipakai z-score; riwayat pendek memakai deviasi relatif
+        terhadap rata-rata (500%); tanpa riwayat tidak dianggap anomali.
+        """
+        stats = self.feature_store.get_user_amount_stats(user_id)
+        if stats.count == 0:
+            return {"is_suspicious": False, "deviation": 0.0, "average": None}
+        
+        avg_amount = stats.mean
+        deviation = abs(amount - avg_amount) / avg_amount if avg_amount else 0.0
+        z_score = stats.z_score(amount)
+        
+        if stats.count >= self.suspicious_patterns["min_history"] and stats.std > 0:
+            is_suspicious = z_score > self.suspicious_patterns["amount_z_score"]
+        else:
+            is_suspicious = deviation > 5.0  # 500% dari rata-rata
         
         return {
-            "is_suspicious": deviation > 5.0,  # 500% dari rata-rata
+            "is_suspicious": is_suspicious,
             "deviation": deviation,
+            "z_score": z_score,
             "average": avg_amount
         }
     
+    def record_transaction(self, user_id: str, amount: float, ip_address: str = None) -> None:
+        """Update feature store setelah transaksi diterima"""
+        self.feature_store.record_transaction(user_id, amount, ip_address)
+    
     def add_to_blacklist(self, identifier: str, type_: str) -> bool:
-        """Tambah ke blacklist"""
+        """Tambah ke blacklist bersama"""
         if type_ == "ip":
             self.blacklisted_ips.add(identifier)
         elif type_ == "user":
-            self.blacklisted_users.add(identifier)
+            self.blacklisted_users.add(str(identifier))
         return True
     
     def remove_from_blacklist(self, identifier: str, type_: str) -> bool:
-        """Hapus dari blacklist"""
-        if type_ == "ip" and identifier in self.blacklisted_ips:
+        """Hapus dari blacklist bersama"""
+        if type_ == "ip":
             self.blacklisted_ips.remove(identifier)
-        elif type_ == "user" and identifier in self.blacklisted_users:
-            self.blacklisted_users.remove(identifier)
+        elif type_ == "user":
+            self.blacklisted_users.remove(str(identifier))
         return True
 
 class AuditTrailService:
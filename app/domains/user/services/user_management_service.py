@@ -8,11 +8,10 @@ from app.schemas.user_profile import (
 )
 from app.common.exceptions.custom_exceptions import HTTPException
 from app.common.base_classes.base_service import BaseService
-from app.common.security.auth_security import get_password_hash
+from app.infrastructure.security.password_service import password_service
 import logging
 import secrets
 import string
-import csv
 import io
 import os
 from datetime import datetime
@@ -185,7 +184,7 @@ class UserManagementService(BaseService):
             temp_password = self._generate_temporary_password()
             
             # Hash password dan update
-            user.hashed_password = get_password_hash(temp_password)
+            user.hashed_password = await password_service.hash_password(temp_password)
             self.db.commit()
             
             logger.info(f"Password user berhasil direset untuk user_id: {user_id}")
@@ -273,37 +272,21 @@ class UserManagementService(BaseService):
             raise HTTPException(status_code=500, detail=f"Gagal mengambil statistik user: {str(e)}")
     
     async def export_users_data(self, format: str = "csv") -> str:
-        """Export data user ke CSV atau Excel"""
+        """Export data user ke CSV, NDJSON atau Parquet secara streaming (memori konstan)"""
+        from app.common.services.streaming_export import streaming_exporter
+        from app.domains.admin.services.data_export_service import DataExportService
+        
         try:
-            users = self.db.query(User).all()
+            job = await streaming_exporter.export_to_file(DataExportService.users_spec(), format)
+            if job.status != "completed":
+                raise HTTPException(status_code=500, detail=f"Gagal export data user: {job.error}")
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"users_export_{timestamp}.{format}"
-            file_path = os.path.join(self.export_dir, filename)
-            
-            if format == "csv":
-                with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = ['id', 'username', 'email', 'full_name', 'phone_number', 
-                                'balance', 'is_active', 'created_at']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    writer.writeheader()
-                    for user in users:
-                        writer.writerow({
-                            'id': user.id,
-                            'username': user.username,
-                            'email': user.email,
-                            'full_name': user.full_name,
-                            'phone_number': user.phone_number,
-                            'balance': float(user.balance),
-                            'is_active': user.is_active,
-                            'created_at': user.created_at.isoformat()
-                        })
-            
-            file_url = f"/static/exports/{filename}"
-            logger.info(f"Data user berhasil diexport ke {format.upper()}: {file_url}")
+            file_url = job.to_dict()["file_url"]
+            logger.info(f"Data user berhasil diexport ke {format.upper()}: {file_url} ({job.rows_written} baris)")
             return file_url
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error exporting users data: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Gagal export data user: {str(e)}")
@@ -6,7 +6,7 @@ from app.schemas.user_profile import (
 )
 from app.utils.exceptions import HTTPException
 from app.common.base_classes.base_service import BaseService
-from app.common.security.auth_security import verify_password, get_password_hash
+from app.infrastructure.security.password_service import password_service
 import logging
 import pyotp
 import qrcode
@@ -30,7 +30,7 @@ class UserSecurityService(BaseService):
                 raise HTTPException(status_code=404, detail="User tidak ditemukan")
             
             # Verifikasi password lama
-            if not verify_password(password_data.current_password, user.hashed_password):
+            if not await password_service.verify_password(password_data.current_password, user.hashed_password):
                 raise HTTPException(status_code=400, detail="Password lama tidak benar")
             
             # Validasi password baru
@@ -38,7 +38,7 @@ class UserSecurityService(BaseService):
                 raise HTTPException(status_code=400, detail="Konfirmasi password tidak cocok")
             
             # Update password
-            user.hashed_password = get_password_hash(password_data.new_password)
+            user.hashed_password = await password_service.hash_password(password_data.new_password)
             self.db.commit()
             
             logger.info(f"Password berhasil diubah untuk user_id: {user_id}")
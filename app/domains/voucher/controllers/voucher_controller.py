@@ -142,6 +142,7 @@ class VoucherController:
         
         try:
             repository = VoucherRepository(db)
+            service = VoucherService(repository)
             
             voucher = repository.get_by_id(voucher_id)
             if not voucher:
@@ -150,7 +151,7 @@ class VoucherController:
                     detail="Voucher tidak ditemukan"
                 )
             
-            updated_voucher = repository.update(voucher_id, voucher_data.dict(exclude_unset=True))
+            updated_voucher = await service.update_voucher(voucher_id, voucher_data)
             
             return APIResponse.success_response(
                 data=updated_voucher,
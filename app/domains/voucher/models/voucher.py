@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Numeric, Boolean, Text, Enum, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, Numeric, Boolean, Text, Enum, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.common.base_classes.base import BaseModel
 import enum
@@ -60,3 +60,19 @@ class VoucherUsage(BaseModel):
     # voucher = relationship("Voucher", back_populates="usages")
     # user = relationship("User", back_populates="voucher_usages")
     # transaction = relationship("PPOBTransaction", back_populates="voucher_usage")
+
+class VoucherUserCounter(BaseModel):
+    """
+    Counter penggunaan voucher per user.
+    Dinaikkan secara atomik saat voucher dipakai sehingga batas per user tidak perlu
+    COUNT(*) atas voucher_usages.
+    """
+    __tablename__ = "voucher_user_counters"
+    
+    voucher_id = Column(Integer, ForeignKey("vouchers.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    usage_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index('idx_voucher_user_counter_unique', 'voucher_id', 'user_id', unique=True),
+    )
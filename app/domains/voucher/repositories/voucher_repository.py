@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from app.common.base_classes.base_repository import BaseRepository
-from app.domains.voucher.models.voucher import Voucher, VoucherUsage, VoucherStatus
+from app.domains.voucher.models.voucher import Voucher, VoucherUsage, VoucherUserCounter, VoucherStatus
 
 class VoucherRepository:
     """
@@ -57,14 +58,123 @@ class VoucherRepository:
             )
         ).all()
     
-    def get_user_usage_count(self, voucher_id: int, user_id: int) -> int:
-        """Hitung berapa kali user sudah menggunakan voucher"""
-        return self.db.query(VoucherUsage).filter(
+    def get_active_vouchers(self) -> List[Voucher]:
+        """Ambil voucher aktif yang belum lewat masa berlaku (untuk index voucher)"""
+        return self.db.query(Voucher).filter(
             and_(
-                VoucherUsage.voucher_id == voucher_id,
-                VoucherUsage.user_id == user_id
+                Voucher.status == VoucherStatus.ACTIVE,
+                Voucher.valid_until >= datetime.now()
+            )
+        ).all()
+    
+    def get_user_usage_count(self, voucher_id: int, user_id: int) -> int:
+        """Hitung berapa kali user sudah menggunakan voucher (dari tabel counter)"""
+        return self.db.execute(
+            select(VoucherUserCounter.usage_count).where(
+                and_(
+                    VoucherUserCounter.voucher_id == voucher_id,
+                    VoucherUserCounter.user_id == user_id
+                )
+            )
+        ).scalar() or 0
+    
+    def get_exhausted_user_pairs(self) -> List[Tuple[int, int]]:
+        """Pasangan (voucher_id, user_id) yang sudah mencapai user_limit pada voucher aktif"""
+        return self.db.execute(
+            select(VoucherUserCounter.voucher_id, VoucherUserCounter.user_id)
+            .join(Voucher, Voucher.id == VoucherUserCounter.voucher_id)
+            .where(
+                and_(
+                    Voucher.status == VoucherStatus.ACTIVE,
+                    VoucherUserCounter.usage_count >= func.coalesce(Voucher.user_limit, 1)
+                )
+            )
+        ).all()
+    
+    def backfill_user_counters(self) -> int:
+        """Isi counter per user dari voucher_usages untuk pasangan yang belum punya counter"""
+        missing = (
+            select(VoucherUsage.voucher_id, VoucherUsage.user_id, func.count(VoucherUsage.id))
+            .where(
+                ~select(VoucherUserCounter.id).where(
+                    and_(
+                        VoucherUserCounter.voucher_id == VoucherUsage.voucher_id,
+                        VoucherUserCounter.user_id == VoucherUsage.user_id
+                    )
+                ).exists()
             )
-        ).count()
+            .group_by(VoucherUsage.voucher_id, VoucherUsage.user_id)
+        )
+        inserted = self.db.execute(
+            insert(VoucherUserCounter).from_select(["voucher_id", "user_id", "usage_count"], missing)
+        ).rowcount
+        self.db.commit()
+        return inserted
+    
+    def record_usage(self, usage_data: dict) -> Optional[Tuple[VoucherUsage, int]]:
+        """
+        Catat penggunaan voucher dalam satu transaksi.
+        Kuota global dan kuota per user dinaikkan dengan UPDATE bersyarat sehingga request
+        bersamaan tidak bisa melewati batas. Return (usage, jumlah pemakaian user) atau
+        None bila voucher tidak aktif / kuota habis.
+        """
+        voucher_id = usage_data["voucher_id"]
+        user_id = usage_data["user_id"]
+        
+        try:
+            claimed = self.db.execute(
+                update(Voucher)
+                .where(
+                    and_(
+                        Voucher.id == voucher_id,
+                        Voucher.status == VoucherStatus.ACTIVE,
+                        or_(Voucher.usage_limit.is_(None), Voucher.usage_count < Voucher.usage_limit)
+                    )
+                )
+                .values(usage_count=Voucher.usage_count + 1)
+            ).rowcount
+            if claimed != 1 or not self._increment_user_counter(voucher_id, user_id):
+                self.db.rollback()
+                return None
+            
+            usage = VoucherUsage(**usage_data)
+            self.db.add(usage)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.db.refresh(usage)
+        return usage, self.get_user_usage_count(voucher_id, user_id)
+    
+    def _increment_user_counter(self, voucher_id: int, user_id: int) -> bool:
+        """Naikkan counter user bila masih di bawah user_limit; buat counter bila belum ada"""
+        user_limit = select(func.coalesce(Voucher.user_limit, 1)).where(Voucher.id == voucher_id).scalar_subquery()
+        for _ in range(2):
+            incremented = self.db.execute(
+                update(VoucherUserCounter)
+                .where(
+                    and_(
+                        VoucherUserCounter.voucher_id == voucher_id,
+                        VoucherUserCounter.user_id == user_id,
+                        VoucherUserCounter.usage_count < user_limit
+                    )
+                )
+                .values(usage_count=VoucherUserCounter.usage_count + 1)
+            ).rowcount
+            if incremented == 1:
+                return True
+            if self.get_user_usage_count(voucher_id, user_id) > 0:
+                return False
+            
+            try:
+                with self.db.begin_nested():
+                    self.db.add(VoucherUserCounter(voucher_id=voucher_id, user_id=user_id, usage_count=1))
+                return True
+            except IntegrityError:
+                # Counter dibuat request lain di antara UPDATE dan INSERT; ulangi UPDATE
+                continue
+        return False
     
     def create_usage(self, usage_data: dict) -> VoucherUsage:
         """Buat record penggunaan voucher"""
@@ -81,20 +191,23 @@ class VoucherRepository:
         ).order_by(VoucherUsage.created_at.desc()).limit(limit).all()
     
     def get_voucher_stats(self) -> dict:
-        """Ambil statistik voucher"""
-        total = self.db.query(Voucher).count()
-        active = self.db.query(Voucher).filter(Voucher.status == VoucherStatus.ACTIVE).count()
-        expired = self.db.query(Voucher).filter(Voucher.status == VoucherStatus.EXPIRED).count()
-        
-        total_usage = self.db.query(VoucherUsage).count()
-        total_discount = self.db.query(func.sum(VoucherUsage.discount_amount)).scalar() or 0
+        """Ambil statistik voucher dalam satu query agregat"""
+        row = self.db.execute(
+            select(
+                func.count(Voucher.id).label("total"),
+                func.count(case((Voucher.status == VoucherStatus.ACTIVE, 1))).label("active"),
+                func.count(case((Voucher.status == VoucherStatus.EXPIRED, 1))).label("expired"),
+                select(func.count(VoucherUsage.id)).scalar_subquery().label("total_usage"),
+                select(func.coalesce(func.sum(VoucherUsage.discount_amount), 0)).scalar_subquery().label("total_discount")
+            )
+        ).one()
         
         return {
-            "total_vouchers": total,
-            "active_vouchers": active,
-            "expired_vouchers": expired,
-            "total_usage": total_usage,
-            "total_discount_given": float(total_discount)
+            "total_vouchers": row.total,
+            "active_vouchers": row.active,
+            "expired_vouchers": row.expired,
+            "total_usage": row.total_usage,
+            "total_discount_given": float(row.total_discount or 0)
         }
     
     def expire_old_vouchers(self) -> int:
@@ -0,0 +1,149 @@
+"""
+Index voucher in-memory untuk hot path validasi checkout
+
+- Voucher aktif dikompilasi sekali menjadi CompiledVoucher: aturan sudah dalam tipe
+  Python dan applicable_categories/applicable_products sudah berupa frozenset
+- Batas per user dicek dari set user yang sudah mencapai user_limit (diambil dari
+  tabel voucher_user_counters), sehingga validasi tidak perlu COUNT(*) ke DB
+- Index diperbarui saat voucher dibuat/diubah/dipakai di worker ini dan dimuat ulang
+  periodik untuk perubahan dari worker lain; batas penggunaan tetap ditegakkan secara
+  atomik di DB saat voucher benar-benar dipakai
+"""
+
+import json
+import logging
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Set
+
+from app.infrastructure.config.settings import settings
+from app.domains.voucher.models.voucher import Voucher, VoucherStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_json_list(value: Optional[str]) -> Optional[FrozenSet[str]]:
+    if not value:
+        return None
+    try:
+        return frozenset(json.loads(value))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid voucher applicability list: {value!r}")
+        return frozenset()
+
+
+class CompiledVoucher:
+    """Snapshot aturan voucher yang siap dievaluasi tanpa akses DB"""
+
+    __slots__ = (
+        "id", "code", "status", "voucher_type", "discount_value", "max_discount",
+        "min_transaction", "usage_limit", "usage_count", "user_limit",
+        "valid_from", "valid_until", "categories", "products", "exhausted_users"
+    )
+
+    def __init__(self, voucher: Voucher, exhausted_users: Optional[Iterable[int]] = None):
+        self.id = voucher.id
+        self.code = voucher.code
+        self.status = voucher.status
+        self.voucher_type = voucher.voucher_type
+        self.discount_value = voucher.discount_value
+        self.max_discount = voucher.max_discount
+        self.min_transaction = voucher.min_transaction or 0
+        self.usage_limit = voucher.usage_limit
+        self.usage_count = voucher.usage_count or 0
+        self.user_limit = voucher.user_limit if voucher.user_limit is not None else 1
+        self.valid_from = voucher.valid_from
+        self.valid_until = voucher.valid_until
+        self.categories = _parse_json_list(voucher.applicable_categories)
+        self.products = _parse_json_list(voucher.applicable_products)
+        self.exhausted_users: Set[int] = set(exhausted_users or ())
+
+    def user_exhausted(self, user_id: int) -> bool:
+        return user_id in self.exhausted_users
+
+
+class VoucherIndex:
+    """
+    Index code -> CompiledVoucher
+    Hanya voucher aktif yang diindeks; kode yang tidak ada di index dicari ke DB
+    (voucher nonaktif atau baru dibuat di worker lain).
+    """
+
+    def __init__(self, refresh_interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._by_code: Dict[str, CompiledVoucher] = {}
+        self._by_id: Dict[int, CompiledVoucher] = {}
+        self._loaded_at: Optional[float] = None
+        self._counters_backfilled = False
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or self._clock() - self._loaded_at >= self.refresh_interval
+
+    def ensure_fresh(self, repository):
+        if self.is_stale():
+            self.load(repository)
+
+    def load(self, repository):
+        """Kompilasi ulang seluruh voucher aktif (dua query) lalu tukar index sekaligus"""
+        if not self._counters_backfilled:
+            # Counter per user untuk pemakaian yang tercatat sebelum tabel counter ada
+            repository.backfill_user_counters()
+            self._counters_backfilled = True
+
+        exhausted: Dict[int, Set[int]] = {}
+        for voucher_id, user_id in repository.get_exhausted_user_pairs():
+            exhausted.setdefault(voucher_id, set()).add(user_id)
+
+        by_code: Dict[str, CompiledVoucher] = {}
+        by_id: Dict[int, CompiledVoucher] = {}
+        for voucher in repository.get_active_vouchers():
+            compiled = CompiledVoucher(voucher, exhausted.get(voucher.id))
+            by_code[compiled.code] = compiled
+            by_id[compiled.id] = compiled
+
+        self._by_code, self._by_id = by_code, by_id
+        self._loaded_at = self._clock()
+        logger.info(f"Voucher index loaded with {len(by_code)} active vouchers")
+
+    def get(self, code: str) -> Optional[CompiledVoucher]:
+        return self._by_code.get(code)
+
+    def upsert(self, voucher: Voucher) -> CompiledVoucher:
+        """Kompilasi ulang satu voucher setelah dibuat/diubah"""
+        previous = self._by_id.get(voucher.id)
+        compiled = CompiledVoucher(voucher)
+        if previous is not None:
+            if previous.user_limit != compiled.user_limit:
+                # Set user yang habis kuotanya bergantung pada user_limit; muat ulang penuh
+                self.invalidate()
+            else:
+                compiled.exhausted_users = previous.exhausted_users
+            self._by_code.pop(previous.code, None)
+            del self._by_id[voucher.id]
+
+        if compiled.status == VoucherStatus.ACTIVE:
+            self._by_code[compiled.code] = compiled
+            self._by_id[compiled.id] = compiled
+        return compiled
+
+    def record_usage(self, voucher_id: int, user_id: int, user_usage_count: int):
+        compiled = self._by_id.get(voucher_id)
+        if compiled is None:
+            return
+        compiled.usage_count += 1
+        if user_usage_count >= compiled.user_limit:
+            compiled.exhausted_users.add(user_id)
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "vouchers": len(self._by_code),
+            "exhausted_user_pairs": sum(len(v.exhausted_users) for v in self._by_code.values()),
+            "age_seconds": None if self._loaded_at is None else round(self._clock() - self._loaded_at, 1)
+        }
+
+
+# Global instance
+voucher_index = VoucherIndex(refresh_interval=settings.VOUCHER_INDEX_REFRESH_INTERVAL)
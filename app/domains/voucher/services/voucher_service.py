@@ -5,6 +5,7 @@ from datetime import datetime
 import json
 from app.common.base_classes.base_service import BaseService
 from app.domains.voucher.repositories.voucher_repository import VoucherRepository
+from app.domains.voucher.services.voucher_index import CompiledVoucher, voucher_index
 from app.domains.voucher.models.voucher import Voucher, VoucherUsage, VoucherType, VoucherStatus
 from app.domains.voucher.schemas.voucher_schemas import (
     VoucherCreate, VoucherUpdate, VoucherValidationRequest, VoucherValidationResponse
@@ -29,23 +30,41 @@ class VoucherService(BaseService):
                 detail="Kode voucher sudah digunakan"
             )
         
-        voucher_dict = voucher_data.dict()
-        
-        # Convert lists to JSON strings
-        if voucher_dict.get('applicable_categories'):
-            voucher_dict['applicable_categories'] = json.dumps(voucher_dict['applicable_categories'])
-        if voucher_dict.get('applicable_products'):
-            voucher_dict['applicable_products'] = json.dumps(voucher_dict['applicable_products'])
-        
-        return self.repository.create(voucher_dict)
+        voucher = self.repository.create(self._encode_applicability(voucher_data.dict()))
+        voucher_index.upsert(voucher)
+        return voucher
+    
+    async def update_voucher(self, voucher_id: int, voucher_data: VoucherUpdate) -> Optional[Voucher]:
+        """Update voucher dan kompilasi ulang entri index-nya"""
+        voucher = self.repository.update(
+            voucher_id, self._encode_applicability(voucher_data.dict(exclude_unset=True))
+        )
+        if voucher:
+            voucher_index.upsert(voucher)
+        return voucher
+    
+    def _encode_applicability(self, voucher_dict: dict) -> dict:
+        """Convert lists to JSON strings"""
+        for field in ('applicable_categories', 'applicable_products'):
+            if voucher_dict.get(field):
+                voucher_dict[field] = json.dumps(voucher_dict[field])
+        return voucher_dict
     
     async def validate_voucher(
         self, 
         request: VoucherValidationRequest, 
         user_id: int
     ) -> VoucherValidationResponse:
-        """Validasi voucher untuk transaksi"""
-        voucher = self.repository.get_by_code(request.code)
+        """
+        Validasi voucher untuk transaksi.
+        Dievaluasi dari index voucher in-memory; DB hanya disentuh saat index dimuat ulang
+        atau kode tidak ada di index (voucher nonaktif / baru dibuat di worker lain).
+        """
+        voucher_index.ensure_fresh(self.repository)
+        voucher = voucher_index.get(request.code)
+        if voucher is None:
+            stored = self.repository.get_by_code(request.code)
+            voucher = voucher_index.upsert(stored) if stored else None
         
         if not voucher:
             return VoucherValidationResponse(
@@ -88,8 +107,7 @@ class VoucherService(BaseService):
             )
         
         # Check user usage limit
-        user_usage_count = self.repository.get_user_usage_count(voucher.id, user_id)
-        if user_usage_count >= voucher.user_limit:
+        if voucher.user_exhausted(user_id):
             return VoucherValidationResponse(
                 valid=False,
                 final_amount=request.transaction_amount,
@@ -97,9 +115,8 @@ class VoucherService(BaseService):
             )
         
         # Check applicable categories
-        if voucher.applicable_categories and request.category:
-            categories = json.loads(voucher.applicable_categories)
-            if request.category not in categories:
+        if voucher.categories and request.category:
+            if request.category not in voucher.categories:
                 return VoucherValidationResponse(
                     valid=False,
                     final_amount=request.transaction_amount,
@@ -107,9 +124,8 @@ class VoucherService(BaseService):
                 )
         
         # Check applicable products
-        if voucher.applicable_products and request.product_code:
-            products = json.loads(voucher.applicable_products)
-            if request.product_code not in products:
+        if voucher.products and request.product_code:
+            if request.product_code not in voucher.products:
                 return VoucherValidationResponse(
                     valid=False,
                     final_amount=request.transaction_amount,
@@ -128,7 +144,7 @@ class VoucherService(BaseService):
             message="Voucher valid"
         )
     
-    def _calculate_discount(self, voucher: Voucher, amount: Decimal) -> Decimal:
+    def _calculate_discount(self, voucher: CompiledVoucher, amount: Decimal) -> Decimal:
         """Hitung jumlah diskon"""
         if voucher.voucher_type == VoucherType.PERCENTAGE:
             discount = amount * (voucher.discount_value / 100)
@@ -161,12 +177,16 @@ class VoucherService(BaseService):
             "final_amount": original_amount - discount_amount
         }
         
-        usage = self.repository.create_usage(usage_data)
-        
-        # Update voucher usage count
-        voucher = self.repository.get_by_id(voucher_id)
-        self.repository.update(voucher_id, {"usage_count": voucher.usage_count + 1})
+        # Kuota global dan per user dinaikkan atomik bersama record usage
+        recorded = self.repository.record_usage(usage_data)
+        if recorded is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Voucher tidak aktif atau sudah mencapai batas penggunaan"
+            )
         
+        usage, user_usage_count = recorded
+        voucher_index.record_usage(voucher_id, user_id, user_usage_count)
         return usage
     
     async def get_user_vouchers(self, user_id: int) -> List[Voucher]:
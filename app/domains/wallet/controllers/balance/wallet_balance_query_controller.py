@@ -4,13 +4,13 @@ Modul ini berisi implementasi query controller untuk wallet balance.
 
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.responses.api_response import APIResponse
-from app.domains.wallet.services.wallet_service import WalletService
-from app.domains.wallet.repositories.wallet_repository import WalletRepository
+from app.domains.wallet.repositories.async_wallet_repository import AsyncWalletRepository
 from app.domains.wallet.schemas.wallet_schemas import WalletBalanceResponse
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_current_user
+from app.core.database import get_async_db
 from app.domains.auth.models.user import User
 
 router = APIRouter()
@@ -23,14 +23,12 @@ router = APIRouter()
 )
 async def get_wallet_balance(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> APIResponse[WalletBalanceResponse]:
     """Get current user's wallet balance"""
     try:
-        repository = WalletRepository(db)
-        service = WalletService(repository)
-        
-        balance = service.get_user_balance(current_user.id)
+        repository = AsyncWalletRepository(db)
+        balance = await repository.get_user_balance(current_user.id)
         
         response_data = WalletBalanceResponse(
             balance=balance,
@@ -29,7 +29,8 @@ async def get_transaction_history(
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    transaction_type: Optional[TransactionTypeEnum] = None
+    transaction_type: Optional[TransactionTypeEnum] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor dari halaman sebelumnya")
 ) -> APIResponse[TransactionHistoryResponse]:
     """Get user's transaction history"""
     try:
@@ -40,7 +41,8 @@ async def get_transaction_history(
             user_id=current_user.id,
             page=page,
             per_page=per_page,
-            transaction_type=transaction_type
+            transaction_type=transaction_type,
+            cursor=cursor
         )
         
         response_data = TransactionHistoryResponse(**result)
@@ -49,6 +51,8 @@ async def get_transaction_history(
             data=response_data,
             message="Riwayat transaksi berhasil diambil"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -3,10 +3,11 @@ Modul ini berisi implementasi transfer controller untuk wallet transactions.
 """
 
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.common.responses.api_response import APIResponse
+from app.common.utils.request_utils import get_client_ip
 from app.domains.wallet.services.wallet_service import WalletService
 from app.domains.wallet.repositories.wallet_repository import WalletRepository
 from app.domains.wallet.schemas.wallet_schemas import (
@@ -25,6 +26,7 @@ router = APIRouter()
 )
 async def transfer_money(
     transfer_request: TransferRequest,
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Session = Depends(get_db)
 ) -> APIResponse[TransferResponse]:
@@ -35,7 +37,8 @@ async def transfer_money(
         
         transfer = service.transfer_money(
             sender_id=current_user.id,
-            transfer_request=transfer_request
+            transfer_request=transfer_request,
+            ip_address=get_client_ip(request)
         )
         
         # Get receiver info for response
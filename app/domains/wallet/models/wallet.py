@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, Text, Enum, DateTime
+from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, Text, Enum, DateTime, func
 from sqlalchemy.orm import relationship
 from app.common.base_classes.base import BaseModel
+from app.core.database import Base
 import enum
 from datetime import datetime
 
@@ -53,6 +54,19 @@ class WalletTransaction(BaseModel):
     # Relationship will be added when User model is properly configured
     # user = relationship("User", back_populates="wallet_transactions")
 
+class WalletBalance(Base):
+    """
+    Model untuk saldo wallet per user (materialized dari ledger wallet_transactions).
+    Satu baris per user sehingga cek saldo cukup satu lookup primary key.
+    Kolom version dipakai untuk optimistic locking pada database tanpa SELECT ... FOR UPDATE.
+    """
+    __tablename__ = "wallet_balances"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    balance = Column(Numeric(15, 2), nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class Transfer(BaseModel):
     """
     Model untuk transfer antar user.
@@ -0,0 +1,125 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, func
+from typing import List, Optional, Dict, Any
+from decimal import Decimal
+
+from app.common.base_classes.base_repository import AsyncBaseRepository
+from app.common.utils.pagination import COUNT_ESTIMATE
+from app.domains.wallet.repositories.wallet_repository import WalletRepository, wallet_transaction_paginator
+from app.domains.wallet.models.wallet import (
+    WalletTransaction, WalletBalance, TransactionType, TransactionStatus
+)
+
+class AsyncWalletRepository(AsyncBaseRepository[WalletTransaction]):
+    """
+    Versi async dari WalletRepository untuk dipakai dari service async def.
+    Query baca ditulis native dengan AsyncSession; operasi tulis yang memakai
+    logika locking saldo dijalankan lewat run_sync di atas koneksi async yang sama,
+    sehingga aturan saldo tetap satu sumber (WalletRepository) tanpa memblokir event loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(WalletTransaction, db)
+
+    async def get_user_balance(self, user_id: int) -> Decimal:
+        """Ambil saldo user saat ini"""
+        balance = await self.db.get(WalletBalance, user_id)
+        if balance is not None:
+            return balance.balance
+        return await self.db.run_sync(lambda session: WalletRepository(session)._ledger_balance(user_id))
+
+    async def create_transaction(
+        self,
+        user_id: int,
+        transaction_type: TransactionType,
+        amount: Decimal,
+        description: str = None,
+        reference_id: str = None,
+        meta_data: str = None,
+        status: TransactionStatus = TransactionStatus.PENDING
+    ) -> WalletTransaction:
+        """Buat transaksi wallet baru"""
+        return await self.db.run_sync(
+            lambda session: WalletRepository(session).create_transaction(
+                user_id=user_id,
+                transaction_type=transaction_type,
+                amount=amount,
+                description=description,
+                reference_id=reference_id,
+                meta_data=meta_data,
+                status=status
+            )
+        )
+
+    async def update_transaction_status(
+        self,
+        transaction_id: int,
+        status: TransactionStatus,
+        description: str = None
+    ) -> Optional[WalletTransaction]:
+        """Update status transaksi (mutasi saldo saat SUCCESS)"""
+        return await self.db.run_sync(
+            lambda session: WalletRepository(session).update_transaction_status(
+                transaction_id, status, description
+            )
+        )
+
+    def _user_transactions_query(
+        self,
+        user_id: int,
+        transaction_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None
+    ):
+        query = select(WalletTransaction).where(WalletTransaction.user_id == user_id)
+
+        if transaction_type:
+            query = query.where(WalletTransaction.transaction_type == transaction_type)
+
+        if status:
+            query = query.where(WalletTransaction.status == status)
+
+        return query
+
+    async def get_user_transactions(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        transaction_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None
+    ) -> List[WalletTransaction]:
+        """Ambil transaksi user dengan filter"""
+        query = self._user_transactions_query(user_id, transaction_type, status)
+        result = await self.db.execute(
+            query.order_by(desc(WalletTransaction.created_at)).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_user_transactions_page(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        transaction_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+        count: Optional[str] = COUNT_ESTIMATE
+    ) -> Dict[str, Any]:
+        """Ambil transaksi user dengan keyset pagination (tanpa OFFSET)"""
+        query = self._user_transactions_query(user_id, transaction_type, status)
+        return await wallet_transaction_paginator.apaginate(self.db, query, cursor, limit, count)
+
+    async def count_user_transactions(
+        self,
+        user_id: int,
+        transaction_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None
+    ) -> int:
+        """Hitung total transaksi user"""
+        query = self._user_transactions_query(user_id, transaction_type, status)
+        return await self.db.scalar(select(func.count()).select_from(query.subquery()))
+
+    async def reconcile_balances(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """Bangun ulang tabel wallet_balances dari ledger"""
+        return await self.db.run_sync(
+            lambda session: WalletRepository(session).reconcile_balances(user_id=user_id)
+        )
@@ -1,34 +1,55 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, or_, desc, func, case, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 from app.common.base_classes.base_repository import BaseRepository
+from app.common.exceptions.custom_exceptions import InsufficientBalanceError, TransactionError
+from app.common.utils.pagination import COUNT_ESTIMATE, KeysetPaginator
 from app.domains.wallet.models.wallet import (
-    WalletTransaction, Transfer, TopUpRequest, 
+    WalletTransaction, WalletBalance, Transfer, TopUpRequest, 
     TransactionType, TransactionStatus, TopUpStatus, PaymentMethod
 )
 
+# Tipe transaksi yang menambah saldo; selain ini mengurangi saldo
+CREDIT_TRANSACTION_TYPES = (
+    TransactionType.TOPUP_MANUAL,
+    TransactionType.TOPUP_MIDTRANS,
+    TransactionType.TRANSFER_RECEIVE,
+    TransactionType.REFUND,
+)
+
+# Riwayat transaksi terbaru dulu dengan keyset (created_at, id)
+wallet_transaction_paginator = KeysetPaginator(
+    WalletTransaction.created_at, WalletTransaction.id, default_page_size=20
+)
+
 class WalletRepository(BaseRepository[WalletTransaction]):
     """
     Repository untuk Wallet yang mengimplementasikan Repository Pattern.
     Menangani semua operasi database terkait wallet dan transaksi keuangan.
+    
+    Saldo disimpan di tabel wallet_balances (satu baris per user) dan hanya
+    diubah di transaksi database yang sama dengan perubahan ledger menjadi SUCCESS.
     """
     
+    # Jumlah percobaan ulang optimistic locking sebelum menyerah
+    BALANCE_UPDATE_RETRIES = 5
+    
     def __init__(self, db: Session):
         super().__init__(WalletTransaction, db)
     
     def get_user_balance(self, user_id: int) -> Decimal:
         """Ambil saldo user saat ini"""
-        last_transaction = self.db.query(WalletTransaction).filter(
-            WalletTransaction.user_id == user_id,
-            WalletTransaction.status == TransactionStatus.SUCCESS
-        ).order_by(desc(WalletTransaction.created_at)).first()
+        balance = self.db.get(WalletBalance, user_id)
+        if balance is not None:
+            return balance.balance
         
-        if last_transaction:
-            return last_transaction.balance_after
-        return Decimal('0')
+        # User belum punya baris saldo (data lama), hitung dari ledger
+        return self._ledger_balance(user_id)
     
     def create_transaction(
         self, 
@@ -37,36 +58,41 @@ class WalletRepository(BaseRepository[WalletTransaction]):
         amount: Decimal,
         description: str = None,
         reference_id: str = None,
-        meta_data: str = None
+        meta_data: str = None,
+        status: TransactionStatus = TransactionStatus.PENDING
     ) -> WalletTransaction:
-        """Buat transaksi wallet baru"""
+        """
+        Buat transaksi wallet baru.
+        Jika status SUCCESS, saldo langsung diperbarui dalam transaksi database yang sama.
+        """
         # Ambil saldo sebelumnya
         balance_before = self.get_user_balance(user_id)
-        
-        # Hitung saldo setelah transaksi
-        if transaction_type in [TransactionType.TOPUP_MANUAL, TransactionType.TOPUP_MIDTRANS, 
-                               TransactionType.TRANSFER_RECEIVE, TransactionType.REFUND]:
-            balance_after = balance_before + amount
-        else:
-            balance_after = balance_before - amount
-        
-        # Generate transaction code
-        transaction_code = f"TXN{datetime.now().strftime('%Y%m%d%H%M%S')}{user_id}"
+        balance_after = balance_before + self._signed_amount(transaction_type, amount)
         
         transaction = WalletTransaction(
             user_id=user_id,
-            transaction_code=transaction_code,
+            transaction_code=self._transaction_code(user_id),
             transaction_type=transaction_type,
             amount=amount,
             balance_before=balance_before,
             balance_after=balance_after,
-            status=TransactionStatus.PENDING,
+            status=status,
             description=description,
             reference_id=reference_id,
             meta_data=meta_data
         )
         
-        return self.create(transaction)
+        try:
+            if status == TransactionStatus.SUCCESS:
+                self._settle(transaction)
+            self.db.add(transaction)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.db.refresh(transaction)
+        return transaction
     
     def update_transaction_status(
         self, 
@@ -74,12 +100,193 @@ class WalletRepository(BaseRepository[WalletTransaction]):
         status: TransactionStatus,
         description: str = None
     ) -> Optional[WalletTransaction]:
-        """Update status transaksi"""
-        update_data = {"status": status}
-        if description:
-            update_data["description"] = description
+        """
+        Update status transaksi.
+        Perubahan ke SUCCESS menerapkan mutasi saldo secara atomik bersama update ledger.
+        """
+        transaction = self.get_by_id(transaction_id)
+        if not transaction:
+            return None
+        
+        try:
+            if status == TransactionStatus.SUCCESS and transaction.status != TransactionStatus.SUCCESS:
+                self._settle(transaction)
+            
+            transaction.status = status
+            if description:
+                transaction.description = description
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.db.refresh(transaction)
+        return transaction
+    
+    @staticmethod
+    def _transaction_code(user_id: int) -> str:
+        return f"TXN{datetime.now().strftime('%Y%m%d%H%M%S%f')}{user_id}"
+    
+    # Balance methods
+    @staticmethod
+    def _signed_amount(transaction_type: TransactionType, amount: Decimal) -> Decimal:
+        """Nilai mutasi saldo: positif untuk kredit, negatif untuk debit"""
+        if transaction_type in CREDIT_TRANSACTION_TYPES:
+            return amount
+        return -amount
+    
+    def _ledger_balance_query(self):
+        """Ekspresi SUM saldo dari ledger transaksi SUCCESS"""
+        return func.coalesce(func.sum(
+            case(
+                (WalletTransaction.transaction_type.in_(CREDIT_TRANSACTION_TYPES), WalletTransaction.amount),
+                else_=-WalletTransaction.amount
+            )
+        ), 0)
+    
+    def _ledger_balance(self, user_id: int) -> Decimal:
+        """Hitung saldo user langsung dari ledger"""
+        result = self.db.query(self._ledger_balance_query()).filter(
+            WalletTransaction.user_id == user_id,
+            WalletTransaction.status == TransactionStatus.SUCCESS
+        ).scalar()
+        return Decimal(str(result or 0))
+    
+    def _dialect_name(self) -> str:
+        return self.db.get_bind().dialect.name
+    
+    def _ensure_balance_row(self, user_id: int):
+        """Buat baris saldo (di-seed dari ledger) jika belum ada, aman terhadap insert bersamaan"""
+        if self.db.get(WalletBalance, user_id) is not None:
+            return
+        
+        values = {"user_id": user_id, "balance": self._ledger_balance(user_id), "version": 0}
+        dialect = self._dialect_name()
+        if dialect == "postgresql":
+            stmt = pg_insert(WalletBalance).values(**values).on_conflict_do_nothing(
+                index_elements=[WalletBalance.user_id]
+            )
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(WalletBalance).values(**values).on_conflict_do_nothing(
+                index_elements=[WalletBalance.user_id]
+            )
+        else:
+            stmt = WalletBalance.__table__.insert().values(**values)
+        self.db.execute(stmt)
+    
+    def _apply_balance_delta(self, user_id: int, delta: Decimal) -> Tuple[Decimal, Decimal]:
+        """
+        Ubah saldo user sebesar delta di dalam transaksi database aktif.
+        PostgreSQL memakai SELECT ... FOR UPDATE, database lain memakai optimistic version check.
+        Mengembalikan (saldo_sebelum, saldo_sesudah).
+        """
+        self._ensure_balance_row(user_id)
+        
+        if self._dialect_name() == "postgresql":
+            row = self.db.execute(
+                select(WalletBalance.balance, WalletBalance.version)
+                .where(WalletBalance.user_id == user_id)
+                .with_for_update()
+            ).one()
+            balance_after = self._checked_balance(user_id, row.balance, delta)
+            self.db.execute(
+                update(WalletBalance)
+                .where(WalletBalance.user_id == user_id)
+                .values(balance=balance_after, version=row.version + 1)
+            )
+            return row.balance, balance_after
+        
+        for _ in range(self.BALANCE_UPDATE_RETRIES):
+            row = self.db.execute(
+                select(WalletBalance.balance, WalletBalance.version)
+                .where(WalletBalance.user_id == user_id)
+            ).one()
+            balance_after = self._checked_balance(user_id, row.balance, delta)
+            result = self.db.execute(
+                update(WalletBalance)
+                .where(
+                    WalletBalance.user_id == user_id,
+                    WalletBalance.version == row.version
+                )
+                .values(balance=balance_after, version=row.version + 1)
+            )
+            if result.rowcount == 1:
+                return row.balance, balance_after
+        
+        raise TransactionError(
+            "Saldo sedang diperbarui oleh transaksi lain, silakan coba lagi",
+            error_type="BALANCE_CONFLICT"
+        )
+    
+    @staticmethod
+    def _checked_balance(user_id: int, current: Decimal, delta: Decimal) -> Decimal:
+        """Hitung saldo baru dan tolak debit yang membuat saldo negatif"""
+        balance_after = current + delta
+        if delta < 0 and balance_after < 0:
+            raise InsufficientBalanceError(
+                current_balance=float(current),
+                required_amount=float(-delta)
+            )
+        return balance_after
+    
+    def _settle(self, transaction: WalletTransaction):
+        """Terapkan transaksi ke saldo dan catat saldo sebelum/sesudah yang sebenarnya"""
+        balance_before, balance_after = self._apply_balance_delta(
+            transaction.user_id,
+            self._signed_amount(transaction.transaction_type, transaction.amount)
+        )
+        transaction.balance_before = balance_before
+        transaction.balance_after = balance_after
+    
+    def reconcile_balances(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Bangun ulang tabel wallet_balances dari ledger transaksi SUCCESS.
+        Mengembalikan ringkasan jumlah user yang diperiksa dan yang saldonya dikoreksi.
+        """
+        query = self.db.query(
+            WalletTransaction.user_id,
+            self._ledger_balance_query().label("balance")
+        ).filter(WalletTransaction.status == TransactionStatus.SUCCESS)
+        if user_id is not None:
+            query = query.filter(WalletTransaction.user_id == user_id)
+        ledger = {row.user_id: Decimal(str(row.balance)) for row in query.group_by(WalletTransaction.user_id)}
+        
+        balance_query = self.db.query(WalletBalance)
+        if user_id is not None:
+            balance_query = balance_query.filter(WalletBalance.user_id == user_id)
         
-        return self.update(transaction_id, update_data)
+        corrected = []
+        try:
+            # Lock baris saldo yang ada agar tidak bertabrakan dengan transaksi berjalan
+            if self._dialect_name() == "postgresql":
+                balance_query = balance_query.with_for_update()
+            
+            for row in balance_query.all():
+                expected = ledger.pop(row.user_id, Decimal('0'))
+                if row.balance != expected:
+                    corrected.append({
+                        "user_id": row.user_id,
+                        "stored_balance": float(row.balance),
+                        "ledger_balance": float(expected)
+                    })
+                    row.balance = expected
+                    row.version = row.version + 1
+            
+            # User dengan ledger tapi belum punya baris saldo
+            for missing_user_id, expected in ledger.items():
+                self.db.add(WalletBalance(user_id=missing_user_id, balance=expected, version=0))
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return {
+            "corrected": corrected,
+            "corrected_count": len(corrected),
+            "created_count": len(ledger),
+            "reconciled_at": datetime.utcnow().isoformat()
+        }
     
     def get_user_transactions(
         self, 
@@ -102,6 +309,26 @@ class WalletRepository(BaseRepository[WalletTransaction]):
         
         return query.order_by(desc(WalletTransaction.created_at)).offset(skip).limit(limit).all()
     
+    def get_user_transactions_page(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        transaction_type: Optional[TransactionType] = None,
+        status: Optional[TransactionStatus] = None,
+        count: Optional[str] = COUNT_ESTIMATE
+    ) -> Dict[str, Any]:
+        """Ambil transaksi user dengan keyset pagination (tanpa OFFSET)"""
+        statement = select(WalletTransaction).where(WalletTransaction.user_id == user_id)
+        
+        if transaction_type:
+            statement = statement.where(WalletTransaction.transaction_type == transaction_type)
+        
+        if status:
+            statement = statement.where(WalletTransaction.status == status)
+        
+        return wallet_transaction_paginator.paginate(self.db, statement, cursor, limit, count)
+    
     def count_user_transactions(
         self, 
         user_id: int,
@@ -146,6 +373,65 @@ class WalletRepository(BaseRepository[WalletTransaction]):
         self.db.refresh(transfer)
         return transfer
     
+    def settle_transfer(
+        self,
+        sender_id: int,
+        receiver_id: int,
+        amount: Decimal,
+        description: str = None,
+        sender_description: str = None,
+        receiver_description: str = None
+    ) -> Tuple[Transfer, WalletTransaction, WalletTransaction]:
+        """
+        Buat transfer beserta transaksi debit pengirim dan kredit penerima dalam satu
+        transaksi database. Baris saldo dikunci berurutan menurut user_id agar dua transfer
+        berlawanan arah tidak saling deadlock; gagal di tengah jalan membatalkan keduanya.
+        """
+        transfer = Transfer(
+            sender_id=sender_id,
+            receiver_id=receiver_id,
+            transfer_code=f"TRF{datetime.now().strftime('%Y%m%d%H%M%S')}{sender_id}",
+            amount=amount,
+            status=TransactionStatus.SUCCESS,
+            description=description
+        )
+        legs = {
+            sender_id: (TransactionType.TRANSFER_SEND, sender_description),
+            receiver_id: (TransactionType.TRANSFER_RECEIVE, receiver_description)
+        }
+        
+        try:
+            transactions = {}
+            for user_id in sorted(legs):
+                transaction_type, leg_description = legs[user_id]
+                balance_before, balance_after = self._apply_balance_delta(
+                    user_id, self._signed_amount(transaction_type, amount)
+                )
+                transactions[user_id] = WalletTransaction(
+                    user_id=user_id,
+                    transaction_code=self._transaction_code(user_id),
+                    transaction_type=transaction_type,
+                    amount=amount,
+                    balance_before=balance_before,
+                    balance_after=balance_after,
+                    status=TransactionStatus.SUCCESS,
+                    description=leg_description,
+                    reference_id=transfer.transfer_code
+                )
+            
+            self.db.add_all([transfer, *transactions.values()])
+            self.db.flush()
+            transfer.sender_transaction_id = transactions[sender_id].id
+            transfer.receiver_transaction_id = transactions[receiver_id].id
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        for instance in (transfer, *transactions.values()):
+            self.db.refresh(instance)
+        return transfer, transactions[sender_id], transactions[receiver_id]
+    
     def update_transfer_status(
         self, 
         transfer_id: int, 
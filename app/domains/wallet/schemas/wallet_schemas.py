@@ -217,6 +217,10 @@ class TransactionHistoryResponse(BaseModel):
     page: int
     per_page: int
     total_pages: int
+    # Keyset pagination: kirim next_cursor sebagai parameter cursor untuk halaman berikutnya
+    next_cursor: Optional[str] = None
+    has_next: bool = False
+    total_is_estimate: bool = False
     
     class Config:
         from_attributes = True
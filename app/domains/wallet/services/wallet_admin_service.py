@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from fastapi import HTTPException, status
 from datetime import datetime
 
@@ -90,3 +90,13 @@ class WalletAdminService(BaseService):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Gagal memproses approval: {str(e)}"
             )
+    
+    def reconcile_balances(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """Bangun ulang saldo materialized dari ledger transaksi (Admin)"""
+        try:
+            return self.repository.reconcile_balances(user_id=user_id)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Gagal melakukan rekonsiliasi saldo: {str(e)}"
+            )
@@ -57,3 +57,6 @@ class WalletService(BaseService):
     
     def process_topup_approval(self, *args, **kwargs):
         return self.admin_service.process_topup_approval(*args, **kwargs)
+    
+    def reconcile_balances(self, *args, **kwargs):
+        return self.admin_service.reconcile_balances(*args, **kwargs)
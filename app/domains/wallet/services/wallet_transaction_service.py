@@ -7,7 +7,16 @@ from app.domains.wallet.repositories.wallet_repository import WalletRepository
 from app.domains.wallet.models.wallet import (
     WalletTransaction, TransactionType, TransactionStatus
 )
-from app.common.exceptions.custom_exceptions import InsufficientBalanceError
+from app.common.exceptions.custom_exceptions import InsufficientBalanceError, ValidationException
+from app.domains.security.services.fraud_feature_store import fraud_feature_store
+
+# Transaksi yang diinisiasi user sendiri dan dihitung sebagai fitur fraud (velocity, pola nominal).
+# PPOB_PAYMENT tidak termasuk: pembelian PPOB sudah dicatat sekali oleh PPOBTransactionService
+FRAUD_TRACKED_TRANSACTION_TYPES = (
+    TransactionType.TRANSFER_SEND,
+    TransactionType.TOPUP_MANUAL,
+    TransactionType.TOPUP_MIDTRANS,
+)
 
 class WalletTransactionService(BaseService):
     """Service untuk menangani transaksi dasar wallet"""
@@ -26,9 +35,10 @@ class WalletTransactionService(BaseService):
         amount: Decimal,
         description: str = None,
         reference_id: str = None,
-        meta_data: str = None
+        meta_data: str = None,
+        ip_address: str = None
     ) -> WalletTransaction:
-        """Buat transaksi wallet baru"""
+        """Buat transaksi wallet baru; ip_address request (bila ada) ikut dicatat ke fitur fraud per IP"""
         try:
             # Validasi saldo untuk transaksi debit
             if transaction_type in [TransactionType.TRANSFER_SEND, TransactionType.PPOB_PAYMENT]:
@@ -36,7 +46,7 @@ class WalletTransactionService(BaseService):
                 if current_balance < amount:
                     raise InsufficientBalanceError("Saldo tidak mencukupi")
             
-            return self.repository.create_transaction(
+            transaction = self.repository.create_transaction(
                 user_id=user_id,
                 transaction_type=transaction_type,
                 amount=amount,
@@ -44,6 +54,11 @@ class WalletTransactionService(BaseService):
                 reference_id=reference_id,
                 meta_data=meta_data
             )
+            
+            if transaction_type in FRAUD_TRACKED_TRANSACTION_TYPES:
+                fraud_feature_store.record_transaction(user_id, amount, ip_address)
+            
+            return transaction
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,10 +83,34 @@ class WalletTransactionService(BaseService):
         user_id: int,
         page: int = 1,
         per_page: int = 20,
-        transaction_type: Optional[TransactionType] = None
+        transaction_type: Optional[TransactionType] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Ambil riwayat transaksi user"""
+        """
+        Ambil riwayat transaksi user.
+        Halaman pertama dan request dengan cursor memakai keyset pagination (next_cursor);
+        page > 1 tanpa cursor tetap dilayani dengan offset pagination legacy.
+        """
         try:
+            if cursor or page == 1:
+                result = self.repository.get_user_transactions_page(
+                    user_id=user_id,
+                    cursor=cursor,
+                    limit=per_page,
+                    transaction_type=transaction_type
+                )
+                meta = result["pagination"]
+                return {
+                    "transactions": result["items"],
+                    "total_count": meta["total_items"] or 0,
+                    "page": page,
+                    "per_page": meta["page_size"],
+                    "total_pages": meta["total_pages"] or 0,
+                    "next_cursor": meta["next_cursor"],
+                    "has_next": meta["has_next"],
+                    "total_is_estimate": meta["total_is_estimate"]
+                }
+            
             skip = (page - 1) * per_page
             
             transactions = self.repository.get_user_transactions(
@@ -93,8 +132,14 @@ class WalletTransactionService(BaseService):
                 "total_count": total_count,
                 "page": page,
                 "per_page": per_page,
-                "total_pages": total_pages
+                "total_pages": total_pages,
+                "has_next": skip + len(transactions) < total_count
             }
+        except ValidationException as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=e.message
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
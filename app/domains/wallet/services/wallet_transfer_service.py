@@ -3,15 +3,14 @@ from decimal import Decimal
 
 from app.common.base_classes.base_service import BaseService
 from app.domains.wallet.repositories.wallet_repository import WalletRepository
-from app.domains.wallet.models.wallet import (
-    Transfer, TransactionType, TransactionStatus
-)
+from app.domains.wallet.models.wallet import Transfer
 from app.domains.wallet.schemas.wallet_schemas import TransferRequest
 from app.domains.auth.models.user import User
 from app.common.exceptions.custom_exceptions import (
     ValidationException, NotFoundError, InsufficientBalanceError
 )
 from app.domains.wallet.services.wallet_transaction_service import WalletTransactionService
+from app.domains.security.services.fraud_feature_store import fraud_feature_store
 
 class WalletTransferService(BaseService):
     """Service untuk menangani transfer antar user"""
@@ -20,7 +19,7 @@ class WalletTransferService(BaseService):
         super().__init__(repository)
         self.transaction_service = WalletTransactionService(repository)
     
-    def transfer_money(self, sender_id: int, transfer_request: TransferRequest) -> Transfer:
+    def transfer_money(self, sender_id: int, transfer_request: TransferRequest, ip_address: str = None) -> Transfer:
         """Transfer uang antar user"""
         try:
             # Validasi receiver
@@ -34,57 +33,19 @@ class WalletTransferService(BaseService):
             if receiver.id == sender_id:
                 raise ValidationException("Tidak dapat transfer ke diri sendiri")
             
-            # Validasi saldo sender
-            sender_balance = self.transaction_service.get_user_balance(sender_id)
-            if sender_balance < transfer_request.amount:
-                raise InsufficientBalanceError("Saldo tidak mencukupi")
+            sender = self.repository.db.query(User).filter(User.id == sender_id).first()
             
-            # Buat transfer record
-            transfer = self.repository.create_transfer(
+            # Debit pengirim, kredit penerima dan record transfer di-commit bersamaan;
+            # saldo tidak cukup terdeteksi saat baris saldo pengirim dikunci
+            transfer, _, _ = self.repository.settle_transfer(
                 sender_id=sender_id,
                 receiver_id=receiver.id,
                 amount=transfer_request.amount,
-                description=transfer_request.description
-            )
-            
-            # Buat transaksi untuk sender (debit)
-            sender_transaction = self.transaction_service.create_transaction(
-                user_id=sender_id,
-                transaction_type=TransactionType.TRANSFER_SEND,
-                amount=transfer_request.amount,
-                description=f"Transfer ke {receiver.username}",
-                reference_id=transfer.transfer_code
-            )
-            
-            # Ambil data sender
-            sender = self.repository.db.query(User).filter(User.id == sender_id).first()
-            
-            # Buat transaksi untuk receiver (credit)
-            receiver_transaction = self.transaction_service.create_transaction(
-                user_id=receiver.id,
-                transaction_type=TransactionType.TRANSFER_RECEIVE,
-                amount=transfer_request.amount,
-                description=f"Transfer dari {sender.username}",
-                reference_id=transfer.transfer_code
-            )
-            
-            # Update status transaksi menjadi success
-            self.transaction_service.update_transaction_status(
-                sender_transaction.id, 
-                TransactionStatus.SUCCESS
-            )
-            self.transaction_service.update_transaction_status(
-                receiver_transaction.id, 
-                TransactionStatus.SUCCESS
-            )
-            
-            # Update transfer dengan transaction IDs
-            self.repository.update_transfer_status(
-                transfer_id=transfer.id,
-                status=TransactionStatus.SUCCESS,
-                sender_transaction_id=sender_transaction.id,
-                receiver_transaction_id=receiver_transaction.id
+                description=transfer_request.description,
+                sender_description=f"Transfer ke {receiver.username}",
+                receiver_description=f"Transfer dari {sender.username}"
             )
+            fraud_feature_store.record_transaction(sender_id, transfer_request.amount, ip_address)
             
             return transfer
             
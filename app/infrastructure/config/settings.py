@@ -97,5 +97,89 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: str = "0"
+    
+    # Serializer cache Redis: "<format>[+<codec>]" dengan format json/orjson/msgpack
+    # dan codec zstd/lz4/zlib; override per cache_type "nama=spec,nama=spec"
+    CACHE_SERIALIZER: str = "json"
+    CACHE_SERIALIZER_OVERRIDES: str = ""
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
+    # Status health Redis di-cache sekian detik agar tidak PING setiap akses cache
+    CACHE_HEALTH_CHECK_INTERVAL: float = 5.0
+    
+    # Near cache: L1 in-process di depan Redis, koheren lewat pub/sub antar worker
+    # CACHE_NEAR_PREFIX_TTLS: "prefix=detik,..." (0 = prefix tidak di-cache di L1)
+    CACHE_NEAR_ENABLED: bool = False
+    CACHE_NEAR_MAX_SIZE: int = 10000
+    CACHE_NEAR_DEFAULT_TTL: float = 5.0
+    CACHE_NEAR_PREFIX_TTLS: str = "ppob_api:ppob:product=30,ppob_api:ppob:inquiry=0"
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    
+    # Rate limiting settings ("memory" per worker, "redis" bersama lintas worker)
+    RATE_LIMIT_STORAGE: str = "memory"
+    
+    # Analytics ingestion (event di-buffer lalu di-insert per batch)
+    ANALYTICS_QUEUE_MAX_SIZE: int = 10000
+    ANALYTICS_BATCH_SIZE: int = 500
+    ANALYTICS_FLUSH_INTERVAL: float = 1.0
+    ANALYTICS_ENQUEUE_TIMEOUT: float = 0.05
+    
+    # Shared HTTP client untuk integrasi keluar (pool koneksi per upstream)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_CLIENT_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_CLIENT_DNS_CACHE_TTL: int = 300
+    
+    # Kredensial Digiflazz; provider digiflazz hanya aktif di factory bila keduanya terisi
+    DIGIFLAZZ_USERNAME: str = ""
+    DIGIFLAZZ_API_KEY: str = ""
+    DIGIFLAZZ_PRODUCTION: bool = False
+    
+    # Health check provider PPOB terjadwal (detik)
+    PPOB_HEALTH_CHECK_INTERVAL: float = 30.0
+    PPOB_HEALTH_CHECK_TIMEOUT: float = 5.0
+    
+    # Index voucher in-memory dimuat ulang dari DB setiap interval ini (detik)
+    # agar perubahan dari worker lain ikut terbaca
+    VOUCHER_INDEX_REFRESH_INTERVAL: float = 60.0
+    # Tabel aturan margin in-process dimuat ulang setiap interval ini (detik)
+    MARGIN_RULES_REFRESH_INTERVAL: float = 60.0
+    
+    # Export streaming (baris per chunk fetch/encode) dan folder hasil export ke file
+    EXPORT_CHUNK_SIZE: int = 5000
+    EXPORT_DIR: str = "static/exports"
+    
+    # Hub WebSocket: antrian outbound per client (pesan) dan batas waktu send (detik);
+    # bridge Redis meneruskan broadcast ke client di worker lain
+    WS_OUTBOUND_QUEUE_SIZE: int = 256
+    WS_SEND_TIMEOUT: float = 5.0
+    WS_REDIS_BRIDGE_ENABLED: bool = False
+    WS_BROADCAST_CHANNEL: str = "ws:broadcast"
+    
+    # Snapshot dashboard admin di-refresh setiap interval (detik) selama masih ada yang
+    # membaca dalam idle timeout (detik)
+    DASHBOARD_SNAPSHOT_INTERVAL: float = 5.0
+    DASHBOARD_SNAPSHOT_IDLE_TIMEOUT: float = 60.0
+    
+    # Startup worker: verifikasi schema (false = hanya lewat scripts/database/sync_schema.py
+    # saat deploy) dan grup router yang tidak didaftarkan, mis. "discord,analytics"
+    DB_SCHEMA_SYNC_ON_STARTUP: bool = True
+    DISABLED_ROUTER_GROUPS: str = ""
+
+    # Hashing password bcrypt di luar event loop: cost, jenis pool ("thread"/"process"),
+    # jumlah worker dan batas operasi yang menunggu sebelum request ditolak (503)
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Cache auth: token terverifikasi dan principal per worker (entri), TTL snapshot principal
+    # (detik), kapasitas bloom filter revocation dan interval bangun ulang bloom dari Redis
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    AUTH_PRINCIPAL_CACHE_TTL: float = 30.0
+    AUTH_REVOCATION_BLOOM_CAPACITY: int = 100000
+    AUTH_REVOCATION_REBUILD_INTERVAL: float = 300.0
+    # Revocation bersama di Redis + pub/sub antar worker (false = revocation hanya per worker)
+    AUTH_REVOCATION_REDIS_ENABLED: bool = False
+    AUTH_EVENTS_CHANNEL: str = "auth:events"
 
 settings = Settings()
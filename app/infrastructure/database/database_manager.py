@@ -1,5 +1,8 @@
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
 from sqlalchemy.orm import Session
-from typing import Generator
+from typing import Generator, Optional
+from datetime import datetime
+import hashlib
 import logging
 
 from app.infrastructure.config.settings import settings
@@ -7,6 +10,16 @@ from app.core.database import engine, SessionLocal, Base
 from app.infrastructure.database.models_registry import import_all_models
 from app.infrastructure.database.init_admin import ensure_admin_exists
 
+# Penanda schema yang sudah disinkronkan; sengaja di MetaData terpisah agar tidak ikut
+# fingerprint model aplikasi
+schema_state_table = Table(
+    "schema_state", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("synced_at", DateTime, nullable=False)
+)
+
+
 class DatabaseManager:
     """
     Database manager class untuk mengelola koneksi dan operasi database
@@ -18,45 +31,90 @@ class DatabaseManager:
         self.Base = Base
         self.logger = logging.getLogger(__name__)
     
+    def schema_fingerprint(self) -> str:
+        """Hash struktur semua model (tabel, kolom, tipe) untuk mendeteksi perubahan schema"""
+        digest = hashlib.sha256()
+        for table in sorted(self.Base.metadata.tables.values(), key=lambda table: table.name):
+            digest.update(table.name.encode())
+            for column in sorted(table.columns, key=lambda column: column.name):
+                digest.update(f"|{column.name}:{column.type!r}:{column.nullable}".encode())
+        return digest.hexdigest()
+    
+    def _stored_fingerprint(self) -> Optional[str]:
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(
+                    select(schema_state_table.c.fingerprint).where(schema_state_table.c.id == 1)
+                ).scalar()
+        except Exception:
+            # Tabel schema_state belum ada: database belum pernah disinkronkan
+            return None
+    
     def create_tables(self):
         """
-        Membuat semua tabel yang didefinisikan dalam model
+        Verifikasi schema saat startup worker.
+        Dengan DB_SCHEMA_SYNC_ON_STARTUP=false langkah ini dilewati seluruhnya (schema disinkronkan
+        sekali lewat scripts/database/sync_schema.py saat deploy). Bila aktif, cukup satu SELECT
+        fingerprint: sinkronisasi penuh hanya berjalan bila model berubah sejak sinkronisasi terakhir.
         """
+        if not settings.DB_SCHEMA_SYNC_ON_STARTUP:
+            self.logger.info("Schema sync on startup disabled, skipping table verification")
+            return
+        
         try:
-            # Import semua model terlebih dahulu
-            self.logger.info("Importing all database models...")
-            models_imported = import_all_models()
-            
-            # Buat semua tabel dengan checkfirst=True untuk menghindari error jika sudah ada
-            self.logger.info("Creating database tables...")
-            self.Base.metadata.create_all(bind=self.engine, checkfirst=True)
-            
-            # Verifikasi tabel yang dibuat
-            from sqlalchemy import inspect
-            inspector = inspect(self.engine)
-            tables = inspector.get_table_names()
-            
-            self.logger.info(f"Database tables verified: {len(tables)} tables")
-            self.logger.info(f"Models imported: {len(models_imported)} models")
-            
-            # Log tabel yang ada untuk debugging
-            for table in tables:
-                self.logger.debug(f"  - Table: {table}")
-            
-            # Pastikan tabel admin ada
-            if 'admins' not in tables:
-                self.logger.warning("Table 'admins' not found, attempting to create manually...")
-                self._create_admin_table_manually()
-            
-            # Buat admin default jika belum ada
-            self.logger.info("Checking admin existence...")
-            self.ensure_default_admin()
-                
+            import_all_models()
+            fingerprint = self.schema_fingerprint()
+            if self._stored_fingerprint() == fingerprint:
+                self.logger.info("Database schema up to date, skipping table verification")
+                return
+            self.sync_schema()
         except Exception as e:
             self.logger.error(f"Error creating database tables: {str(e)}")
             # Jangan raise exception agar aplikasi tetap bisa jalan
             self.logger.info("Continuing startup despite database error...")
     
+    def sync_schema(self) -> str:
+        """
+        Membuat semua tabel yang didefinisikan dalam model, memastikan admin default,
+        lalu menyimpan fingerprint schema. Return fingerprint yang disimpan.
+        """
+        # Import semua model terlebih dahulu
+        self.logger.info("Importing all database models...")
+        models_imported = import_all_models()
+        
+        # Buat semua tabel dengan checkfirst=True untuk menghindari error jika sudah ada
+        self.logger.info("Creating database tables...")
+        self.Base.metadata.create_all(bind=self.engine, checkfirst=True)
+        
+        # Verifikasi tabel yang dibuat
+        tables = inspect(self.engine).get_table_names()
+        
+        self.logger.info(f"Database tables verified: {len(tables)} tables")
+        self.logger.info(f"Models imported: {len(models_imported)} models")
+        
+        # Log tabel yang ada untuk debugging
+        for table in tables:
+            self.logger.debug(f"  - Table: {table}")
+        
+        # Pastikan tabel admin ada
+        if 'admins' not in tables:
+            self.logger.warning("Table 'admins' not found, attempting to create manually...")
+            self._create_admin_table_manually()
+        
+        # Buat admin default jika belum ada
+        self.logger.info("Checking admin existence...")
+        self.ensure_default_admin()
+        
+        fingerprint = self.schema_fingerprint()
+        schema_state_table.create(bind=self.engine, checkfirst=True)
+        with self.engine.begin() as connection:
+            connection.execute(schema_state_table.delete())
+            connection.execute(schema_state_table.insert().values(
+                id=1, fingerprint=fingerprint, synced_at=datetime.utcnow()
+            ))
+        self.logger.info(f"Database schema synced (fingerprint {fingerprint[:12]})")
+        return fingerprint
+    
     def _create_admin_table_manually(self):
         """
         Membuat tabel admin secara manual jika tidak ada
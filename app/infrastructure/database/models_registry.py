@@ -44,8 +44,8 @@ def import_all_models():
         
     try:
         # Wallet models
-        from app.domains.wallet.models.wallet import WalletTransaction, Transfer, TopUpRequest
-        models_imported.extend(["WalletTransaction", "Transfer", "TopUpRequest"])
+        from app.domains.wallet.models.wallet import WalletTransaction, WalletBalance, Transfer, TopUpRequest
+        models_imported.extend(["WalletTransaction", "WalletBalance", "Transfer", "TopUpRequest"])
         logger.info("Wallet models imported successfully")
     except ImportError as e:
         logger.warning(f"Wallet models not available: {e}")
@@ -60,8 +60,8 @@ def import_all_models():
         
     try:
         # Voucher models
-        from app.domains.voucher.models.voucher import Voucher, VoucherUsage
-        models_imported.extend(["Voucher", "VoucherUsage"])
+        from app.domains.voucher.models.voucher import Voucher, VoucherUsage, VoucherUserCounter
+        models_imported.extend(["Voucher", "VoucherUsage", "VoucherUserCounter"])
         logger.info("Voucher models imported successfully")
     except ImportError as e:
         logger.warning(f"Voucher models not available: {e}")
@@ -69,10 +69,14 @@ def import_all_models():
     try:
         # Analytics models - Fixed import path
         from app.domains.analytics.models.analytics import (
-            AnalyticsEvent, ProductAnalytics, VoucherAnalytics, DashboardMetrics
+            AnalyticsEvent, ProductAnalytics, VoucherAnalytics, DashboardMetrics,
+            AnalyticsRollup, AnalyticsProductRollup, AnalyticsVoucherRollup, AnalyticsRollupState,
+            AnalyticsRollupGap
         )
         models_imported.extend([
-            "AnalyticsEvent", "ProductAnalytics", "VoucherAnalytics", "DashboardMetrics"
+            "AnalyticsEvent", "ProductAnalytics", "VoucherAnalytics", "DashboardMetrics",
+            "AnalyticsRollup", "AnalyticsProductRollup", "AnalyticsVoucherRollup", "AnalyticsRollupState",
+            "AnalyticsRollupGap"
         ])
         logger.info("Analytics models imported successfully")
     except ImportError as e:
@@ -94,5 +98,13 @@ def import_all_models():
     except ImportError as e:
         logger.warning(f"Transaction models not available: {e}")
     
+    try:
+        # Inventory models
+        from app.domains.inventory.models.inventory_models import StockAlert, StockMovement, StockReservation
+        models_imported.extend(["StockAlert", "StockMovement", "StockReservation"])
+        logger.info("Inventory models imported successfully")
+    except ImportError as e:
+        logger.warning(f"Inventory models not available: {e}")
+    
     logger.info(f"Total models imported: {len(models_imported)} - {models_imported}")
     return models_imported
@@ -0,0 +1,308 @@
+"""
+Shared HTTP client untuk integrasi keluar (provider PPOB, Midtrans, Discord/Telegram, validasi game).
+
+Satu ClientSession aiohttp per upstream untuk seluruh umur aplikasi sehingga koneksi
+TCP/TLS dipakai ulang (keep-alive), dengan pool per host, cache DNS, timeout dan
+retry budget per upstream, serta histogram latency per upstream.
+aiohttp tidak mendukung HTTP/2; keuntungan utamanya (tanpa handshake per request)
+sudah didapat dari koneksi HTTP/1.1 keep-alive yang dipakai ulang.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.infrastructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+class UpstreamError(Exception):
+    """Request ke upstream gagal setelah retry (koneksi/timeout)"""
+
+    def __init__(self, upstream: str, message: str):
+        self.upstream = upstream
+        super().__init__(f"{upstream}: {message}")
+
+class UpstreamConfig:
+    """Konfigurasi satu upstream: timeout, ukuran pool dan kebijakan retry"""
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        max_connections: int = None,
+        max_connections_per_host: int = None,
+        max_retries: int = 2,
+        retry_ratio: float = 0.1,
+        retry_statuses: tuple = (502, 503, 504),
+        retry_non_idempotent: bool = False
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections or settings.HTTP_CLIENT_MAX_CONNECTIONS
+        self.max_connections_per_host = max_connections_per_host or settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST
+        self.max_retries = max_retries
+        self.retry_ratio = retry_ratio
+        self.retry_statuses = retry_statuses
+        # POST pembayaran hanya di-retry bila upstream idempoten (mis. ref_id Digiflazz)
+        self.retry_non_idempotent = retry_non_idempotent
+
+# Default per upstream; upstream yang tidak terdaftar memakai UpstreamConfig(name)
+DEFAULT_UPSTREAMS = {
+    "digiflazz": UpstreamConfig("digiflazz", timeout=30.0, max_retries=2, retry_non_idempotent=True),
+    "ppob": UpstreamConfig("ppob", timeout=30.0, max_retries=1),
+    "midtrans": UpstreamConfig("midtrans", timeout=15.0, max_retries=1),
+    "discord": UpstreamConfig("discord", timeout=5.0, max_retries=1),
+    "telegram": UpstreamConfig("telegram", timeout=5.0, max_retries=1),
+    "game_validation": UpstreamConfig("game_validation", timeout=5.0, max_retries=1),
+}
+
+class RetryBudget:
+    """
+    Token bucket retry: setiap request menabung retry_ratio token, setiap retry memakai
+    satu token. Retry dibatasi ~retry_ratio dari trafik sehingga upstream yang sedang down
+    tidak dibanjiri retry (retry storm).
+    """
+
+    def __init__(self, ratio: float = 0.1, min_tokens: float = 3.0, max_tokens: float = 50.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min_tokens
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.exhausted += 1
+        return False
+
+class LatencyHistogram:
+    """Histogram latency dengan bucket tetap (ms); percentile diestimasi dari batas bucket"""
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        self.counts[bisect_left(self.BUCKETS_MS, latency_ms)] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, percent: float) -> float:
+        if not self.total:
+            return 0.0
+        rank = self.total * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(self.BUCKETS_MS[index]) if index < len(self.BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}": count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 2) if self.total else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": buckets
+        }
+
+class UpstreamResponse:
+    """Response yang body-nya sudah dibaca penuh sehingga koneksi langsung kembali ke pool"""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+    def json(self) -> Any:
+        import json
+        return json.loads(self.body) if self.body else None
+
+class HTTPClientRegistry:
+    """
+    Registry HTTP client seumur aplikasi, satu entri per upstream.
+    ClientSession aiohttp dibuat lazy per event loop (TCPConnector dengan limit per host,
+    keep-alive dan cache DNS); requests.Session dengan pool koneksi tersedia untuk SDK
+    sync seperti midtransclient. Semua session ditutup lewat aclose() saat shutdown.
+    """
+
+    def __init__(self, upstreams: Optional[Dict[str, UpstreamConfig]] = None):
+        self.upstreams: Dict[str, UpstreamConfig] = dict(upstreams or DEFAULT_UPSTREAMS)
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._sync_sessions: Dict[str, requests.Session] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: UpstreamConfig) -> None:
+        """Daftarkan / ganti konfigurasi upstream (session lama tetap dipakai sampai aclose)"""
+        self.upstreams[config.name] = config
+        self._budgets.pop(config.name, None)
+
+    def config_for(self, upstream: str) -> UpstreamConfig:
+        config = self.upstreams.get(upstream)
+        if config is None:
+            config = self.upstreams.setdefault(upstream, UpstreamConfig(upstream))
+        return config
+
+    def session(self, upstream: str) -> aiohttp.ClientSession:
+        """ClientSession bersama untuk upstream di event loop yang sedang berjalan"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(upstream)
+        if session is not None and not session.closed and session._loop is loop:
+            return session
+
+        config = self.config_for(upstream)
+        connector = aiohttp.TCPConnector(
+            limit=config.max_connections,
+            limit_per_host=config.max_connections_per_host,
+            ttl_dns_cache=settings.HTTP_CLIENT_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=settings.HTTP_CLIENT_KEEPALIVE_TIMEOUT
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=config.timeout, sock_connect=config.connect_timeout)
+        )
+        self._sessions[upstream] = session
+        logger.info(f"HTTP client pool created for upstream '{upstream}'")
+        return session
+
+    def sync_session(self, upstream: str) -> requests.Session:
+        """requests.Session dengan pool koneksi keep-alive untuk SDK sync"""
+        with self._lock:
+            session = self._sync_sessions.get(upstream)
+            if session is None:
+                config = self.config_for(upstream)
+                adapter = HTTPAdapter(
+                    pool_connections=config.max_connections_per_host,
+                    pool_maxsize=config.max_connections_per_host
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sync_sessions[upstream] = session
+            return session
+
+    def _budget(self, upstream: str) -> RetryBudget:
+        budget = self._budgets.get(upstream)
+        if budget is None:
+            budget = self._budgets[upstream] = RetryBudget(self.config_for(upstream).retry_ratio)
+        return budget
+
+    def _count(self, upstream: str, key: str) -> None:
+        counters = self._counters.setdefault(upstream, {"requests": 0, "retries": 0, "errors": 0})
+        counters[key] = counters.get(key, 0) + 1
+
+    def observe(self, upstream: str, latency_ms: float) -> None:
+        """Catat latency satu request ke histogram upstream"""
+        histogram = self._histograms.get(upstream)
+        if histogram is None:
+            histogram = self._histograms[upstream] = LatencyHistogram()
+        histogram.observe(latency_ms)
+
+    async def request(self, upstream: str, method: str, url: str, **kwargs) -> UpstreamResponse:
+        """
+        Kirim request lewat pool upstream dan baca body-nya.
+        Gagal koneksi selalu boleh di-retry (request belum terkirim); timeout dan status
+        di retry_statuses hanya di-retry untuk method idempoten atau upstream yang
+        mengizinkan. Setiap retry memakai token dari retry budget upstream.
+        """
+        config = self.config_for(upstream)
+        budget = self._budget(upstream)
+        method = method.upper()
+        may_retry = method in IDEMPOTENT_METHODS or config.retry_non_idempotent
+
+        budget.deposit()
+        self._count(upstream, "requests")
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                async with self.session(upstream).request(method, url, **kwargs) as response:
+                    body = await response.read()
+                    result = UpstreamResponse(response.status, dict(response.headers), body)
+            except aiohttp.ClientConnectorError as e:
+                error, retryable = e, True
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                error, retryable = e, may_retry
+            else:
+                self.observe(upstream, (time.perf_counter() - started) * 1000)
+                if not (result.status in config.retry_statuses and may_retry):
+                    return result
+                error, retryable = None, True
+
+            if attempt >= config.max_retries or not retryable or not budget.withdraw():
+                if error is None:
+                    return result
+                self._count(upstream, "errors")
+                message = "timeout" if isinstance(error, asyncio.TimeoutError) else str(error) or type(error).__name__
+                raise UpstreamError(upstream, message) from error
+
+            attempt += 1
+            self._count(upstream, "retries")
+            logger.warning(f"Retrying {method} to upstream '{upstream}' (attempt {attempt + 1})")
+            await asyncio.sleep(min(0.05 * (2 ** attempt), 1.0))
+
+    async def get(self, upstream: str, url: str, **kwargs) -> UpstreamResponse:
+        return await self.request(upstream, "GET", url, **kwargs)
+
+    async def post(self, upstream: str, url: str, **kwargs) -> UpstreamResponse:
+        return await self.request(upstream, "POST", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistik per upstream: jumlah request/retry/error, sisa retry budget dan histogram latency"""
+        stats = {}
+        for upstream in sorted(set(self._counters) | set(self._histograms)):
+            budget = self._budgets.get(upstream)
+            stats[upstream] = {
+                **self._counters.get(upstream, {}),
+                "retry_budget_tokens": round(budget.tokens, 2) if budget else None,
+                "retry_budget_exhausted": budget.exhausted if budget else 0,
+                "latency": self._histograms.get(upstream, LatencyHistogram()).snapshot()
+            }
+        return stats
+
+    async def aclose(self) -> None:
+        """Tutup semua session (dipanggil saat shutdown)"""
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            if not session.closed:
+                await session.close()
+        with self._lock:
+            sync_sessions, self._sync_sessions = self._sync_sessions, {}
+        for session in sync_sessions.values():
+            session.close()
+
+# Global instance
+http_client_registry = HTTPClientRegistry()
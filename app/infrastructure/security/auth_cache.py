@@ -0,0 +1,458 @@
+"""
+Auth Cache
+Cache verifikasi JWT dan principal agar autentikasi per request cukup lookup dict:
+
+- Token yang sudah diverifikasi (signature + expiry) disimpan di LRU dengan key digest
+  token; entri berlaku sampai exp token dan dicek ulang ke revocation set hanya bila ada
+  revocation baru sejak pengecekan terakhir (generation)
+- Principal (User/Admin) disimpan sebagai snapshot kolom dengan TTL pendek lalu dipasang
+  ke session request via merge(load=False) tanpa SELECT; perubahan lewat ORM (mis. user
+  dinonaktifkan) langsung meng-invalidate snapshot
+- Revocation set (logout/forced revoke) berupa bloom filter jti in-process di depan sorted
+  set Redis; bila Redis tidak dipakai revocation disimpan lokal per worker
+- Bila bridge Redis aktif, revocation dan invalidation principal disebarkan lewat pub/sub;
+  selama listener belum tersambung cache token dan principal dilewati
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import redis
+import redis.asyncio as redis_async
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.infrastructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_KEY = "auth:revoked"
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def revocation_id(claims: Dict[str, Any], digest: bytes) -> str:
+    """jti token; token lama tanpa jti memakai digest token sebagai gantinya"""
+    return claims.get("jti") or digest.hex()
+
+
+class BloomFilter:
+    """Bloom filter di atas bytearray; posisi bit dari satu digest blake2b (double hashing)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationSet:
+    """
+    Set jti yang dicabut sampai token-nya expired.
+    Bloom filter menjawab "pasti tidak dicabut" tanpa I/O; hit bloom dikonfirmasi ke sorted
+    set Redis (score = exp) atau ke dict lokal bila Redis tidak dipakai.
+    """
+
+    def __init__(self, capacity: int = 100000, redis_url: Optional[str] = None, clock=time.time):
+        self.capacity = capacity
+        self.redis_url = redis_url
+        self._clock = clock
+        self._bloom = BloomFilter(capacity)
+        self._local: Dict[str, float] = {}
+        # Hasil konfirmasi Redis untuk hit bloom (termasuk false positive)
+        self._confirmed: Dict[str, bool] = {}
+        self._client: Optional[redis.Redis] = None
+        self._lock = threading.Lock()
+        # Naik setiap ada revocation baru atau bloom dibangun ulang
+        self.generation = 0
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url, decode_responses=True, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+        return self._client
+
+    def apply(self, jti: str, expires_at: float):
+        """Catat revocation di worker ini (dari revoke lokal atau pesan pub/sub)"""
+        with self._lock:
+            self._bloom.add(jti)
+            self._confirmed[jti] = True
+            if self.redis_url is None:
+                self._local[jti] = expires_at
+                if len(self._local) > self.capacity:
+                    self._rebuild(self._local.items())
+            self.generation += 1
+
+    def add(self, jti: str, expires_at: float):
+        """Cabut jti sampai expires_at (epoch detik)"""
+        if self.redis_url is not None:
+            self._get_client().zadd(REVOCATION_KEY, {jti: expires_at})
+        self.apply(jti, expires_at)
+
+    def contains(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        if self.redis_url is None:
+            expires_at = self._local.get(jti)
+            return expires_at is not None and expires_at > self._clock()
+        confirmed = self._confirmed.get(jti)
+        if confirmed is not None:
+            return confirmed
+        try:
+            confirmed = self._get_client().zscore(REVOCATION_KEY, jti) is not None
+        except Exception as e:
+            # Hampir semua hit bloom memang token yang dicabut: tolak bila Redis tidak bisa dicek
+            logger.error(f"Failed to confirm token revocation: {e}")
+            return True
+        with self._lock:
+            self._confirmed[jti] = confirmed
+        return confirmed
+
+    def _rebuild(self, entries: Iterable[Tuple[str, float]]):
+        now = self._clock()
+        bloom = BloomFilter(self.capacity)
+        active = {}
+        for jti, expires_at in entries:
+            if expires_at > now:
+                bloom.add(jti)
+                active[jti] = expires_at
+        self._bloom = bloom
+        self._confirmed = {}
+        if self.redis_url is None:
+            self._local = active
+        self.generation += 1
+
+    def reload(self):
+        """Bangun ulang bloom dari Redis dan buang revocation yang token-nya sudah expired"""
+        if self.redis_url is None:
+            with self._lock:
+                self._rebuild(list(self._local.items()))
+            return
+        client = self._get_client()
+        now = self._clock()
+        client.zremrangebyscore(REVOCATION_KEY, "-inf", now)
+        entries = client.zrangebyscore(REVOCATION_KEY, now, "+inf", withscores=True)
+        with self._lock:
+            self._rebuild(entries)
+
+    @property
+    def size(self) -> int:
+        return self._bloom.count
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+class AuthCache:
+    """Cache token terverifikasi, cache principal dan revocation set untuk dependency auth"""
+
+    def __init__(
+        self,
+        token_cache_size: int = 10000,
+        principal_ttl: float = 30.0,
+        principal_cache_size: int = 10000,
+        revocation_capacity: int = 100000,
+        redis_url: Optional[str] = None,
+        channel: str = "auth:events",
+        rebuild_interval: float = 300.0,
+        clock=time.time
+    ):
+        self.token_cache_size = token_cache_size
+        self.principal_ttl = principal_ttl
+        self.principal_cache_size = principal_cache_size
+        self.redis_url = redis_url
+        self.channel = channel
+        self.rebuild_interval = rebuild_interval
+        self.instance_id = uuid.uuid4().hex
+        self._clock = clock
+
+        self.revocations = RevocationSet(revocation_capacity, redis_url, clock)
+        # digest token -> (claims, exp, generation revocation saat terakhir dicek)
+        self._tokens: "OrderedDict[bytes, Tuple[Dict[str, Any], float, int]]" = OrderedDict()
+        # (tabel, id) -> (snapshot kolom, kedaluwarsa)
+        self._principals: "OrderedDict[Tuple[str, Any], Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._principal_generation = 0
+        self._watched = set()
+        self._lock = threading.Lock()
+
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listening = False
+        self._stopping = False
+
+        # Statistik
+        self._token_hits = 0
+        self._token_misses = 0
+        self._principal_hits = 0
+        self._principal_misses = 0
+        self._revoked_rejections = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Cache hanya dipakai bila tidak ada worker lain atau listener pub/sub tersambung"""
+        return self.redis_url is None or self._listening
+
+    # ---- Token terverifikasi ---------------------------------------------
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        """Claims token yang sudah diverifikasi sebelumnya; None bila belum ada/expired/dicabut"""
+        if not self.enabled:
+            return None
+        digest = token_digest(token)
+        with self._lock:
+            entry = self._tokens.get(digest)
+            if entry is not None:
+                self._tokens.move_to_end(digest)
+        if entry is None:
+            self._token_misses += 1
+            return None
+
+        claims, expires_at, generation = entry
+        if expires_at <= self._clock():
+            self._drop_token(digest)
+            self._token_misses += 1
+            return None
+        current_generation = self.revocations.generation
+        if generation != current_generation:
+            if self.revocations.contains(revocation_id(claims, digest)):
+                self._drop_token(digest)
+                return None
+            with self._lock:
+                if digest in self._tokens:
+                    self._tokens[digest] = (claims, expires_at, current_generation)
+        self._token_hits += 1
+        return claims
+
+    def put_claims(self, token: str, claims: Dict[str, Any]):
+        """Simpan claims hasil verifikasi penuh (hanya token dengan exp)"""
+        expires_at = claims.get("exp")
+        if not self.enabled or not isinstance(expires_at, (int, float)):
+            return
+        generation = self.revocations.generation
+        with self._lock:
+            self._tokens[token_digest(token)] = (claims, float(expires_at), generation)
+            while len(self._tokens) > self.token_cache_size:
+                self._tokens.popitem(last=False)
+
+    def _drop_token(self, digest: bytes):
+        with self._lock:
+            self._tokens.pop(digest, None)
+
+    # ---- Revocation -------------------------------------------------------
+
+    def is_revoked(self, token: str, claims: Dict[str, Any]) -> bool:
+        revoked = self.revocations.contains(revocation_id(claims, token_digest(token)))
+        if revoked:
+            self._revoked_rejections += 1
+        return revoked
+
+    def revoke(self, token: str, claims: Dict[str, Any]):
+        """Cabut token (logout); berlaku seketika di worker ini dan worker lain via pub/sub"""
+        digest = token_digest(token)
+        self._drop_token(digest)
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            expires_at = self._clock() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        self.revoke_jti(revocation_id(claims, digest), float(expires_at))
+
+    def revoke_jti(self, jti: str, expires_at: float):
+        """Forced revocation berdasarkan jti sampai expires_at (epoch detik)"""
+        self.revocations.add(jti, expires_at)
+        self._publish({"revoke": jti, "exp": expires_at})
+
+    # ---- Principal --------------------------------------------------------
+
+    def load_principal(self, db: Session, model, principal_id: Any):
+        """
+        Ambil instance model (User/Admin) yang terpasang di session db.
+        Hit cache tidak menjalankan SELECT; model harus didaftarkan lewat watch().
+        """
+        key = (model.__tablename__, principal_id)
+        if self.enabled and model in self._watched:
+            with self._lock:
+                entry = self._principals.get(key)
+                if entry is not None:
+                    self._principals.move_to_end(key)
+            if entry is not None and entry[1] > self._clock():
+                self._principal_hits += 1
+                instance = model(**entry[0])
+                make_transient_to_detached(instance)
+                return db.merge(instance, load=False)
+
+        self._principal_misses += 1
+        generation = self._principal_generation
+        instance = db.get(model, principal_id)
+        if instance is not None and model in self._watched and self.enabled:
+            snapshot = {
+                attribute.key: getattr(instance, attribute.key)
+                for attribute in model.__mapper__.column_attrs
+            }
+            with self._lock:
+                # Invalidation yang terjadi selama SELECT berarti snapshot bisa jadi basi
+                if generation == self._principal_generation:
+                    self._principals[key] = (snapshot, self._clock() + self.principal_ttl)
+                    while len(self._principals) > self.principal_cache_size:
+                        self._principals.popitem(last=False)
+        return instance
+
+    def watch(self, model):
+        """Invalidate principal model setiap kali barisnya di-update/di-delete lewat ORM"""
+        if model in self._watched:
+            return
+        self._watched.add(model)
+
+        def invalidate(mapper, connection, target):
+            self.invalidate_principal(model.__tablename__, target.id)
+
+        event.listen(model, "after_update", invalidate)
+        event.listen(model, "after_delete", invalidate)
+
+    def invalidate_principal(self, table: str, principal_id: Any, publish: bool = True):
+        with self._lock:
+            self._principals.pop((table, principal_id), None)
+            self._principal_generation += 1
+        if publish:
+            self._publish({"principal": [table, principal_id]})
+
+    # ---- Pub/sub antar worker --------------------------------------------
+
+    def _publish(self, payload: Dict[str, Any]):
+        if self.redis_url is None or not self._listening:
+            return
+        try:
+            self.revocations._get_client().publish(self.channel, json.dumps({"origin": self.instance_id, **payload}))
+        except Exception as e:
+            logger.error(f"Failed to publish auth event: {e}")
+
+    def handle_event(self, data: str):
+        """Terapkan revocation/invalidation dari worker lain (pesan sendiri diabaikan)"""
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return
+        if payload.get("origin") == self.instance_id:
+            return
+        if "revoke" in payload:
+            self.revocations.apply(payload["revoke"], float(payload.get("exp", 0)))
+        if "principal" in payload:
+            table, principal_id = payload["principal"]
+            self.invalidate_principal(table, principal_id, publish=False)
+
+    def _reset(self):
+        with self._lock:
+            self._tokens.clear()
+            self._principals.clear()
+            self._principal_generation += 1
+
+    async def start(self):
+        """Muat revocation dari Redis dan mulai listener pub/sub (bila Redis dipakai)"""
+        if self.redis_url is None or self._listener_task is not None:
+            return
+        self._stopping = False
+        self._listener_task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        backoff = 1.0
+        client = redis_async.from_url(self.redis_url, decode_responses=True)
+        try:
+            while not self._stopping:
+                pubsub = None
+                try:
+                    pubsub = client.pubsub(ignore_subscribe_messages=True)
+                    await pubsub.subscribe(self.channel)
+                    # Revocation yang terlewat selama listener putus diambil dari sorted set
+                    await asyncio.to_thread(self.revocations.reload)
+                    self._reset()
+                    self._listening = True
+                    backoff = 1.0
+                    rebuilt_at = time.monotonic()
+                    logger.info(f"Auth cache subscribed to {self.channel}")
+
+                    while not self._stopping:
+                        message = await pubsub.get_message(timeout=1.0)
+                        if message is not None and message.get("type") == "message":
+                            self.handle_event(message["data"])
+                        if time.monotonic() - rebuilt_at >= self.rebuild_interval:
+                            await asyncio.to_thread(self.revocations.reload)
+                            rebuilt_at = time.monotonic()
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._listening = False
+                    logger.warning(f"Auth cache listener error: {e}")
+                    if self._stopping:
+                        break
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30.0)
+                finally:
+                    if pubsub is not None:
+                        try:
+                            await pubsub.reset()
+                        except Exception:
+                            pass
+        finally:
+            self._listening = False
+            await client.close()
+
+    async def close(self):
+        self._stopping = True
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self.revocations.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "tokens_cached": len(self._tokens),
+            "token_hits": self._token_hits,
+            "token_misses": self._token_misses,
+            "principals_cached": len(self._principals),
+            "principal_hits": self._principal_hits,
+            "principal_misses": self._principal_misses,
+            "revocations": self.revocations.size,
+            "revoked_rejections": self._revoked_rejections
+        }
+
+
+# Global instance
+auth_cache = AuthCache(
+    token_cache_size=settings.AUTH_CACHE_MAX_SIZE,
+    principal_ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+    principal_cache_size=settings.AUTH_CACHE_MAX_SIZE,
+    revocation_capacity=settings.AUTH_REVOCATION_BLOOM_CAPACITY,
+    redis_url=settings.REDIS_URL if settings.AUTH_REVOCATION_REDIS_ENABLED else None,
+    channel=settings.AUTH_EVENTS_CHANNEL,
+    rebuild_interval=settings.AUTH_REVOCATION_REBUILD_INTERVAL
+)
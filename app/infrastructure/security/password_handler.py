@@ -1,14 +1,16 @@
-from passlib.context import CryptContext
 from typing import Union
+from app.infrastructure.config.settings import settings
+from app.infrastructure.security.password_service import build_password_context
 
 class PasswordHandler:
     """
     Password handler yang mengimplementasikan Single Responsibility Principle.
     Fokus hanya pada operasi password hashing dan verification.
+    Versi sinkron untuk script/CLI; endpoint async memakai password_service.
     """
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = build_password_context(settings.PASSWORD_BCRYPT_ROUNDS)
     
     def hash_password(self, password: str) -> str:
         """Hash password menggunakan bcrypt"""
@@ -0,0 +1,163 @@
+"""
+Password Service
+Hashing dan verifikasi bcrypt di luar event loop untuk endpoint auth async.
+
+- bcrypt dijalankan di pool thread (bcrypt melepas GIL) atau pool process terbatas,
+  sehingga login/register tidak menahan request lain di worker yang sama
+- Jumlah operasi yang menunggu/berjalan dibatasi; bila penuh request ditolak cepat
+  dengan PasswordServiceBusyError (503) alih-alih menumpuk antrian tanpa batas
+- Latency per operasi (total dan waktu tunggu antrian) dicatat sebagai histogram
+- Cost bcrypt diatur lewat PASSWORD_BCRYPT_ROUNDS; hash dengan cost lain dianggap
+  perlu diperbarui dan di-hash ulang secara transparan saat login berhasil
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.common.exceptions.custom_exceptions import PasswordServiceBusyError
+from app.infrastructure.config.settings import settings
+from app.infrastructure.external_apis.http_client import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_TYPES = ("thread", "process")
+
+
+@lru_cache(maxsize=None)
+def build_password_context(rounds: int) -> CryptContext:
+    """CryptContext bcrypt dengan cost tertentu (di-cache per proses)"""
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# Fungsi level module agar bisa di-pickle ke pool process
+
+def _hash_password(password: str, rounds: int) -> str:
+    return build_password_context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return build_password_context(rounds).verify_and_update(password, hashed_password)
+
+
+def _timed(func: Callable, *args) -> Tuple[float, Any]:
+    """Jalankan func di worker dan kembalikan durasi eksekusinya (detik) beserta hasilnya"""
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+class AsyncPasswordService:
+    """
+    Service password async - Single Responsibility: menjalankan bcrypt di pool terbatas
+    Pool dibuat saat operasi pertama sehingga import module tidak memulai thread/process.
+    """
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        executor_type: str = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64
+    ):
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(f"Executor password tidak dikenal: {executor_type}. Gunakan {', '.join(EXECUTOR_TYPES)}")
+        self.rounds = rounds
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.context = build_password_context(rounds)
+
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._peak_pending = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self.latency: Dict[str, LatencyHistogram] = {"hash": LatencyHistogram(), "verify": LatencyHistogram()}
+        self.queue_wait = LatencyHistogram()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable, *args) -> Any:
+        # _pending hanya diubah dari event loop sehingga tidak perlu lock
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            logger.warning(f"Password {operation} rejected: {self._pending} operations pending")
+            raise PasswordServiceBusyError()
+        self._pending += 1
+        self._peak_pending = max(self._peak_pending, self._pending)
+        started = time.perf_counter()
+        try:
+            elapsed, result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _timed, func, *args
+            )
+        finally:
+            self._pending -= 1
+        total = time.perf_counter() - started
+        self.latency[operation].observe(total * 1000)
+        self.queue_wait.observe(max(total - elapsed, 0.0) * 1000)
+        return result
+
+    async def hash_password(self, password: str) -> str:
+        """Hash password dengan cost yang dikonfigurasi"""
+        return await self._run("hash", _hash_password, password, self.rounds)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifikasi password dengan hash"""
+        valid, _ = await self.verify_and_update(plain_password, hashed_password)
+        return valid
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verifikasi password; bila valid dan hash memakai cost lain dari konfigurasi,
+        kembalikan juga hash baru yang harus disimpan (None bila tidak perlu diperbarui)
+        """
+        valid, new_hash = await self._run("verify", _verify_and_update, plain_password, hashed_password, self.rounds)
+        if new_hash is not None:
+            self._rehashed += 1
+        return valid, new_hash
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Cek apakah hash perlu diperbarui ke cost saat ini (tanpa menjalankan bcrypt)"""
+        return self.context.needs_update(hashed_password)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.executor_type,
+            "workers": self.max_workers,
+            "rounds": self.rounds,
+            "pending": self._pending,
+            "peak_pending": self._peak_pending,
+            "max_pending": self.max_pending,
+            "rejected": self._rejected,
+            "rehashed": self._rehashed,
+            "hash_latency": self.latency["hash"].snapshot(),
+            "verify_latency": self.latency["verify"].snapshot(),
+            "queue_wait": self.queue_wait.snapshot()
+        }
+
+    def shutdown(self):
+        """Hentikan pool; operasi yang belum mulai dibatalkan"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+password_service = AsyncPasswordService(
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -1,8 +1,10 @@
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 from app.infrastructure.config.settings import settings
+from app.infrastructure.security.auth_cache import auth_cache
 
 class TokenHandler:
     """
@@ -25,7 +27,7 @@ class TokenHandler:
         else:
             expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
         
-        to_encode.update({"exp": expire, "type": "access"})
+        to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
     
@@ -33,7 +35,7 @@ class TokenHandler:
         """Buat refresh token"""
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
-        to_encode.update({"exp": expire, "type": "refresh"})
+        to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
     
@@ -50,17 +52,30 @@ class TokenHandler:
         }
     
     def verify_token(self, token: str, token_type: str = "access") -> Dict[str, Any]:
-        """Verifikasi dan decode token"""
+        """
+        Verifikasi dan decode token.
+        Token yang pernah diverifikasi diambil dari auth_cache (tanpa cek signature ulang);
+        payload hasil cache dipakai bersama sehingga tidak boleh diubah pemanggil.
+        """
+        payload = auth_cache.get_claims(token)
+        if payload is None:
+            payload = self._decode_token(token)
+            auth_cache.put_claims(token, payload)
+        
+        # Cek tipe token
+        if payload.get("type") != token_type:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token type"
+            )
+        
+        return payload
+    
+    def _decode_token(self, token: str) -> Dict[str, Any]:
+        """Verifikasi penuh: signature, expiration dan revocation"""
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
             
-            # Cek tipe token
-            if payload.get("type") != token_type:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token type"
-                )
-            
             # Cek expiration
             exp = payload.get("exp")
             if exp is None or datetime.utcnow() > datetime.fromtimestamp(exp):
@@ -69,6 +84,13 @@ class TokenHandler:
                     detail="Token expired"
                 )
             
+            # Cek revocation (logout / forced revoke)
+            if auth_cache.is_revoked(token, payload):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token revoked"
+                )
+            
             return payload
             
         except JWTError:
@@ -77,6 +99,34 @@ class TokenHandler:
                 detail="Invalid token"
             )
     
+    def revoke_token(self, token: str, token_type: str = "access") -> Dict[str, Any]:
+        """Cabut token yang masih valid (logout); berlaku seketika untuk request berikutnya"""
+        payload = self.verify_token(token, token_type)
+        auth_cache.revoke(token, payload)
+        return payload
+    
+    def revoke_session(self, access_token: str, refresh_token: Optional[str] = None) -> bool:
+        """
+        Logout: cabut access token dan refresh token pasangannya agar sesi tidak bisa
+        diperpanjang lewat refresh. Refresh token yang tidak valid atau milik subject lain
+        dilewati; return True bila refresh token ikut dicabut.
+        """
+        payload = self.verify_token(access_token)
+        refresh_payload = None
+        if refresh_token:
+            try:
+                refresh_payload = self.verify_token(refresh_token, "refresh")
+            except HTTPException:
+                refresh_payload = None
+            if refresh_payload is not None and refresh_payload.get("sub") != payload.get("sub"):
+                refresh_payload = None
+        
+        auth_cache.revoke(access_token, payload)
+        if refresh_payload is None:
+            return False
+        auth_cache.revoke(refresh_token, refresh_payload)
+        return True
+    
     def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
         """Refresh access token menggunakan refresh token"""
         payload = self.verify_token(refresh_token, "refresh")
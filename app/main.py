@@ -1,3 +1,7 @@
+# Profiler import dipasang sebelum import lain (aktif bila IMPORT_PROFILE=1)
+from app.core.import_profiler import import_profiler
+import_profiler.start_from_env()
+
 from app.infrastructure.application.app_factory import create_base_application
 from app.infrastructure.application.middleware import setup_middleware
 from app.infrastructure.application.health import setup_health_check
@@ -51,6 +55,9 @@ def create_application():
     server_logger.info("🎯 FA Application initialization completed successfully!")
     server_logger.info("📊 Enhanced logging system active - All requests and errors will be logged")
     
+    # Laporan waktu import per module (hanya dalam mode IMPORT_PROFILE)
+    import_profiler.log_report()
+    
     return application
 
 app = create_application()
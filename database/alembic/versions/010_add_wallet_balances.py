@@ -0,0 +1,40 @@
+"""Add materialized wallet balances table
+
+Revision ID: 010_add_wallet_balances
+Revises: 009_add_discord_logs_commands
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_add_wallet_balances'
+down_revision = '009_add_discord_logs_commands'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('wallet_balances',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('balance', sa.Numeric(precision=15, scale=2), nullable=False, server_default='0'),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Seed saldo dari ledger transaksi SUCCESS yang sudah ada
+    op.execute("""
+        INSERT INTO wallet_balances (user_id, balance, version)
+        SELECT user_id,
+               SUM(CASE WHEN transaction_type IN ('TOPUP_MANUAL', 'TOPUP_MIDTRANS', 'TRANSFER_RECEIVE', 'REFUND')
+                        THEN amount ELSE -amount END),
+               0
+        FROM wallet_transactions
+        WHERE status = 'SUCCESS'
+        GROUP BY user_id
+    """)
+
+def downgrade():
+    op.drop_table('wallet_balances')
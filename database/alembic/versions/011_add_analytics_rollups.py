@@ -0,0 +1,81 @@
+"""Add analytics rollup tables
+
+Revision ID: 011_add_analytics_rollups
+Revises: 010_add_wallet_balances
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_add_analytics_rollups'
+down_revision = '010_add_wallet_balances'
+branch_labels = None
+depends_on = None
+
+def _base_columns():
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    ]
+
+def upgrade():
+    op.create_table('analytics_rollups',
+        *_base_columns(),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('revenue', sa.Numeric(precision=20, scale=2), nullable=False, server_default='0'),
+        sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('new_registrations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_logins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('unique_users_sketch', sa.LargeBinary(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_analytics_rollup_unique', 'analytics_rollups',
+                    ['granularity', 'bucket_start'], unique=True)
+
+    op.create_table('analytics_product_rollups',
+        *_base_columns(),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('view_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('purchase_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('revenue', sa.Numeric(precision=20, scale=2), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_analytics_product_rollup_unique', 'analytics_product_rollups',
+                    ['granularity', 'bucket_start', 'product_id'], unique=True)
+
+    op.create_table('analytics_voucher_rollups',
+        *_base_columns(),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('voucher_id', sa.Integer(), nullable=False),
+        sa.Column('usage_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_discount', sa.Numeric(precision=20, scale=2), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_analytics_voucher_rollup_unique', 'analytics_voucher_rollups',
+                    ['granularity', 'bucket_start', 'voucher_id'], unique=True)
+
+    # High-water mark refresh; rollup diisi bertahap oleh refresh pertama
+    op.create_table('analytics_rollup_state',
+        *_base_columns(),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_event_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+
+def downgrade():
+    op.drop_table('analytics_rollup_state')
+    op.drop_index('idx_analytics_voucher_rollup_unique', table_name='analytics_voucher_rollups')
+    op.drop_table('analytics_voucher_rollups')
+    op.drop_index('idx_analytics_product_rollup_unique', table_name='analytics_product_rollups')
+    op.drop_table('analytics_product_rollups')
+    op.drop_index('idx_analytics_rollup_unique', table_name='analytics_rollups')
+    op.drop_table('analytics_rollups')
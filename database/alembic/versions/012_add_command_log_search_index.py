@@ -0,0 +1,45 @@
+"""Add full-text search index for discord command logs
+
+Revision ID: 012_add_command_log_search_index
+Revises: 011_add_analytics_rollups
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012_add_command_log_search_index'
+down_revision = '011_add_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+SEARCH_DOCUMENT = (
+    "coalesce(command, '') || ' ' || coalesce(command_args, '') || ' ' || "
+    "coalesce(response_message, '') || ' ' || coalesce(error_message, '')"
+)
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('discord_command_logs'):
+        # Tabel dibuat oleh create_all; index dibuat otomatis saat pencarian pertama
+        return
+
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_discord_command_logs_search ON discord_command_logs "
+            f"USING GIN (to_tsvector('simple', {SEARCH_DOCUMENT}))"
+        )
+    elif bind.dialect.name == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS discord_command_logs_fts USING fts5(document)")
+        op.execute(
+            "INSERT INTO discord_command_logs_fts (rowid, document) "
+            f"SELECT id, {SEARCH_DOCUMENT} FROM discord_command_logs"
+        )
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_discord_command_logs_search")
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS discord_command_logs_fts")
@@ -30,8 +30,8 @@ def import_all_models():
     
     try:
         # Wallet models - perbaiki import yang salah
-        from app.domains.wallet.models.wallet import WalletTransaction, Transfer, TopUpRequest
-        models_imported.extend(["WalletTransaction", "Transfer", "TopUpRequest"])
+        from app.domains.wallet.models.wallet import WalletTransaction, WalletBalance, Transfer, TopUpRequest
+        models_imported.extend(["WalletTransaction", "WalletBalance", "Transfer", "TopUpRequest"])
         print("✅ Wallet models imported")
     except ImportError as e:
         print(f"⚠️  Wallet models import error: {e}")
@@ -70,8 +70,16 @@ def import_all_models():
     
     try:
         # Analytics models - import semua model analytics
-        from app.domains.analytics.models.analytics import AnalyticsEvent, ProductAnalytics, VoucherAnalytics, DashboardMetrics
-        models_imported.extend(["AnalyticsEvent", "ProductAnalytics", "VoucherAnalytics", "DashboardMetrics"])
+        from app.domains.analytics.models.analytics import (
+            AnalyticsEvent, ProductAnalytics, VoucherAnalytics, DashboardMetrics,
+            AnalyticsRollup, AnalyticsProductRollup, AnalyticsVoucherRollup, AnalyticsRollupState,
+            AnalyticsRollupGap
+        )
+        models_imported.extend([
+            "AnalyticsEvent", "ProductAnalytics", "VoucherAnalytics", "DashboardMetrics",
+            "AnalyticsRollup", "AnalyticsProductRollup", "AnalyticsVoucherRollup", "AnalyticsRollupState",
+            "AnalyticsRollupGap"
+        ])
         print("✅ Analytics models imported")
     except ImportError as e:
         print(f"⚠️  Analytics models import error: {e}")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Script untuk rekonsiliasi saldo wallet
+Membangun ulang tabel wallet_balances dari ledger wallet_transactions (status SUCCESS).
+Jalankan secara berkala (cron) atau setelah migrasi data manual.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+def reconcile_wallet_balances(user_id=None):
+    """Rekonsiliasi saldo wallet dari ledger"""
+    from app.core.database import SessionLocal
+    from app.infrastructure.database.models_registry import import_all_models
+    from app.domains.wallet.repositories.wallet_repository import WalletRepository
+    
+    import_all_models()
+    db = SessionLocal()
+    try:
+        print("🔄 Memulai rekonsiliasi saldo wallet...")
+        report = WalletRepository(db).reconcile_balances(user_id=user_id)
+        
+        for item in report["corrected"]:
+            print(
+                f"⚠️  User {item['user_id']}: saldo tersimpan {item['stored_balance']:,.2f} "
+                f"-> ledger {item['ledger_balance']:,.2f}"
+            )
+        
+        print(f"✅ Selesai: {report['corrected_count']} saldo dikoreksi, "
+              f"{report['created_count']} baris saldo baru dibuat")
+        return True
+    except Exception as e:
+        print(f"❌ Rekonsiliasi gagal: {e}")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    target_user = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    success = reconcile_wallet_balances(target_user)
+    sys.exit(0 if success else 1)
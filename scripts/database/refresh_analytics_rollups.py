@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Script untuk refresh rollup analytics
+Memproses event analytics baru sejak high-water mark ke tabel rollup per jam dan per hari.
+Jalankan secara berkala (cron, mis. tiap jam) agar dashboard membaca rollup, bukan event mentah.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+def refresh_analytics_rollups():
+    """Refresh incremental rollup analytics"""
+    from app.core.database import SessionLocal
+    from app.infrastructure.database.models_registry import import_all_models
+    from app.domains.analytics.repositories.analytics_rollup_repository import AnalyticsRollupRepository
+    
+    import_all_models()
+    db = SessionLocal()
+    try:
+        print("🔄 Memulai refresh rollup analytics...")
+        report = AnalyticsRollupRepository(db).refresh()
+        
+        if report["skipped"]:
+            print("⚠️  Refresh lain sedang berjalan, dilewati")
+        else:
+            print(f"✅ Selesai: {report['processed_events']} event diproses, "
+                  f"high-water mark {report['high_water_mark']}")
+        return True
+    except Exception as e:
+        print(f"❌ Refresh rollup gagal: {e}")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = refresh_analytics_rollups()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Script sinkronisasi schema database
+Membuat tabel yang belum ada, memastikan admin default, lalu menyimpan fingerprint schema.
+Jalankan sekali per deploy (release phase) dan set DB_SCHEMA_SYNC_ON_STARTUP=false agar
+worker tidak memverifikasi schema setiap kali start.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+def sync_schema():
+    """Sinkronkan schema database dengan model aplikasi"""
+    from app.infrastructure.database.database_manager import db_manager
+    
+    try:
+        print("🔄 Sinkronisasi schema database...")
+        fingerprint = db_manager.sync_schema()
+        print(f"✅ Schema tersinkron (fingerprint {fingerprint[:12]})")
+        return True
+    except Exception as e:
+        print(f"❌ Sinkronisasi schema gagal: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = sync_schema()
+    sys.exit(0 if success else 1)
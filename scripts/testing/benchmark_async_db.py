@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark sync Session vs AsyncSession di dalam handler async def
+
+Mensimulasikan N request bersamaan yang membaca command log (query DB) sambil
+mengukur latency request "ringan" lain di event loop yang sama. Dengan Session sync,
+query memblokir event loop sehingga request ringan ikut menunggu; dengan AsyncSession
+event loop tetap bebas.
+
+Usage: python scripts/testing/benchmark_async_db.py [concurrency] [rounds]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.domains.discord.models.command_log import DiscordCommandLog
+from app.domains.discord.repositories.command_log_repository import CommandLogRepository
+from app.domains.discord.repositories.async_command_log_repository import AsyncCommandLogRepository
+
+SEED_ROWS = 20000
+QUERY_LIMIT = 500
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+def seed_database(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[DiscordCommandLog.__table__])
+    with engine.begin() as conn:
+        conn.execute(DiscordCommandLog.__table__.insert(), [
+            {
+                "user_id": str(i % 500),
+                "username": f"user{i % 500}",
+                "channel_id": "1",
+                "command": "/balance",
+                "is_successful": i % 10 != 0,
+                "execution_time_ms": i % 300,
+                "timestamp": datetime.utcnow()
+            }
+            for i in range(SEED_ROWS)
+        ])
+    engine.dispose()
+
+
+async def probe_loop(stop: asyncio.Event, latencies: list):
+    """Request ringan: ukur seberapa lama event loop terlambat menjalankannya"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        latencies.append(time.perf_counter() - started - 0.001)
+
+
+async def run_scenario(name: str, handler, concurrency: int, rounds: int):
+    request_latencies, probe_latencies = [], []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(stop, probe_latencies))
+
+    async def client():
+        for _ in range(rounds):
+            started = time.perf_counter()
+            await handler()
+            request_latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    print(
+        f"{name:<14} requests={len(request_latencies):<5} "
+        f"throughput={len(request_latencies) / elapsed:8.1f}/s  "
+        f"db p50={percentile(request_latencies, 50):7.2f}ms p99={percentile(request_latencies, 99):7.2f}ms  "
+        f"unrelated p50={percentile(probe_latencies, 50):7.2f}ms p99={percentile(probe_latencies, 99):7.2f}ms"
+    )
+
+
+async def main(concurrency: int, rounds: int):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        seed_database(path)
+
+        sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        SyncSession = sessionmaker(bind=sync_engine)
+
+        async def sync_handler():
+            # Pola lama: Session sync dipanggil langsung dari async def
+            db = SyncSession()
+            try:
+                CommandLogRepository(db).get_recent_logs(QUERY_LIMIT)
+            finally:
+                db.close()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def async_handler():
+            async with AsyncSession() as db:
+                await AsyncCommandLogRepository(db).get_recent_logs(QUERY_LIMIT)
+
+        print(f"concurrency={concurrency} rounds={rounds} rows={SEED_ROWS} limit={QUERY_LIMIT}")
+        await run_scenario("sync Session", sync_handler, concurrency, rounds)
+        await run_scenario("AsyncSession", async_handler, concurrency, rounds)
+
+        sync_engine.dispose()
+        await async_engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(concurrency, rounds))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark invalidation cache Redis: KEYS vs SCAN+UNLINK vs tag
+
+Mengisi Redis dengan N key (default 1 juta), lalu menghapus sebagian key milik satu
+"user" dengan tiga cara sambil mengukur latency GET dari klien lain:
+- legacy: KEYS pattern + DEL (cara lama RedisCacheService.clear)
+- scan:   RedisCacheService.clear (SCAN bertahap + UNLINK per batch)
+- tag:    RedisCacheService.invalidate_tags (SMEMBERS + UNLINK set tag)
+
+KEYS memblokir Redis selama menelusuri seluruh keyspace sehingga latency probe melonjak;
+SCAN dan tag membiarkan probe tetap dilayani.
+
+PERINGATAN: memakai FLUSHDB pada database target. Jalankan di Redis khusus benchmark.
+
+Usage: python scripts/testing/benchmark_cache_invalidation.py [redis_url] [total_keys]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import redis.asyncio as redis
+
+from app.cache.implementations.redis_cache import RedisCacheService
+
+TAGGED_KEYS = 2000
+SEED_BATCH = 10000
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+async def seed(cache: RedisCacheService, total_keys: int):
+    client = await cache._get_redis_client()
+    await client.flushdb()
+
+    for start in range(0, total_keys, SEED_BATCH):
+        pipe = client.pipeline(transaction=False)
+        for i in range(start, min(start + SEED_BATCH, total_keys)):
+            pipe.set(f"ppob_api:ppob:cache:item_{i}", "x", ex=3600)
+        await pipe.execute()
+
+    # Key milik user 42 (target invalidation), juga terdaftar di tag
+    for i in range(TAGGED_KEYS):
+        await cache.set(f"ppob_api:ppob:cache:user_transactions_42_{i}", {"i": i}, ttl=3600, tags=["user:42"])
+
+
+async def probe(url: str, stop: asyncio.Event, samples: list):
+    """Klien terpisah yang terus melakukan GET dan mencatat latency-nya"""
+    client = redis.from_url(url, decode_responses=True)
+    try:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await client.get("ppob_api:ppob:cache:item_1")
+            samples.append(time.perf_counter() - started)
+            await asyncio.sleep(0.001)
+    finally:
+        await client.close()
+
+
+async def measure(url: str, name: str, invalidate):
+    stop = asyncio.Event()
+    samples = []
+    probe_task = asyncio.create_task(probe(url, stop, samples))
+    await asyncio.sleep(0.2)
+
+    started = time.perf_counter()
+    await invalidate()
+    elapsed = time.perf_counter() - started
+
+    await asyncio.sleep(0.2)
+    stop.set()
+    await probe_task
+
+    print(
+        f"{name:<8} invalidation={elapsed * 1000:9.1f}ms  "
+        f"probe p50={percentile(samples, 50):6.2f}ms  "
+        f"p99={percentile(samples, 99):8.2f}ms  max={max(samples) * 1000:8.2f}ms"
+    )
+
+
+async def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else "redis://localhost:6379/15"
+    total_keys = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+
+    cache = RedisCacheService(redis_url=url)
+    client = await cache._get_redis_client()
+    pattern = "ppob_api:ppob:cache:user_transactions_42_*"
+
+    async def legacy():
+        keys = await client.keys(pattern)
+        if keys:
+            await client.delete(*keys)
+
+    print(f"Seeding {total_keys} keys...")
+    for name, invalidate in (
+        ("legacy", legacy),
+        ("scan", lambda: cache.clear(pattern)),
+        ("tag", lambda: cache.invalidate_tags(["user:42"])),
+    ):
+        await seed(cache, total_keys)
+        await measure(url, name, invalidate)
+        remaining = await cache.count(pattern)
+        assert remaining == 0, f"{name}: {remaining} keys left"
+
+    await client.flushdb()
+    await cache.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark serializer cache: biaya encode/decode dan ukuran payload
+
+Payload dibangun dari schema aplikasi yang benar-benar di-cache:
+- daftar produk PPOB (PPOBProductResponse, Decimal + datetime)
+- data dashboard admin (DashboardResponse: stats, transaksi terbaru, tren, top produk)
+
+Serializer yang dependency-nya tidak terpasang otomatis dilewati.
+
+Usage: python scripts/testing/benchmark_cache_serializers.py [products] [iterations]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.cache.implementations.cache_serializers import build_serializer
+from app.domains.admin.schemas.components.dashboard_schemas import DashboardResponse
+from app.domains.ppob.schemas.ppob_schemas import PPOBProductResponse
+
+SPECS = [
+    "json", "json+zlib",
+    "orjson", "orjson+zstd", "orjson+lz4",
+    "msgpack", "msgpack+zstd", "msgpack+lz4"
+]
+
+
+def build_products(count: int):
+    now = datetime(2024, 1, 1, 8, 0)
+    return [
+        PPOBProductResponse(
+            id=i,
+            product_code=f"TSEL{i:05d}",
+            product_name=f"Telkomsel Pulsa {i % 200 * 5}K",
+            category_id=i % 12 + 1,
+            provider="digiflazz",
+            price=Decimal(i % 200 * 5000 + 1500),
+            admin_fee=Decimal("1500.00"),
+            description="Pulsa reguler, masa aktif mengikuti kartu",
+            is_active="true",
+            created_at=now,
+            updated_at=now + timedelta(minutes=i)
+        ).model_dump()
+        for i in range(count)
+    ]
+
+
+def build_dashboard():
+    now = datetime(2024, 1, 1, 8, 0)
+    return DashboardResponse(
+        stats={
+            "total_users": 152340,
+            "active_users": 48211,
+            "total_transactions": 2840112,
+            "total_revenue": 9182273611.5,
+            "pending_transactions": 312,
+            "failed_transactions": 1802
+        },
+        recent_transactions=[
+            {
+                "id": 900000 + i,
+                "transaction_code": f"TRX{900000 + i}",
+                "user_id": i % 1000,
+                "amount": Decimal(i * 1250),
+                "status": "success",
+                "created_at": now - timedelta(minutes=i)
+            }
+            for i in range(50)
+        ],
+        transaction_trends=[
+            {"date": (now - timedelta(days=d)).date().isoformat(), "count": 9000 + d * 13, "amount": 410000000.0 + d}
+            for d in range(30)
+        ],
+        top_products=[
+            {"product_code": f"TSEL{i:05d}", "sales": 10000 - i * 37, "revenue": Decimal(i * 1000000)}
+            for i in range(10)
+        ]
+    ).model_dump()
+
+
+def bench(serializer, payload, iterations: int):
+    encoded = serializer.serialize(payload)
+    size = len(encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        serializer.serialize(payload)
+    encode_us = (time.perf_counter() - started) / iterations * 1e6
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        serializer.deserialize(encoded)
+    decode_us = (time.perf_counter() - started) / iterations * 1e6
+
+    return size, encode_us, decode_us
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    payloads = {
+        f"products[{product_count}]": build_products(product_count),
+        "dashboard": build_dashboard()
+    }
+
+    for name, payload in payloads.items():
+        print(f"\n{name}")
+        print(f"  {'serializer':<14}{'bytes':>10}{'encode us':>12}{'decode us':>12}")
+        seen = set()
+        for spec in SPECS:
+            serializer = build_serializer(spec, compression_threshold=1024)
+            label = type(serializer).__name__ + getattr(serializer, "codec", "") + type(getattr(serializer, "inner", None)).__name__
+            if label in seen:
+                # Dependency tidak terpasang sehingga jatuh ke serializer yang sama
+                continue
+            seen.add(label)
+            size, encode_us, decode_us = bench(serializer, payload, iterations)
+            print(f"  {spec:<14}{size:>10}{encode_us:>12.1f}{decode_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
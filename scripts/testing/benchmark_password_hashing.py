@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark login storm: bcrypt inline vs pool hashing password
+
+Mensimulasikan N login bersamaan (verifikasi bcrypt) sambil mengukur latency request
+"ringan" lain di event loop yang sama. Verifikasi inline (pola lama: pwd_context.verify
+langsung di async def) memblokir event loop; AsyncPasswordService menjalankannya di pool
+thread/process sehingga request lain tetap dilayani.
+
+Usage: python scripts/testing/benchmark_password_hashing.py [concurrency] [rounds] [bcrypt_cost]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.common.exceptions.custom_exceptions import PasswordServiceBusyError
+from app.infrastructure.security.password_service import AsyncPasswordService, build_password_context
+
+PASSWORD = "Rahasia123!"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+async def probe_loop(stop: asyncio.Event, latencies: list):
+    """Request ringan: ukur seberapa lama event loop terlambat menjalankannya"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        latencies.append(time.perf_counter() - started - 0.001)
+
+
+async def run_scenario(name: str, login, concurrency: int, rounds: int):
+    login_latencies, probe_latencies = [], []
+    rejected = 0
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(stop, probe_latencies))
+
+    async def client():
+        nonlocal rejected
+        for _ in range(rounds):
+            started = time.perf_counter()
+            try:
+                await login()
+            except PasswordServiceBusyError:
+                rejected += 1
+                continue
+            login_latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    print(
+        f"{name:<16} logins={len(login_latencies):<5} rejected={rejected:<4} "
+        f"throughput={len(login_latencies) / elapsed:7.1f}/s  "
+        f"login p50={percentile(login_latencies, 50):8.1f}ms p99={percentile(login_latencies, 99):8.1f}ms  "
+        f"unrelated p50={percentile(probe_latencies, 50):7.2f}ms p99={percentile(probe_latencies, 99):7.2f}ms"
+    )
+
+
+async def main(concurrency: int, rounds: int, cost: int):
+    context = build_password_context(cost)
+    hashed = context.hash(PASSWORD)
+    workers = os.cpu_count() or 4
+
+    async def inline_login():
+        # Pola lama: bcrypt dipanggil langsung dari async def
+        assert context.verify(PASSWORD, hashed)
+
+    print(f"concurrency={concurrency} rounds={rounds} bcrypt_cost={cost} workers={workers}")
+    await run_scenario("inline", inline_login, concurrency, rounds)
+
+    for executor_type in ("thread", "process"):
+        service = AsyncPasswordService(
+            rounds=cost, executor_type=executor_type, max_workers=workers, max_pending=concurrency
+        )
+
+        async def pooled_login():
+            valid, _ = await service.verify_and_update(PASSWORD, hashed)
+            assert valid
+
+        # Warm-up agar biaya start pool tidak ikut terukur
+        await service.verify_password(PASSWORD, hashed)
+        await run_scenario(f"pool ({executor_type})", pooled_login, concurrency, rounds)
+        stats = service.get_stats()
+        print(f"{'':<16} peak_pending={stats['peak_pending']} queue_wait p99={stats['queue_wait']['p99_ms']}ms")
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    cost = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    asyncio.run(main(concurrency, rounds, cost))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Load test broadcast WebSocket: 10k socket, sebagian lambat
+
+Membandingkan broadcast cara lama (scan semua subscription, json.dumps per client,
+await send_text berurutan) dengan hub ConnectionManager (index topik, serialize sekali,
+antrian per client dan task pengirim). Socket disimulasikan in-process dengan latency
+send per socket sehingga yang diukur adalah biaya fan-out hub, bukan jaringan.
+
+Metrik per broadcast:
+- publish: waktu sampai broadcast_to_topic selesai (berapa lama pemanggil tertahan)
+- total: waktu sampai semua socket cepat yang masih terhubung menerima semua pesan
+  (termasuk jeda antar broadcast)
+
+Usage: python scripts/testing/benchmark_websocket_broadcast.py [sockets] [slow_sockets] [broadcasts]
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domains.discord.services.websocket_manager import ConnectionManager
+
+TOPICS = ["bot_status", "command_logs", "transactions", "stock"]
+FAST_SEND_DELAY = 0.0005
+SLOW_SEND_DELAY = 0.5
+BROADCAST_INTERVAL = 0.05
+
+
+class SimulatedWebSocket:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+class LegacyConnectionManager:
+    """Broadcast lama: list subscription per client, dumps dan send berurutan"""
+
+    def __init__(self):
+        self.connections = {}
+        self.subscriptions = {}
+
+    async def broadcast_to_topic(self, topic: str, message: dict):
+        for client_id, topics in self.subscriptions.items():
+            if topic in topics and client_id in self.connections:
+                await self.connections[client_id].send_text(json.dumps(message))
+
+
+def build_sockets(total: int, slow: int):
+    return [SimulatedWebSocket(SLOW_SEND_DELAY if i < slow else FAST_SEND_DELAY) for i in range(total)]
+
+
+async def wait_delivered(manager: ConnectionManager, sockets, expected: int):
+    connected = {id(client.websocket) for client in manager.clients.values()}
+    pending = [ws for ws in sockets if id(ws) in connected]
+    while any(ws.received < expected for ws in pending):
+        await asyncio.sleep(0.001)
+
+
+async def run_legacy(total: int, slow: int, broadcasts: int):
+    manager = LegacyConnectionManager()
+    sockets = build_sockets(total, slow)
+    for i, websocket in enumerate(sockets):
+        manager.connections[str(i)] = websocket
+        manager.subscriptions[str(i)] = list(TOPICS)
+
+    # Cara lama menunggu setiap send; satu broadcast sudah cukup menunjukkan biayanya
+    started = time.perf_counter()
+    await manager.broadcast_to_topic("transactions", {"seq": 0})
+    elapsed = time.perf_counter() - started
+    print(f"legacy  broadcasts=1    publish={elapsed * 1000:10.1f}ms")
+
+
+async def run_hub(total: int, slow: int, broadcasts: int):
+    manager = ConnectionManager(queue_size=64)
+    sockets = build_sockets(total, slow)
+    for websocket in sockets:
+        client_id = await manager.connect(websocket)
+        await manager.subscribe_to_topics(client_id, TOPICS)
+
+    fast_sockets = sockets[slow:]
+    publish_total = 0.0
+    started = time.perf_counter()
+    for seq in range(broadcasts):
+        publish_started = time.perf_counter()
+        await manager.broadcast_to_topic("transactions", {"seq": seq})
+        publish_total += time.perf_counter() - publish_started
+        await asyncio.sleep(BROADCAST_INTERVAL)
+    await wait_delivered(manager, fast_sockets, broadcasts)
+    elapsed = time.perf_counter() - started
+
+    stats = manager.get_stats()
+    fast_received = sum(ws.received for ws in fast_sockets)
+    print(
+        f"hub     broadcasts={broadcasts:<4} publish={publish_total / broadcasts * 1000:10.1f}ms  "
+        f"total={elapsed * 1000:10.1f}ms  fast_received={fast_received}/{len(fast_sockets) * broadcasts}  "
+        f"dropped={stats['dropped_slow_consumers']}"
+    )
+    await manager.close()
+
+
+async def main():
+    logging.disable(logging.WARNING)
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    slow = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    broadcasts = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    print(f"{total} sockets ({slow} slow), fast send {FAST_SEND_DELAY * 1000}ms, slow send {SLOW_SEND_DELAY * 1000}ms")
+    await run_legacy(total, slow, broadcasts)
+    await run_hub(total, slow, broadcasts)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Test Analytics Ingestion
+Test untuk antrian ingestion analytics: bulk insert per batch, drain saat shutdown dan backpressure
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.domains.auth.models.user import User
+from app.domains.analytics.models.analytics import AnalyticsEvent
+from app.domains.analytics.schemas.analytics_schemas import AnalyticsEventCreate
+from app.domains.analytics.services.analytics_ingestion import AnalyticsIngestionQueue
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn, tables=[User.__table__, AnalyticsEvent.__table__]
+            )
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_events_are_flushed_in_batches_and_drained_on_close(session_factory):
+    queue = AnalyticsIngestionQueue(
+        max_queue_size=5000, batch_size=500, flush_interval=60, session_factory=session_factory
+    )
+
+    for i in range(1200):
+        assert await queue.enqueue(AnalyticsEventCreate(event_type="product_view", product_id=i))
+
+    # Belum ada yang ditulis sebelum close karena batch terakhir belum penuh
+    await queue.close()
+
+    async with session_factory() as session:
+        count = await session.scalar(select(func.count(AnalyticsEvent.id)))
+
+    stats = queue.get_stats()
+    assert count == 1200
+    assert stats["flushed"] == 1200
+    assert stats["batches"] == 3
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure_then_drops():
+    release = asyncio.Event()
+
+    class BlockedSession:
+        async def __aenter__(self):
+            await release.wait()
+            raise RuntimeError("database unavailable")
+
+        async def __aexit__(self, *args):
+            return False
+
+    queue = AnalyticsIngestionQueue(
+        max_queue_size=10, batch_size=5, flush_interval=60,
+        enqueue_timeout=0.01, session_factory=BlockedSession
+    )
+    event = AnalyticsEventCreate(event_type="user_login", user_id=1)
+
+    results = [await queue.enqueue(event) for _ in range(30)]
+
+    # 5 event sedang di-flush (worker tertahan), 10 di buffer, sisanya dibuang
+    assert results.count(True) == 15
+    assert queue.get_stats()["dropped"] == 15
+
+    release.set()
+    await queue.close()
+    assert queue.get_stats()["failed"] == 15
@@ -0,0 +1,159 @@
+"""
+Test Analytics Rollups
+Test untuk refresh incremental rollup analytics dan query dashboard berbasis rollup
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.domains.auth.models.user import User
+from app.domains.analytics.models.analytics import (
+    AnalyticsEvent, AnalyticsRollup, AnalyticsProductRollup, AnalyticsVoucherRollup, AnalyticsRollupState,
+    AnalyticsRollupGap
+)
+from app.domains.analytics.repositories.analytics_rollup_repository import AnalyticsRollupRepository
+from app.domains.analytics.services.analytics_rollup_refresher import AnalyticsRollupRefresher
+from app.common.utils.hyperloglog import HyperLogLog
+
+
+NOW = datetime(2026, 10, 18, 12, 30)
+
+
+@pytest.fixture
+def db():
+    # StaticPool: thread refresher memakai database in-memory yang sama
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            User.__table__, AnalyticsEvent.__table__, AnalyticsRollup.__table__,
+            AnalyticsProductRollup.__table__, AnalyticsVoucherRollup.__table__,
+            AnalyticsRollupState.__table__, AnalyticsRollupGap.__table__
+        ]
+    )
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_event(db, event_type, timestamp, **kwargs):
+    db.add(AnalyticsEvent(event_type=event_type, event_timestamp=timestamp, **kwargs))
+    db.commit()
+
+
+def seed_events(db):
+    # Tersebar di beberapa hari, jam parsial di awal rentang, dan jam yang sedang berjalan
+    for days_ago in range(5):
+        day = NOW - timedelta(days=days_ago, hours=3)
+        add_event(db, "product_purchase", day, user_id=days_ago + 1, product_id=7, amount=Decimal("10000"))
+        add_event(db, "product_view", day, user_id=days_ago + 1, product_id=7)
+        add_event(db, "product_view", day, user_id=days_ago + 1, product_id=8)
+        add_event(db, "user_login", day, user_id=days_ago + 1)
+        add_event(db, "voucher_used", day, user_id=1, voucher_id=3, amount=Decimal("500"))
+    add_event(db, "transaction_success", NOW - timedelta(minutes=10), user_id=99, amount=Decimal("2500"))
+
+
+def test_rollup_totals_match_raw_events(db):
+    seed_events(db)
+    repo = AnalyticsRollupRepository(db)
+    start, end = NOW - timedelta(days=3, hours=4), NOW
+
+    before = repo.get_period_totals(start, end)
+    report = repo.refresh(now=NOW)
+    after = repo.get_period_totals(start, end)
+
+    # Event di jam berjalan belum di-rollup tapi tetap terhitung lewat scan mentah
+    assert report["processed_events"] == 25
+    assert before == after
+    assert after["total_revenue"] == 4 * 10000 + 2500
+    assert after["transaction_count"] == 5
+    assert after["total_logins"] == 4
+    assert after["unique_users"] == 5
+
+    products = repo.get_top_products(start, end)
+    assert products[0]["product_id"] == 7
+    assert products[0]["view_count"] == 8
+    assert products[0]["purchase_count"] == 4
+    assert repo.get_top_vouchers(start, end)[0]["usage_count"] == 4
+
+
+def test_refresh_is_incremental(db):
+    seed_events(db)
+    repo = AnalyticsRollupRepository(db)
+    repo.refresh(now=NOW)
+
+    assert repo.refresh(now=NOW)["processed_events"] == 0
+
+    # Setelah jam berjalan tertutup, hanya event baru yang diproses dan bucket lama ditambah
+    add_event(db, "user_login", NOW - timedelta(days=1, hours=3), user_id=2)
+    report = repo.refresh(now=NOW + timedelta(hours=1))
+    assert report["processed_events"] == 2
+
+    series = repo.get_period_series(NOW - timedelta(days=2), NOW + timedelta(hours=1))
+    logins = {item["period"].date(): item["total_logins"] for item in series}
+    assert logins[(NOW - timedelta(days=1)).date()] == 2
+
+
+def test_late_committed_event_below_high_water_mark_is_rolled_up(db):
+    seed_events(db)
+    late_id = db.query(AnalyticsEvent).count() + 1
+    # Id berikutnya dipakai transaksi yang belum commit saat refresh berjalan
+    db.add(AnalyticsEvent(id=late_id + 1, event_type="user_login", event_timestamp=NOW - timedelta(hours=2), user_id=1))
+    db.commit()
+    repo = AnalyticsRollupRepository(db)
+    start, end = NOW - timedelta(days=3, hours=4), NOW + timedelta(hours=1)
+
+    repo.refresh(now=NOW + timedelta(hours=1))
+    assert repo.get_gaps() == [(late_id, late_id)]
+
+    db.add(AnalyticsEvent(id=late_id, event_type="user_login", event_timestamp=NOW - timedelta(hours=2), user_id=2))
+    db.commit()
+    # Belum di-rollup tapi tetap terbaca lewat gap
+    assert repo.get_period_totals(start, end)["total_logins"] == 6
+
+    report = repo.refresh(now=NOW + timedelta(hours=2))
+    assert report["processed_events"] == 1
+    assert repo.get_gaps() == []
+    assert repo.get_period_totals(start, end)["total_logins"] == 6
+
+    # Gap yang tidak pernah terisi dilepas setelah jendela overlap
+    db.add(AnalyticsEvent(id=late_id + 3, event_type="user_login", event_timestamp=NOW, user_id=3))
+    db.commit()
+    repo.refresh(now=NOW + timedelta(hours=3))
+    assert repo.get_gaps() == [(late_id + 2, late_id + 2)]
+    repo.refresh(now=NOW + timedelta(hours=5))
+    assert repo.get_gaps() == []
+
+
+@pytest.mark.asyncio
+async def test_refresher_runs_refresh_off_the_request_path(db):
+    for _ in range(3):
+        add_event(db, "user_login", datetime.utcnow() - timedelta(days=1), user_id=1)
+    refresher = AnalyticsRollupRefresher(sessionmaker(bind=db.get_bind()))
+
+    refresher.schedule()
+    refresher.schedule()
+    await refresher.stop()
+
+    assert refresher.get_stats()["last_result"]["processed_events"] == 3
+    # Sudah di-refresh jam ini: tidak dijalankan ulang
+    assert refresher.refresh_if_stale() is None
+
+
+def test_hyperloglog_estimate_and_merge():
+    first, second = HyperLogLog(), HyperLogLog()
+    first.update(range(0, 6000))
+    second.update(range(4000, 10000))
+
+    merged = HyperLogLog(first.to_bytes())
+    merged.merge(second)
+
+    assert abs(first.count() - 6000) / 6000 < 0.1
+    assert abs(merged.count() - 10000) / 10000 < 0.1
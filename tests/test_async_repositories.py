@@ -0,0 +1,78 @@
+"""
+Test Async Repositories
+Test untuk repository AsyncSession (wallet dan command log) di atas aiosqlite
+"""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, get_async_database_url
+from app.domains.auth.models.user import User
+from app.domains.discord.models.command_log import DiscordCommandLog
+from app.domains.discord.repositories.async_command_log_repository import AsyncCommandLogRepository
+from app.domains.wallet.models.wallet import (
+    WalletTransaction, WalletBalance, TransactionType, TransactionStatus
+)
+from app.domains.wallet.repositories.async_wallet_repository import AsyncWalletRepository
+
+
+@pytest_asyncio.fixture
+async def async_db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                User.__table__, WalletTransaction.__table__,
+                WalletBalance.__table__, DiscordCommandLog.__table__
+            ]
+        )
+    session = async_sessionmaker(engine, expire_on_commit=False)()
+    yield session
+    await session.close()
+    await engine.dispose()
+
+
+def test_async_database_url():
+    assert get_async_database_url("sqlite:///./fa_database.db") == "sqlite+aiosqlite:///./fa_database.db"
+    assert get_async_database_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert get_async_database_url("postgresql+psycopg2://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+
+
+@pytest.mark.asyncio
+async def test_async_wallet_repository_settles_balance(async_db):
+    repo = AsyncWalletRepository(async_db)
+
+    topup = await repo.create_transaction(1, TransactionType.TOPUP_MANUAL, Decimal("50000"))
+    await repo.update_transaction_status(topup.id, TransactionStatus.SUCCESS)
+    await repo.create_transaction(
+        1, TransactionType.PPOB_PAYMENT, Decimal("20000"), status=TransactionStatus.SUCCESS
+    )
+
+    assert await repo.get_user_balance(1) == Decimal("30000")
+    assert await repo.count_user_transactions(1) == 2
+    transactions = await repo.get_user_transactions(1, transaction_type=TransactionType.PPOB_PAYMENT)
+    assert [t.amount for t in transactions] == [Decimal("20000")]
+
+
+@pytest.mark.asyncio
+async def test_async_command_log_stats(async_db):
+    repo = AsyncCommandLogRepository(async_db)
+    for success, elapsed in ((True, 100), (True, 200), (False, 300)):
+        await repo.create_log({
+            "user_id": "42",
+            "username": "tester",
+            "channel_id": "1",
+            "command": "/balance",
+            "is_successful": success,
+            "execution_time_ms": elapsed
+        })
+
+    stats = await repo.get_command_stats(hours=1)
+
+    assert stats == {"total": 3, "success": 2, "failed": 1, "avg_response_time_ms": 200.0}
+    assert len(await repo.get_logs_by_user("42")) == 3
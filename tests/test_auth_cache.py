@@ -0,0 +1,123 @@
+"""
+Test Auth Cache
+Test untuk cache token terverifikasi, cache principal dengan invalidation dan revocation token
+"""
+
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.common.dependencies import auth_deps
+from app.domains.auth.models.user import User
+from app.infrastructure.security import token_handler as token_handler_module
+from app.infrastructure.security.auth_cache import AuthCache, BloomFilter
+from app.infrastructure.security.token_handler import TokenHandler
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = AuthCache(principal_ttl=60.0)
+    cache.watch(User)
+    monkeypatch.setattr(token_handler_module, "auth_cache", cache)
+    monkeypatch.setattr(auth_deps, "auth_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(username="budi", email="budi@example.com", full_name="Budi", hashed_password="x"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_verified_token_is_served_from_cache_until_revoked(cache, monkeypatch):
+    handler = TokenHandler()
+    token = handler.create_access_token({"sub": "budi", "user_id": 1})
+    payload = handler.verify_token(token)
+    assert payload["jti"]
+
+    # Hit cache tidak memverifikasi signature ulang
+    monkeypatch.setattr(token_handler_module.jwt, "decode", lambda *args, **kwargs: pytest.fail("decode ulang"))
+    assert handler.verify_token(token) is payload
+    with pytest.raises(HTTPException) as wrong_type:
+        handler.verify_token(token, "refresh")
+    assert wrong_type.value.detail == "Invalid token type"
+    monkeypatch.undo()
+    monkeypatch.setattr(token_handler_module, "auth_cache", cache)
+
+    handler.revoke_token(token)
+    with pytest.raises(HTTPException) as revoked:
+        handler.verify_token(token)
+    assert revoked.value.detail == "Token revoked"
+    # Dua verify di atas dan verify di dalam revoke_token
+    assert cache.get_stats()["token_hits"] == 3
+
+
+def test_revocation_from_other_worker_applies_to_cached_token(cache):
+    handler = TokenHandler()
+    token = handler.create_access_token({"sub": "budi", "user_id": 1})
+    jti = handler.verify_token(token)["jti"]
+
+    cache.handle_event('{"origin": "worker-2", "revoke": "%s", "exp": %f}' % (jti, time.time() + 60))
+    assert cache.get_claims(token) is None
+    with pytest.raises(HTTPException):
+        handler.verify_token(token)
+
+
+def test_principal_cache_skips_select_and_is_invalidated_on_disable(cache, db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    token = TokenHandler().create_access_token({"sub": "budi", "user_id": 1})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    assert auth_deps.get_current_user(credentials, db).username == "budi"
+    db.close()
+    statements.clear()
+    user = auth_deps.get_current_user(credentials, db)
+    assert statements == []
+
+    # Instance dari cache terpasang di session: perubahan tetap tersimpan
+    user.full_name = "Budi Santoso"
+    db.commit()
+    assert db.query(User.full_name).scalar() == "Budi Santoso"
+
+    db.query(User).one().is_active = False
+    db.commit()
+    db.close()
+    with pytest.raises(HTTPException) as inactive:
+        auth_deps.get_current_user(credentials, db)
+    assert inactive.value.detail == "User is inactive"
+    assert cache.get_stats()["principal_hits"] == 1
+
+
+def test_logout_revokes_refresh_token_of_the_same_session(cache):
+    handler = TokenHandler()
+    tokens = handler.create_token_pair({"sub": "budi", "user_id": 1})
+    other_refresh = handler.create_refresh_token({"sub": "sari", "user_id": 2})
+
+    assert handler.revoke_session(tokens["access_token"], other_refresh) is False
+    # Refresh token milik user lain tidak ikut dicabut
+    assert handler.refresh_access_token(other_refresh)["access_token"]
+
+    second = handler.create_token_pair({"sub": "budi", "user_id": 1})
+    assert handler.revoke_session(second["access_token"], second["refresh_token"]) is True
+    with pytest.raises(HTTPException) as revoked:
+        handler.refresh_access_token(second["refresh_token"])
+    assert revoked.value.detail == "Token revoked"
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    for index in range(1000):
+        bloom.add(f"jti-{index}")
+    assert all(f"jti-{index}" in bloom for index in range(1000))
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
@@ -0,0 +1,70 @@
+"""
+Test Cache Invalidation
+Test untuk invalidation berbasis tag dan pattern (SCAN) pada RedisCacheService dan MemoryCacheService
+"""
+
+import pytest
+
+from app.cache.implementations.memory_cache import MemoryCacheService
+from app.cache.implementations.redis_cache import RedisCacheService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def build_redis_cache():
+    cache = RedisCacheService(redis_url="redis://localhost:6379/0", db=0)
+    cache._redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_redis_tag_invalidation_removes_only_tagged_keys():
+    cache = build_redis_cache()
+    client = cache._redis_client
+
+    await cache.set("history:1:a", {"n": 1}, ttl=60, tags=["user:1"])
+    await cache.set("history:1:b", {"n": 2}, ttl=120, tags=["user:1", "ppob:category:pulsa"])
+    await cache.set("history:2:a", {"n": 3}, ttl=60, tags=["user:2"])
+
+    # TTL set tag mengikuti anggota terlama
+    assert 60 < await client.ttl("tag:user:1") <= 120
+
+    assert await cache.invalidate_tags(["user:1"]) == 2
+    assert await cache.get("history:1:a") is None
+    assert await cache.get("history:1:b") is None
+    assert await cache.get("history:2:a") == {"n": 3}
+    assert not await client.exists("tag:user:1")
+
+
+@pytest.mark.asyncio
+async def test_redis_pattern_clear_uses_batched_scan():
+    cache = build_redis_cache()
+    cache.UNLINK_BATCH = 7
+    client = cache._redis_client
+
+    for i in range(50):
+        await client.set(f"ppob_api:ppob:cache:user_transactions_{i}", "x")
+    await client.set("ppob_api:other", "keep")
+
+    async def forbidden_keys(*args, **kwargs):
+        raise AssertionError("KEYS must not be used")
+    client.keys = forbidden_keys
+
+    assert await cache.count("ppob_api:ppob:cache:*") == 50
+    assert await cache.clear("ppob_api:ppob:cache:*")
+    assert await cache.count("ppob_api:ppob:cache:*") == 0
+    assert await client.get("ppob_api:other") == "keep"
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_tag_invalidation():
+    cache = MemoryCacheService(max_size=100)
+
+    await cache.set("a", 1, tags=["user:1"])
+    await cache.set("b", 2, tags=["user:1"])
+    await cache.set("c", 3, tags=["user:2"])
+
+    assert await cache.invalidate_tags(["user:1"]) == 2
+    assert await cache.get("a") is None
+    assert await cache.get("c") == 3
+    await cache.close()
@@ -0,0 +1,71 @@
+"""
+Test Cache Serializers
+Test untuk serializer cache (json/orjson/msgpack), kompresi dan pemilihan serializer
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.cache.implementations.cache_serializers import (
+    CompressedCacheSerializer, JSONCacheSerializer, build_serializer
+)
+from app.cache.implementations.redis_cache import RedisCacheService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+PRODUCTS = [
+    {
+        "product_code": f"TSEL{i}",
+        "product_name": f"Telkomsel {i}K",
+        "price": Decimal(f"{i}500.00"),
+        "is_active": True,
+        "created_at": datetime(2024, 1, 1, 10, 30)
+    }
+    for i in range(1, 50)
+]
+
+
+def test_compression_applies_only_above_threshold():
+    serializer = CompressedCacheSerializer(JSONCacheSerializer(), codec="zlib", threshold=256)
+
+    small = serializer.serialize({"a": 1})
+    large = serializer.serialize(PRODUCTS)
+
+    assert small[:1] == b"\x00"
+    assert large[:1] != b"\x00"
+    assert len(large) < len(JSONCacheSerializer().serialize(PRODUCTS))
+    assert serializer.deserialize(small) == {"a": 1}
+    assert serializer.deserialize(large)[0]["product_code"] == "TSEL1"
+
+
+def test_msgpack_preserves_decimal_and_datetime():
+    pytest.importorskip("msgpack")
+    serializer = build_serializer("msgpack")
+
+    restored = serializer.deserialize(serializer.serialize(PRODUCTS))
+
+    assert restored == PRODUCTS
+    assert isinstance(restored[0]["price"], Decimal)
+
+
+def test_build_serializer_falls_back_when_unavailable():
+    assert isinstance(build_serializer("unknown"), JSONCacheSerializer)
+    assert isinstance(build_serializer("json+nonexistent"), JSONCacheSerializer)
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_round_trip_with_binary_serializer():
+    pytest.importorskip("orjson")
+    cache = RedisCacheService(redis_url="redis://localhost:6379/0", serializer=build_serializer("orjson+zlib", 128))
+    assert cache.serializer.binary
+    cache._redis_client = fakeredis.FakeAsyncRedis(decode_responses=False)
+
+    await cache.set("ppob:products", PRODUCTS, ttl=60)
+    restored = await cache.get("ppob:products")
+
+    assert restored[0]["price"] == "1500.00"
+    assert restored[0]["created_at"] == "2024-01-01T10:30:00"
+    assert len(restored) == len(PRODUCTS)
@@ -0,0 +1,93 @@
+"""
+Test Cache Stampede Protection
+Test untuk single-flight, stale-while-revalidate dan lock lintas worker pada CacheHelper.get_or_set
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.cache.decorators.cache_decorators import CacheHelper, cache_result
+from app.cache.implementations.redis_cache import RedisCacheService
+from app.cache.managers.cache_manager import cache_manager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class CountingFactory:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"products": ["TSEL5", "TSEL10"], "version": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_run_factory_once():
+    factory = CountingFactory()
+    key = "ppob_api:ppob:products:stampede"
+
+    results = await asyncio.gather(*[
+        CacheHelper.get_or_set(key, factory, ttl=60, cache_type="memory")
+        for _ in range(50)
+    ])
+
+    assert factory.calls == 1
+    assert all(result["version"] == 1 for result in results)
+
+    @cache_result(ttl=60, key_prefix="stampede:decorated", cache_type="memory")
+    async def load_products(category: str):
+        return await factory()
+
+    await asyncio.gather(*[load_products("pulsa") for _ in range(20)])
+    assert factory.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_single_background_refresh():
+    factory = CountingFactory()
+    key = "ppob_api:ppob:products:swr"
+    memory = await cache_manager.get_cache_service("memory")
+
+    await CacheHelper.get_or_set(key, factory, ttl=60, cache_type="memory", stale_ttl=300)
+    envelope = await memory.get(key)
+    envelope["expires_at"] = time.time() - 1
+
+    # Lewat ttl tapi masih dalam stale window: nilai lama langsung dikembalikan
+    results = await asyncio.gather(*[
+        CacheHelper.get_or_set(key, factory, ttl=60, cache_type="memory", stale_ttl=300)
+        for _ in range(20)
+    ])
+    assert all(result["version"] == 1 for result in results)
+
+    await asyncio.sleep(factory.delay * 3)
+    assert factory.calls == 2
+    refreshed = await CacheHelper.get_or_set(key, factory, ttl=60, cache_type="memory", stale_ttl=300)
+    assert refreshed["version"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_lock_deduplicates_across_workers():
+    await cache_manager.initialize()
+    server = fakeredis.FakeServer()
+    for worker in ("stampede_worker_a", "stampede_worker_b"):
+        service = RedisCacheService(redis_url="redis://localhost:6379/0")
+        service._redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        cache_manager._cache_services[worker] = service
+
+    factory = CountingFactory(delay=0.2)
+    key = "ppob_api:ppob:products:locked"
+
+    results = await asyncio.gather(
+        CacheHelper.get_or_set(key, factory, ttl=60, cache_type="stampede_worker_a", lock_timeout=2),
+        CacheHelper.get_or_set(key, factory, ttl=60, cache_type="stampede_worker_b", lock_timeout=2)
+    )
+
+    assert factory.calls == 1
+    assert results[0] == results[1]
+    for worker in ("stampede_worker_a", "stampede_worker_b"):
+        del cache_manager._cache_services[worker]
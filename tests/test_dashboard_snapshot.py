@@ -0,0 +1,93 @@
+"""
+Test Dashboard Snapshot
+Test untuk statistik dashboard satu query per tabel dan snapshot yang dipakai bersama oleh semua admin
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.domains.admin.services.dashboard.dashboard_snapshot import DashboardSnapshot
+from app.domains.auth.models.user import User
+from app.domains.ppob.models.ppob import PPOBTransaction, TransactionStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    User.__table__.create(engine)
+    PPOBTransaction.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add_all([
+        User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}",
+             is_active=i != 3)
+        for i in range(1, 5)
+    ])
+    statuses = [TransactionStatus.SUCCESS] * 3 + [TransactionStatus.PENDING, TransactionStatus.FAILED]
+    db.add_all([
+        PPOBTransaction(user_id=1, transaction_code=f"TRX{i}", product_code="PLN20", product_name="Token PLN 20K",
+                        customer_number="123", amount=20000, admin_fee=2500, total_amount=22500,
+                        status=status, created_at=datetime.utcnow())
+        for i, status in enumerate(statuses)
+    ])
+    db.commit()
+    db.close()
+    return factory
+
+
+def test_snapshot_serves_all_readers_from_one_query_set(session_factory):
+    statements = []
+    event.listen(session_factory.kw["bind"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+    clock = FakeClock()
+    snapshot = DashboardSnapshot(session_factory, interval=5.0, clock=clock)
+
+    payloads = [snapshot.get() for _ in range(20)]
+    # Satu query per tabel untuk statistik + transaksi terbaru, trend dan produk terpopuler
+    assert len(statements) == 5
+    assert all(payload is payloads[0] for payload in payloads)
+
+    stats = payloads[0]["stats"]
+    assert stats == {
+        "total_users": 4,
+        "active_users": 3,
+        "total_transactions": 5,
+        "total_revenue": 67500.0,
+        "pending_transactions": 1,
+        "failed_transactions": 1
+    }
+    assert len(payloads[0]["recent_transactions"]) == 5
+    assert payloads[0]["top_products"][0]["transaction_count"] == 3
+
+    clock.now = 5.0
+    snapshot.get()
+    assert len(statements) == 10
+    assert snapshot.get_stats()["refresh_count"] == 2
+
+
+def test_background_refresh_skips_when_nobody_reads(session_factory):
+    clock = FakeClock()
+    snapshot = DashboardSnapshot(session_factory, interval=5.0, idle_timeout=60.0, clock=clock)
+
+    snapshot._refresh_if_read()
+    assert snapshot.get_stats()["refresh_count"] == 0
+
+    snapshot.get()
+    clock.now = 30.0
+    snapshot._refresh_if_read()
+    assert snapshot.get_stats()["refresh_count"] == 2
+
+    clock.now = 120.0
+    snapshot._refresh_if_read()
+    assert snapshot.get_stats()["refresh_count"] == 2
@@ -0,0 +1,96 @@
+"""
+Test Fraud Feature Store
+Test untuk counter sliding window, statistik Welford dan blacklist bersama pada AntiFraudService
+"""
+
+import statistics
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.domains.security.services.fraud_feature_store import (
+    BloomFilter, FraudFeatureStore, RunningStats
+)
+from app.domains.security.services.security_service import AntiFraudService
+from app.domains.wallet.models.wallet import TransactionType
+from app.domains.wallet.services import wallet_transaction_service
+from app.domains.wallet.services.wallet_transaction_service import WalletTransactionService
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_800_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sliding_windows_and_welford_stats():
+    clock = FakeClock()
+    store = FraudFeatureStore(clock=clock)
+
+    for amount in (10000, 20000, 30000):
+        store.record_transaction(1, amount, ip_address="10.0.0.1")
+    clock.now += 120
+    store.record_transaction(1, 40000)
+
+    features = store.get_user_features(1)
+    assert features["count_1m"] == 1
+    assert features["count_1h"] == 4
+    assert store.get_ip_features("10.0.0.1")["count_1h"] == 3
+
+    # Transaksi lebih dari satu hari lalu keluar dari jendela
+    clock.now += 86400
+    assert store.get_user_features(1)["count_1d"] == 0
+
+    stats = RunningStats()
+    values = [12000, 15000, 9000, 50000, 11000]
+    for value in values:
+        stats.update(value)
+    assert abs(stats.mean - statistics.mean(values)) < 1e-6
+    assert abs(stats.variance - statistics.variance(values)) < 1e-3
+
+
+def test_anti_fraud_service_uses_features_and_shared_blacklist():
+    clock = FakeClock()
+    store = FraudFeatureStore(clock=clock)
+
+    for _ in range(6):
+        store.record_transaction("42", 50000)
+    result = AntiFraudService(db=None, feature_store=store).check_transaction_fraud("42", 55000, "10.0.0.2")
+    assert "Transaksi terlalu cepat" in result["reasons"]
+    assert "Pola transaksi tidak biasa" not in result["reasons"]
+
+    # Blacklist tidak hilang saat service dibuat ulang
+    AntiFraudService(db=None, feature_store=store).add_to_blacklist("10.0.0.9", "ip")
+    blocked = AntiFraudService(db=None, feature_store=store).check_transaction_fraud("7", 1000, "10.0.0.9")
+    assert blocked["action"] == "block"
+
+    AntiFraudService(db=None, feature_store=store).remove_from_blacklist("10.0.0.9", "ip")
+    assert AntiFraudService(db=None, feature_store=store).check_transaction_fraud("7", 1000, "10.0.0.9")["action"] == "allow"
+
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}")
+    assert all(f"user{i}" in bloom for i in range(1000))
+    assert sum(f"other{i}" in bloom for i in range(1000)) < 50
+
+
+class FakeWalletRepository:
+    def get_user_balance(self, user_id):
+        return Decimal("1000000")
+
+    def create_transaction(self, **kwargs):
+        return SimpleNamespace(**kwargs)
+
+
+def test_wallet_transactions_record_request_ip_once(monkeypatch):
+    store = FraudFeatureStore(clock=FakeClock())
+    monkeypatch.setattr(wallet_transaction_service, "fraud_feature_store", store)
+    service = WalletTransactionService(FakeWalletRepository())
+
+    service.create_transaction(7, TransactionType.TRANSFER_SEND, Decimal("50000"), ip_address="10.0.0.9")
+    # Debit wallet untuk pembelian PPOB sudah dicatat sebagai transaksi PPOB
+    service.create_transaction(7, TransactionType.PPOB_PAYMENT, Decimal("20000"), ip_address="10.0.0.9")
+
+    assert store.get_user_features(7)["count_1h"] == 1
+    assert store.get_ip_features("10.0.0.9")["count_1h"] == 1
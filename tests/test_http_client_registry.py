@@ -0,0 +1,89 @@
+"""
+Test HTTP Client Registry
+Test untuk pool HTTP client bersama terhadap mock server lokal: keep-alive, retry budget dan histogram latency
+"""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.infrastructure.external_apis.http_client import (
+    HTTPClientRegistry, UpstreamConfig, UpstreamError
+)
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_and_5xx_is_retried():
+    state = {"peers": set(), "flaky": 0}
+
+    async def ok(request):
+        state["peers"].add(request.transport.get_extra_info("peername"))
+        return web.json_response({"status": "ok"})
+
+    async def flaky(request):
+        state["flaky"] += 1
+        if state["flaky"] == 1:
+            return web.Response(status=503)
+        return web.json_response({"status": "recovered"})
+
+    app = web.Application()
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/flaky", flaky)
+    server = TestServer(app)
+    await server.start_server()
+
+    registry = HTTPClientRegistry({"mock": UpstreamConfig("mock", timeout=5.0, max_retries=2)})
+    try:
+        for _ in range(10):
+            response = await registry.get("mock", str(server.make_url("/ok")))
+            assert response.json() == {"status": "ok"}
+
+        # Sepuluh request lewat satu koneksi keep-alive
+        assert len(state["peers"]) == 1
+
+        response = await registry.get("mock", str(server.make_url("/flaky")))
+        assert response.status == 200
+        assert state["flaky"] == 2
+
+        stats = registry.get_stats()["mock"]
+        assert stats["requests"] == 11
+        assert stats["retries"] == 1
+        assert stats["latency"]["count"] == 12
+    finally:
+        await registry.aclose()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried_and_connect_errors_respect_budget():
+    calls = {"count": 0}
+
+    async def unavailable(request):
+        calls["count"] += 1
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_post("/pay", unavailable)
+    server = TestServer(app)
+    await server.start_server()
+
+    registry = HTTPClientRegistry({"mock": UpstreamConfig("mock", max_retries=3)})
+    try:
+        # POST non-idempoten: 503 dikembalikan apa adanya tanpa retry
+        response = await registry.post("mock", str(server.make_url("/pay")), json={})
+        assert response.status == 503
+        assert calls["count"] == 1
+
+        # Port tertutup: gagal koneksi di-retry sampai retry budget habis lalu UpstreamError
+        closed_url = str(server.make_url("/pay"))
+        await server.close()
+        for _ in range(3):
+            with pytest.raises(UpstreamError):
+                await registry.post("mock", closed_url, json={})
+
+        stats = registry.get_stats()["mock"]
+        assert stats["errors"] == 3
+        assert stats["retry_budget_exhausted"] >= 1
+        assert stats["retries"] <= 4
+    finally:
+        await registry.aclose()
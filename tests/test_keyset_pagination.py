@@ -0,0 +1,93 @@
+"""
+Test Keyset Pagination
+Test untuk KeysetPaginator: cursor opaque (timestamp, id) tanpa duplikat/celah dan validasi cursor
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.common.exceptions.custom_exceptions import ValidationException
+from app.common.utils.pagination import COUNT_EXACT, KeysetPaginator, decode_cursor, encode_cursor
+from app.core.database import Base
+from app.domains.admin.repositories.user_management_repository import UserManagementRepository
+from app.domains.auth.models.user import User
+from app.domains.discord.models.command_log import DiscordCommandLog
+
+
+START = datetime(2026, 10, 1, 8, 0)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[DiscordCommandLog.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_cursor_walks_all_rows_without_duplicates_or_gaps(db):
+    # Banyak log dengan timestamp sama: id harus menjadi tie-breaker
+    for i in range(23):
+        db.add(DiscordCommandLog(
+            user_id=f"user{i % 2}", username="User", channel_id="chan",
+            command="balance", is_successful=True,
+            timestamp=START + timedelta(minutes=i // 5)
+        ))
+    db.commit()
+
+    paginator = KeysetPaginator(DiscordCommandLog.timestamp, DiscordCommandLog.id)
+    statement = select(DiscordCommandLog)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = paginator.paginate(db, statement, cursor, page_size=5, count=COUNT_EXACT)
+        seen.extend(log.id for log in page["items"])
+        pages += 1
+        assert page["pagination"]["total_items"] == 23
+        cursor = page["pagination"]["next_cursor"]
+        if not page["pagination"]["has_next"]:
+            break
+
+    expected = [log.id for log in db.scalars(
+        select(DiscordCommandLog).order_by(DiscordCommandLog.timestamp.desc(), DiscordCommandLog.id.desc())
+    )]
+    assert seen == expected
+    assert pages == 5
+    assert cursor is None
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    values = [START, 42]
+    assert decode_cursor(encode_cursor(values)) == values
+
+    paginator = KeysetPaginator(DiscordCommandLog.timestamp, DiscordCommandLog.id)
+    with pytest.raises(ValidationException):
+        paginator.apply(select(DiscordCommandLog), cursor="bukan-cursor")
+    with pytest.raises(ValidationException):
+        paginator.apply(select(DiscordCommandLog), cursor=encode_cursor([1]))
+
+
+def test_offset_fallback_continues_keyset_first_page():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    # created_at tidak searah dengan id agar urutan tanpa ORDER BY berbeda
+    for i in range(12):
+        db.add(User(username=f"user{i}", email=f"user{i}@example.com", full_name="User",
+                    hashed_password="x", created_at=START - timedelta(minutes=(i * 7) % 12)))
+    db.commit()
+
+    repository = UserManagementRepository(db)
+    first_page = repository.get_users_page(limit=5)["items"]
+    second_page, total = repository.get_users_with_pagination(skip=5, limit=5)
+    third_page, _ = repository.get_users_with_pagination(skip=10, limit=5)
+
+    ids = [user.id for user in first_page + second_page + third_page]
+    assert total == 12
+    assert ids == [user.id for user in db.scalars(select(User).order_by(User.created_at.desc(), User.id.desc()))]
+    db.close()
@@ -0,0 +1,78 @@
+"""
+Test Log Search Engine
+Test untuk index pencarian Discord command log (posting list in-process dan FTS5 persisten)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.domains.discord.models.command_log import DiscordCommandLog
+from app.domains.discord.repositories.command_log_repository import CommandLogRepository
+from app.domains.discord.services.log_search_engine import LogSearchEngine
+
+
+START = datetime(2026, 10, 1, 8, 0)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[DiscordCommandLog.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def seed_logs(db, count=40):
+    repo = CommandLogRepository(db)
+    for i in range(count):
+        failed = i % 4 == 0
+        repo.create_log({
+            "user_id": f"user{i % 3}",
+            "username": f"User {i % 3}",
+            "channel_id": "chan",
+            "guild_id": "guild1",
+            "command": "topup" if i % 2 else "balance",
+            "command_args": f"amount {i * 1000}",
+            "response_message": "saldo berhasil ditambahkan" if not failed else None,
+            "error_message": "provider timeout error" if failed else None,
+            "is_successful": not failed,
+            "timestamp": START + timedelta(hours=i)
+        })
+
+
+def test_in_process_tier_filters_and_ranks(db):
+    seed_logs(db)
+    engine = LogSearchEngine(max_documents=1000)
+    assert engine.sync(CommandLogRepository(db)) == 40
+
+    assert len(engine.search_by_command("TOPUP")) == 20
+    assert len(engine.search_by_date_range(START, START + timedelta(hours=9))) == 10
+
+    # Log yang cocok dengan lebih banyak term (provider + timeout) berada di atas
+    logs = engine.search_logs(db, "provider timeout saldo", user_id="user0", limit=5)
+    assert logs
+    assert all(log.user_id == "user0" for log in logs)
+    assert logs[0].error_message == "provider timeout error"
+
+
+def test_memory_is_bounded_and_old_ranges_use_persistent_index(db):
+    seed_logs(db)
+    engine = LogSearchEngine(max_documents=10)
+    engine.sync(CommandLogRepository(db))
+
+    assert engine.get_index_stats()["total_indexed_logs"] <= 11
+    assert not engine.covers(START)
+
+    # Rentang lama di luar jendela in-process dijawab FTS5 dengan ranking bm25
+    logs = engine.search_logs(db, "timeout", start_date=START, end_date=START + timedelta(hours=5))
+    assert [log.id for log in logs] == [5, 1]
+
+    # Log baru ter-index incremental
+    seed_logs(db, count=1)
+    assert engine.sync(CommandLogRepository(db)) == 1
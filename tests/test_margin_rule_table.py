@@ -0,0 +1,54 @@
+"""
+Test Margin Rule Table
+Test untuk tabel aturan margin in-process: satu query per load, prioritas override dan invalidation
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.domains.admin.services.margin.margin_calculation_service import MarginCalculationService
+from app.domains.admin.services.margin.margin_rule_table import MarginRuleTable
+from app.domains.ppob.models.ppob import PPOBMarginConfig
+
+
+def test_price_many_uses_one_query_and_product_overrides():
+    engine = create_engine("sqlite://")
+    PPOBMarginConfig.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        PPOBMarginConfig(category="pulsa", product_code=None, margin_type="percentage", margin_value=2.5, is_active=True),
+        PPOBMarginConfig(category="pulsa", product_code="TSEL100", margin_type="fixed", margin_value=1500, is_active=True),
+        PPOBMarginConfig(category="pln", product_code=None, margin_type="fixed", margin_value=2000, is_active=False)
+    ])
+    db.commit()
+
+    table = MarginRuleTable(refresh_interval=3600)
+    service = MarginCalculationService(db, table)
+    catalog = [
+        {"product_code": f"TSEL{i}", "category": "pulsa" if i % 3 else "pln", "base_price": Decimal(1000 * i)}
+        for i in range(1, 301)
+    ]
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    prices = service.price_many(catalog)
+    assert service.calculate_price_with_margin(Decimal("10000"), "pulsa") == Decimal("10250")
+    assert len(statements) == 1
+
+    assert prices[0] == Decimal("1025")
+    assert prices[2] == Decimal("3000")  # kategori pln: margin tidak aktif
+    assert prices[99] == Decimal("101500")  # override TSEL100
+    assert prices == [
+        service.calculate_price_with_margin(item["base_price"], item["category"], item["product_code"])
+        for item in catalog
+    ]
+
+    # Setelah konfigurasi berubah, invalidate memaksa load ulang
+    db.query(PPOBMarginConfig).filter(PPOBMarginConfig.category == "pln").update({"is_active": True})
+    db.commit()
+    assert service.calculate_price_with_margin(Decimal("3000"), "pln") == Decimal("3000")
+    table.invalidate()
+    assert service.calculate_price_with_margin(Decimal("3000"), "pln") == Decimal("5000")
+    db.close()
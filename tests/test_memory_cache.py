@@ -0,0 +1,75 @@
+"""
+Test Memory Cache Engine
+Test untuk LRU eviction, TTL reaper dan statistik MemoryCacheService
+"""
+
+import asyncio
+import pytest
+from app.cache.implementations.memory_cache import MemoryCacheService
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_accessed():
+    cache = MemoryCacheService(max_size=3, shard_count=1)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.set("c", 3)
+
+    # Akses "a" sehingga "b" menjadi yang paling lama tidak diakses
+    assert await cache.get("a") == 1
+    await cache.set("d", 4)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("d") == 4
+
+    health = await cache.health_check()
+    assert health["evictions"] == 1
+    assert health["hits"] == 3
+    assert health["misses"] == 1
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_reaper_removes_expired_items():
+    cache = MemoryCacheService(max_size=100, cleanup_interval=0.05)
+
+    await cache.set("short", "value", ttl=0.1)
+    await cache.set("long", "value", ttl=60)
+    await cache.set("forever", "value")
+
+    await asyncio.sleep(0.3)
+
+    health = await cache.health_check()
+    assert health["total_items"] == 2
+    assert health["expirations"] == 1
+    assert await cache.exists("long")
+    assert not await cache.exists("short")
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_overwrite_resets_ttl():
+    cache = MemoryCacheService(max_size=10, cleanup_interval=0.05)
+
+    await cache.set("key", "old", ttl=0.1)
+    await cache.set("key", "new", ttl=60)
+    await asyncio.sleep(0.25)
+
+    assert await cache.get("key") == "new"
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_clear_with_pattern():
+    cache = MemoryCacheService(max_size=100)
+
+    await cache.set("ppob:products:pulsa", [1])
+    await cache.set("ppob:products:data", [2])
+    await cache.set("user:1", {"id": 1})
+
+    assert await cache.clear("ppob:products:*")
+    assert await cache.get("ppob:products:pulsa") is None
+    assert await cache.get("user:1") == {"id": 1}
+    await cache.close()
@@ -0,0 +1,73 @@
+"""
+Test Near Cache
+Test untuk near cache (L1 in-process + L2 Redis) dan invalidation pub/sub antar worker
+"""
+
+import asyncio
+
+import pytest
+
+from app.cache.implementations.near_cache import NearCacheService
+from app.cache.implementations.redis_cache import RedisCacheService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def build_worker(server, **kwargs):
+    l2 = RedisCacheService(redis_url="redis://localhost:6379/0")
+    l2._redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return NearCacheService(l2, prefix_ttls={"ppob_api:ppob:product": 30, "ppob_api:ppob:inquiry": 0}, **kwargs)
+
+
+async def wait_until(condition, timeout: float = 3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_l1_serves_hot_keys_and_stays_coherent_across_workers():
+    server = fakeredis.FakeServer()
+    worker_a, worker_b = build_worker(server), build_worker(server)
+    key = "ppob_api:ppob:products:pulsa"
+
+    await worker_a.set(key, [{"code": "TSEL5"}], ttl=300)
+    await worker_b.get(key)
+    await wait_until(lambda: worker_a._listening and worker_b._listening)
+
+    assert await worker_b.get(key) == [{"code": "TSEL5"}]
+    for _ in range(10):
+        assert await worker_b.get(key) == [{"code": "TSEL5"}]
+    stats = worker_b.get_stats()
+    assert stats["l1_hits"] == 10
+    assert stats["l2_hits"] == 2
+
+    # Update di worker A membuang L1 worker B lewat pub/sub
+    await worker_a.set(key, [{"code": "TSEL10"}], ttl=300)
+    await wait_until(lambda: key not in worker_b._l1)
+    assert await worker_b.get(key) == [{"code": "TSEL10"}]
+
+    await worker_a.set("ppob_api:ppob:history:1", {"n": 1}, ttl=300, tags=["user:1"])
+    await worker_b.get("ppob_api:ppob:history:1")
+    assert "ppob_api:ppob:history:1" in worker_b._l1
+    assert await worker_a.invalidate_tags(["user:1"]) == 1
+    await wait_until(lambda: "ppob_api:ppob:history:1" not in worker_b._l1)
+    assert await worker_b.get("ppob_api:ppob:history:1") is None
+
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_prefix_ttl_zero_bypasses_l1():
+    worker = build_worker(fakeredis.FakeServer())
+    await worker.get("warmup")
+    await wait_until(lambda: worker._listening)
+
+    await worker.set("ppob_api:ppob:inquiry:pln:123", {"amount": 1}, ttl=60)
+    await worker.set("ppob_api:other", {"a": 1}, ttl=60)
+
+    assert "ppob_api:ppob:inquiry:pln:123" not in worker._l1
+    assert "ppob_api:other" in worker._l1
+    await worker.close()
@@ -0,0 +1,79 @@
+"""
+Test Password Service
+Test untuk hashing bcrypt di pool, batas antrian dan rehash saat login bila cost berubah
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.common.exceptions.custom_exceptions import PasswordServiceBusyError
+from app.domains.auth.models.user import User
+from app.domains.auth.repositories.user_repository import UserRepository
+from app.domains.auth.services.auth_service import AuthService
+from app.infrastructure.security.password_service import AsyncPasswordService, build_password_context
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(
+        username="budi", email="budi@example.com", full_name="Budi",
+        hashed_password=build_password_context(4).hash("Rahasia123!")
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_when_cost_changes(db):
+    service = AuthService(UserRepository(db))
+    service.password_service = AsyncPasswordService(rounds=5, max_workers=2)
+    try:
+        assert await service.authenticate_user("budi", "salah") is None
+        assert db.query(User).one().hashed_password.startswith("$2b$04$")
+
+        user = await service.authenticate_user("budi", "Rahasia123!")
+        assert user.hashed_password.startswith("$2b$05$")
+        assert not service.password_service.needs_rehash(db.query(User).one().hashed_password)
+
+        # Hash sudah memakai cost terbaru: login berikutnya tidak menulis ulang
+        await service.authenticate_user("budi", "Rahasia123!")
+        stats = service.password_service.get_stats()
+        assert stats["rehashed"] == 1
+        assert stats["verify_latency"]["count"] == 3
+    finally:
+        service.password_service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_queue_is_full_without_blocking_loop():
+    service = AsyncPasswordService(rounds=8, max_workers=1, max_pending=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        results = await asyncio.gather(
+            *(service.hash_password("Rahasia123!") for _ in range(3)),
+            return_exceptions=True
+        )
+    finally:
+        ticker_task.cancel()
+        service.shutdown()
+
+    assert sum(isinstance(result, PasswordServiceBusyError) for result in results) == 1
+    assert all(result.startswith("$2b$08$") for result in results if isinstance(result, str))
+    # Event loop tetap berjalan selama bcrypt dihitung di pool
+    assert ticks > 0
+    assert service.get_stats()["rejected"] == 1
@@ -0,0 +1,151 @@
+"""
+Test PPOB Provider Routing
+Test untuk routing provider berbasis latency (peak-EWMA / power-of-two-choices) dan circuit breaker
+"""
+
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.common.exceptions.custom_exceptions import ExternalServiceError
+from app.domains.ppob.schemas.ppob_schemas import PPOBInquiryRequest, PPOBInquiryResponse
+from app.domains.ppob.services.ppob_payment_service import PPOBPaymentService
+from app.domains.ppob.services.providers import (
+    CircuitState, PPOBProviderFactory, ProviderCircuitBreaker
+)
+from app.domains.ppob.services.providers.digiflazz_provider import DigiflazzProvider
+
+
+class FakeProvider:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def inquiry(self, request):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"ok": True}
+
+    async def health_check(self):
+        return {"status": "unhealthy" if self.fail else "healthy"}
+
+
+def build_factory(**providers):
+    factory = PPOBProviderFactory()
+    for name in list(factory.providers):
+        factory.remove_provider(name)
+    factory.health_monitor.interval = 3600
+    for priority, (name, provider) in enumerate(providers.items()):
+        factory.register_provider(name, FakeProvider, priority=priority, config={})
+        factory.providers[name]._instance = provider
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_traffic_follows_fastest_provider():
+    slow, fast = FakeProvider(delay=0.03), FakeProvider(delay=0.001)
+    factory = build_factory(slow=slow, fast=fast)
+
+    for _ in range(20):
+        await factory.inquiry({"customer_number": "123"})
+
+    # Provider lambat (prioritas lebih tinggi) hanya dipakai sampai latency-nya terukur
+    assert fast.calls > slow.calls
+    assert fast.calls >= 15
+    await factory.stop_health_checks()
+
+
+@pytest.mark.asyncio
+async def test_failing_provider_is_isolated_by_circuit_breaker():
+    broken, backup = FakeProvider(fail=True), FakeProvider(delay=0.001)
+    factory = build_factory(broken=broken, backup=backup)
+    factory.providers["broken"].latency.observe(1.0)
+    factory.providers["backup"].latency.observe(100.0)
+    factory.providers["broken"].circuit_breaker = ProviderCircuitBreaker(failure_threshold=2)
+
+    for _ in range(10):
+        assert await factory.inquiry({"customer_number": "123"}) == {"ok": True}
+
+    assert factory.providers["broken"].circuit_breaker.state == CircuitState.OPEN
+    assert broken.calls == 2
+
+    backup.fail = True
+    with pytest.raises(ExternalServiceError):
+        await factory.inquiry({"customer_number": "123"})
+    await factory.stop_health_checks()
+
+
+@pytest.mark.asyncio
+async def test_failing_digiflazz_payment_trips_circuit_breaker(monkeypatch):
+    digiflazz = DigiflazzProvider(username="user", api_key="key")
+    calls = []
+
+    async def upstream_down(endpoint, data):
+        calls.append(endpoint)
+        raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(digiflazz, "_make_digiflazz_request", upstream_down)
+    factory = build_factory(digiflazz=digiflazz)
+    factory.providers["digiflazz"].circuit_breaker = ProviderCircuitBreaker(failure_threshold=2)
+    request = {"product_code": "PLN20", "customer_number": "1234567890", "transaction_code": "TRX1"}
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await factory.payment(request)
+
+    assert factory.providers["digiflazz"].circuit_breaker.state == CircuitState.OPEN
+    with pytest.raises(ExternalServiceError):
+        await factory.payment(request)
+    assert len(calls) == 2
+
+
+def test_half_open_allows_single_probe_then_closes():
+    now = [0.0]
+    breaker = ProviderCircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert not breaker.allows_request()
+
+    now[0] = 11
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.acquire()
+    assert not breaker.acquire()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+class FakeRepository:
+    db = None
+
+    async def get_product_by_code(self, product_code):
+        return SimpleNamespace(product_code=product_code, product_name="Pulsa 10K", category_id=1)
+
+
+@pytest.mark.asyncio
+async def test_payment_service_inquiry_goes_through_factory():
+    class InquiryProvider(FakeProvider):
+        async def inquiry(self, request):
+            await super().inquiry(request)
+            return PPOBInquiryResponse(
+                customer_number=request.customer_number, customer_name="Budi", amount=10000,
+                admin_fee=1000, total_amount=11000, product_name="", ref_id="REF1"
+            )
+
+    broken, backup = FakeProvider(fail=True), InquiryProvider(delay=0.001)
+    factory = build_factory(broken=broken, backup=backup)
+    service = PPOBPaymentService(FakeRepository(), provider_factory=factory)
+
+    response = await service.inquiry(PPOBInquiryRequest(category_id=1, product_code="PULSA10", customer_number="0812"))
+
+    # Inquiry di-failover ke provider sehat dan hasilnya tercatat di routing
+    assert broken.calls == 1 and backup.calls == 1
+    assert factory.providers["broken"].circuit_breaker.to_dict()["consecutive_failures"] == 1
+    assert response.amount == Decimal("10500")
+    assert response.total_amount == Decimal("11500")
+    assert response.product_name == "Pulsa 10K"
@@ -0,0 +1,71 @@
+"""
+Test Bulk Price Update
+Test untuk sinkronisasi harga produk set-based beserta laporan error per baris dan margin batch
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.domains.admin.services.margin.margin_calculation_service import MarginCalculationService
+from app.domains.admin.services.margin.margin_rule_table import MarginRuleTable
+from app.domains.ppob.models.ppob import PPOBMarginConfig
+from app.domains.product.models.product import Product
+from app.domains.product.repositories.product_repository import ProductRepository
+from app.domains.product.services.product_service import ProductService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Product.__table__.create(engine)
+    PPOBMarginConfig.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Product(code=f"TSEL{i}", name=f"Pulsa {i}", category="pulsa" if i % 2 else "data", provider="digiflazz",
+                base_price=Decimal(1000 * i), selling_price=Decimal(1000 * i + 500), admin_fee=Decimal("0"))
+        for i in range(1, 501)
+    ])
+    session.add_all([
+        PPOBMarginConfig(category="pulsa", product_code=None, margin_type="percentage", margin_value=10.0, is_active=True),
+        PPOBMarginConfig(category="data", product_code="TSEL2", margin_type="fixed", margin_value=750.0, is_active=True)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_sync_writes_once_and_reports_bad_rows(db):
+    service = ProductService(ProductRepository(db))
+    updates = [{"code": f"TSEL{i}", "base_price": 2000 * i} for i in range(1, 501)]
+    updates += [
+        {"code": "UNKNOWN", "base_price": 1000},
+        {"product_id": 3, "selling_price": "abc"},
+        {"product_id": 5, "selling_price": 1},
+        {"base_price": 1000}
+    ]
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = await service.bulk_sync_prices(updates, margin_service=MarginCalculationService(db, MarginRuleTable()))
+
+    # SELECT harga per kolom identitas (id, code), satu SELECT margin, satu UPDATE executemany
+    assert len(statements) == 4
+    assert result.updated_count == 500
+    assert [(error.index, error.error) for error in result.errors] == [
+        (500, "Produk tidak ditemukan"),
+        (501, "Format harga tidak valid"),
+        (502, "Harga jual tidak boleh lebih kecil dari harga dasar"),
+        (503, "product_id atau code wajib diisi")
+    ]
+
+    db.expire_all()
+    pulsa = db.query(Product).filter(Product.code == "TSEL1").one()
+    assert (pulsa.base_price, pulsa.selling_price, pulsa.margin) == (Decimal("2000"), Decimal("2200"), Decimal("200"))
+    product_margin = db.query(Product).filter(Product.code == "TSEL2").one()
+    assert product_margin.selling_price == Decimal("4750")
+    # Kategori tanpa margin: harga jual = harga dasar
+    assert db.query(Product).filter(Product.code == "TSEL4").one().selling_price == Decimal("8000")
@@ -0,0 +1,84 @@
+"""
+Test Rate Limiter Backends
+Test untuk token bucket in-process dan sliding window Redis (via fakeredis jika tersedia)
+"""
+
+import pytest
+from app.common.middleware.rate_limit_backends import (
+    InMemoryTokenBucketBackend, RedisSlidingWindowBackend
+)
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_enforces_burst_limit():
+    backend = InMemoryTokenBucketBackend()
+
+    results = [
+        await backend.hit("rate_limit:ip:1", limit=10, window=60, burst_limit=3, burst_window=10)
+        for _ in range(4)
+    ]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[-1].retry_after >= 1
+    # Key lain tidak terpengaruh
+    other = await backend.hit("rate_limit:ip:2", limit=10, window=60, burst_limit=3, burst_window=10)
+    assert other.allowed
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_cleanup_removes_idle_keys():
+    backend = InMemoryTokenBucketBackend(idle_ttl=0)
+    await backend.hit("rate_limit:ip:1", limit=10, window=60, burst_limit=5, burst_window=10)
+
+    assert await backend.cleanup() == 1
+    assert backend.get_stats()["storage_size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_is_shared_between_instances():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+
+    # Dua instance backend mensimulasikan dua worker dengan Redis yang sama
+    worker_a = RedisSlidingWindowBackend(redis_client=fakeredis.FakeAsyncRedis(server=server))
+    worker_b = RedisSlidingWindowBackend(redis_client=fakeredis.FakeAsyncRedis(server=server))
+
+    allowed = []
+    for backend in (worker_a, worker_b, worker_a, worker_b):
+        result = await backend.hit("rate_limit:ip:1", limit=3, window=60, burst_limit=10, burst_window=10)
+        allowed.append(result.allowed)
+
+    assert allowed == [True, True, True, False]
+    assert worker_a.get_stats()["redis_errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_falls_back_when_unavailable():
+    backend = RedisSlidingWindowBackend(redis_url="redis://127.0.0.1:1/0")
+
+    result = await backend.hit("rate_limit:ip:1", limit=3, window=60, burst_limit=3, burst_window=10)
+
+    assert result.allowed
+    assert backend.get_stats()["redis_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_backs_off_after_failure():
+    now = [0.0]
+    backend = RedisSlidingWindowBackend(redis_url="redis://127.0.0.1:1/0", clock=lambda: now[0])
+
+    for _ in range(5):
+        assert (await backend.hit("rate_limit:ip:1", limit=10, window=60, burst_limit=10, burst_window=10)).allowed
+    # Selama jendela backoff Redis tidak dicoba lagi
+    assert backend.get_stats()["redis_errors"] == 1
+    assert backend.get_stats()["backing_off"]
+
+    now[0] = 1.5
+    await backend.hit("rate_limit:ip:1", limit=10, window=60, burst_limit=10, burst_window=10)
+    assert backend.get_stats()["redis_errors"] == 2
+
+    # Backoff bertambah dua kali lipat untuk kegagalan beruntun
+    now[0] = 3.0
+    await backend.hit("rate_limit:ip:1", limit=10, window=60, burst_limit=10, burst_window=10)
+    assert backend.get_stats()["redis_errors"] == 2
@@ -0,0 +1,85 @@
+"""
+Test Startup Worker
+Test untuk profiler waktu import, registrasi router dari tabel spec dan sinkronisasi schema sekali jalan
+"""
+
+import importlib
+import sys
+
+import pytest
+from fastapi import APIRouter
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1 import router as router_module
+from app.api.v1.router import RouterSpec, register_routers
+from app.common.utils.lazy_imports import lazy_import
+from app.core.import_profiler import ImportProfiler
+from app.infrastructure.database.database_manager import DatabaseManager
+
+
+def test_import_profiler_reports_self_and_cumulative_time(tmp_path, monkeypatch):
+    package = tmp_path / "profiled_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import heavy\n")
+    (package / "heavy.py").write_text("import time\ntime.sleep(0.05)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = ImportProfiler()
+    profiler.start()
+    try:
+        importlib.import_module("profiled_pkg")
+    finally:
+        profiler.stop()
+        sys.modules.pop("profiled_pkg", None)
+        sys.modules.pop("profiled_pkg.heavy", None)
+
+    timings = profiler.timings
+    assert timings["profiled_pkg.heavy"][1] >= 0.05
+    assert timings["profiled_pkg"][1] >= timings["profiled_pkg.heavy"][1]
+    assert timings["profiled_pkg"][0] < 0.05
+    assert profiler.report(1)[0][0] == "profiled_pkg"
+
+
+def test_lazy_module_defers_import():
+    sys.modules.pop("colorsys", None)
+    colorsys = lazy_import("colorsys")
+    assert not colorsys.is_loaded and "colorsys" not in sys.modules
+    assert colorsys.rgb_to_hsv(1, 0, 0)[0] == 0
+    assert colorsys.is_loaded
+
+
+def test_register_routers_skips_disabled_groups_and_missing_modules(monkeypatch):
+    monkeypatch.setattr(router_module.settings, "DISABLED_ROUTER_GROUPS", "discord")
+    specs = [
+        RouterSpec("app.api.v1.endpoints.health", "router", "/wallet/health", "wallet", "Wallet health"),
+        RouterSpec("app.api.v1.endpoints.discord_bot", "router", "/discord/bot", "discord-bot-api", "Discord bot API"),
+        RouterSpec("app.api.v1.endpoints.does_not_exist", "router", "/ppob", "ppob", "Missing controller")
+    ]
+    router = APIRouter()
+    assert register_routers(router, specs) == 1
+    assert all(route.path.startswith("/wallet/health") for route in router.routes)
+
+
+def test_schema_sync_runs_once_until_models_change(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    manager = DatabaseManager()
+    manager.engine = engine
+    manager.SessionLocal = sessionmaker(bind=engine)
+
+    fingerprint = manager.sync_schema()
+    assert manager._stored_fingerprint() == fingerprint
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    monkeypatch.setattr(manager, "sync_schema", lambda: pytest.fail("schema sudah tersinkron"))
+    manager.create_tables()
+    # Startup berikutnya cukup satu SELECT fingerprint
+    assert len(statements) == 1 and "schema_state" in statements[0]
+
+    monkeypatch.setattr(manager, "schema_fingerprint", lambda: "changed")
+    synced = []
+    monkeypatch.setattr(manager, "sync_schema", lambda: synced.append(True))
+    manager.create_tables()
+    assert synced == [True]
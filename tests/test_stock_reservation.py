@@ -0,0 +1,131 @@
+"""
+Test Stock Reservation Engine
+Test untuk pengurangan stok atomik, idempotency key dan bulk sweep reservasi expired
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from app.common.exceptions.custom_exceptions import InsufficientStockError
+from app.domains.discord.models.discord import LiveStock
+from app.domains.inventory.models.inventory_models import StockReservation
+from app.domains.inventory.services.stock_reservation_engine import StockReservationEngine
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stock.db'}", connect_args={"timeout": 30})
+
+    # BEGIN IMMEDIATE agar transaksi SQLite serempak mengantre, bukan gagal "database is locked"
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    LiveStock.__table__.create(engine)
+    StockReservation.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    yield factory
+    engine.dispose()
+
+
+def add_product(factory, stock: int) -> int:
+    db = factory()
+    product = LiveStock(bot_id=1, product_code="DLOCK", product_name="Diamond Lock",
+                        price_wl=100, stock_quantity=stock, category="lock")
+    db.add(product)
+    db.commit()
+    product_id = product.id
+    db.close()
+    return product_id
+
+
+def stock_of(db, product_id: int) -> int:
+    return db.execute(select(LiveStock.stock_quantity).where(LiveStock.id == product_id)).scalar_one()
+
+
+def test_concurrent_reservations_never_oversell(session_factory):
+    engine = StockReservationEngine()
+    engine.register_source("livestock", LiveStock.__table__, "stock_quantity")
+    product_id = add_product(session_factory, stock=50)
+
+    succeeded, rejected = [], []
+    barrier = threading.Barrier(16)
+
+    def buyer(worker: int):
+        barrier.wait()
+        for attempt in range(10):
+            db = session_factory()
+            try:
+                engine.reserve(db, "livestock", product_id, 1, reserved_for=f"user:{worker}")
+                succeeded.append(worker)
+            except InsufficientStockError:
+                rejected.append(worker)
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=buyer, args=(worker,)) for worker in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(succeeded) == 50
+    assert len(rejected) == 16 * 10 - 50
+    db = session_factory()
+    assert stock_of(db, product_id) == 0
+    db.close()
+
+
+def test_idempotency_and_bulk_sweep_restore_stock(session_factory):
+    engine = StockReservationEngine()
+    engine.register_source("livestock", LiveStock.__table__, "stock_quantity")
+    product_id = add_product(session_factory, stock=10)
+    db = session_factory()
+
+    first = engine.reserve(db, "livestock", product_id, 3, "user:1", idempotency_key="buy:1")
+    again = engine.reserve(db, "livestock", product_id, 3, "user:1", idempotency_key="buy:1")
+    assert again.id == first.id
+    assert stock_of(db, product_id) == 7
+
+    short = engine.reserve(db, "livestock", product_id, 2, "user:2", ttl_seconds=60)
+    confirmed = engine.reserve(db, "livestock", product_id, 1, "user:3")
+    assert engine.confirm(db, confirmed.id)
+    assert stock_of(db, product_id) == 4
+    assert engine.next_expiry() == short.expires_at
+
+    # Reservasi aktif (3 + 2) dilepas sekaligus; yang sudah dikonfirmasi tidak dikembalikan
+    released = engine.sweep_expired(db, now=datetime.utcnow() + timedelta(hours=1))
+    assert released == 2
+    assert stock_of(db, product_id) == 9
+    assert engine.sweep_expired(db, now=datetime.utcnow() + timedelta(hours=1)) == 0
+    assert not engine.release(db, first.id)
+    db.close()
+
+
+def test_failed_reservation_keeps_caller_transaction(session_factory):
+    engine = StockReservationEngine()
+    engine.register_source("livestock", LiveStock.__table__, "stock_quantity")
+    product_id = add_product(session_factory, stock=1)
+
+    db = session_factory()
+    db.get(LiveStock, product_id).price_wl = 250
+    engine.reserve(db, "livestock", product_id, 1, reserved_for="order-1", commit=False)
+    with pytest.raises(InsufficientStockError):
+        engine.reserve(db, "livestock", product_id, 1, reserved_for="order-2", commit=False)
+    # Hanya savepoint reservasi kedua yang di-rollback
+    db.commit()
+    db.close()
+
+    db = session_factory()
+    assert stock_of(db, product_id) == 0
+    assert db.get(LiveStock, product_id).price_wl == 250
+    assert db.query(StockReservation).count() == 1
+    db.close()
@@ -0,0 +1,72 @@
+"""
+Test Streaming Export
+Test untuk export streaming CSV, NDJSON dan Parquet per chunk beserta progres job export ke file
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.common.exceptions.custom_exceptions import ValidationException
+from app.common.services.streaming_export import StreamingExporter
+from app.domains.admin.services.data_export_service import DataExportService
+from app.domains.auth.models.user import User
+
+
+@pytest.fixture
+def exporter():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    User.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    db.add_all([
+        User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}",
+             balance=Decimal(1000 * i), is_active=i % 3 != 0)
+        for i in range(1, 26)
+    ])
+    db.commit()
+    db.close()
+    return StreamingExporter(session_factory, chunk_size=10)
+
+
+def test_csv_export_streams_per_chunk(exporter):
+    chunks = list(exporter.iter_export(DataExportService.users_spec(), "csv"))
+    # Header + 3 chunk (10, 10, 5 baris)
+    assert len(chunks) == 4
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert len(rows) == 25
+    assert rows[0]["username"] == "user1" and rows[0]["balance"] == "1000.00"
+
+
+def test_ndjson_and_parquet_round_trip(exporter):
+    spec = DataExportService.users_spec("inactive")
+    records = [json.loads(line) for line in b"".join(exporter.iter_export(spec, "ndjson")).splitlines()]
+    assert [record["username"] for record in records] == [f"user{i}" for i in range(3, 26, 3)]
+    assert records[0]["balance"] == 3000.0 and records[0]["is_active"] is False
+
+    parquet = pytest.importorskip("pyarrow.parquet")
+    table = parquet.read_table(io.BytesIO(b"".join(exporter.iter_export(spec, "parquet"))))
+    assert table.num_rows == len(records)
+    assert table.column("username").to_pylist() == [record["username"] for record in records]
+
+    with pytest.raises(ValidationException):
+        exporter.iter_export(spec, "xlsx").__next__()
+
+
+@pytest.mark.asyncio
+async def test_export_to_file_tracks_progress(exporter, tmp_path):
+    exporter.export_dir = str(tmp_path)
+    job = await exporter.export_to_file(DataExportService.users_spec(), "ndjson")
+
+    assert job.status == "completed" and job.rows_written == 25
+    assert exporter.get_job(job.id) is job
+    with open(job.path, "rb") as file:
+        assert len(file.read()) == job.bytes_written
+    assert job.to_dict()["file_url"].endswith(".ndjson")
+    assert not list(tmp_path.glob("*.part"))
@@ -0,0 +1,97 @@
+"""
+Test Voucher Index
+Test untuk validasi voucher dari index in-memory, counter per user dan statistik agregat
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.domains.voucher.models.voucher import Voucher, VoucherUsage, VoucherUserCounter, VoucherType
+from app.domains.voucher.repositories.voucher_repository import VoucherRepository
+from app.domains.voucher.schemas.voucher_schemas import VoucherValidationRequest
+from app.domains.voucher.services.voucher_index import VoucherIndex
+from app.domains.voucher.services import voucher_service as voucher_service_module
+from app.domains.voucher.services.voucher_service import VoucherService
+
+
+@pytest.fixture
+def voucher_service(monkeypatch):
+    engine = create_engine("sqlite://")
+    for model in (Voucher, VoucherUsage, VoucherUserCounter):
+        model.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+
+    now = datetime.now()
+    db.add(Voucher(
+        code="HEMAT10", name="Hemat 10%", voucher_type=VoucherType.PERCENTAGE,
+        discount_value=Decimal("10"), max_discount=Decimal("5000"), min_transaction=Decimal("10000"),
+        usage_limit=3, user_limit=1, valid_from=now - timedelta(days=1), valid_until=now + timedelta(days=1),
+        applicable_categories='["pulsa"]'
+    ))
+    db.commit()
+
+    index = VoucherIndex(refresh_interval=3600)
+    monkeypatch.setattr(voucher_service_module, "voucher_index", index)
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    yield VoucherService(VoucherRepository(db)), queries
+    db.close()
+
+
+def request(amount: int = 50000, category: str = "pulsa") -> VoucherValidationRequest:
+    return VoucherValidationRequest(code="HEMAT10", transaction_amount=Decimal(amount), category=category)
+
+
+@pytest.mark.asyncio
+async def test_validation_served_from_index_without_queries(voucher_service):
+    service, queries = voucher_service
+
+    first = await service.validate_voucher(request(), user_id=1)
+    assert first.valid and first.discount_amount == Decimal("5000")
+
+    queries.clear()
+    for user_id in range(2, 50):
+        assert (await service.validate_voucher(request(), user_id=user_id)).valid
+    assert not (await service.validate_voucher(request(category="pln"), user_id=2)).valid
+    assert not (await service.validate_voucher(request(amount=5000), user_id=2)).valid
+    assert queries == []
+
+
+@pytest.mark.asyncio
+async def test_usage_limits_enforced_atomically_and_reflected_in_index(voucher_service):
+    service, _ = voucher_service
+    voucher_id = (await service.validate_voucher(request(), user_id=1)).voucher_id
+
+    await service.use_voucher(voucher_id, 1, None, Decimal(50000), Decimal(5000))
+    result = await service.validate_voucher(request(), user_id=1)
+    assert not result.valid and "batas penggunaan voucher ini" in result.message
+
+    # Kuota per user ditegakkan di DB walaupun validasi dilewati
+    with pytest.raises(HTTPException):
+        await service.use_voucher(voucher_id, 1, None, Decimal(50000), Decimal(5000))
+
+    await service.use_voucher(voucher_id, 2, None, Decimal(50000), Decimal(5000))
+    await service.use_voucher(voucher_id, 3, None, Decimal(50000), Decimal(5000))
+    assert not (await service.validate_voucher(request(), user_id=4)).valid
+    with pytest.raises(HTTPException):
+        await service.use_voucher(voucher_id, 4, None, Decimal(50000), Decimal(5000))
+
+    stats = await service.get_voucher_stats()
+    assert stats == {
+        "total_vouchers": 1,
+        "active_vouchers": 1,
+        "expired_vouchers": 0,
+        "total_usage": 3,
+        "total_discount_given": 15000.0
+    }
+
+    # Index yang dimuat ulang dari DB membaca user yang kuotanya habis dari tabel counter
+    fresh = VoucherIndex()
+    fresh.load(service.repository)
+    assert fresh.get("HEMAT10").exhausted_users == {1, 2, 3}
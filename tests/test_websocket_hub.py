@@ -0,0 +1,105 @@
+"""
+Test WebSocket Broadcast Hub
+Test untuk index topik, fan-out lewat antrian per client, pemutusan slow consumer dan bridge antar worker
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.domains.discord.services.websocket_manager import ConnectionManager, SLOW_CONSUMER_CLOSE_CODE
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0, block: bool = False):
+        self.delay = delay
+        self.block = block
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.block:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def drain(manager: ConnectionManager):
+    while any(client.queue.qsize() for client in manager.clients.values()):
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_to_10k_sockets_with_single_serialization(monkeypatch):
+    manager = ConnectionManager(queue_size=8)
+    sockets = []
+    for i in range(10000):
+        websocket = FakeWebSocket()
+        client_id = await manager.connect(websocket)
+        await manager.subscribe_to_topics(client_id, ["bot_status"] if i % 2 else ["command_logs"])
+        sockets.append(websocket)
+
+    dumps_calls = []
+    original_dumps = json.dumps
+    monkeypatch.setattr(json, "dumps", lambda *args, **kwargs: dumps_calls.append(1) or original_dumps(*args, **kwargs))
+    delivered = await manager.broadcast_to_topic("bot_status", {"status": "online"})
+    monkeypatch.setattr(json, "dumps", original_dumps)
+
+    assert delivered == 5000 and len(dumps_calls) == 1
+    await drain(manager)
+    assert all(ws.sent == ['{"status": "online"}'] for ws in sockets[1::2])
+    assert all(ws.sent == [] for ws in sockets[0::2])
+
+    await manager.unsubscribe_from_topics(manager.get_topic_subscribers("bot_status")[0], ["bot_status"])
+    assert len(manager.get_topic_subscribers("bot_status")) == 4999
+    await manager.close()
+    assert manager.topic_index == {}
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_without_delaying_others():
+    manager = ConnectionManager(queue_size=4, send_timeout=5.0)
+    fast = FakeWebSocket()
+    stuck = FakeWebSocket(block=True)
+    fast_id = await manager.connect(fast)
+    stuck_id = await manager.connect(stuck)
+    for client_id in (fast_id, stuck_id):
+        await manager.subscribe_to_topics(client_id, ["orders"])
+
+    # Satu pesan tertahan di send, empat mengisi antrian, pesan keenam membuat antrian penuh
+    for i in range(6):
+        await manager.broadcast_to_topic("orders", {"n": i})
+        await asyncio.sleep(0.01)
+
+    assert len(fast.sent) == 6
+    assert stuck_id not in manager.clients and stuck.closed_with == SLOW_CONSUMER_CLOSE_CODE
+    assert manager.get_topic_subscribers("orders") == [fast_id]
+    assert manager.get_stats()["dropped_slow_consumers"] == 1
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_bridge_message_from_other_worker_is_delivered_locally():
+    worker_a = ConnectionManager()
+    worker_b = ConnectionManager()
+    websocket = FakeWebSocket()
+    client_id = await worker_b.connect(websocket)
+    await worker_b.subscribe_to_topics(client_id, ["bot_status"])
+
+    frame = worker_a._frame("bot_status", json.dumps({"status": "offline"}))
+    assert worker_b.handle_bridge_message(frame) == 1
+    # Pesan dari worker sendiri tidak dikirim ulang
+    assert worker_a.handle_bridge_message(frame) == 0
+
+    await drain(worker_b)
+    assert websocket.sent == ['{"status": "offline"}']
+    await worker_b.close()